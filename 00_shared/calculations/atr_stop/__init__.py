@@ -0,0 +1,18 @@
+"""
+ATR Stop Outcome Simulator
+==========================
+
+Vectorized stop / R-level resolution shared by the ATR stop processors
+(03_backtest m1/m5_atr_stop_2, 08_journal j_m1/j_m5_atr_stop).
+
+Usage:
+    from shared.calculations.atr_stop import prepare_bars, simulate_outcomes
+
+    bars = prepare_bars(m1_bars)
+    outcome = simulate_outcomes(bars, entry_minutes, stops, r_prices, is_long, eod_minutes)
+    outcome.apply(0, result, bars)
+"""
+
+from .simulator import SimBars, SimOutcome, prepare_bars, simulate_outcomes, simulate_reference
+
+__all__ = ["SimBars", "SimOutcome", "prepare_bars", "simulate_outcomes", "simulate_reference"]
@@ -0,0 +1,308 @@
+"""
+ATR Stop Outcome Simulator
+==========================
+XIII Trading LLC - Epoch Trading System v2.0
+
+Batch engine behind the ATR stop processors:
+    - 03_backtest m1_atr_stop_2 / m5_atr_stop_2
+    - 08_journal j_m1_atr_stop / j_m5_atr_stop
+
+Rules (identical to the per-trade M1 bar walk):
+    - Bars strictly after the entry candle, up to and including the EOD
+      cutoff, are walked in time order
+    - Stop: bar CLOSE beyond the stop (LONG close <= stop, SHORT close >= stop)
+    - R-levels: bar HIGH/LOW touches the target (LONG high >= R, SHORT low <= R)
+    - Same-candle conflict: a bar that triggers the stop credits no R-levels
+    - The walk ends at the stop bar, or at the bar where the last R-level is
+      hit (a stop after that bar is not recorded)
+    - WIN = R1 credited; max_r = highest credited level, -1 for LOSS
+
+All trades of one ticker-date share one sorted bar array. Each trade's
+walk window comes from a binary search on bar minutes, and its first stop
+bar and first hit bar per R-level from a masked argmax over that window,
+instead of a Python loop per bar.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# =============================================================================
+# BAR PREPARATION
+# =============================================================================
+
+def _time_to_minutes(time_val) -> Optional[float]:
+    """Convert a time value to minutes from midnight."""
+    if time_val is None:
+        return None
+    try:
+        if isinstance(time_val, timedelta):
+            return time_val.total_seconds() / 60
+        if isinstance(time_val, time):
+            return time_val.hour * 60 + time_val.minute + time_val.second / 60
+        if isinstance(time_val, datetime):
+            return time_val.hour * 60 + time_val.minute + time_val.second / 60
+        if isinstance(time_val, str):
+            parts = time_val.split(':')
+            if len(parts) >= 2:
+                hours = int(parts[0])
+                minutes = int(parts[1])
+                seconds = int(parts[2]) if len(parts) > 2 else 0
+                return hours * 60 + minutes + seconds / 60
+        return None
+    except Exception:
+        return None
+
+
+def _timedelta_to_time(td) -> Optional[time]:
+    """Convert timedelta (from psycopg2) to time object."""
+    if td is None:
+        return None
+    if isinstance(td, time):
+        return td
+    if isinstance(td, timedelta):
+        total_seconds = int(td.total_seconds())
+        hours = total_seconds // 3600
+        minutes = (total_seconds % 3600) // 60
+        seconds = total_seconds % 60
+        return time(hours, minutes, seconds)
+    return None
+
+
+def _safe_float(value, default: float = 0.0) -> float:
+    """Safely convert value to float, handling Decimal types."""
+    if value is None:
+        return default
+    try:
+        if isinstance(value, Decimal):
+            return float(value)
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+@dataclass
+class SimBars:
+    """One ticker-date of bars, sorted by time, as parallel arrays."""
+    minutes: np.ndarray        # minutes from midnight, ascending
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    times: List[Optional[time]]
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+
+def prepare_bars(bars: List[Dict[str, Any]], time_key: str = 'bar_time') -> SimBars:
+    """
+    Sort bar dicts by time once and convert them to arrays.
+
+    Bars whose time cannot be parsed are dropped (the bar walk skips them
+    without counting them). The sort is stable, so equal times keep their
+    input order.
+    """
+    keyed = [(_time_to_minutes(bar.get(time_key)), bar) for bar in bars]
+    keyed = sorted(
+        [(minutes, bar) for minutes, bar in keyed if minutes is not None],
+        key=lambda item: item[0],
+    )
+    return SimBars(
+        minutes=np.array([m for m, _ in keyed], dtype=np.float64),
+        high=np.array([_safe_float(b.get('high')) for _, b in keyed], dtype=np.float64),
+        low=np.array([_safe_float(b.get('low')) for _, b in keyed], dtype=np.float64),
+        close=np.array([_safe_float(b.get('close')) for _, b in keyed], dtype=np.float64),
+        times=[_timedelta_to_time(b.get(time_key)) for _, b in keyed],
+    )
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+@dataclass
+class SimOutcome:
+    """
+    Outcome arrays for a batch of trades over one SimBars.
+
+    Indices refer to positions in SimBars; -1 means "not hit".
+    """
+    levels: List[int]
+    start: np.ndarray          # (n,) first walked bar per trade
+    stop_idx: np.ndarray       # (n,) recorded stop bar
+    r_idx: np.ndarray          # (n, n_levels) credited hit bar per level
+
+    def max_r(self, i: int) -> int:
+        """Highest credited level, -1 if none."""
+        hit = [level for level, j in zip(self.levels, self.r_idx[i]) if j >= 0]
+        return max(hit) if hit else -1
+
+    def apply(self, i: int, result: Any, bars: SimBars):
+        """
+        Copy trade i's outcome onto a result dataclass.
+
+        Sets r{N}_hit / r{N}_time / r{N}_bars_from_entry, stop_hit /
+        stop_time / stop_bars_from_entry, max_r and result ('WIN'/'LOSS').
+        bars_from_entry is 1 for the first walked bar.
+        """
+        start = int(self.start[i])
+        for level, j in zip(self.levels, self.r_idx[i]):
+            if j >= 0:
+                setattr(result, f'r{level}_hit', True)
+                setattr(result, f'r{level}_time', bars.times[j])
+                setattr(result, f'r{level}_bars_from_entry', int(j) - start + 1)
+
+        j = int(self.stop_idx[i])
+        if j >= 0:
+            result.stop_hit = True
+            result.stop_time = bars.times[j]
+            result.stop_bars_from_entry = j - start + 1
+
+        if getattr(result, 'r1_hit', False):
+            result.result = 'WIN'
+            result.max_r = self.max_r(i)
+        else:
+            result.result = 'LOSS'
+            result.max_r = -1
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True along the last axis, -1 where none."""
+    first = mask.argmax(axis=-1)
+    return np.where(mask.any(axis=-1), first, -1)
+
+
+def simulate_outcomes(
+    bars: SimBars,
+    entry_minutes: Sequence[float],
+    stop_prices: Sequence[float],
+    r_prices: Sequence[Sequence[float]],
+    is_long: Sequence[bool],
+    eod_minutes: float,
+    levels: Sequence[int] = (1, 2, 3, 4, 5),
+) -> SimOutcome:
+    """
+    Resolve stop and R-level hits for every trade of one ticker-date.
+
+    Args:
+        bars: Shared sorted bars (prepare_bars)
+        entry_minutes: Entry time per trade, minutes from midnight
+        stop_prices: Stop price per trade
+        r_prices: (n, n_levels) R-level target prices per trade
+        is_long: Direction per trade
+        eod_minutes: EOD cutoff, minutes from midnight (inclusive)
+        levels: R-multiples matching the r_prices columns
+
+    Returns:
+        SimOutcome with stop and credited R-level indices
+    """
+    entry_minutes = np.asarray(entry_minutes, dtype=np.float64)
+    stop_prices = np.asarray(stop_prices, dtype=np.float64)
+    r_prices = np.asarray(r_prices, dtype=np.float64).reshape(len(entry_minutes), len(levels))
+    is_long = np.asarray(is_long, dtype=bool)
+    n_bars = len(bars)
+
+    # Walk window per trade: bars after the entry candle through EOD
+    start = np.searchsorted(bars.minutes, entry_minutes, side='right')
+    end = np.searchsorted(bars.minutes, eod_minutes, side='right')
+    positions = np.arange(n_bars)
+    in_window = (positions[None, :] >= start[:, None]) & (positions[None, :] < end)
+
+    # First bar closing beyond the stop
+    stop_cond = np.where(
+        is_long[:, None],
+        bars.close[None, :] <= stop_prices[:, None],
+        bars.close[None, :] >= stop_prices[:, None],
+    ) & in_window
+    first_stop = _first_true(stop_cond)
+
+    # First bar touching each R-level
+    hit_cond = np.where(
+        is_long[:, None, None],
+        bars.high[None, None, :] >= r_prices[:, :, None],
+        bars.low[None, None, :] <= r_prices[:, :, None],
+    ) & in_window[:, None, :]
+    first_hit = _first_true(hit_cond)
+
+    # A level counts only if hit on a bar strictly before the stop bar
+    stop_at = np.where(first_stop >= 0, first_stop, n_bars)
+    credited = (first_hit >= 0) & (first_hit < stop_at[:, None])
+
+    # All levels credited -> the walk ended there and the stop was never seen
+    all_credited = credited.all(axis=1)
+    stop_idx = np.where((first_stop >= 0) & ~all_credited, first_stop, -1)
+
+    return SimOutcome(
+        levels=list(levels),
+        start=start,
+        stop_idx=stop_idx,
+        r_idx=np.where(credited, first_hit, -1),
+    )
+
+
+def simulate_reference(
+    bars: List[Dict[str, Any]],
+    entry_minutes: float,
+    stop_price: float,
+    r_prices: Dict[int, float],
+    is_long: bool,
+    eod_minutes: float,
+    time_key: str = 'bar_time',
+) -> Dict[str, Any]:
+    """
+    Per-trade bar walk the batch engine replaces (kept for cross-checks).
+
+    Returns:
+        Dict with r_hits {level: (time, bars_from_entry)}, stop
+        (time, bars_from_entry) or None, max_r and result
+    """
+    r_levels_hit = {}
+    stop = None
+    bar_count = 0
+
+    sorted_bars = sorted(bars, key=lambda b: _time_to_minutes(b.get(time_key)) or 0)
+
+    for bar in sorted_bars:
+        bar_minutes = _time_to_minutes(bar.get(time_key))
+        if bar_minutes is None:
+            continue
+        if bar_minutes <= entry_minutes:
+            continue
+        if bar_minutes > eod_minutes:
+            break
+
+        bar_count += 1
+        bar_high = _safe_float(bar.get('high'))
+        bar_low = _safe_float(bar.get('low'))
+        bar_close = _safe_float(bar.get('close'))
+        bar_time = _timedelta_to_time(bar.get(time_key))
+
+        stop_on_this_bar = bar_close <= stop_price if is_long else bar_close >= stop_price
+
+        new_hits = [
+            r for r in r_prices
+            if r not in r_levels_hit
+            and (bar_high >= r_prices[r] if is_long else bar_low <= r_prices[r])
+        ]
+
+        if stop_on_this_bar:
+            stop = (bar_time, bar_count)
+            break
+
+        for r in new_hits:
+            r_levels_hit[r] = (bar_time, bar_count)
+
+        if len(r_levels_hit) == len(r_prices):
+            break
+
+    win = 1 in r_levels_hit
+    return {
+        'r_hits': r_levels_hit,
+        'stop': stop,
+        'max_r': max(r_levels_hit) if win else -1,
+        'result': 'WIN' if win else 'LOSS',
+    }
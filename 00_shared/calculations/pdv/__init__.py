@@ -9,8 +9,13 @@ Usage:
     from shared.calculations.pdv import calculate_pdv
 
     result = calculate_pdv("AAPL", date(2026, 3, 14))
+
+    # Whole universe: grouped daily bars, results as they complete
+    for result in calculate_pdv_batch(tickers, date(2026, 3, 14)):
+        ...
 """
 
 from .calculator import calculate_pdv, PDVResult, Alignment
+from .batch import calculate_pdv_batch, PDVBatch
 
-__all__ = ["calculate_pdv", "PDVResult", "Alignment"]
+__all__ = ["calculate_pdv", "calculate_pdv_batch", "PDVBatch", "PDVResult", "Alignment"]
@@ -0,0 +1,468 @@
+"""
+Batched Prior Day Value (PDV) Calculator
+========================================
+XIII Trading LLC - Epoch Trading System v2.0
+
+Produces the same PDVResult as calculate_pdv() for a whole ticker universe
+with far fewer requests:
+
+    - Daily bars (prior trading day, D1 ATR) come from one grouped daily
+      request per date for the whole universe, and the ATR of every ticker
+      is computed in one vectorized pass.
+    - The prior day session and the 08:00 ET price are sliced from a single
+      5-min read per ticker (through the client's local bar store).
+    - Volume profiles for a chunk of tickers are built together with
+      _build_profiles_batch().
+    - Structure direction stays per ticker (MarketStructureCalculator) and
+      runs on a worker pool, so results stream out as each ticker finishes.
+
+Clients without fetch_grouped_daily() fall back to one daily-bar read per
+ticker, which still replaces the day-by-day prior trading day probe.
+
+Usage:
+    from shared.calculations.pdv import PDVBatch, calculate_pdv_batch
+
+    for result in calculate_pdv_batch(tickers, date(2026, 3, 16), polygon):
+        print(result.ticker, result.alignment)
+
+    # Or one ticker at a time on top of the universe-wide daily data
+    batch = PDVBatch(tickers, date(2026, 3, 16), polygon).prepare()
+    result = batch.calculate("AAPL")
+"""
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .calculator import (
+    ET_TIMEZONE,
+    PDVResult,
+    _determine_alignment,
+    _get_default_client,
+    _get_structure_direction,
+)
+
+logger = logging.getLogger(__name__)
+
+ATR_PERIOD = 14
+PRIOR_DAY_SEARCH_DAYS = 9   # Same reach as _find_prior_trading_day()
+MIN_SESSION_BARS = 5        # Same minimum as _calculate_prior_day_vp()
+GROUPED_DAILY_WORKERS = 4
+
+
+@dataclass
+class _PendingPDV:
+    """One ticker between the pipeline stages."""
+    result: PDVResult
+    d1_atr: Optional[float] = None
+    session: Optional[pd.DataFrame] = None   # Prior day 04:00-20:00 ET 5-min bars
+    price: Optional[float] = None            # Last 5-min close before 08:00 ET
+
+
+# =============================================================================
+# VECTORIZED DAILY LEVELS
+# =============================================================================
+
+def daily_levels(
+    daily: pd.DataFrame,
+    analysis_date: date,
+    period: int = ATR_PERIOD,
+) -> Dict[str, Tuple[Optional[date], Optional[float]]]:
+    """
+    Prior trading day and D1 ATR for every ticker in a long daily table.
+
+    Vectorized equivalent of _find_prior_trading_day() and
+    _calculate_d1_atr(): the prior day is the latest weekday in the 9 days
+    before analysis_date with a bar; the ATR is the mean of the last
+    `period` true ranges over the bars from (period * 2 + 10) days back
+    through analysis_date, None with fewer than period + 1 bars.
+
+    Args:
+        daily: DataFrame with ticker, date, high, low, close (one row per ticker per day)
+        analysis_date: The day being evaluated
+        period: ATR period
+
+    Returns:
+        {ticker: (prior_date or None, d1_atr or None)} for tickers with any bar
+    """
+    if daily.empty:
+        return {}
+
+    days = pd.to_datetime(daily['date'])
+    analysis_ts = pd.Timestamp(analysis_date)
+
+    # Prior trading day
+    search = (
+        (days >= analysis_ts - pd.Timedelta(days=PRIOR_DAY_SEARCH_DAYS))
+        & (days < analysis_ts)
+        & (days.dt.weekday < 5)
+    )
+    prior = days[search].groupby(daily['ticker'][search]).max()
+    levels = {ticker: (ts.date(), None) for ticker, ts in prior.items()}
+
+    # True range per ticker, oldest first (the first bar uses high - low)
+    in_window = (days >= analysis_ts - pd.Timedelta(days=period * 2 + 10)) & (days <= analysis_ts)
+    window = daily[in_window].assign(_day=days[in_window]).sort_values(['ticker', '_day'], kind='stable')
+    tickers = window['ticker'].to_numpy()
+    high = window['high'].to_numpy(dtype=np.float64)
+    low = window['low'].to_numpy(dtype=np.float64)
+    close = window['close'].to_numpy(dtype=np.float64)
+
+    first = np.ones(len(window), dtype=bool)
+    first[1:] = tickers[1:] != tickers[:-1]
+    prev_close = np.empty_like(close)
+    prev_close[1:] = close[:-1]
+    hl = high - low
+    tr = np.where(first, hl, np.maximum(hl, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))))
+
+    # Mean of the last `period` true ranges of each ticker with enough bars
+    starts = np.flatnonzero(first)
+    ends = np.r_[starts[1:], len(window)]
+    enough = (ends - starts) >= period + 1
+    if enough.any():
+        rows = ends[enough][:, None] - period + np.arange(period)
+        atrs = np.mean(tr[rows], axis=1)
+        for ticker, atr in zip(tickers[starts[enough]], atrs):
+            prior_date = levels.get(ticker, (None, None))[0]
+            levels[ticker] = (prior_date, round(float(atr), 4))
+
+    return levels
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+class PDVBatch:
+    """
+    PDV for a ticker universe on one analysis date.
+
+    prepare() loads the universe's daily bars (one grouped request per
+    date); calculate() then runs one ticker, iter_results() runs them all
+    on worker pools and yields each PDVResult as it completes.
+
+    A ticker that raises gets a PDVResult with error set instead of
+    propagating, so one bad symbol never stops a screen.
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        analysis_date: date,
+        polygon_client=None,
+        atr_period: int = ATR_PERIOD,
+    ):
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.analysis_date = analysis_date
+        self.client = polygon_client or _get_default_client()
+        self.atr_period = atr_period
+        self.end_ts_0800 = datetime(
+            analysis_date.year, analysis_date.month, analysis_date.day,
+            8, 0, 0, tzinfo=ET_TIMEZONE
+        )
+
+        self._levels: Dict[str, Tuple[Optional[date], Optional[float]]] = {}
+        self._universe_loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def window_start(self) -> date:
+        """First date of the daily bars read for the prior day search and the ATR."""
+        return self.analysis_date - timedelta(days=max(self.atr_period * 2 + 10, PRIOR_DAY_SEARCH_DAYS))
+
+    # -------------------------------------------------------------------------
+    # Daily bars
+    # -------------------------------------------------------------------------
+
+    def prepare(self) -> 'PDVBatch':
+        """
+        Load daily levels for the whole universe from grouped daily bars.
+
+        Leaves the batch on the per-ticker fallback if the client has no
+        fetch_grouped_daily() or any date could not be fetched.
+        """
+        fetch = getattr(self.client, 'fetch_grouped_daily', None)
+        if fetch is None or self._universe_loaded:
+            return self
+
+        days = [
+            self.window_start + timedelta(days=i)
+            for i in range((self.analysis_date - self.window_start).days + 1)
+        ]
+        days = [d for d in days if d.weekday() < 5]
+        with ThreadPoolExecutor(max_workers=GROUPED_DAILY_WORKERS) as pool:
+            tables = list(pool.map(fetch, days))
+
+        if any(table is None for table in tables):
+            logger.warning(
+                f"Grouped daily bars incomplete for {self.analysis_date}; "
+                f"using per-ticker daily bars"
+            )
+            return self
+
+        universe = set(self.tickers)
+        frames = [
+            table[table['ticker'].isin(universe)].assign(date=day)
+            for day, table in zip(days, tables) if not table.empty
+        ]
+        daily = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['ticker', 'date', 'high', 'low', 'close']
+        )
+        levels = daily_levels(daily, self.analysis_date, self.atr_period)
+
+        with self._lock:
+            # Universe tickers without a single bar traded on none of the dates
+            self._levels = {ticker: levels.get(ticker, (None, None)) for ticker in self.tickers}
+            self._universe_loaded = True
+        return self
+
+    def _daily_levels(self, ticker: str) -> Tuple[Optional[date], Optional[float]]:
+        """(prior_date, d1_atr) from the universe table or one daily-bar read."""
+        with self._lock:
+            if ticker in self._levels:
+                return self._levels[ticker]
+
+        df = self.client.fetch_daily_bars(ticker, self.window_start, self.analysis_date)
+        if df is None or df.empty:
+            levels = (None, None)
+        else:
+            daily = df[['date', 'high', 'low', 'close']].assign(ticker=ticker)
+            levels = daily_levels(daily, self.analysis_date, self.atr_period).get(ticker, (None, None))
+
+        with self._lock:
+            self._levels[ticker] = levels
+        return levels
+
+    # -------------------------------------------------------------------------
+    # Pipeline stages
+    # -------------------------------------------------------------------------
+
+    def _load(self, ticker: str) -> _PendingPDV:
+        """Daily levels plus one 5-min read covering the prior day and 08:00 ET."""
+        item = _PendingPDV(result=PDVResult(ticker=ticker, analysis_date=self.analysis_date))
+        result = item.result
+
+        if self.client is None:
+            result.error = "Could not initialize Polygon client"
+            return item
+
+        try:
+            prior_date, item.d1_atr = self._daily_levels(ticker)
+            if prior_date is None:
+                result.error = "Could not find prior trading day"
+                return item
+            result.prior_day_date = prior_date
+
+            price_start = self.analysis_date - timedelta(days=1)
+            df = self.client.fetch_minute_bars(
+                ticker, min(prior_date, price_start), multiplier=5,
+                end_timestamp=self.end_ts_0800
+            )
+            if df is None or df.empty:
+                logger.warning(f"No 5-min bars for {ticker} before {self.end_ts_0800}")
+                return item
+
+            timestamps = pd.to_datetime(df['timestamp'])
+            if timestamps.dt.tz is None:
+                timestamps = timestamps.dt.tz_localize('UTC')
+            et_time = timestamps.dt.tz_convert(ET_TIMEZONE)
+            et_date = et_time.dt.date
+
+            # 04:00 - 20:00 ET on the prior day
+            session = (et_date == prior_date) & (et_time.dt.hour >= 4) & (et_time.dt.hour < 20)
+            item.session = df[session]
+
+            price_bars = df[et_date >= price_start]
+            if not price_bars.empty:
+                item.price = round(float(price_bars.iloc[-1]['close']), 2)
+        except Exception as e:
+            logger.warning(f"PDV load failed for {ticker}: {e}")
+            result.error = str(e)
+
+        return item
+
+    def _profile(self, items: List[_PendingPDV]) -> List[_PendingPDV]:
+        """Prior day POC / VAH / VAL for a chunk of tickers in one profile pass."""
+        from shared.indicators.core.volume_profile import (
+            _build_profiles_batch,
+            _find_poc_index,
+            _calculate_poc_price,
+            _calculate_value_area,
+        )
+        from shared.indicators.config import CONFIG as SHARED_CONFIG
+
+        eligible = []
+        for item in items:
+            if item.result.error:
+                continue
+            if item.session is None or len(item.session) < MIN_SESSION_BARS:
+                logger.warning(
+                    f"Insufficient session bars for {item.result.ticker} on {item.result.prior_day_date}"
+                )
+                item.result.error = "Could not calculate prior day volume profile"
+            else:
+                eligible.append(item)
+        if not eligible:
+            return items
+
+        vp_cfg = SHARED_CONFIG.volume_profile
+        sessions = [item.session for item in eligible]
+        session_ids = np.repeat(np.arange(len(eligible), dtype=np.int64), [len(s) for s in sessions])
+        opens, highs, lows, closes, volumes = (
+            np.concatenate([s[col].to_numpy(dtype=np.float64) for s in sessions])
+            for col in ('open', 'high', 'low', 'close', 'volume')
+        )
+        zone_tops, buy_profs, sell_profs, _, _, gaps = _build_profiles_batch(
+            opens, highs, lows, closes, volumes, session_ids, len(eligible), vp_cfg.resolution,
+        )
+
+        for row, item in enumerate(eligible):
+            result = item.result
+            gap = float(gaps[row])
+            if gap <= 0:
+                logger.warning(f"Flat session for {result.ticker} on {result.prior_day_date}")
+                result.error = "Could not calculate prior day volume profile"
+                continue
+
+            poc_idx = _find_poc_index(buy_profs[row], sell_profs[row])
+            poc = _calculate_poc_price(zone_tops[row], poc_idx, gap)
+            val, vah = _calculate_value_area(
+                buy_profs[row], sell_profs[row], zone_tops[row], gap, poc_idx, vp_cfg.value_area_pct
+            )
+            result.pd_poc = round(poc, 2)
+            result.pd_vah = round(vah, 2)
+            result.pd_val = round(val, 2)
+
+        return items
+
+    def _finish(self, item: _PendingPDV) -> PDVResult:
+        """08:00 ET price, D1 ATR bands, structure direction and alignment."""
+        result = item.result
+        try:
+            price = item.price
+            if price is None:
+                # Same fallback as _get_price_at_time()
+                df = self.client.fetch_hourly_bars(
+                    result.ticker, self.analysis_date - timedelta(days=1),
+                    end_timestamp=self.end_ts_0800
+                )
+                if df is not None and not df.empty:
+                    price = round(float(df.iloc[-1]['close']), 2)
+            result.price_at_0800 = price
+            if price is None:
+                logger.warning(f"No price data for {result.ticker} at {self.end_ts_0800}")
+                result.error = "Could not get price at 08:00 ET"
+                return result
+
+            result.d1_atr = item.d1_atr
+            if item.d1_atr is not None:
+                result.d1_atr_high = round(result.pd_poc + item.d1_atr, 2)
+                result.d1_atr_low = round(result.pd_poc - item.d1_atr, 2)
+
+            result.direction = _get_structure_direction(
+                self.client, result.ticker, self.analysis_date, self.end_ts_0800
+            )
+
+            if item.d1_atr is not None and result.direction is not None:
+                result.alignment = _determine_alignment(
+                    price=price,
+                    poc=result.pd_poc,
+                    vah=result.pd_vah,
+                    val=result.pd_val,
+                    d1_atr=item.d1_atr,
+                    direction=result.direction,
+                )
+        except Exception as e:
+            logger.warning(f"PDV finish failed for {result.ticker}: {e}")
+            result.error = str(e)
+
+        return result
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def calculate(self, ticker: str) -> PDVResult:
+        """
+        PDV for one ticker, using the universe's daily levels when prepared.
+
+        Safe to call from several threads at once.
+        """
+        item = self._load(ticker.upper())
+        self._profile([item])
+        if item.result.error:
+            return item.result
+        return self._finish(item)
+
+    def iter_results(self, max_workers: int = 8, chunk_size: int = 25) -> Iterator[PDVResult]:
+        """
+        PDV for every ticker, yielded in completion order.
+
+        5-min reads run on one pool; as they land, chunks of up to
+        chunk_size tickers get their volume profiles together, then the
+        structure direction of each runs on a second pool.
+
+        Args:
+            max_workers: Threads per pool
+            chunk_size: Tickers per volume profile pass
+
+        Yields:
+            PDVResult per ticker (same fields as calculate_pdv)
+        """
+        self.prepare()
+
+        loader = ThreadPoolExecutor(max_workers=max_workers)
+        finisher = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            loads = {loader.submit(self._load, ticker) for ticker in self.tickers}
+            loads_left = len(loads)
+            pending = set(loads)
+            chunk: List[_PendingPDV] = []
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in loads:
+                        chunk.append(future.result())
+                        loads_left -= 1
+                    else:
+                        yield future.result()
+
+                if chunk and (len(chunk) >= chunk_size or loads_left == 0):
+                    for item in self._profile(chunk):
+                        if item.result.error:
+                            yield item.result
+                        else:
+                            pending.add(finisher.submit(self._finish, item))
+                    chunk = []
+        finally:
+            loader.shutdown(wait=False, cancel_futures=True)
+            finisher.shutdown(wait=False, cancel_futures=True)
+
+
+def calculate_pdv_batch(
+    tickers: Iterable[str],
+    analysis_date: date,
+    polygon_client=None,
+    max_workers: int = 8,
+) -> Iterator[PDVResult]:
+    """
+    Calculate Prior Day Value alignment for many tickers.
+
+    Args:
+        tickers: Stock symbols
+        analysis_date: The day to evaluate (price/structure assessed at 08:00 ET)
+        polygon_client: Optional 01_application PolygonClient instance.
+                       If None, will be created internally.
+        max_workers: Threads per worker pool
+
+    Returns:
+        Iterator of PDVResult, one per ticker, in completion order
+    """
+    return PDVBatch(tickers, analysis_date, polygon_client).iter_results(max_workers)
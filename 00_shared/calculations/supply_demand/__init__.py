@@ -0,0 +1,36 @@
+"""
+Supply & Demand Zone Engine
+============================
+
+Timeframe-agnostic pivot zone detection shared by the H1 and H4
+calculators. Each timeframe supplies a ZoneParams set.
+
+Usage:
+    from shared.calculations.supply_demand import ZoneParams, calculate_zones
+
+    params = ZoneParams(label="H2", left_bars=15, right_bars=10, atr_length=25,
+                        recency_bars=50, max_touches=30)
+    result = calculate_zones(df_h2, params, ticker="MU")
+"""
+
+from .engine import (
+    ZoneParams,
+    Zone,
+    ZoneType,
+    ZoneStatus,
+    SupplyDemandResult,
+    calculate_zones,
+    bars_to_frame,
+    walk_forward_reference,
+)
+
+__all__ = [
+    "ZoneParams",
+    "Zone",
+    "ZoneType",
+    "ZoneStatus",
+    "SupplyDemandResult",
+    "calculate_zones",
+    "bars_to_frame",
+    "walk_forward_reference",
+]
@@ -37,6 +37,14 @@ class EpochConfig:
     def CACHE_DIR(self) -> Path:
         return self.BASE_DIR / "cache"
 
+    @property
+    def BAR_STORE_DIR(self) -> Path:
+        return self.CACHE_DIR / "bars"
+
+    @property
+    def POLYGON_RATE_LIMIT_FILE(self) -> Path:
+        return self.CACHE_DIR / "polygon_rate_limit.bin"
+
     # ==========================================================================
     # DATA SOURCE
     # ==========================================================================
@@ -50,6 +58,28 @@ class EpochConfig:
     API_MAX_RETRIES: int = 3
     API_RETRY_DELAY: float = 1.0
 
+    # Local bar store (shared.data.bar_store) - all Polygon bar clients read
+    # through it so previously fetched dates never hit the network again
+    BAR_STORE_ENABLED: bool = True
+
+    # Shared Polygon rate limiter (shared.data.rate_limiter) - one token bucket
+    # for every Polygon client in the process, or across processes if enabled
+    POLYGON_RATE_LIMIT: float = 10.0   # requests per second (plan limit)
+    POLYGON_RATE_BURST: float = 10.0   # bucket capacity
+    POLYGON_RATE_LIMIT_CROSS_PROCESS: bool = False
+    POLYGON_ENDPOINT_WEIGHTS: Dict[str, float] = field(default_factory=lambda: {
+        'aggs': 1.0,
+        'options_contracts': 1.0,
+        'options_snapshot': 1.0,
+        'reference': 1.0,
+    })
+
+    # Shared Postgres connection pool (shared.data.db_pool) - one pool per
+    # database for every client in the process; connections open lazily
+    DB_POOL_MAX_CONNECTIONS: int = 10
+    DB_POOL_TIMEOUT: float = 30.0      # seconds to wait for a free connection
+    DB_ITERSIZE: int = 10_000          # rows per server-side cursor round trip
+
     # ==========================================================================
     # POLYGON TIMEFRAME SETTINGS
     # ==========================================================================
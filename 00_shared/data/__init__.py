@@ -7,7 +7,11 @@ Centralized data access for all Epoch modules.
 Provides:
 - Polygon.io client for market data
 - Supabase client for database operations
-- Caching and rate limiting
+- Local columnar bar store (read-through cache for Polygon bars)
+- COPY-based bulk writer for Postgres populators
+- Shared token-bucket rate limiter for all Polygon clients
+- Shared Postgres connection pool with columnar query decoding
+- Caching
 
 Usage:
     from shared.data.polygon import PolygonClient
@@ -22,7 +26,15 @@ Usage:
     zones = db.get_zones("AAPL", date.today())
 """
 
+from .bar_store import BarStore, get_bar_store, read_bars
+from .bulk_writer import BulkWriter, bulk_write
+from .db_pool import DatabasePool, get_db_pool
 from .polygon import PolygonClient
+from .rate_limiter import RateLimiter, get_rate_limiter, share_across_processes
 from .supabase import SupabaseClient
 
-__all__ = ["PolygonClient", "SupabaseClient"]
+__all__ = [
+    "BarStore", "BulkWriter", "DatabasePool", "PolygonClient", "RateLimiter",
+    "SupabaseClient", "bulk_write", "get_bar_store", "get_db_pool",
+    "get_rate_limiter", "read_bars", "share_across_processes",
+]
@@ -0,0 +1,713 @@
+"""
+Epoch Trading System - Local Bar Store
+======================================
+
+On-disk columnar store for Polygon aggregate bars, shared by every client
+that fetches bars (shared PolygonClient, 01_application, backtest S15/M1
+fetchers, journal viewer, trade reel).
+
+Layout:
+    <root>/<TICKER>/<multiplier><timespan>/<YYYY-MM-DD>.arrow
+
+One Arrow IPC file per ticker / timeframe / Eastern trading date, read
+memory-mapped. A partition only exists for a date that was fetched
+completely (any date before today, Eastern time). Dates with no bars
+(weekends, holidays) are stored as empty partitions so they are never
+requested again - for weekdays only once they are EMPTY_SETTLE_DAYS old,
+since a recent empty response may be a gap the upstream fills in later.
+
+Bars are split-adjusted, so a split makes every earlier partition stale.
+With a splits source (PolygonSplits for the process-wide store) the
+ticker's split dates are looked up at most every SPLITS_TTL_SECONDS, and
+partitions dated before the latest split that were written before it took
+effect are fetched again.
+
+A read finds the dates in the range without a partition, merges them into
+contiguous spans and fetches only those spans from the upstream. Today's
+bars are always fetched and never persisted.
+
+The upstream is any callable:
+
+    upstream(ticker, multiplier, timespan, from_date, to_date) -> List[dict]
+
+returning raw Polygon aggregate dicts (t, o, h, l, c, v, vw, n) and raising
+on failure (an empty list means "no bars", and is stored as such).
+PolygonAggsUpstream is the live implementation; FakeUpstream generates
+deterministic bars for offline tests.
+
+Usage:
+    from shared.data.bar_store import read_bars, PolygonAggsUpstream
+
+    upstream = PolygonAggsUpstream(api_key)
+    raw = read_bars("AAPL", 1, "minute", date(2025, 1, 2), date(2025, 1, 31), upstream)
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+
+# Raw Polygon aggregate columns, in storage order
+AGG_COLUMNS = ["t", "o", "h", "l", "c", "v", "vw", "n"]
+AGG_SCHEMA = pa.schema(
+    [("t", pa.int64())] + [(col, pa.float64()) for col in AGG_COLUMNS[1:]]
+)
+
+# Timespans that partition cleanly by date -> seconds per unit
+STORED_TIMESPANS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# Polygon caps a single aggregates response at 50,000 results
+MAX_RESULTS_PER_REQUEST = 50000
+
+# Weekday partitions with no bars are only stored once the date is this old
+EMPTY_SETTLE_DAYS = 5
+
+# Seconds a ticker's split dates are reused before the source is asked again
+SPLITS_TTL_SECONDS = 12 * 3600
+
+Upstream = Callable[[str, int, str, date, date], List[Dict]]
+SplitsSource = Callable[[str], List[date]]
+
+
+class UpstreamError(Exception):
+    """Raised by an upstream when bars could not be fetched."""
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _empty_frame() -> pd.DataFrame:
+    """Empty raw-aggregate DataFrame with the storage dtypes."""
+    return AGG_SCHEMA.empty_table().to_pandas()
+
+
+def _records_to_frame(records: List[Dict]) -> pd.DataFrame:
+    """Raw Polygon result dicts -> DataFrame with exactly AGG_COLUMNS."""
+    if not records:
+        return _empty_frame()
+    df = pd.DataFrame.from_records(records)
+    for col in AGG_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    df = df[AGG_COLUMNS]
+    df["t"] = df["t"].astype("int64")
+    for col in AGG_COLUMNS[1:]:
+        df[col] = df[col].astype("float64")
+    return df
+
+
+def _et_dates(t_ms: np.ndarray) -> np.ndarray:
+    """Eastern calendar date of each millisecond timestamp."""
+    ts = pd.to_datetime(t_ms, unit="ms", utc=True).tz_convert(ET)
+    return np.asarray(ts.date)
+
+
+def _date_range(start_date: date, end_date: date) -> List[date]:
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _as_date(d: Union[str, date, datetime]) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return datetime.strptime(str(d)[:10], "%Y-%m-%d").date()
+
+
+def max_days_per_request(multiplier: int, timespan: str) -> int:
+    """Calendar days one aggregates request can cover without truncation."""
+    bar_seconds = multiplier * STORED_TIMESPANS[timespan]
+    return max(1, (MAX_RESULTS_PER_REQUEST * bar_seconds) // 86400)
+
+
+def request_windows(
+    multiplier: int,
+    timespan: str,
+    start_date: Union[str, date, datetime],
+    end_date: Union[str, date, datetime],
+) -> List[Tuple[date, date]]:
+    """
+    Split [start_date, end_date] into contiguous (from, to) request windows.
+
+    Each window covers at most max_days_per_request() calendar days, so a
+    single response never hits the result limit. Timespans of a week or
+    longer always fit one request and come back as a single window.
+    """
+    start, end = _as_date(start_date), _as_date(end_date)
+    if start > end:
+        return []
+    if timespan not in STORED_TIMESPANS:
+        return [(start, end)]
+    max_days = max_days_per_request(multiplier, timespan)
+    windows = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=max_days - 1))
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+# =============================================================================
+# BAR STORE
+# =============================================================================
+
+class BarStore:
+    """
+    Date-partitioned Arrow store for raw aggregate bars.
+
+    Partition writes are atomic renames, so concurrent threads and processes
+    never see a torn file. Upstream fetches run outside any lock: readers of
+    disjoint ranges (e.g. the date chunks of one long range) fetch in
+    parallel, and overlapping concurrent reads at worst fetch the same span
+    twice and write identical partitions.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        splits: Optional[SplitsSource] = None,
+        splits_ttl: float = SPLITS_TTL_SECONDS,
+        empty_settle_days: int = EMPTY_SETTLE_DAYS,
+    ):
+        """
+        Args:
+            root: Directory holding the store (created on first write)
+            splits: Callable(ticker) -> split execution dates; None disables
+                    split invalidation
+            splits_ttl: Seconds a ticker's split dates are cached in the store
+            empty_settle_days: Age (days) before an empty weekday is stored
+        """
+        self.root = Path(root)
+        self.splits = splits
+        self.splits_ttl = splits_ttl
+        self.empty_settle_days = empty_settle_days
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "partitions_read": 0,
+            "partitions_written": 0,
+            "upstream_requests": 0,
+        }
+
+    @staticmethod
+    def is_stored(timespan: str) -> bool:
+        """Whether bars of this timespan are kept in the store."""
+        return timespan in STORED_TIMESPANS
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _dir(self, ticker: str, multiplier: int, timespan: str) -> Path:
+        return self.root / ticker.upper() / f"{multiplier}{timespan}"
+
+    def partition_path(self, ticker: str, multiplier: int, timespan: str, day: date) -> Path:
+        """Path of the partition file for one date."""
+        return self._dir(ticker, multiplier, timespan) / f"{day.isoformat()}.arrow"
+
+    # -------------------------------------------------------------------------
+    # Gap detection
+    # -------------------------------------------------------------------------
+
+    def missing_dates(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        start_date: date,
+        end_date: date,
+    ) -> List[date]:
+        """
+        Dates in [start_date, end_date] that must come from the upstream.
+
+        That is today onwards, dates without a partition, and dates before
+        the ticker's latest split whose partition was written before it.
+        """
+        now = datetime.now(ET)
+        today = now.date()
+        split_cutoff = None
+        for day in reversed(self.split_dates(ticker)):
+            effective = datetime(day.year, day.month, day.day, 9, 30, tzinfo=ET)
+            if effective <= now:
+                split_cutoff = (day, effective.timestamp())
+                break
+
+        missing = []
+        for day in _date_range(start_date, end_date):
+            if day >= today:
+                missing.append(day)
+                continue
+            try:
+                written = self.partition_path(ticker, multiplier, timespan, day).stat().st_mtime
+            except FileNotFoundError:
+                missing.append(day)
+                continue
+            if split_cutoff is not None and day < split_cutoff[0] and written < split_cutoff[1]:
+                missing.append(day)
+        return missing
+
+    def split_dates(self, ticker: str) -> List[date]:
+        """
+        Sorted split execution dates of a ticker (empty without a splits source).
+
+        Kept in <root>/<TICKER>/splits.json for splits_ttl seconds. If the
+        source fails, the last stored dates are used.
+        """
+        if self.splits is None:
+            return []
+        path = self.root / ticker.upper() / "splits.json"
+        stored = None
+        try:
+            age = time.time() - path.stat().st_mtime
+            stored = [date.fromisoformat(d) for d in json.loads(path.read_text())]
+            if age < self.splits_ttl:
+                return stored
+        except (OSError, ValueError):
+            pass
+
+        try:
+            dates = sorted(set(_as_date(d) for d in self.splits(ticker.upper())))
+        except Exception as e:
+            logger.warning(f"Split lookup failed for {ticker}: {e}")
+            return stored or []
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps([d.isoformat() for d in dates]))
+        os.replace(tmp_path, path)
+        return dates
+
+    def missing_spans(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        start_date: date,
+        end_date: date,
+    ) -> List[Tuple[date, date]]:
+        """
+        Missing dates merged into contiguous (from, to) request spans.
+
+        Spans are capped at max_days_per_request() so no response is
+        truncated by the per-request result limit.
+        """
+        max_days = max_days_per_request(multiplier, timespan)
+        spans: List[Tuple[date, date]] = []
+        for day in self.missing_dates(ticker, multiplier, timespan, start_date, end_date):
+            if spans:
+                span_start, span_end = spans[-1]
+                if day == span_end + timedelta(days=1) and (day - span_start).days < max_days:
+                    spans[-1] = (span_start, day)
+                    continue
+            spans.append((day, day))
+        return spans
+
+    # -------------------------------------------------------------------------
+    # Read / write
+    # -------------------------------------------------------------------------
+
+    def get_bars(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        start_date: Union[str, date, datetime],
+        end_date: Union[str, date, datetime],
+        upstream: Upstream,
+    ) -> pd.DataFrame:
+        """
+        Raw aggregate bars for [start_date, end_date], fetching only gaps.
+
+        Args:
+            ticker: Stock symbol
+            multiplier: Bar size multiplier (e.g. 5 for 5-minute bars)
+            timespan: "second", "minute", "hour" or "day"
+            start_date: First Eastern date (inclusive)
+            end_date: Last Eastern date (inclusive)
+            upstream: Callable used for dates not yet stored
+
+        Returns:
+            DataFrame with AGG_COLUMNS sorted by t (no duplicate timestamps)
+
+        Raises:
+            Whatever the upstream raises; nothing is stored for a failed span.
+        """
+        ticker = ticker.upper()
+        start, end = _as_date(start_date), _as_date(end_date)
+        if start > end:
+            return _empty_frame()
+        if not self.is_stored(timespan):
+            raise ValueError(f"Timespan '{timespan}' is not stored (use one of {list(STORED_TIMESPANS)})")
+
+        today = datetime.now(ET).date()
+        live_frames = []
+
+        for span_start, span_end in self.missing_spans(ticker, multiplier, timespan, start, end):
+            records = upstream(ticker, multiplier, timespan, span_start, span_end)
+            self._count("upstream_requests")
+            live_frames.append(self._write_span(
+                ticker, multiplier, timespan, span_start, span_end,
+                _records_to_frame(records), today,
+            ))
+
+        tables = []
+        for day in _date_range(start, min(end, today - timedelta(days=1))):
+            path = self.partition_path(ticker, multiplier, timespan, day)
+            if path.exists():
+                tables.append(self._read_partition(path))
+
+        frames = [t.to_pandas() for t in tables if t.num_rows] + [f for f in live_frames if not f.empty]
+        if not frames:
+            return _empty_frame()
+        df = pd.concat(frames, ignore_index=True)
+        return df.drop_duplicates(subset="t").sort_values("t").reset_index(drop=True)
+
+    def _write_span(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        span_start: date,
+        span_end: date,
+        df: pd.DataFrame,
+        today: date,
+    ) -> pd.DataFrame:
+        """
+        Persist every complete date of a fetched span.
+
+        Weekdays without bars are left unstored (and asked for again) until
+        they are empty_settle_days old. Returns the rows of incomplete dates
+        (today onwards), which are served to the caller but not stored.
+        """
+        days = _et_dates(df["t"].to_numpy()) if len(df) else np.array([], dtype=object)
+        for day in _date_range(span_start, min(span_end, today - timedelta(days=1))):
+            rows = df[days == day] if len(df) else df
+            if rows.empty and day.weekday() < 5 and (today - day).days < self.empty_settle_days:
+                continue
+            self._write_partition(self.partition_path(ticker, multiplier, timespan, day), rows)
+        if not len(df):
+            return df
+        return df[(days >= max(today, span_start)) & (days <= span_end)]
+
+    def _write_partition(self, path: Path, df: pd.DataFrame):
+        """Atomically write one partition (write temp file, then rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, schema=AGG_SCHEMA, preserve_index=False)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with ipc.new_file(sink, AGG_SCHEMA) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self._count("partitions_written")
+
+    def _read_partition(self, path: Path) -> pa.Table:
+        """Memory-mapped read of one partition."""
+        with pa.memory_map(str(path), "r") as source:
+            table = ipc.open_file(source).read_all()
+        self._count("partitions_read")
+        return table
+
+    def clear(self, ticker: Optional[str] = None):
+        """Delete stored partitions for one ticker, or the whole store."""
+        import shutil
+
+        target = self.root / ticker.upper() if ticker else self.root
+        if target.exists():
+            shutil.rmtree(target)
+
+
+# =============================================================================
+# UPSTREAMS
+# =============================================================================
+
+class _PolygonRest:
+    """Polygon REST GETs with retries, paced by the shared rate limiter."""
+
+    BASE_URL = "https://api.polygon.io"
+    ENDPOINT = "default"    # rate limiter endpoint (weight and metrics)
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        rate_limit_delay: Optional[float] = None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        session: Optional[requests.Session] = None,
+        timeout: float = 30,
+        limiter=None,
+    ):
+        """
+        Args:
+            api_key: Polygon API key
+            rate_limit_delay: Deprecated; extra per-client spacing between
+                requests (seconds) on top of the shared limiter
+            max_retries: Attempts per page request
+            retry_delay: Base backoff between attempts (seconds)
+            session: Optional shared requests session
+            timeout: Per-request timeout (seconds)
+            limiter: RateLimiter to use (defaults to the process-wide one)
+        """
+        from .rate_limiter import spacing_limiter
+
+        self.api_key = api_key
+        self.limiter = limiter
+        self.rate_limit_delay = rate_limit_delay
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self._session = session or requests.Session()
+        self._spacing = spacing_limiter(rate_limit_delay)
+
+    def _wait_for_rate_limit(self):
+        if self.limiter is None:
+            from .rate_limiter import get_rate_limiter
+            self.limiter = get_rate_limiter()
+        self.limiter.acquire(self.ENDPOINT)
+        if self._spacing is not None:
+            self._spacing.acquire(self.ENDPOINT)
+
+    def _get(self, url: str, params: Dict) -> Dict:
+        for attempt in range(self.max_retries):
+            self._wait_for_rate_limit()
+            try:
+                response = self._session.get(url, params=params, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay * (attempt + 1))
+                    continue
+                raise UpstreamError(f"Request failed: {e}") from e
+
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 429:
+                time.sleep(self.retry_delay * (attempt + 1))
+                continue
+            raise UpstreamError(f"Polygon API error {response.status_code}: {url}")
+
+        raise UpstreamError(f"Failed after {self.max_retries} retries: {url}")
+
+
+class PolygonAggsUpstream(_PolygonRest):
+    """
+    Live upstream: Polygon /v2/aggs range requests with pagination.
+
+    Follows next_url until the span is complete; retries 429s and network
+    errors; raises UpstreamError on anything else. Every page request goes
+    through the shared rate limiter.
+    """
+
+    ENDPOINT = "aggs"
+
+    def __call__(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        from_date: date,
+        to_date: date,
+    ) -> List[Dict]:
+        url = (
+            f"{self.BASE_URL}/v2/aggs/ticker/{ticker.upper()}/range/"
+            f"{multiplier}/{timespan}/{from_date.isoformat()}/{to_date.isoformat()}"
+        )
+        params = {
+            "apiKey": self.api_key,
+            "adjusted": "true",
+            "sort": "asc",
+            "limit": MAX_RESULTS_PER_REQUEST,
+        }
+
+        records: List[Dict] = []
+        while url:
+            data = self._get(url, params)
+            if data.get("status") not in ("OK", "DELAYED"):
+                raise UpstreamError(f"Polygon status {data.get('status')}: {ticker}")
+            records.extend(data.get("results") or [])
+            url = data.get("next_url")
+            params = {"apiKey": self.api_key}
+        return records
+
+
+class PolygonSplits(_PolygonRest):
+    """
+    Splits source: execution dates from Polygon /v3/reference/splits.
+
+    The API key defaults to shared.config.credentials (read on first call).
+    """
+
+    ENDPOINT = "reference"
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        super().__init__(api_key, **kwargs)
+
+    def __call__(self, ticker: str) -> List[date]:
+        if self.api_key is None:
+            from ..config.credentials import POLYGON_API_KEY
+            self.api_key = POLYGON_API_KEY
+
+        url = f"{self.BASE_URL}/v3/reference/splits"
+        params = {"apiKey": self.api_key, "ticker": ticker.upper(), "limit": 1000}
+        dates: List[date] = []
+        while url:
+            data = self._get(url, params)
+            dates.extend(_as_date(r["execution_date"]) for r in data.get("results") or [])
+            url = data.get("next_url")
+            params = {"apiKey": self.api_key}
+        return sorted(dates)
+
+
+class FakeUpstream:
+    """
+    Offline upstream with deterministic bars.
+
+    Weekdays get bars from 04:00 to 20:00 ET (one bar at midnight for daily
+    bars); weekends have none. Each bar depends only on (ticker, timestamp),
+    so any split of a range into spans yields identical data. Every call is
+    recorded in `calls` so tests can assert what touched the "network".
+    """
+
+    def __init__(self, fail: bool = False, empty_days: Optional[List[date]] = None):
+        """
+        Args:
+            fail: Raise UpstreamError on every call (simulates an outage)
+            empty_days: Weekdays returned without bars (simulates upstream gaps)
+        """
+        self.fail = fail
+        self.empty_days = set(empty_days or [])
+        self.calls: List[Tuple[str, int, str, date, date]] = []
+
+    def __call__(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        from_date: date,
+        to_date: date,
+    ) -> List[Dict]:
+        self.calls.append((ticker, multiplier, timespan, from_date, to_date))
+        if self.fail:
+            raise UpstreamError("FakeUpstream configured to fail")
+
+        step_ms = multiplier * STORED_TIMESPANS[timespan] * 1000
+        base = 50.0 + zlib.crc32(ticker.encode()) % 400
+        records = []
+        for day in _date_range(from_date, to_date):
+            if day.weekday() >= 5 or day in self.empty_days:
+                continue
+            if timespan == "day":
+                stamps = [int(datetime(day.year, day.month, day.day, tzinfo=ET).timestamp() * 1000)]
+            else:
+                open_ms = int(datetime(day.year, day.month, day.day, 4, tzinfo=ET).timestamp() * 1000)
+                close_ms = int(datetime(day.year, day.month, day.day, 20, tzinfo=ET).timestamp() * 1000)
+                stamps = range(open_ms, close_ms, step_ms)
+            for t in stamps:
+                wave = math.sin(t / 3.6e7) * 5.0
+                noise = ((t // 1000) * 2654435761 % 1000) / 1000.0
+                close = round(base + wave + noise, 2)
+                records.append({
+                    "t": t,
+                    "o": round(close - 0.05, 2),
+                    "h": round(close + 0.10, 2),
+                    "l": round(close - 0.10, 2),
+                    "c": close,
+                    "v": float(1000 + (t // 1000) % 5000),
+                    "vw": close,
+                    "n": float(10 + (t // 1000) % 90),
+                })
+        return records
+
+
+# =============================================================================
+# PROCESS-WIDE STORE
+# =============================================================================
+
+_store: Optional[BarStore] = None
+_store_configured = False
+_store_lock = threading.Lock()
+
+
+def configure_bar_store(
+    root: Optional[Union[str, Path]] = None,
+    enabled: bool = True,
+    splits: Optional[SplitsSource] = None,
+) -> Optional[BarStore]:
+    """
+    Set the process-wide store used by read_bars().
+
+    Args:
+        root: Store directory (defaults to EpochConfig.BAR_STORE_DIR)
+        enabled: False makes every client go straight to its upstream
+        splits: Splits source for invalidation (defaults to PolygonSplits)
+
+    Returns:
+        The configured store, or None when disabled
+    """
+    global _store, _store_configured
+    with _store_lock:
+        if not enabled:
+            _store = None
+        else:
+            if root is None:
+                from ..config.epoch_config import config as epoch_config
+                root = epoch_config.BAR_STORE_DIR
+            _store = BarStore(root, splits=splits or PolygonSplits())
+        _store_configured = True
+        return _store
+
+
+def get_bar_store() -> Optional[BarStore]:
+    """Process-wide store (configured from EpochConfig on first use)."""
+    if not _store_configured:
+        from ..config.epoch_config import config as epoch_config
+        return configure_bar_store(enabled=epoch_config.BAR_STORE_ENABLED)
+    return _store
+
+
+def read_bars(
+    ticker: str,
+    multiplier: int,
+    timespan: str,
+    start_date: Union[str, date, datetime],
+    end_date: Union[str, date, datetime],
+    upstream: Upstream,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """
+    Read bars through the store, falling back to the upstream directly.
+
+    Timespans the store does not keep (week, month, ...) and a disabled
+    store both go straight to the upstream.
+
+    Returns:
+        DataFrame with AGG_COLUMNS sorted by t
+    """
+    store = store if store is not None else get_bar_store()
+    if store is not None and BarStore.is_stored(timespan):
+        return store.get_bars(ticker, multiplier, timespan, start_date, end_date, upstream)
+
+    records = upstream(ticker.upper(), multiplier, timespan, _as_date(start_date), _as_date(end_date))
+    return _records_to_frame(records).sort_values("t").reset_index(drop=True)
@@ -0,0 +1,376 @@
+"""
+Epoch Trading System - Bulk Writer
+==================================
+
+COPY-based bulk load path for the secondary-analysis and journal
+populators (m1 bars, m1 indicator bars, trade / ramp-up / post-trade
+indicators).
+
+Each flush:
+    1. COPY the buffered rows into a session-private staging table
+       (TEMP tables are never WAL-logged, like UNLOGGED ones, and
+       disappear with the session)
+    2. Merge with one INSERT ... SELECT ... ON CONFLICT statement that also
+       returns the staged and merged row counts
+    3. Reconcile: the staged count must equal the rows sent, or the flush
+       raises BulkWriteError
+
+Rows are buffered up to `batch_size` and generators are consumed in
+chunks, so memory stays bounded however many rows a backfill produces.
+The writer never commits; callers keep their own transaction boundaries
+(flush() returns the rows flushed so a caller can commit after each one).
+
+Usage:
+    from shared.data.bulk_writer import BulkWriter, bulk_write
+
+    # One-shot
+    result = bulk_write(conn, "m1_bars_2", COLUMNS, rows,
+                        conflict_columns=("ticker", "bar_timestamp"))
+    conn.commit()
+
+    # Across many calls
+    writer = BulkWriter(conn, "m1_indicator_bars_2", COLUMNS,
+                        conflict_columns=("ticker", "bar_date", "bar_time"))
+    for rows in per_ticker_date_rows:
+        if writer.write(rows):
+            conn.commit()
+    writer.flush()
+    conn.commit()
+    writer.close()
+"""
+
+import io
+import itertools
+import json
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Characters with a meaning in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+class BulkWriteError(Exception):
+    """A flush failed or the staged row count did not reconcile."""
+
+
+@dataclass
+class BulkWriteResult:
+    """Cumulative counts for a writer (or one bulk_write call)."""
+    rows: int = 0          # rows handed to the writer and flushed
+    staged: int = 0        # rows COPY'd into staging (reconciled against rows)
+    merged: int = 0        # rows inserted or updated in the target table
+    batches: int = 0
+
+    @property
+    def skipped(self) -> int:
+        """Staged rows the merge left out (ON CONFLICT DO NOTHING)."""
+        return self.staged - self.merged
+
+
+# =============================================================================
+# COPY TEXT ENCODING
+# =============================================================================
+
+def _array_element(value) -> str:
+    if value is None:
+        return "NULL"
+    text = copy_literal(value)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def copy_literal(value) -> str:
+    """
+    Encode one value for COPY ... FROM STDIN (text format), before escaping.
+
+    NULL is returned pre-escaped as \\N; all other values are escaped by
+    the caller via copy_field.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        return repr(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        # psycopg2 returns TIME columns as timedelta; HH:MM:SS[.ffffff]
+        total = value.total_seconds()
+        sign = "-" if total < 0 else ""
+        total = abs(total)
+        hours, rem = divmod(int(total), 3600)
+        minutes, seconds = divmod(rem, 60)
+        micros = int(round((total - int(total)) * 1_000_000))
+        frac = f".{micros:06d}" if micros else ""
+        return f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}{frac}"
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return "{" + ",".join(_array_element(v) for v in value) + "}"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    return str(value)
+
+
+def copy_field(value) -> str:
+    """Encode and escape one value as a COPY text-format field."""
+    if value is None:
+        return "\\N"
+    return copy_literal(value).translate(_COPY_ESCAPES)
+
+
+class _CopyStream(io.RawIOBase):
+    """File-like view of a row chunk, encoded lazily as COPY reads it."""
+
+    def __init__(self, rows: List[Sequence], width: int):
+        self._rows = iter(rows)
+        self._width = width
+        self._pending = b""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        parts = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            if len(row) != self._width:
+                raise BulkWriteError(f"Row {self.count} has {len(row)} values, expected {self._width}")
+            line = ("\t".join(copy_field(v) for v in row) + "\n").encode("utf-8")
+            parts.append(line)
+            length += len(line)
+            self.count += 1
+        data = b"".join(parts)
+        if size < 0:
+            self._pending = b""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+
+class BulkWriter:
+    """
+    Buffered COPY + merge writer bound to one connection and target table.
+    """
+
+    def __init__(
+        self,
+        conn,
+        table: str,
+        columns: Sequence[str],
+        conflict_columns: Sequence[str] = (),
+        on_conflict: str = "nothing",
+        update_columns: Optional[Sequence[str]] = None,
+        update_extra: Optional[Dict[str, str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            conn: psycopg2 connection (never committed by the writer)
+            table: Target table
+            columns: Target columns, in row order
+            conflict_columns: ON CONFLICT target (unique key)
+            on_conflict: "nothing" (DO NOTHING) or "update" (DO UPDATE SET
+                update_columns to EXCLUDED)
+            update_columns: Columns overwritten on conflict (default: every
+                non-key column)
+            update_extra: Extra SET expressions for "update", e.g.
+                {"calculated_at": "NOW()"}
+            batch_size: Rows per COPY + merge
+        """
+        if on_conflict not in ("nothing", "update"):
+            raise ValueError(f"on_conflict must be 'nothing' or 'update', got {on_conflict!r}")
+        if on_conflict == "update" and not conflict_columns:
+            raise ValueError("on_conflict='update' needs conflict_columns")
+
+        self.conn = conn
+        self.table = table
+        self.columns = list(columns)
+        self.conflict_columns = list(conflict_columns)
+        self.on_conflict = on_conflict
+        self.update_columns = (
+            list(update_columns) if update_columns is not None
+            else [c for c in self.columns if c not in self.conflict_columns]
+        )
+        self.update_extra = dict(update_extra or {})
+        self.batch_size = max(1, int(batch_size))
+
+        base = table.split(".")[-1].strip('"')
+        self.staging_table = f"_bulk_{base[:40]}_{uuid.uuid4().hex[:8]}"
+        self.result = BulkWriteResult()
+        self._buffer: List[Sequence] = []
+
+    # -------------------------------------------------------------------------
+    # SQL
+    # -------------------------------------------------------------------------
+
+    def _prepare_sql(self) -> str:
+        cols = ", ".join(self.columns)
+        return (
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} AS "
+            f"SELECT {cols} FROM {self.table} WITH NO DATA; "
+            f"TRUNCATE {self.staging_table}"
+        )
+
+    def _merge_sql(self) -> str:
+        cols = ", ".join(self.columns)
+        select = f"SELECT {cols} FROM {self.staging_table}"
+        conflict = ""
+
+        if self.on_conflict == "update":
+            keys = ", ".join(self.conflict_columns)
+            # One row per key: the last one loaded wins, as with sequential upserts
+            select = (
+                f"SELECT DISTINCT ON ({keys}) {cols} FROM {self.staging_table} "
+                f"ORDER BY {keys}, ctid DESC"
+            )
+            sets = [f"{c} = EXCLUDED.{c}" for c in self.update_columns]
+            sets += [f"{c} = {expr}" for c, expr in self.update_extra.items()]
+            conflict = f"ON CONFLICT ({keys}) DO UPDATE SET {', '.join(sets)}"
+        elif self.conflict_columns:
+            conflict = f"ON CONFLICT ({', '.join(self.conflict_columns)}) DO NOTHING"
+
+        return (
+            f"WITH merged AS ("
+            f"INSERT INTO {self.table} ({cols}) {select} {conflict} RETURNING 1"
+            f") SELECT (SELECT COUNT(*) FROM {self.staging_table}), (SELECT COUNT(*) FROM merged)"
+        )
+
+    # -------------------------------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------------------------------
+
+    def write(self, rows: Iterable[Sequence]) -> int:
+        """
+        Buffer rows, flushing every batch_size rows.
+
+        Generators are consumed in batch_size chunks, never materialized.
+
+        Returns:
+            Rows flushed during this call (0 if everything is still buffered)
+        """
+        flushed = 0
+        iterator = iter(rows)
+        while True:
+            room = self.batch_size - len(self._buffer)
+            chunk = list(itertools.islice(iterator, room))
+            self._buffer.extend(chunk)
+            if len(self._buffer) < self.batch_size:
+                return flushed
+            flushed += self.flush()
+
+    def flush(self) -> int:
+        """
+        COPY the buffer into staging and merge it into the target table.
+
+        Returns:
+            Rows flushed (0 if the buffer was empty)
+        """
+        if not self._buffer:
+            return 0
+        batch, self._buffer = self._buffer, []
+        stream = _CopyStream(batch, len(self.columns))
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(self._prepare_sql())
+                cur.copy_expert(
+                    f"COPY {self.staging_table} ({', '.join(self.columns)}) FROM STDIN",
+                    stream
+                )
+                cur.execute(self._merge_sql())
+                staged, merged = cur.fetchone()
+        except BulkWriteError:
+            raise
+        except Exception as e:
+            raise BulkWriteError(f"Flush of {len(batch)} rows into {self.table} failed: {e}") from e
+
+        if staged != len(batch) or stream.count != len(batch):
+            raise BulkWriteError(
+                f"Row count mismatch for {self.table}: sent {len(batch)}, "
+                f"encoded {stream.count}, staged {staged}"
+            )
+
+        self.result.rows += len(batch)
+        self.result.staged += staged
+        self.result.merged += merged
+        self.result.batches += 1
+        return len(batch)
+
+    @property
+    def pending(self) -> int:
+        """Rows buffered but not yet flushed."""
+        return len(self._buffer)
+
+    def discard(self):
+        """Drop buffered rows (e.g. after the caller rolled back)."""
+        self._buffer = []
+
+    def close(self):
+        """Drop the staging table. Unflushed rows are discarded."""
+        self._buffer = []
+        if self.conn.closed:
+            return
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+        except Exception:
+            # Aborted transaction: the TEMP table goes away with the session
+            pass
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        self.close()
+
+
+def bulk_write(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    conflict_columns: Sequence[str] = (),
+    on_conflict: str = "nothing",
+    update_columns: Optional[Sequence[str]] = None,
+    update_extra: Optional[Dict[str, str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> BulkWriteResult:
+    """
+    Write all rows through a BulkWriter and return its counts (no commit).
+    """
+    with BulkWriter(conn, table, columns, conflict_columns, on_conflict,
+                    update_columns, update_extra, batch_size) as writer:
+        writer.write(rows)
+    return writer.result
@@ -0,0 +1,458 @@
+"""
+Epoch Trading System - Shared Postgres Connection Pool
+======================================================
+
+One thread-safe connection pool per database for every Epoch client in the
+process, so the Supabase client, the analysis data providers, the journal
+and training clients and the secondary processors reuse warm connections
+instead of each paying its own SSL handshake, and can query concurrently.
+
+Connections open lazily up to `max_connections`; a caller that finds the
+pool exhausted waits (up to `timeout` seconds) for one to be returned.
+Every connection is rolled back before it goes back to the pool, so a
+borrower never sees another borrower's open transaction - callers that
+write commit themselves.
+
+Query helpers decode results column by column straight into NumPy arrays
+(NUMERIC is cast to float by a cursor-scoped typecaster, so no Decimal and
+no per-row dicts are built). iter_batches() streams large results through a
+server-side cursor. Every query is timed; metrics() reports totals and a
+per-label breakdown.
+
+Usage:
+    from shared.data.db_pool import get_db_pool
+
+    pool = get_db_pool()                       # SUPABASE_DB_CONFIG
+    df = pool.query_frame("SELECT * FROM trades_2 WHERE date = %s", [d],
+                          label="trades")
+    arrays = pool.query_arrays("SELECT close, volume FROM m1_bars_2 ...")
+    for batch in pool.iter_batches("SELECT * FROM m1_indicator_bars_2"):
+        ...
+    with pool.connection() as conn:            # plain psycopg2 connection
+        ...
+    print(pool.metrics())
+"""
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import psycopg2
+import psycopg2.extensions
+import pyarrow as pa
+
+
+class PoolTimeout(Exception):
+    """No connection was returned to the pool within the timeout."""
+
+
+# =============================================================================
+# COLUMN DECODING
+# =============================================================================
+
+# Postgres type OIDs with a native NumPy representation
+_BOOL_OIDS = {16}
+_INT_OIDS = {20, 21, 23}                  # int8, int2, int4
+_FLOAT_OIDS = {700, 701, 1700}            # float4, float8, numeric
+_TIMESTAMP_OIDS = {1114}                  # timestamp without time zone
+
+# NUMERIC -> float, registered per cursor so other cursors still get Decimal
+NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "EPOCH_NUMERIC_AS_FLOAT",
+    lambda value, cur: float(value) if value is not None else None,
+)
+
+
+def _column_array(values: Sequence, type_code: int) -> np.ndarray:
+    """One result column as an array; NULLs become NaN / NaT / None."""
+    if type_code in _FLOAT_OIDS:
+        return np.array(values, dtype=np.float64)
+    if type_code in _INT_OIDS:
+        return np.array(values, dtype=np.float64 if None in values else np.int64)
+    if type_code in _BOOL_OIDS and None not in values:
+        return np.array(values, dtype=bool)
+    if type_code in _TIMESTAMP_OIDS:
+        return np.array(values, dtype="datetime64[us]")
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def decode_columns(description: Sequence, rows: List[Tuple]) -> Dict[str, np.ndarray]:
+    """
+    Tuple rows from a cursor as {column: array}, in select-list order.
+
+    Args:
+        description: cursor.description (name and type OID per column)
+        rows: fetched tuple rows
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(description)
+    return {col[0]: _column_array(values, col[1]) for col, values in zip(description, columns)}
+
+
+def _default_label(sql: str) -> str:
+    return " ".join(sql.split())[:60].rstrip()
+
+
+# =============================================================================
+# DATABASE POOL
+# =============================================================================
+
+class DatabasePool:
+    """
+    Lazily-filled, bounded pool of psycopg2 connections with query timing.
+
+    Thread-safe: any number of threads may borrow connections and run the
+    query helpers concurrently.
+    """
+
+    def __init__(
+        self,
+        db_config: Dict[str, Any],
+        max_connections: int = 10,
+        timeout: Optional[float] = 30.0,
+        itersize: int = 10_000,
+        connect: Callable[..., Any] = psycopg2.connect,
+    ):
+        """
+        Args:
+            db_config: psycopg2.connect keyword arguments
+            max_connections: Most connections open (borrowed + idle) at once
+            timeout: Seconds getconn() waits for a free connection (None = forever)
+            itersize: Rows per round trip for server-side cursors
+            connect: Connection factory (psycopg2.connect)
+        """
+        self.db_config = dict(db_config)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.itersize = itersize
+        self._connect = connect
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle: List[Any] = []
+        self._closed = False
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    # -------------------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------------------
+
+    def getconn(self):
+        """
+        Borrow a connection (reusing an idle one when possible).
+
+        Long-lived clients hold one between connect() and disconnect();
+        everything else should use connection().
+
+        Raises:
+            PoolTimeout: No connection became free within `timeout`
+        """
+        if self._closed:
+            raise psycopg2.InterfaceError("connection pool is closed")
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"no free connection after {self.timeout}s "
+                              f"({self.max_connections} in use)")
+        wait = time.perf_counter() - start
+        try:
+            conn = None
+            with self._lock:
+                while self._idle and conn is None:
+                    conn = self._idle.pop()
+                    if conn.closed:
+                        conn = None
+            opened = conn is None
+            if opened:
+                conn = self._connect(**self.db_config)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._metrics_lock:
+            m = self._metrics
+            m["borrows"] += 1
+            m["wait_seconds"] += wait
+            m["max_wait_seconds"] = max(m["max_wait_seconds"], wait)
+            if opened:
+                m["connections_opened"] += 1
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """Return a borrowed connection, rolled back; broken ones are dropped."""
+        try:
+            if not close and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+            if close or conn.closed or self._closed:
+                if not conn.closed:
+                    conn.close()
+            else:
+                with self._lock:
+                    self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of a with-block."""
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            if not conn.closed:
+                conn.close()
+
+    @property
+    def idle_connections(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _cursor(conn, name: Optional[str] = None):
+        cur = conn.cursor(name) if name else conn.cursor()
+        if isinstance(cur, psycopg2.extensions.cursor):
+            psycopg2.extensions.register_type(NUMERIC_AS_FLOAT, cur)
+        return cur
+
+    @contextmanager
+    def _timed(self, label: str) -> Iterator[List[int]]:
+        """Time a query; the caller adds its row count to the yielded list."""
+        rows = [0]
+        start = time.perf_counter()
+        try:
+            yield rows
+        finally:
+            self._record(label, time.perf_counter() - start, rows[0])
+
+    def query_arrays(self, sql: str, params: Optional[Sequence] = None,
+                     label: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Run a query and decode the result column-wise.
+
+        Returns:
+            {column: array} in select-list order (float64 for numeric and
+            real columns, int64 or float64 for integers, datetime64[us] for
+            timestamps, object otherwise)
+        """
+        with self._timed(label or _default_label(sql)) as counter:
+            with self.connection() as conn:
+                with self._cursor(conn) as cur:
+                    cur.execute(sql, params)
+                    rows = cur.fetchall()
+                    description = cur.description
+            counter[0] = len(rows)
+        return decode_columns(description, rows)
+
+    def query_frame(self, sql: str, params: Optional[Sequence] = None,
+                    label: Optional[str] = None) -> pd.DataFrame:
+        """query_arrays() as a DataFrame (timestamptz and other objects inferred)."""
+        return pd.DataFrame(self.query_arrays(sql, params, label)).infer_objects()
+
+    def query_arrow(self, sql: str, params: Optional[Sequence] = None,
+                    label: Optional[str] = None) -> pa.Table:
+        """query_arrays() as an Arrow table."""
+        arrays = self.query_arrays(sql, params, label)
+        return pa.table({name: pa.array(values) for name, values in arrays.items()})
+
+    def query_records(self, sql: str, params: Optional[Sequence] = None,
+                      label: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Rows as plain dicts, for callers that build objects row by row."""
+        with self._timed(label or _default_label(sql)) as counter:
+            with self.connection() as conn:
+                with self._cursor(conn) as cur:
+                    cur.execute(sql, params)
+                    names = [col[0] for col in cur.description]
+                    records = [dict(zip(names, row)) for row in cur.fetchall()]
+            counter[0] = len(records)
+        return records
+
+    def iter_batches(self, sql: str, params: Optional[Sequence] = None,
+                     batch_size: Optional[int] = None,
+                     label: Optional[str] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream a large result through a server-side cursor.
+
+        The connection stays borrowed until the generator is exhausted or
+        closed, and only `batch_size` rows are held in memory at a time.
+
+        Yields:
+            {column: array} per batch of up to `batch_size` rows
+        """
+        batch_size = batch_size or self.itersize
+        with self._timed(label or _default_label(sql)) as counter:
+            with self.connection() as conn:
+                with self._cursor(conn, name=f"epoch_{uuid.uuid4().hex}") as cur:
+                    cur.itersize = batch_size
+                    cur.execute(sql, params)
+                    while True:
+                        rows = cur.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        counter[0] += len(rows)
+                        yield decode_columns(cur.description, rows)
+
+    def execute(self, sql: str, params: Optional[Sequence] = None,
+                label: Optional[str] = None) -> int:
+        """Run a write statement and commit; returns the affected row count."""
+        with self._timed(label or _default_label(sql)) as counter:
+            with self.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+                    counter[0] = max(cur.rowcount, 0)
+                conn.commit()
+        return counter[0]
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def _record(self, label: str, seconds: float, rows: int):
+        with self._metrics_lock:
+            m = self._metrics
+            m["queries"] += 1
+            m["rows"] += rows
+            m["query_seconds"] += seconds
+            m["max_query_seconds"] = max(m["max_query_seconds"], seconds)
+            q = m["labels"].setdefault(label, {"queries": 0, "rows": 0, "seconds": 0.0, "max_seconds": 0.0})
+            q["queries"] += 1
+            q["rows"] += rows
+            q["seconds"] += seconds
+            q["max_seconds"] = max(q["max_seconds"], seconds)
+
+    def metrics(self) -> Dict:
+        """
+        Query and pool metrics since creation or the last reset_metrics().
+
+        Returns:
+            Dict with queries, rows, query_seconds, max_query_seconds,
+            mean_query_seconds, borrows, connections_opened, wait_seconds,
+            max_wait_seconds and per-label query counts and timings
+        """
+        with self._metrics_lock:
+            m = dict(self._metrics)
+            m["labels"] = {k: dict(v) for k, v in self._metrics["labels"].items()}
+        m["mean_query_seconds"] = m["query_seconds"] / m["queries"] if m["queries"] else 0.0
+        return m
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self._metrics = {
+                "queries": 0,
+                "rows": 0,
+                "query_seconds": 0.0,
+                "max_query_seconds": 0.0,
+                "borrows": 0,
+                "connections_opened": 0,
+                "wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "labels": {},
+            }
+
+
+# =============================================================================
+# PROCESS-WIDE POOLS
+# =============================================================================
+
+_pools: Dict[Tuple, DatabasePool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_config: Dict[str, Any]) -> Tuple:
+    """Configs naming the same server, database and user share a pool."""
+    return (
+        db_config.get("host"),
+        str(db_config.get("port", 5432)),
+        db_config.get("database", db_config.get("dbname")),
+        db_config.get("user"),
+    )
+
+
+def _default_db_config() -> Dict[str, Any]:
+    from ..config.credentials import SUPABASE_DB_CONFIG
+    return SUPABASE_DB_CONFIG
+
+
+def _build_pool(
+    db_config: Dict[str, Any],
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    itersize: Optional[int] = None,
+) -> DatabasePool:
+    from ..config.epoch_config import config as epoch_config
+
+    return DatabasePool(
+        db_config,
+        max_connections=epoch_config.DB_POOL_MAX_CONNECTIONS if max_connections is None else max_connections,
+        timeout=epoch_config.DB_POOL_TIMEOUT if timeout is None else timeout,
+        itersize=epoch_config.DB_ITERSIZE if itersize is None else itersize,
+    )
+
+
+def configure_db_pool(
+    db_config: Optional[Dict[str, Any]] = None,
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    itersize: Optional[int] = None,
+) -> DatabasePool:
+    """
+    Replace the process-wide pool for a database.
+
+    Unset arguments come from EpochConfig; db_config defaults to
+    SUPABASE_DB_CONFIG. Idle connections of the replaced pool are closed.
+
+    Returns:
+        The configured pool
+    """
+    db_config = db_config if db_config is not None else _default_db_config()
+    pool = _build_pool(db_config, max_connections, timeout, itersize)
+    with _pools_lock:
+        old = _pools.get(_pool_key(db_config))
+        _pools[_pool_key(db_config)] = pool
+    if old is not None:
+        old.close()
+    return pool
+
+
+def get_db_pool(db_config: Optional[Dict[str, Any]] = None) -> DatabasePool:
+    """Process-wide pool for `db_config` (created from EpochConfig on first use)."""
+    db_config = db_config if db_config is not None else _default_db_config()
+    key = _pool_key(db_config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _build_pool(db_config)
+        return pool
+
+
+def close_db_pools():
+    """Close every process-wide pool (idle connections immediately)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
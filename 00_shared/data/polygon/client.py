@@ -10,17 +10,31 @@ Usage:
 
     client = PolygonClient()
     df = client.get_bars("AAPL", "5min", "2024-01-01", "2024-01-31")
+
+    # Process a long range chunk by chunk
+    for chunk in client.iter_bars("AAPL", "S15", "2024-01-01", "2024-06-30"):
+        ...
+
+Adjusted second/minute/hour/day bars are read through the local bar store
+(shared.data.bar_store), so only dates never fetched before hit the API.
+Long ranges are split into request windows sized per timeframe, fetched
+concurrently under the client's rate limit and merged in timestamp order.
 """
 
+import functools
+import threading
 import time
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, Iterator, List, Any, Union
 from pathlib import Path
 
 from ...config.credentials import POLYGON_API_KEY, POLYGON_BASE_URL
 from ...config.epoch_config import config as epoch_config
+from ..bar_store import read_bars, request_windows
+from ..rate_limiter import RateLimiter, get_rate_limiter, spacing_limiter
 
 
 class PolygonClient:
@@ -28,12 +42,25 @@ class PolygonClient:
     Centralized Polygon.io API client.
 
     Handles all market data fetching with:
-    - Automatic rate limiting
+    - Rate limiting through the shared token bucket (all Polygon clients)
     - Retry logic
+    - Range splitting and next_url pagination
     - Data normalization
-    - Caching (optional)
+    - Read-through local bar store
     """
 
+    # Raw aggregate keys -> standard column names
+    COLUMN_MAP = {
+        "t": "timestamp",
+        "o": "open",
+        "h": "high",
+        "l": "low",
+        "c": "close",
+        "v": "volume",
+        "vw": "vwap",
+        "n": "transactions",
+    }
+
     # Timeframe mappings
     TIMEFRAME_MAP = {
         # User-friendly -> (multiplier, timespan)
@@ -68,28 +95,36 @@ class PolygonClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        rate_limit_delay: float = 0.1,
+        rate_limit_delay: Optional[float] = None,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        max_workers: int = 4,
+        limiter: Optional[RateLimiter] = None,
     ):
         """
         Initialize Polygon client.
 
         Args:
             api_key: Polygon API key (uses default from credentials if not provided)
-            rate_limit_delay: Seconds between API calls
+            rate_limit_delay: Deprecated; extra spacing between this client's
+                requests (seconds) on top of the shared limiter
             max_retries: Max retry attempts on failure
             retry_delay: Seconds between retries
+            max_workers: Request windows fetched concurrently by get_bars
+            limiter: RateLimiter to pace requests (defaults to the shared one)
         """
         self.api_key = api_key or POLYGON_API_KEY
         self.base_url = POLYGON_BASE_URL
+        self.limiter = limiter or get_rate_limiter()
         self.rate_limit_delay = rate_limit_delay
+        self._spacing = spacing_limiter(rate_limit_delay)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_workers = max(1, max_workers)
 
         # Request tracking
-        self._last_request_time = 0.0
         self._request_count = 0
+        self._count_lock = threading.Lock()
 
         # Session for connection pooling
         self._session = requests.Session()
@@ -98,12 +133,26 @@ class PolygonClient:
             "Accept": "application/json",
         })
 
-    def _wait_for_rate_limit(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self._last_request_time = time.time()
+    def _wait_for_rate_limit(self, endpoint: str = "default"):
+        """Take a token from the shared rate limiter before a request."""
+        self.limiter.acquire(endpoint)
+        if self._spacing is not None:
+            self._spacing.acquire(endpoint)
+        with self._count_lock:
+            self._request_count += 1
+
+    @staticmethod
+    def _endpoint_name(endpoint: str) -> str:
+        """Rate limiter endpoint name (weight key) for an API path."""
+        if endpoint.startswith("/v2/aggs"):
+            return "aggs"
+        if endpoint.startswith("/v3/snapshot/options"):
+            return "options_snapshot"
+        if endpoint.startswith("/v3/reference/options"):
+            return "options_contracts"
+        if endpoint.startswith("/v3/reference"):
+            return "reference"
+        return "default"
 
     def _make_request(
         self,
@@ -130,8 +179,7 @@ class PolygonClient:
         url = f"{self.base_url}{endpoint}"
 
         for attempt in range(self.max_retries):
-            self._wait_for_rate_limit()
-            self._request_count += 1
+            self._wait_for_rate_limit(self._endpoint_name(endpoint))
 
             try:
                 response = self._session.get(url, params=params, timeout=30)
@@ -199,60 +247,145 @@ class PolygonClient:
         """
         Fetch OHLCV bar data for a symbol.
 
+        The range is split into request windows sized for the timeframe,
+        fetched concurrently and merged, so long S15/M1 ranges are never
+        truncated.
+
         Args:
             symbol: Stock ticker (e.g., "AAPL")
             timeframe: e.g., "5min", "M5", "H1", "D1"
             start_date: Start date
             end_date: End date
             adjusted: Use split-adjusted prices
-            limit: Max bars per request
+            limit: Max bars per request page (pagination fetches the rest)
 
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume, vwap
         """
-        symbol = symbol.upper()
-        multiplier, timespan = self._parse_timeframe(timeframe)
-        start = self._parse_date(start_date)
-        end = self._parse_date(end_date)
-
-        endpoint = f"/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/{start}/{end}"
-        params = {
-            "adjusted": str(adjusted).lower(),
-            "sort": "asc",
-            "limit": limit,
-        }
+        chunks = list(self.iter_bars(symbol, timeframe, start_date, end_date, adjusted, limit))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
 
-        response = self._make_request(endpoint, params)
+    def iter_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: Union[str, datetime, date],
+        end_date: Union[str, datetime, date],
+        adjusted: bool = True,
+        limit: int = 50000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream bars one request window at a time, in timestamp order.
 
-        if response.get("resultsCount", 0) == 0:
-            return pd.DataFrame()
+        Up to max_workers windows are in flight ahead of the consumer; only
+        those are held in memory. Chunks never overlap and empty windows
+        are skipped. Stopping iteration early cancels windows not yet
+        started.
 
-        results = response.get("results", [])
-
-        # Convert to DataFrame
-        df = pd.DataFrame(results)
-
-        # Rename columns to standard names
-        column_map = {
-            "t": "timestamp",
-            "o": "open",
-            "h": "high",
-            "l": "low",
-            "c": "close",
-            "v": "volume",
-            "vw": "vwap",
-            "n": "transactions",
-        }
-        df = df.rename(columns=column_map)
+        Args:
+            Same as get_bars.
+
+        Yields:
+            DataFrames with the get_bars columns
+        """
+        symbol = symbol.upper()
+        multiplier, timespan = self._parse_timeframe(timeframe)
+        windows = request_windows(
+            multiplier, timespan, self._parse_date(start_date), self._parse_date(end_date)
+        )
+        if not windows:
+            return
+
+        def fetch(window):
+            return self._fetch_window(symbol, multiplier, timespan, window[0], window[1], adjusted, limit)
+
+        last_t = None
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(windows))) as executor:
+            pending = [executor.submit(fetch, w) for w in windows[:self.max_workers]]
+            queued = iter(windows[self.max_workers:])
+            try:
+                while pending:
+                    df = pending.pop(0).result()
+                    next_window = next(queued, None)
+                    if next_window is not None:
+                        pending.append(executor.submit(fetch, next_window))
+
+                    if last_t is not None:
+                        df = df[df["t"] > last_t]
+                    if df.empty:
+                        continue
+                    last_t = df["t"].iloc[-1]
+                    yield self._normalize_bars(df)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fetch_window(
+        self,
+        symbol: str,
+        multiplier: int,
+        timespan: str,
+        from_date: date,
+        to_date: date,
+        adjusted: bool,
+        limit: int,
+    ) -> pd.DataFrame:
+        """Raw aggregates for one window, sorted by t without duplicates."""
+        if adjusted:
+            df = read_bars(
+                symbol, multiplier, timespan, from_date, to_date,
+                functools.partial(self._fetch_aggs, limit=limit)
+            )
+        else:
+            records = self._fetch_aggs(
+                symbol, multiplier, timespan, from_date, to_date, adjusted=False, limit=limit
+            )
+            df = pd.DataFrame(records)
+        if df.empty:
+            return pd.DataFrame(columns=["t"])
+        return df.drop_duplicates(subset="t").sort_values("t").reset_index(drop=True)
+
+    def _normalize_bars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Raw aggregates -> standard column names with Eastern timestamps."""
+        df = df.rename(columns=self.COLUMN_MAP)
 
         # Convert timestamp (milliseconds) to datetime
         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
         df["timestamp"] = df["timestamp"].dt.tz_localize("UTC").dt.tz_convert("America/New_York")
 
-        # Sort by timestamp
-        df = df.sort_values("timestamp").reset_index(drop=True)
+        return df.reset_index(drop=True)
 
-        return df
+    def _fetch_aggs(
+        self,
+        symbol: str,
+        multiplier: int,
+        timespan: str,
+        from_date: date,
+        to_date: date,
+        adjusted: bool = True,
+        limit: int = 50000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Raw aggregates for a date span (also the bar store upstream).
+
+        Follows next_url pagination so long spans are never truncated.
+        """
+        endpoint = (
+            f"/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/"
+            f"{self._parse_date(from_date)}/{self._parse_date(to_date)}"
+        )
+        params = {"adjusted": str(adjusted).lower(), "sort": "asc", "limit": limit}
+
+        results: List[Dict[str, Any]] = []
+        while endpoint:
+            response = self._make_request(endpoint, params)
+            results.extend(response.get("results", []))
+            next_url = response.get("next_url")
+            endpoint = next_url[len(self.base_url):] if next_url else None
+            params = {}
+        return results
 
     def get_daily_bars(
         self,
@@ -0,0 +1,334 @@
+"""
+Epoch Trading System - Shared Polygon Rate Limiter
+==================================================
+
+One token bucket for every Polygon client, so bar fetches, options
+snapshots and the backtest fetchers running side by side stay inside the
+plan limit together instead of each pacing itself.
+
+Each request takes `weight` tokens (per-endpoint weights, default 1). The
+bucket refills at `rate` tokens per second up to `burst`. A request that
+finds too few tokens reserves them anyway (the balance goes negative) and
+sleeps until its reservation is covered, so callers are served strictly in
+the order they arrived - a thread can never be starved by later ones.
+
+Cross-process mode keeps the bucket state in a small file guarded by an OS
+file lock, so subprocess-based processors share the same budget. The path
+is exported in EPOCH_POLYGON_RATE_FILE so child processes pick it up.
+
+Usage:
+    from shared.data.rate_limiter import get_rate_limiter, share_across_processes
+
+    limiter = get_rate_limiter()
+    limiter.acquire("aggs")
+    ...
+    print(limiter.metrics())
+
+    # Before starting worker processes
+    share_across_processes()
+"""
+
+import os
+import struct
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+# Environment variable carrying the cross-process state file to subprocesses
+RATE_FILE_ENV = "EPOCH_POLYGON_RATE_FILE"
+
+# Request cost by endpoint; anything not listed costs 1 token
+DEFAULT_ENDPOINT_WEIGHTS = {
+    "aggs": 1.0,
+    "options_contracts": 1.0,
+    "options_snapshot": 1.0,
+    "reference": 1.0,
+}
+
+# tokens, last refill (epoch seconds)
+_STATE = struct.Struct("<dd")
+
+
+# =============================================================================
+# CROSS-PROCESS STATE
+# =============================================================================
+
+class _FileBucket:
+    """Bucket state in a file, read-modify-written under an exclusive OS lock."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def locked(self, burst: float) -> Iterator[List[float]]:
+        """Yield [tokens, last] for modification; written back on exit."""
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._lock(fd)
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                raw = os.read(fd, _STATE.size)
+                state = list(_STATE.unpack(raw)) if len(raw) == _STATE.size else [burst, time.time()]
+                yield state
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, _STATE.pack(*state))
+            finally:
+                self._unlock(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _lock(fd: int):
+        if os.name == "nt":
+            os.lseek(fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    continue
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    @staticmethod
+    def _unlock(fd: int):
+        if os.name == "nt":
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+# =============================================================================
+# RATE LIMITER
+# =============================================================================
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with FIFO reservations and wait metrics.
+
+    Thread-safe; with `state_path` it is also shared across processes.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None,
+        state_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            rate: Tokens (weight-1 requests) per second; <= 0 disables limiting
+            burst: Bucket capacity (defaults to one second of rate, at least 1)
+            weights: Per-endpoint token cost (merged over DEFAULT_ENDPOINT_WEIGHTS)
+            state_path: Bucket state file for cross-process mode
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.weights = {**DEFAULT_ENDPOINT_WEIGHTS, **(weights or {})}
+        self.state_path = Path(state_path) if state_path else None
+
+        self._lock = threading.Lock()
+        self._file = _FileBucket(self.state_path) if self.state_path else None
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    @property
+    def cross_process(self) -> bool:
+        return self._file is not None
+
+    def _reserve(self, weight: float) -> float:
+        """Take `weight` tokens; return seconds until the reservation is covered."""
+        with self._lock:
+            if self._file is None:
+                now = time.monotonic()
+                self._tokens, self._last = self._take(self._tokens, self._last, now, weight)
+                return max(0.0, -self._tokens / self.rate)
+            with self._file.locked(self.burst) as state:
+                now = time.time()
+                state[0], state[1] = self._take(state[0], state[1], now, weight)
+                return max(0.0, -state[0] / self.rate)
+
+    def _take(self, tokens: float, last: float, now: float, weight: float):
+        tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate)
+        return tokens - weight, now
+
+    def acquire(self, endpoint: str = "default", weight: Optional[float] = None) -> float:
+        """
+        Block until a request to `endpoint` may be sent.
+
+        Args:
+            endpoint: Endpoint name used for the weight lookup and metrics
+            weight: Explicit token cost (overrides the endpoint weight)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if weight is None:
+            weight = self.weights.get(endpoint, 1.0)
+        wait = self._reserve(weight) if self.rate > 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._metrics_lock:
+            m = self._metrics
+            m["requests"] += 1
+            m["tokens"] += weight
+            m["wait_seconds"] += wait
+            m["max_wait_seconds"] = max(m["max_wait_seconds"], wait)
+            if wait > 0:
+                m["waited_requests"] += 1
+            e = m["endpoints"].setdefault(endpoint, {"requests": 0, "tokens": 0.0, "wait_seconds": 0.0})
+            e["requests"] += 1
+            e["tokens"] += weight
+            e["wait_seconds"] += wait
+        return wait
+
+    def metrics(self) -> Dict:
+        """
+        Wait-time metrics since creation or the last reset_metrics().
+
+        Returns:
+            Dict with requests, tokens, waited_requests, wait_seconds,
+            max_wait_seconds, mean_wait_seconds and per-endpoint counts
+        """
+        with self._metrics_lock:
+            m = dict(self._metrics)
+            m["endpoints"] = {k: dict(v) for k, v in self._metrics["endpoints"].items()}
+        m["mean_wait_seconds"] = m["wait_seconds"] / m["requests"] if m["requests"] else 0.0
+        return m
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self._metrics = {
+                "requests": 0,
+                "tokens": 0.0,
+                "waited_requests": 0,
+                "wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "endpoints": {},
+            }
+
+
+# =============================================================================
+# PROCESS-WIDE LIMITER
+# =============================================================================
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def configure_rate_limiter(
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+    weights: Optional[Dict[str, float]] = None,
+    cross_process: Optional[bool] = None,
+    state_path: Optional[Union[str, Path]] = None,
+) -> RateLimiter:
+    """
+    Set the process-wide limiter returned by get_rate_limiter().
+
+    Unset arguments come from EpochConfig. Enabling cross-process mode
+    exports the state file in EPOCH_POLYGON_RATE_FILE, so subprocesses
+    started afterwards join the same bucket.
+
+    Returns:
+        The configured limiter
+    """
+    global _limiter
+    from ..config.epoch_config import config as epoch_config
+
+    if cross_process is None:
+        cross_process = epoch_config.POLYGON_RATE_LIMIT_CROSS_PROCESS or RATE_FILE_ENV in os.environ
+    if cross_process and state_path is None:
+        state_path = os.environ.get(RATE_FILE_ENV) or epoch_config.POLYGON_RATE_LIMIT_FILE
+
+    with _limiter_lock:
+        _limiter = RateLimiter(
+            rate=epoch_config.POLYGON_RATE_LIMIT if rate is None else rate,
+            burst=epoch_config.POLYGON_RATE_BURST if burst is None else burst,
+            weights={**epoch_config.POLYGON_ENDPOINT_WEIGHTS, **(weights or {})},
+            state_path=state_path if cross_process else None,
+        )
+        if cross_process:
+            os.environ[RATE_FILE_ENV] = str(_limiter.state_path)
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter (configured from EpochConfig on first use)."""
+    if _limiter is None:
+        return configure_rate_limiter()
+    return _limiter
+
+
+def share_across_processes(state_path: Optional[Union[str, Path]] = None) -> RateLimiter:
+    """
+    Switch the process-wide limiter to cross-process mode.
+
+    Call before starting worker processes: a worker without the state file
+    builds its own bucket, so N workers would get N times the plan limit.
+    Keeps the current rate, burst and weights; a no-op when the limiter is
+    already shared.
+
+    Args:
+        state_path: Bucket state file (default: EPOCH_POLYGON_RATE_FILE,
+            then EpochConfig.POLYGON_RATE_LIMIT_FILE)
+
+    Returns:
+        The cross-process limiter
+    """
+    global _limiter
+    limiter = get_rate_limiter()
+    if limiter.cross_process:
+        return limiter
+    if state_path is None:
+        state_path = os.environ.get(RATE_FILE_ENV)
+    if state_path is None:
+        from ..config.epoch_config import config as epoch_config
+        state_path = epoch_config.POLYGON_RATE_LIMIT_FILE
+
+    with _limiter_lock:
+        _limiter = RateLimiter(
+            rate=limiter.rate,
+            burst=limiter.burst,
+            weights=limiter.weights,
+            state_path=state_path,
+        )
+        os.environ[RATE_FILE_ENV] = str(_limiter.state_path)
+        return _limiter
+
+
+def spacing_limiter(rate_limit_delay: Optional[float]) -> Optional[RateLimiter]:
+    """
+    Limiter for the deprecated per-client rate_limit_delay argument.
+
+    Warns when a delay is passed. A positive delay still keeps that client's
+    requests at least rate_limit_delay apart, on top of the shared bucket.
+
+    Returns:
+        A private RateLimiter, or None when no spacing applies
+    """
+    if rate_limit_delay is None:
+        return None
+    warnings.warn(
+        "rate_limit_delay is deprecated; Polygon requests are paced by the shared "
+        "rate limiter (shared.data.rate_limiter)",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    if rate_limit_delay <= 0:
+        return None
+    return RateLimiter(rate=1.0 / rate_limit_delay, burst=1.0)
@@ -3,7 +3,9 @@ Epoch Trading System - Supabase Client
 =======================================
 
 Centralized Supabase/PostgreSQL client for database operations.
-Provides a clean interface for all Epoch modules.
+Provides a clean interface for all Epoch modules. Queries borrow
+connections from the shared pool (shared.data.db_pool), so clients are
+cheap to create and safe to use from several threads.
 
 Usage:
     from shared.data.supabase import SupabaseClient
@@ -14,14 +16,12 @@ Usage:
         db.close()
 """
 
-import psycopg2
-import psycopg2.extras
 import pandas as pd
 from datetime import datetime, date
 from typing import Optional, Dict, List, Any, Union
-from contextlib import contextmanager
 
 from ...config.credentials import SUPABASE_DB_CONFIG
+from ..db_pool import DatabasePool, get_db_pool
 
 
 class SupabaseClient:
@@ -29,7 +29,7 @@ class SupabaseClient:
     Centralized Supabase/PostgreSQL client.
 
     Handles all database operations with:
-    - Connection management
+    - Pooled connection management
     - Query execution
     - Data loading and saving
     - Transaction support
@@ -39,6 +39,7 @@ class SupabaseClient:
         self,
         session_date: Optional[date] = None,
         verbose: bool = False,
+        pool: Optional[DatabasePool] = None,
     ):
         """
         Initialize Supabase client.
@@ -46,24 +47,25 @@ class SupabaseClient:
         Args:
             session_date: Trading session date (defaults to today)
             verbose: Enable verbose logging
+            pool: Connection pool (defaults to the shared SUPABASE_DB_CONFIG pool)
         """
         self.session_date = session_date or date.today()
         self.verbose = verbose
-        self._conn = None
-        self._cursor = None
+        self._pool = pool
 
     def connect(self) -> bool:
         """
-        Connect to Supabase PostgreSQL database.
+        Connect to Supabase PostgreSQL database (checks out and returns
+        one pooled connection to verify the database is reachable).
 
         Returns:
             True if connected successfully, False otherwise
         """
         try:
-            self._conn = psycopg2.connect(**SUPABASE_DB_CONFIG)
-            self._cursor = self._conn.cursor(
-                cursor_factory=psycopg2.extras.RealDictCursor
-            )
+            if self._pool is None:
+                self._pool = get_db_pool(SUPABASE_DB_CONFIG)
+            with self._pool.connection():
+                pass
 
             if self.verbose:
                 print(f"[Supabase] Connected to {SUPABASE_DB_CONFIG['host']}")
@@ -74,11 +76,7 @@ class SupabaseClient:
             return False
 
     def close(self):
-        """Close database connection."""
-        if self._cursor:
-            self._cursor.close()
-        if self._conn:
-            self._conn.close()
+        """Release the client (pooled connections stay open for reuse)."""
         if self.verbose:
             print("[Supabase] Connection closed")
 
@@ -168,13 +166,9 @@ class SupabaseClient:
         """
 
         try:
-            self._cursor.execute(query, [query_date, ticker])
-            row = self._cursor.fetchone()
+            row = self._fetch_one(query, [query_date, ticker])
 
-            if not row:
-                return None
-
-            return dict(row)
+            return row
 
         except Exception as e:
             print(f"[Supabase] Error getting primary zone: {e}")
@@ -209,9 +203,8 @@ class SupabaseClient:
         """
 
         try:
-            self._cursor.execute(query, [query_date, ticker])
-            row = self._cursor.fetchone()
-            return dict(row) if row else None
+            row = self._fetch_one(query, [query_date, ticker])
+            return row
 
         except Exception as e:
             print(f"[Supabase] Error getting secondary zone: {e}")
@@ -246,9 +239,8 @@ class SupabaseClient:
         """
 
         try:
-            self._cursor.execute(query, [query_date, ticker])
-            row = self._cursor.fetchone()
-            return dict(row) if row else None
+            row = self._fetch_one(query, [query_date, ticker])
+            return row
 
         except Exception as e:
             print(f"[Supabase] Error getting bar data: {e}")
@@ -280,8 +272,7 @@ class SupabaseClient:
         """
 
         try:
-            self._cursor.execute(query, [query_date, ticker])
-            row = self._cursor.fetchone()
+            row = self._fetch_one(query, [query_date, ticker])
 
             if not row:
                 return []
@@ -364,9 +355,8 @@ class SupabaseClient:
         """
 
         try:
-            self._cursor.execute(query, [query_date, ticker])
-            row = self._cursor.fetchone()
-            return dict(row) if row else None
+            row = self._fetch_one(query, [query_date, ticker])
+            return row
 
         except Exception as e:
             print(f"[Supabase] Error getting market structure: {e}")
@@ -392,18 +382,17 @@ class SupabaseClient:
             DataFrame with query results
         """
         try:
-            self._cursor.execute(query, params or [])
-            rows = self._cursor.fetchall()
-
-            if not rows:
-                return pd.DataFrame()
-
-            return pd.DataFrame(rows)
+            return self._pool.query_frame(query, params or [])
 
         except Exception as e:
             print(f"[Supabase] Query error: {e}")
             return pd.DataFrame()
 
+    def _fetch_one(self, query: str, params: List) -> Optional[Dict]:
+        """First result row as a dict, or None."""
+        rows = self._pool.query_records(query, params)
+        return rows[0] if rows else None
+
     def execute(self, query: str, params: Optional[List] = None) -> bool:
         """
         Execute a write query (INSERT, UPDATE, DELETE).
@@ -416,13 +405,11 @@ class SupabaseClient:
             True if successful, False otherwise
         """
         try:
-            self._cursor.execute(query, params or [])
-            self._conn.commit()
+            self._pool.execute(query, params or [])
             return True
 
         except Exception as e:
             print(f"[Supabase] Execute error: {e}")
-            self._conn.rollback()
             return False
 
     def insert_dataframe(
@@ -457,15 +444,15 @@ class SupabaseClient:
             """
 
             # Insert rows
-            for _, row in df.iterrows():
-                self._cursor.execute(query, list(row))
-
-            self._conn.commit()
+            with self._pool.connection() as conn:
+                with conn.cursor() as cur:
+                    for _, row in df.iterrows():
+                        cur.execute(query, list(row))
+                conn.commit()
             return True
 
         except Exception as e:
             print(f"[Supabase] Insert error: {e}")
-            self._conn.rollback()
             return False
 
 
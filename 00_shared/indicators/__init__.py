@@ -10,6 +10,8 @@ Architecture:
     - config.py    : Single canonical configuration (frozen dataclasses)
     - types.py     : All result dataclasses
     - _utils.py    : Bar accessor helpers + math utilities
+    - bar_array.py : BarArray columnar bar container (zero-copy inputs)
+    - streaming.py : Incremental update(bar) counterparts of the bar-list wrappers
     - core/        : 7 indicator modules (numpy core + DataFrame/bar-list wrappers)
     - structure/   : Fractal-based market structure detection
 
@@ -29,6 +31,7 @@ Usage:
     from shared.indicators.core.volume_delta import volume_delta_df, calculate_bar_delta
     from shared.indicators.core.atr import atr_df, calculate_atr
     from shared.indicators.structure import get_market_structure
+    from shared.indicators import BarArray
 
 ================================================================================
 """
@@ -36,6 +39,23 @@ Usage:
 # Configuration
 from .config import CONFIG
 
+# Columnar bars
+from .bar_array import BarArray, as_bar_array
+
+# Incremental (per-bar) state
+from .streaming import (
+    StreamingIndicator,
+    VolumeDeltaStream,
+    VolumeROCStream,
+    CVDStream,
+    ATRStream,
+    SMAStream,
+    SMASpreadStream,
+    VWAPStream,
+    CandleRangeStream,
+    IndicatorStream,
+)
+
 # Result types
 from .types import (
     VolumeDeltaResult,
@@ -84,6 +104,11 @@ from .structure import (
 
 __all__ = [
     "CONFIG",
+    "BarArray", "as_bar_array",
+    # Streaming
+    "StreamingIndicator", "VolumeDeltaStream", "VolumeROCStream", "CVDStream",
+    "ATRStream", "SMAStream", "SMASpreadStream", "VWAPStream", "CandleRangeStream",
+    "IndicatorStream",
     # Types
     "VolumeDeltaResult", "RollingDeltaResult", "VolumeROCResult", "CVDResult",
     "ATRResult", "SMAResult", "SMAMomentumResult", "VWAPResult",
@@ -9,6 +9,7 @@ Provides a universal interface for extracting OHLCV values from:
 - dict-style bars ({"high": 100.0, ...})
 - object-style bars (bar.high_price)
 - pandas DataFrames
+- BarArray columns (see bar_array.py)
 
 ================================================================================
 """
@@ -92,32 +93,37 @@ def get_volume(bar: Union[dict, Any], default: int = 0) -> int:
 
 def bars_to_arrays(bars, up_to_index=None):
     """
-    Extract OHLCV numpy arrays from a list of bar dicts/objects.
+    Extract OHLCV numpy arrays from a list of bar dicts/objects or a BarArray.
+
+    A BarArray is returned as views of its columns; a bar list is converted
+    column by column through BarArray.from_bars on every call, so callers
+    that read many windows of the same bars should convert them once with
+    as_bar_array first. Missing values are 0.0.
 
     Args:
-        bars: List of bar data (dict or object)
+        bars: List of bar data (dict or object), or a BarArray
         up_to_index: Extract up to this index (inclusive). None = all.
 
     Returns:
         Tuple of (open, high, low, close, volume) as numpy arrays
     """
+    from .bar_array import BarArray
+
     end = (up_to_index + 1) if up_to_index is not None else len(bars)
     end = min(end, len(bars))
 
-    opens = np.empty(end, dtype=np.float64)
-    highs = np.empty(end, dtype=np.float64)
-    lows = np.empty(end, dtype=np.float64)
-    closes = np.empty(end, dtype=np.float64)
-    volumes = np.empty(end, dtype=np.float64)
+    if isinstance(bars, BarArray):
+        return tuple(fill_missing(col) for col in bars[:end].ohlcv())
+    window = bars if end == len(bars) else bars[:end]
+    return BarArray.from_bars(window, missing=0.0, timestamps=False).ohlcv()
 
-    for i in range(end):
-        opens[i] = get_open(bars[i], 0.0)
-        highs[i] = get_high(bars[i], 0.0)
-        lows[i] = get_low(bars[i], 0.0)
-        closes[i] = get_close(bars[i], 0.0)
-        volumes[i] = get_volume(bars[i], 0)
 
-    return opens, highs, lows, closes, volumes
+def fill_missing(values: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """Replace NaN with default, returning values itself when it has no NaN."""
+    mask = np.isnan(values)
+    if not mask.any():
+        return values
+    return np.where(mask, default, values)
 
 
 # =============================================================================
@@ -152,3 +158,85 @@ def linear_regression_slope(values: np.ndarray) -> float:
         return 0.0
 
     return float(numerator / denominator)
+
+
+# =============================================================================
+# ROLLING WINDOW KERNELS
+# =============================================================================
+# Each output index i covers the trailing window values[i - window + 1:i + 1]
+# and is NaN until the first full window. A NaN inside a window makes that
+# window's result NaN, exactly as the equivalent slice reduction would.
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sums from one cumulative sum (O(n))."""
+    n = len(values)
+    result = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return result
+
+    nan = np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(nan, 0.0, values))))
+    result[window - 1:] = csum[window:] - csum[:-window]
+
+    if nan.any():
+        nan_count = np.concatenate(([0], np.cumsum(nan)))
+        result[window - 1:][nan_count[window:] - nan_count[:-window] > 0] = np.nan
+    return result
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window means (see rolling_sum)."""
+    return rolling_sum(values, window) / window
+
+
+def _rolling_extreme(values: np.ndarray, window: int, ufunc: np.ufunc) -> np.ndarray:
+    """
+    Van Herk / Gil-Werman running max or min (O(n), no per-bar loop).
+
+    The series is cut into blocks of `window`. Any window spans the tail of
+    one block and the head of the next, so its extreme is the combination
+    of one suffix-accumulated and one prefix-accumulated value.
+    """
+    n = len(values)
+    result = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return result
+
+    pad = (-n) % window
+    blocks = np.concatenate([values, np.full(pad, values[-1])]).reshape(-1, window)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()[:n]
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+    # np.maximum / np.minimum propagate NaN like ndarray.max() / .min()
+    result[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:])
+    return result
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window maxima."""
+    return _rolling_extreme(values, window, np.maximum)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window minima."""
+    return _rolling_extreme(values, window, np.minimum)
+
+
+def rolling_regression_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    linear_regression_slope() of every trailing window.
+
+    With x centred (xc = x - x_mean, which sums to zero) the least-squares
+    slope reduces to sum(xc * y) / sum(xc ** 2), so the whole series is a
+    single correlation with the fixed xc kernel.
+    """
+    n = len(values)
+    result = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return result
+    if window < 2:
+        result[window - 1:] = 0.0
+        return result
+
+    xc = np.arange(window, dtype=np.float64) - (window - 1) / 2.0
+    result[window - 1:] = np.correlate(values, xc, mode="valid") / np.sum(xc ** 2)
+    return result
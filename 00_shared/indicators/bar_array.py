@@ -0,0 +1,400 @@
+"""
+================================================================================
+EPOCH TRADING SYSTEM - BAR ARRAY
+Structure-of-arrays bar container shared by every indicator.
+XIII Trading LLC
+================================================================================
+
+A BarArray holds one contiguous column per field instead of one object per
+bar, so indicators read columns directly instead of walking bar objects
+through the get_* accessors on every call.
+
+Columns:
+    open, high, low, close, volume, vwap : float64 (missing prices are NaN)
+    timestamp                            : int64 ns since epoch, or None
+
+Integer timestamps on input are read as epoch milliseconds (Polygon's 't'
+and the bar dicts built from it) unless a constructor is given unit=.
+
+Construction never copies a column that is already float64 / int64:
+    BarArray.from_frame(df)         DataFrame columns (zero-copy views)
+    BarArray.from_records(arr)      NumPy structured / record array fields
+    BarArray.from_polygon(results)  Polygon aggregates JSON (o/h/l/c/v/vw/t)
+    BarArray.from_bars(bars)        bar dicts/objects (S15Bar fast path)
+
+Slicing (bars[a:b], up_to(), between()) returns views, so a session can be
+converted once and windowed by index or time for free afterwards.
+
+Usage:
+    from shared.indicators import BarArray, calculate_atr
+    bars = BarArray.from_frame(m1_df)
+    morning = bars.between("2026-01-05 14:30", "2026-01-05 16:00")
+    atr = calculate_atr(morning)
+
+================================================================================
+"""
+
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ._utils import get_bar_value, get_volume, safe_float
+
+
+# Accessor key names, in the order get_bar_value tries them
+_FIELD_KEYS = {
+    "open": ("open_price", "open"),
+    "high": ("high_price", "high"),
+    "low": ("low_price", "low"),
+    "close": ("close_price", "close"),
+    "volume": ("volume",),
+    "vwap": ("vwap",),
+}
+_TIMESTAMP_KEYS = ("timestamp", "bar_timestamp")
+_POLYGON_KEYS = {"open": "o", "high": "h", "low": "l", "close": "c", "volume": "v", "vwap": "vw"}
+_NS_PER_UNIT = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+
+# =============================================================================
+# COLUMN HELPERS
+# =============================================================================
+
+def _float_column(values: Any) -> np.ndarray:
+    """View values as a float64 array (no copy when already float64)."""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _timestamp_ns(values: Any, unit: str = "ms") -> Optional[np.ndarray]:
+    """
+    Convert timestamps to int64 nanoseconds since epoch.
+
+    Integers count `unit` ('s', 'ms', 'us' or 'ns') since the epoch; int64
+    input with unit='ns' is returned as-is. Tz-aware datetimes count from the
+    UTC epoch; naive values are taken as-is. datetime64[ns] input is viewed,
+    not copied.
+    """
+    if values is None:
+        return None
+    if unit not in _NS_PER_UNIT:
+        raise ValueError(f"unknown timestamp unit {unit!r}")
+    array = getattr(values, "array", None)
+    if not isinstance(array, pd.arrays.DatetimeArray):
+        raw = values if isinstance(values, np.ndarray) else np.asarray(values)
+        if raw.dtype.kind in "iu":
+            if unit == "ns":
+                return raw.astype(np.int64, copy=False)
+            return raw.astype(np.int64) * _NS_PER_UNIT[unit]
+        array = pd.DatetimeIndex(values).array
+    if array.unit != "ns":
+        array = array.as_unit("ns")
+    return array.asi8
+
+
+def _to_ns(value: Any) -> int:
+    """Convert a single timestamp bound to int64 nanoseconds (see _timestamp_ns)."""
+    return int(pd.Timestamp(value).as_unit("ns").value)
+
+
+def _resolve_key(bar: Any, keys) -> Optional[str]:
+    """First key of keys present on bar (dict key or attribute), as get_bar_value would pick."""
+    for key in keys:
+        if isinstance(bar, dict):
+            if key in bar:
+                return key
+        elif hasattr(bar, key):
+            return key
+    return None
+
+
+def _bars_column(bars, field: str, missing: float) -> np.ndarray:
+    """
+    Extract one float64 column from a bar list.
+
+    Fast path: resolve the key on the first bar, then read every bar with a
+    single itemgetter/attrgetter. Lists that are not uniform (mixed key names,
+    None or unparseable values) fall back to the per-bar get_* accessors.
+    """
+    n = len(bars)
+    key = _resolve_key(bars[0], _FIELD_KEYS[field])
+    if key is None:
+        return np.full(n, missing, dtype=np.float64)
+
+    getter = itemgetter(key) if isinstance(bars[0], dict) else attrgetter(key)
+    try:
+        return np.fromiter(map(getter, bars), dtype=np.float64, count=n)
+    except (KeyError, AttributeError, TypeError, ValueError):
+        pass
+
+    if field == "volume":
+        return np.fromiter((get_volume(bar, 0) for bar in bars), dtype=np.float64, count=n)
+    keys = _FIELD_KEYS[field]
+    values = (safe_float(get_bar_value(bar, *keys)) for bar in bars)
+    return np.fromiter((missing if v is None else v for v in values), dtype=np.float64, count=n)
+
+
+# =============================================================================
+# BAR ARRAY
+# =============================================================================
+
+class BarArray:
+    """
+    Columnar OHLCV bars: one float64 array per field plus int64 ns timestamps.
+
+    len(), slicing and iteration-free windowing work like a bar list, and an
+    integer index returns a bar dict, so code written against bar lists keeps
+    working. Slices share memory with the parent; do not mutate columns of a
+    BarArray built from someone else's data.
+    """
+
+    __slots__ = ("open", "high", "low", "close", "volume", "vwap", "timestamp")
+
+    def __init__(
+        self,
+        open: Any,
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any,
+        vwap: Any = None,
+        timestamp: Any = None,
+        unit: str = "ms",
+    ):
+        self.open = _float_column(open)
+        self.high = _float_column(high)
+        self.low = _float_column(low)
+        self.close = _float_column(close)
+        self.volume = _float_column(volume)
+        self.vwap = (np.full(len(self.close), np.nan) if vwap is None else _float_column(vwap))
+        self.timestamp = _timestamp_ns(timestamp, unit)
+
+        n = len(self.close)
+        columns = [self.open, self.high, self.low, self.volume, self.vwap]
+        if self.timestamp is not None:
+            columns.append(self.timestamp)
+        if any(len(col) != n for col in columns):
+            raise ValueError("BarArray columns must all have the same length")
+
+    # -------------------------------------------------------------------------
+    # Constructors
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls) -> "BarArray":
+        """A BarArray with no bars."""
+        none = np.empty(0, dtype=np.float64)
+        return cls(none, none, none, none, none, none, np.empty(0, dtype=np.int64), unit="ns")
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        timestamp_col: Optional[str] = None,
+        open_col: str = "open",
+        high_col: str = "high",
+        low_col: str = "low",
+        close_col: str = "close",
+        volume_col: str = "volume",
+        vwap_col: str = "vwap",
+        unit: str = "ms",
+    ) -> "BarArray":
+        """
+        Wrap DataFrame columns without copying them.
+
+        Timestamps come from timestamp_col, else a 'timestamp' or
+        'bar_timestamp' column, else a DatetimeIndex; otherwise None.
+        An integer timestamp column counts `unit` since the epoch.
+        """
+        if timestamp_col is None:
+            timestamp_col = next((c for c in _TIMESTAMP_KEYS if c in df.columns), None)
+        if timestamp_col is not None:
+            timestamp = df[timestamp_col]
+        elif isinstance(df.index, pd.DatetimeIndex):
+            timestamp = df.index
+        else:
+            timestamp = None
+
+        def column(name):
+            return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return cls(
+            column(open_col), column(high_col), column(low_col), column(close_col),
+            column(volume_col),
+            vwap=column(vwap_col) if vwap_col in df.columns else None,
+            timestamp=timestamp,
+            unit=unit,
+        )
+
+    @classmethod
+    def from_records(cls, records: np.ndarray, unit: str = "ms") -> "BarArray":
+        """
+        Wrap the fields of a NumPy structured/record array without copying.
+
+        Field names follow the bar accessors (open or open_price, ...). A
+        'timestamp' field may be datetime64 or integers counting `unit`
+        since the epoch.
+        """
+        names = records.dtype.names or ()
+
+        def field(name):
+            key = next((k for k in _FIELD_KEYS[name] if k in names), None)
+            if key is None:
+                if name == "vwap":
+                    return None
+                raise ValueError(f"record array has no '{name}' field")
+            return records[key]
+
+        timestamp = None
+        key = next((k for k in _TIMESTAMP_KEYS if k in names), None)
+        if key is not None:
+            timestamp = records[key]
+            if np.issubdtype(timestamp.dtype, np.datetime64):
+                timestamp = timestamp.astype("datetime64[ns]", copy=False).view(np.int64)
+                unit = "ns"
+
+        return cls(field("open"), field("high"), field("low"), field("close"),
+                   field("volume"), vwap=field("vwap"), timestamp=timestamp, unit=unit)
+
+    @classmethod
+    def from_polygon(cls, results: Any) -> "BarArray":
+        """
+        Build from Polygon aggregates JSON: a response dict or its 'results' list.
+
+        Keys o/h/l/c/v/vw map to the price/volume columns and 't' (epoch
+        milliseconds) to the timestamp column. Missing vw is NaN.
+        """
+        if isinstance(results, dict):
+            results = results.get("results") or []
+        n = len(results)
+        if n == 0:
+            return cls.empty()
+
+        def column(key, default=np.nan):
+            return np.fromiter((r.get(key, default) for r in results), dtype=np.float64, count=n)
+
+        timestamp = np.fromiter((r["t"] for r in results), dtype=np.int64, count=n)
+        columns = {name: column(key) for name, key in _POLYGON_KEYS.items()}
+        return cls(**columns, timestamp=timestamp, unit="ms")
+
+    @classmethod
+    def from_bars(cls, bars, missing: float = np.nan, timestamps: bool = True,
+                  unit: str = "ms") -> "BarArray":
+        """
+        Build from a list of bar dicts/objects (S15Bar, M1 bar dicts, ...).
+
+        Key names resolve as in the get_* accessors; missing prices become
+        `missing`, missing volume 0, and volume is truncated to whole shares
+        like get_volume. Uniform lists (the normal case) are read one column
+        at a time without the per-bar accessor calls. Integer timestamps
+        (Polygon M1 dicts) count `unit` since the epoch.
+        """
+        if isinstance(bars, BarArray):
+            return bars
+        if not bars:
+            return cls.empty()
+        bars = list(bars) if not isinstance(bars, list) else bars
+
+        columns = {name: _bars_column(bars, name, np.nan if name == "vwap" else missing)
+                   for name in _FIELD_KEYS}
+        volume = columns["volume"]
+        volume[np.isnan(volume)] = 0.0
+        np.trunc(volume, out=volume)
+
+        timestamp = None
+        if timestamps:
+            key = _resolve_key(bars[0], _TIMESTAMP_KEYS)
+            if key is not None:
+                getter = itemgetter(key) if isinstance(bars[0], dict) else attrgetter(key)
+                try:
+                    timestamp = _timestamp_ns(list(map(getter, bars)), unit)
+                except (KeyError, AttributeError, TypeError, ValueError):
+                    timestamp = None
+        return cls(**columns, timestamp=timestamp, unit="ns")
+
+    # -------------------------------------------------------------------------
+    # Sequence protocol
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, key):
+        """Integer index -> bar dict; slice (or index array) -> BarArray."""
+        if isinstance(key, (int, np.integer)):
+            i = int(key)
+            row = {name: float(getattr(self, name)[i]) for name in _FIELD_KEYS}
+            row["volume"] = int(row["volume"])
+            row["timestamp"] = (None if self.timestamp is None
+                                else pd.Timestamp(int(self.timestamp[i]), unit="ns"))
+            return row
+        return BarArray(
+            self.open[key], self.high[key], self.low[key], self.close[key],
+            self.volume[key], self.vwap[key],
+            None if self.timestamp is None else self.timestamp[key],
+            unit="ns",
+        )
+
+    def __repr__(self) -> str:
+        span = ""
+        if self.timestamp is not None and len(self):
+            first = pd.Timestamp(int(self.timestamp[0]), unit="ns")
+            last = pd.Timestamp(int(self.timestamp[-1]), unit="ns")
+            span = f", {first} .. {last}"
+        return f"BarArray({len(self)} bars{span})"
+
+    # -------------------------------------------------------------------------
+    # Windows (views)
+    # -------------------------------------------------------------------------
+
+    def up_to(self, index: Optional[int]) -> "BarArray":
+        """Bars 0..index inclusive (all bars when index is None)."""
+        if index is None:
+            return self
+        return self[:max(index + 1, 0)]
+
+    def between(self, start: Any = None, end: Any = None) -> "BarArray":
+        """
+        Bars with start <= timestamp < end, as a view.
+
+        Bounds accept anything pd.Timestamp does (None = open-ended) and
+        are compared like the stored timestamps: by UTC instant when
+        tz-aware, as wall-clock time when naive. Timestamps must be sorted ascending.
+        """
+        if self.timestamp is None:
+            raise ValueError("BarArray has no timestamps")
+        lo = 0 if start is None else int(np.searchsorted(self.timestamp, _to_ns(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamp, _to_ns(end), side="left"))
+        return self[lo:max(lo, hi)]
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def ohlcv(self):
+        """Tuple of (open, high, low, close, volume) arrays (no copies)."""
+        return self.open, self.high, self.low, self.close, self.volume
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with one column per field (plus 'timestamp' when present)."""
+        data: Dict[str, np.ndarray] = {}
+        if self.timestamp is not None:
+            data["timestamp"] = self.timestamp.view("datetime64[ns]")
+        for name in _FIELD_KEYS:
+            data[name] = getattr(self, name)
+        return pd.DataFrame(data)
+
+
+def as_bar_array(bars: Any, unit: str = "ms") -> BarArray:
+    """
+    Return bars as a BarArray, converting DataFrames, record arrays and bar lists.
+
+    Integer timestamps count `unit` since the epoch.
+    """
+    if isinstance(bars, BarArray):
+        return bars
+    if isinstance(bars, pd.DataFrame):
+        return BarArray.from_frame(bars, unit=unit)
+    if isinstance(bars, np.ndarray) and bars.dtype.names:
+        return BarArray.from_records(bars, unit=unit)
+    return BarArray.from_bars(bars, unit=unit)
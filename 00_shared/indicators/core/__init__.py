@@ -39,7 +39,7 @@ from .candle_range import (
     calculate_candle_range_pct, calculate_candle_range_from_bar,
     is_absorption_zone, get_range_classification, is_candle_range_healthy,
 )
-from .volume_profile import calculate_volume_profile, calculate_session_targets
+from .volume_profile import calculate_volume_profile, calculate_volume_profiles, calculate_session_targets
 
 __all__ = [
     # DataFrame wrappers
@@ -62,5 +62,5 @@ __all__ = [
     "is_absorption_zone", "get_range_classification", "is_candle_range_healthy",
     # Volume Profile
     "volume_profile_df", "prior_day_levels_df",
-    "calculate_volume_profile", "calculate_session_targets",
+    "calculate_volume_profile", "calculate_volume_profiles", "calculate_session_targets",
 ]
@@ -20,7 +20,8 @@ from typing import List, Optional, Any
 
 from ..config import CONFIG
 from ..types import ATRResult
-from .._utils import get_high, get_low, get_close
+from .._utils import get_high, get_low, get_close, fill_missing
+from ..bar_array import BarArray
 
 
 # =============================================================================
@@ -133,10 +134,10 @@ def calculate_atr(
     up_to_index: Optional[int] = None,
 ) -> ATRResult:
     """
-    Calculate ATR from a list of bar dicts/objects.
+    Calculate ATR from a list of bar dicts/objects or a BarArray.
 
     Args:
-        bars: List of bar data
+        bars: List of bar data, or a BarArray
         period: ATR period (default from config)
         up_to_index: Calculate up to this index (inclusive)
 
@@ -154,13 +155,23 @@ def calculate_atr(
     if end_index < 1:
         return ATRResult(atr=None, true_range=None, period=period)
 
-    true_ranges = []
-    for i in range(1, end_index + 1):
-        high = get_high(bars[i], 0.0)
-        low = get_low(bars[i], 0.0)
-        prev_close = get_close(bars[i - 1], 0.0)
-        tr = calculate_true_range(high, low, prev_close)
-        true_ranges.append(tr)
+    if isinstance(bars, BarArray):
+        # Only the last `period` true ranges are needed
+        start = max(1, end_index - period + 1)
+        high = fill_missing(bars.high[start:end_index + 1])
+        low = fill_missing(bars.low[start:end_index + 1])
+        prev_close = fill_missing(bars.close[start - 1:end_index])
+        true_ranges = np.maximum(
+            high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)),
+        ).tolist()
+    else:
+        true_ranges = []
+        for i in range(1, end_index + 1):
+            high = get_high(bars[i], 0.0)
+            low = get_low(bars[i], 0.0)
+            prev_close = get_close(bars[i - 1], 0.0)
+            tr = calculate_true_range(high, low, prev_close)
+            true_ranges.append(tr)
 
     if len(true_ranges) < period:
         return ATRResult(
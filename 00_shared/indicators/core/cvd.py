@@ -22,7 +22,10 @@ from typing import List, Optional, Any
 
 from ..config import CONFIG
 from ..types import CVDResult
-from .._utils import linear_regression_slope
+from .._utils import (
+    bars_to_arrays, linear_regression_slope, rolling_max, rolling_min, rolling_regression_slope,
+)
+from ..bar_array import BarArray
 from .volume_delta import _bar_delta_core_with_open, calculate_bar_delta_from_bar
 
 
@@ -46,6 +49,9 @@ def _cvd_slope_core(cvd_series: np.ndarray, window: int) -> np.ndarray:
     """
     Calculate normalized CVD slope for each bar using linear regression.
 
+    Rolling slope, max and min are whole-series kernels, so there is no
+    per-bar loop.
+
     Returns:
         numpy array of normalized slope values (NaN where insufficient data)
     """
@@ -53,21 +59,19 @@ def _cvd_slope_core(cvd_series: np.ndarray, window: int) -> np.ndarray:
     n = len(cvd_series)
     result = np.full(n, np.nan)
 
-    for i in range(window - 1, n):
-        recent = cvd_series[i - window + 1:i + 1]
+    if window <= 0 or n < window:
+        return result
 
-        if len(recent) < 3:
-            result[i] = 0.0
-            continue
+    if window < 3:
+        result[window - 1:] = 0.0
+        return result
 
-        slope = linear_regression_slope(recent)
-        cvd_range = recent.max() - recent.min()
+    slope = rolling_regression_slope(cvd_series, window)[window - 1:]
+    cvd_range = (rolling_max(cvd_series, window) - rolling_min(cvd_series, window))[window - 1:]
 
-        if cvd_range == 0:
-            result[i] = 0.0
-        else:
-            normalized = slope / cvd_range * len(recent)
-            result[i] = float(np.clip(normalized, cfg.clamp_min, cfg.clamp_max))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.clip(slope / cvd_range * window, cfg.clamp_min, cfg.clamp_max)
+    result[window - 1:] = np.where(cvd_range == 0, 0.0, normalized)
 
     return result
 
@@ -130,10 +134,10 @@ def calculate_cvd_slope(
     window: Optional[int] = None,
 ) -> CVDResult:
     """
-    Calculate CVD slope from a list of bars.
+    Calculate CVD slope from a list of bars or a BarArray.
 
     Args:
-        bars: List of bar data
+        bars: List of bar data, or a BarArray
         up_to_index: Calculate up to this index (inclusive)
         window: Number of bars for slope calculation
 
@@ -152,18 +156,15 @@ def calculate_cvd_slope(
         return CVDResult(slope=0.0, trend="Flat", cvd_values=[], window_size=0)
 
     # Build CVD series from bar deltas
-    bar_deltas = []
-    for i in range(end_index + 1):
-        result = calculate_bar_delta_from_bar(bars[i])
-        bar_deltas.append(result.bar_delta)
-
-    cvd_series = []
-    cumsum = 0.0
-    for delta in bar_deltas:
-        cumsum += delta
-        cvd_series.append(cumsum)
-
-    recent_cvd = np.array(cvd_series[-cvd_window:])
+    if isinstance(bars, BarArray):
+        bar_deltas = _bar_delta_core_with_open(*bars_to_arrays(bars, end_index))
+    else:
+        bar_deltas = [calculate_bar_delta_from_bar(bars[i]).bar_delta for i in range(end_index + 1)]
+
+    # np.cumsum accumulates left to right, so the sums match a running total
+    cvd_series = np.cumsum(bar_deltas, dtype=np.float64)
+
+    recent_cvd = cvd_series[-cvd_window:]
 
     if len(recent_cvd) < 3:
         return CVDResult(slope=0.0, trend="Flat", cvd_values=recent_cvd.tolist(), window_size=len(recent_cvd))
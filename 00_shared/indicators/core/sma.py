@@ -21,7 +21,8 @@ from typing import List, Optional, Any, Union
 
 from ..config import CONFIG
 from ..types import SMAResult, SMAMomentumResult
-from .._utils import get_close
+from .._utils import get_close, rolling_mean
+from ..bar_array import BarArray
 
 
 # =============================================================================
@@ -30,24 +31,22 @@ from .._utils import get_close
 
 def _sma_core(close: np.ndarray, period: int) -> np.ndarray:
     """
-    Calculate SMA series.
+    Calculate SMA series (cumulative-sum rolling mean).
 
     Returns:
         numpy array (NaN where insufficient data)
     """
-    n = len(close)
-    result = np.full(n, np.nan)
-
-    for i in range(period - 1, n):
-        result[i] = close[i - period + 1:i + 1].mean()
-
-    return result
+    return rolling_mean(close, period)
 
 
 def _ema_core(close: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate EMA series.
 
+    The recursion ema[i] = (close[i] - ema[i-1]) * k + ema[i-1] runs in
+    pandas' compiled ewm (adjust=False, alpha=k). A NaN close makes every
+    later value NaN, as the recursion would.
+
     Returns:
         numpy array
     """
@@ -58,11 +57,13 @@ def _ema_core(close: np.ndarray, period: int) -> np.ndarray:
         return result
 
     # Seed with SMA
-    result[period - 1] = close[:period].mean()
-    multiplier = 2.0 / (period + 1)
+    seeded = np.concatenate(([close[:period].mean()], close[period:]))
+    nan_at = np.flatnonzero(np.isnan(seeded))
+    stop = nan_at[0] if len(nan_at) else len(seeded)
 
-    for i in range(period, n):
-        result[i] = (close[i] - result[i - 1]) * multiplier + result[i - 1]
+    multiplier = 2.0 / (period + 1)
+    ema = pd.Series(seeded[:stop]).ewm(alpha=multiplier, adjust=False).mean()
+    result[period - 1:period - 1 + stop] = ema.to_numpy()
 
     return result
 
@@ -133,7 +134,7 @@ def calculate_sma(
     period: int,
     up_to_index: Optional[int] = None,
 ) -> Optional[float]:
-    """Calculate SMA from bar list. Returns None if insufficient data."""
+    """Calculate SMA from bar list or BarArray. Returns None if insufficient data."""
     if not bars:
         return None
 
@@ -144,11 +145,15 @@ def calculate_sma(
         return None
 
     start_idx = end_index - period + 1
-    prices = []
-    for i in range(start_idx, end_index + 1):
-        price = get_close(bars[i])
-        if price is not None:
-            prices.append(price)
+    if isinstance(bars, BarArray):
+        window = bars.close[start_idx:end_index + 1]
+        prices = window[~np.isnan(window)].tolist()
+    else:
+        prices = []
+        for i in range(start_idx, end_index + 1):
+            price = get_close(bars[i])
+            if price is not None:
+                prices.append(price)
 
     if len(prices) < period:
         return None
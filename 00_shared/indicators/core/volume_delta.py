@@ -23,6 +23,7 @@ from typing import List, Optional, Any, Union
 from ..config import CONFIG
 from ..types import VolumeDeltaResult, RollingDeltaResult
 from .._utils import get_open, get_high, get_low, get_close, get_volume, bars_to_arrays
+from ..bar_array import BarArray
 
 
 # =============================================================================
@@ -260,7 +261,7 @@ def calculate_rolling_delta(
     Calculate rolling volume delta over N bars.
 
     Args:
-        bars: List of bar data
+        bars: List of bar data, or a BarArray
         up_to_index: Calculate up to this index (inclusive)
         rolling_period: Number of bars for rolling window
 
@@ -277,10 +278,14 @@ def calculate_rolling_delta(
     start_idx = max(0, end_index - period + 1)
     bar_count = end_index - start_idx + 1
 
-    rolling_delta = 0.0
-    for i in range(start_idx, end_index + 1):
-        result = calculate_bar_delta_from_bar(bars[i])
-        rolling_delta += result.bar_delta
+    if isinstance(bars, BarArray):
+        deltas = _bar_delta_core_with_open(*bars_to_arrays(bars[start_idx:end_index + 1]))
+        rolling_delta = sum(deltas.tolist(), 0.0)
+    else:
+        rolling_delta = 0.0
+        for i in range(start_idx, end_index + 1):
+            result = calculate_bar_delta_from_bar(bars[i])
+            rolling_delta += result.bar_delta
 
     if rolling_delta > 0:
         signal = "Bullish"
@@ -16,10 +16,19 @@ Core algorithm (Leviathan / LonesomeTheBlue methodology):
   3. POC = midpoint of zone with highest total volume
   4. Value Area = expand from POC zone until VA% of total volume captured
 
+Engine:
+  Step 2 runs vectorized over every bar of every session at once. Each
+  body/wick segment is a uniform volume density; fully covered zones are
+  filled through a per-session difference array (prefix sum) and only the
+  two end zones of a segment use the explicit overlap formula.
+  _build_profile_reference() keeps the per-bar Pine Script walk for
+  cross-checking.
+
 Usage:
     from shared.indicators.core.volume_profile import (
         volume_profile_df,
         calculate_volume_profile,
+        calculate_volume_profiles,
         calculate_session_targets,
     )
 
@@ -133,6 +142,182 @@ def _distribute_bar_volume(
         sell_profile[i] += (tw + bw) / 2.0
 
 
+def _segment_zone_volume(
+    seg_bot: np.ndarray,
+    seg_top: np.ndarray,
+    seg_vol: np.ndarray,
+    seg_session: np.ndarray,
+    session_high: np.ndarray,
+    gap: np.ndarray,
+    zone_tops: np.ndarray,
+    zone_widths: np.ndarray,
+) -> np.ndarray:
+    """
+    Spread many price segments' volume across profile zones in one pass.
+
+    Vectorized equivalent of calling _zone_overlap_volume() for every
+    (segment, zone) pair. Each segment holds a uniform volume density
+    (vol / height). Zones fully covered by a segment receive density * width,
+    accumulated through a per-session difference array (prefix sum). Only the
+    two end zones of each segment use the explicit overlap formula.
+
+    Args:
+        seg_bot, seg_top: segment price boundaries (one entry per segment)
+        seg_vol: volume carried by each segment
+        seg_session: session row index of each segment
+        session_high: top of each session's price range, shape (S,)
+        gap: zone height of each session, shape (S,)
+        zone_tops: zone upper boundaries, shape (S, resolution)
+        zone_widths: actual zone heights (zone_top - zone_bot), shape (S, resolution)
+
+    Returns:
+        Allocated volume per zone, shape (S, resolution)
+    """
+    n_sessions, resolution = zone_tops.shape
+    height = seg_top - seg_bot
+    keep = (height > 0) & (seg_vol > 0)
+
+    seg_bot = seg_bot[keep]
+    seg_top = seg_top[keep]
+    seg_vol = seg_vol[keep]
+    height = height[keep]
+    sid = seg_session[keep]
+
+    out = np.zeros(n_sessions * resolution, dtype=np.float64)
+    if len(seg_vol) == 0:
+        return out.reshape(n_sessions, resolution)
+
+    s_high = session_high[sid]
+    s_gap = gap[sid]
+    density = seg_vol / height
+
+    # Zone indices (0 = top zone) containing each segment's top and bottom
+    i_top = np.clip(np.floor((s_high - seg_top) / s_gap), 0, resolution - 1).astype(np.int64)
+    i_bot = np.clip(np.floor((s_high - seg_bot) / s_gap), 0, resolution - 1).astype(np.int64)
+
+    # Interior zones (i_top + 1 .. i_bot - 1) are fully covered
+    interior = (i_bot - i_top) >= 2
+    width = resolution + 1
+    diff = np.bincount(
+        sid[interior] * width + i_top[interior] + 1,
+        weights=density[interior],
+        minlength=n_sessions * width,
+    )
+    diff -= np.bincount(
+        sid[interior] * width + i_bot[interior],
+        weights=density[interior],
+        minlength=n_sessions * width,
+    )
+    covered = np.cumsum(diff.reshape(n_sessions, width), axis=1)[:, :resolution]
+    out += (covered * zone_widths).ravel()
+
+    # Partial zones at each end of the segment (bottom end only if distinct)
+    flat_tops = zone_tops.ravel()
+    ends = ((i_top, np.ones(len(seg_vol), dtype=bool)), (i_bot, i_bot != i_top))
+    for idx, mask in ends:
+        flat_idx = sid[mask] * resolution + idx[mask]
+        z_top = flat_tops[flat_idx]
+        z_bot = z_top - s_gap[mask]
+        overlap = np.maximum(
+            np.minimum(z_top, seg_top[mask]) - np.maximum(z_bot, seg_bot[mask]), 0.0
+        )
+        out += np.bincount(
+            flat_idx,
+            weights=overlap * seg_vol[mask] / height[mask],
+            minlength=n_sessions * resolution,
+        )
+
+    return out.reshape(n_sessions, resolution)
+
+
+def _build_profiles_batch(
+    open_arr: np.ndarray,
+    high_arr: np.ndarray,
+    low_arr: np.ndarray,
+    close_arr: np.ndarray,
+    volume_arr: np.ndarray,
+    session_ids: np.ndarray,
+    n_sessions: int,
+    resolution: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build volume profiles for many sessions at once.
+
+    Applies the profileAdd() split (body -> buy/sell by candle colour, wicks
+    split 50/50) to every bar simultaneously, then accumulates all segments
+    with _segment_zone_volume().
+
+    Args:
+        open_arr, high_arr, low_arr, close_arr, volume_arr: numpy arrays (all bars)
+        session_ids: session row index (0..n_sessions-1) for each bar
+        n_sessions: number of sessions
+        resolution: number of price zones
+
+    Returns:
+        (zone_tops, buy_profiles, sell_profiles, session_highs, session_lows, gaps)
+        Profile arrays have shape (n_sessions, resolution). Flat sessions
+        (high == low) get gap 0.0 and all-zero profiles.
+    """
+    o = np.asarray(open_arr, dtype=np.float64)
+    h = np.asarray(high_arr, dtype=np.float64)
+    l = np.asarray(low_arr, dtype=np.float64)
+    c = np.asarray(close_arr, dtype=np.float64)
+    v = np.asarray(volume_arr, dtype=np.float64)
+    sid = np.asarray(session_ids, dtype=np.int64)
+
+    session_high = np.full(n_sessions, -np.inf)
+    session_low = np.full(n_sessions, np.inf)
+    np.maximum.at(session_high, sid, h)
+    np.minimum.at(session_low, sid, l)
+
+    price_range = session_high - session_low
+    flat = ~(price_range > 0)
+    gap = np.where(flat, 0.0, price_range / resolution)
+
+    steps = np.arange(resolution, dtype=np.float64)
+    zone_tops = session_high[:, None] - gap[:, None] * steps[None, :]
+    zone_widths = zone_tops - (zone_tops - gap[:, None])
+
+    buy = np.zeros((n_sessions, resolution), dtype=np.float64)
+    sell = np.zeros((n_sessions, resolution), dtype=np.float64)
+
+    # Bars in flat sessions, zero-volume bars and dojis with no range carry nothing
+    active = (v > 0) & (h != l) & ~flat[sid]
+    if not np.any(active):
+        return zone_tops, buy, sell, session_high, session_low, gap
+
+    o, h, l, c, v, sid = o[active], h[active], l[active], c[active], v[active], sid[active]
+
+    body_top = np.maximum(c, o)
+    body_bot = np.minimum(c, o)
+    is_green = c >= o
+
+    top_wick = h - body_top
+    bottom_wick = body_bot - l
+    body = body_top - body_bot
+
+    denominator = 2.0 * top_wick + 2.0 * bottom_wick + body
+    body_vol = body * v / denominator
+    top_wick_vol = 2.0 * top_wick * v / denominator
+    bottom_wick_vol = 2.0 * bottom_wick * v / denominator
+
+    args = (session_high, gap, zone_tops, zone_widths)
+
+    # Body volume -> buy if green, sell if red
+    buy += _segment_zone_volume(body_bot[is_green], body_top[is_green], body_vol[is_green], sid[is_green], *args)
+    sell += _segment_zone_volume(body_bot[~is_green], body_top[~is_green], body_vol[~is_green], sid[~is_green], *args)
+
+    # Wick volume -> split 50/50
+    wicks = (
+        _segment_zone_volume(body_top, h, top_wick_vol, sid, *args)
+        + _segment_zone_volume(l, body_bot, bottom_wick_vol, sid, *args)
+    ) / 2.0
+    buy += wicks
+    sell += wicks
+
+    return zone_tops, buy, sell, session_high, session_low, gap
+
+
 def _build_profile_core(
     open_arr: np.ndarray,
     high_arr: np.ndarray,
@@ -144,6 +329,8 @@ def _build_profile_core(
     """
     Build a volume profile from OHLCV arrays.
 
+    Single-session view over _build_profiles_batch().
+
     Args:
         open_arr, high_arr, low_arr, close_arr, volume_arr: numpy arrays
         resolution: number of price zones
@@ -151,6 +338,27 @@ def _build_profile_core(
     Returns:
         (zone_tops, buy_profile, sell_profile, session_high, session_low, gap)
     """
+    session_ids = np.zeros(len(high_arr), dtype=np.int64)
+    zone_tops, buy, sell, s_high, s_low, gap = _build_profiles_batch(
+        open_arr, high_arr, low_arr, close_arr, volume_arr, session_ids, 1, resolution,
+    )
+    return zone_tops[0], buy[0], sell[0], float(s_high[0]), float(s_low[0]), float(gap[0])
+
+
+def _build_profile_reference(
+    open_arr: np.ndarray,
+    high_arr: np.ndarray,
+    low_arr: np.ndarray,
+    close_arr: np.ndarray,
+    volume_arr: np.ndarray,
+    resolution: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float, float]:
+    """
+    Per-bar reference implementation of _build_profile_core().
+
+    Walks every bar through _distribute_bar_volume(). Kept to cross-check
+    the vectorized engine; not used on any hot path.
+    """
     session_high = float(np.max(high_arr))
     session_low = float(np.min(low_arr))
 
@@ -244,6 +452,20 @@ def _calculate_value_area(
     return val, vah
 
 
+def _session_levels(
+    zone_tops: np.ndarray,
+    buy_profile: np.ndarray,
+    sell_profile: np.ndarray,
+    gap: float,
+    va_pct: int,
+) -> Tuple[float, float, float]:
+    """Return (poc, val, vah) for one built profile."""
+    poc_idx = _find_poc_index(buy_profile, sell_profile)
+    poc = _calculate_poc_price(zone_tops, poc_idx, gap)
+    val, vah = _calculate_value_area(buy_profile, sell_profile, zone_tops, gap, poc_idx, va_pct)
+    return poc, val, vah
+
+
 # =============================================================================
 # DATAFRAME WRAPPER
 # =============================================================================
@@ -287,33 +509,46 @@ def volume_profile_df(
         else:
             raise ValueError(f"Column '{date_col}' not found. Need a date column to group sessions.")
 
-    results = []
-    for session_date, group in df.groupby(date_col):
-        if len(group) < min_bars:
-            continue
-
-        o = group[open_col].values.astype(np.float64)
-        h = group[high_col].values.astype(np.float64)
-        l = group[low_col].values.astype(np.float64)
-        c = group[close_col].values.astype(np.float64)
-        v = group[volume_col].values.astype(np.float64)
+    # Factorize sessions once (sorted, like groupby) instead of looping groups
+    codes, session_keys = pd.factorize(df[date_col], sort=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(session_keys))
+    keep_session = counts >= min_bars
 
-        zone_tops, buy_prof, sell_prof, s_high, s_low, gap = _build_profile_core(o, h, l, c, v, resolution)
+    results = []
+    if not np.any(keep_session):
+        return pd.DataFrame(results)
+
+    row_of_session = np.full(len(session_keys), -1, dtype=np.int64)
+    row_of_session[keep_session] = np.arange(int(np.sum(keep_session)))
+    bar_rows = np.where(codes >= 0, row_of_session[np.maximum(codes, 0)], -1)
+    bar_mask = bar_rows >= 0
+
+    zone_tops, buy_profs, sell_profs, s_highs, s_lows, gaps = _build_profiles_batch(
+        df[open_col].values.astype(np.float64)[bar_mask],
+        df[high_col].values.astype(np.float64)[bar_mask],
+        df[low_col].values.astype(np.float64)[bar_mask],
+        df[close_col].values.astype(np.float64)[bar_mask],
+        df[volume_col].values.astype(np.float64)[bar_mask],
+        bar_rows[bar_mask],
+        int(np.sum(keep_session)),
+        resolution,
+    )
 
+    for row, session_date in enumerate(session_keys[keep_session]):
+        gap = float(gaps[row])
         if gap <= 0:
             continue
 
-        poc_idx = _find_poc_index(buy_prof, sell_prof)
-        poc = _calculate_poc_price(zone_tops, poc_idx, gap)
-        val, vah = _calculate_value_area(buy_prof, sell_prof, zone_tops, gap, poc_idx, va_pct)
+        buy_prof, sell_prof = buy_profs[row], sell_profs[row]
+        poc, val, vah = _session_levels(zone_tops[row], buy_prof, sell_prof, gap, va_pct)
 
         results.append({
             "date": session_date,
             "poc": poc,
             "vah": vah,
             "val": val,
-            "session_high": s_high,
-            "session_low": s_low,
+            "session_high": float(s_highs[row]),
+            "session_low": float(s_lows[row]),
             "total_volume": float(np.sum(buy_prof) + np.sum(sell_prof)),
             "buy_volume": float(np.sum(buy_prof)),
             "sell_volume": float(np.sum(sell_prof)),
@@ -403,51 +638,84 @@ def calculate_volume_profile(
     Calculate volume profile for a list of bars (single session).
 
     Args:
-        bars: List of bar dicts/objects with OHLCV data
+        bars: List of bar dicts/objects with OHLCV data, or a BarArray
         resolution: number of price zones (default from config)
         va_pct: value area percentage (default from config)
 
     Returns:
         VolumeProfileResult or None if insufficient data
     """
+    return calculate_volume_profiles([bars], resolution, va_pct)[0]
+
+
+def calculate_volume_profiles(
+    sessions: List[List[Any]],
+    resolution: Optional[int] = None,
+    va_pct: Optional[int] = None,
+) -> List[Optional[VolumeProfileResult]]:
+    """
+    Calculate volume profiles for many sessions in one batched pass.
+
+    Args:
+        sessions: List of bar lists or BarArrays, one per session
+        resolution: number of price zones (default from config)
+        va_pct: value area percentage (default from config)
+
+    Returns:
+        List aligned with sessions: VolumeProfileResult, or None where a
+        session has insufficient data or no price range
+    """
     cfg = CONFIG.volume_profile
     resolution = resolution or cfg.resolution
     va_pct = va_pct or cfg.value_area_pct
 
-    if not bars or len(bars) < cfg.min_bars:
-        return None
+    results: List[Optional[VolumeProfileResult]] = [None] * len(sessions)
+    eligible = [i for i, bars in enumerate(sessions) if bars and len(bars) >= cfg.min_bars]
+    if not eligible:
+        return results
 
-    opens, highs, lows, closes, volumes = bars_to_arrays(bars)
+    arrays = [bars_to_arrays(sessions[i]) for i in eligible]
+    session_ids = np.repeat(
+        np.arange(len(eligible), dtype=np.int64),
+        [len(a[0]) for a in arrays],
+    )
+    opens, highs, lows, closes, volumes = (
+        np.concatenate([a[k] for a in arrays]) for k in range(5)
+    )
 
-    zone_tops, buy_prof, sell_prof, s_high, s_low, gap = _build_profile_core(
-        opens, highs, lows, closes, volumes, resolution,
+    zone_tops, buy_profs, sell_profs, s_highs, s_lows, gaps = _build_profiles_batch(
+        opens, highs, lows, closes, volumes, session_ids, len(eligible), resolution,
     )
 
-    if gap <= 0:
-        return None
+    for row, i in enumerate(eligible):
+        gap = float(gaps[row])
+        if gap <= 0:
+            continue
 
-    poc_idx = _find_poc_index(buy_prof, sell_prof)
-    poc = _calculate_poc_price(zone_tops, poc_idx, gap)
-    val, vah = _calculate_value_area(buy_prof, sell_prof, zone_tops, gap, poc_idx, va_pct)
-
-    # Build profile list: (zone_mid_price, buy_vol, sell_vol)
-    profile = []
-    for i in range(len(zone_tops)):
-        mid = zone_tops[i] - gap / 2.0
-        profile.append((float(mid), float(buy_prof[i]), float(sell_prof[i])))
-
-    return VolumeProfileResult(
-        poc=poc,
-        vah=vah,
-        val=val,
-        total_volume=float(np.sum(buy_prof) + np.sum(sell_prof)),
-        buy_volume=float(np.sum(buy_prof)),
-        sell_volume=float(np.sum(sell_prof)),
-        session_high=s_high,
-        session_low=s_low,
-        resolution=resolution,
-        profile=profile,
-    )
+        buy_prof, sell_prof = buy_profs[row], sell_profs[row]
+        poc, val, vah = _session_levels(zone_tops[row], buy_prof, sell_prof, gap, va_pct)
+
+        # Build profile list: (zone_mid_price, buy_vol, sell_vol)
+        mids = zone_tops[row] - gap / 2.0
+        profile = [
+            (float(mids[k]), float(buy_prof[k]), float(sell_prof[k]))
+            for k in range(resolution)
+        ]
+
+        results[i] = VolumeProfileResult(
+            poc=poc,
+            vah=vah,
+            val=val,
+            total_volume=float(np.sum(buy_prof) + np.sum(sell_prof)),
+            buy_volume=float(np.sum(buy_prof)),
+            sell_volume=float(np.sum(sell_prof)),
+            session_high=float(s_highs[row]),
+            session_low=float(s_lows[row]),
+            resolution=resolution,
+            profile=profile,
+        )
+
+    return results
 
 
 def calculate_session_targets(
@@ -470,17 +738,17 @@ def calculate_session_targets(
     """
     targets = SessionTargets()
 
-    prior = calculate_volume_profile(prior_session_bars, resolution, va_pct)
+    prior, current = calculate_volume_profiles(
+        [prior_session_bars, current_session_bars or []], resolution, va_pct,
+    )
     if prior is not None:
         targets.prior_day_poc = prior.poc
         targets.prior_day_vah = prior.vah
         targets.prior_day_val = prior.val
 
-    if current_session_bars:
-        current = calculate_volume_profile(current_session_bars, resolution, va_pct)
-        if current is not None:
-            targets.current_poc = current.poc
-            targets.current_vah = current.vah
-            targets.current_val = current.val
+    if current is not None:
+        targets.current_poc = current.poc
+        targets.current_vah = current.vah
+        targets.current_val = current.val
 
     return targets
@@ -20,7 +20,8 @@ from typing import List, Optional, Any
 
 from ..config import CONFIG
 from ..types import VolumeROCResult
-from .._utils import get_volume
+from .._utils import get_volume, fill_missing, rolling_mean, rolling_sum
+from ..bar_array import BarArray
 
 
 # =============================================================================
@@ -40,14 +41,17 @@ def _volume_roc_core(volume: np.ndarray, period: int) -> np.ndarray:
     """
     n = len(volume)
     result = np.full(n, np.nan)
-
-    for i in range(period, n):
-        baseline = volume[i - period:i]
-        avg = baseline.mean()
-        if avg == 0:
-            result[i] = 0.0
-        else:
-            result[i] = ((volume[i] - avg) / avg) * 100.0
+    if n <= period:
+        return result
+
+    # Baseline for bar i is the mean of the `period` bars before it
+    avg = rolling_mean(volume, period)[period - 1:n - 1]
+    # An all-zero baseline counts as zero even if the cumulative sums leave
+    # a rounding residue
+    zero = (rolling_sum((volume != 0).astype(np.float64), period)[period - 1:n - 1] == 0) | (avg == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roc = (volume[period:] - avg) / avg * 100.0
+    result[period:] = np.where(zero, 0.0, roc)
 
     return result
 
@@ -93,7 +97,7 @@ def calculate_volume_roc(
     Calculate Volume ROC vs baseline average.
 
     Args:
-        bars: List of bar data
+        bars: List of bar data, or a BarArray
         up_to_index: Calculate up to this index (inclusive)
         baseline_period: Number of bars for baseline
 
@@ -108,17 +112,21 @@ def calculate_volume_roc(
     end_index = up_to_index if up_to_index is not None else len(bars) - 1
     end_index = min(end_index, len(bars) - 1)
 
+    start_idx = max(0, end_index - baseline)
+    if isinstance(bars, BarArray):
+        current_volume = int(np.nan_to_num(bars.volume[end_index]))
+        baseline_volumes = fill_missing(bars.volume[start_idx:max(start_idx, end_index)]).tolist()
+    else:
+        current_volume = get_volume(bars[end_index])
+        baseline_volumes = [get_volume(bars[i]) for i in range(start_idx, end_index)]
+
     if end_index < baseline:
         return VolumeROCResult(
             roc=None, signal="Average",
-            current_volume=get_volume(bars[end_index]),
+            current_volume=current_volume,
             baseline_avg=None,
         )
 
-    current_volume = get_volume(bars[end_index])
-    start_idx = end_index - baseline
-    baseline_volumes = [get_volume(bars[i]) for i in range(start_idx, end_index)]
-
     if not baseline_volumes:
         return VolumeROCResult(roc=None, signal="Average", current_volume=current_volume, baseline_avg=None)
 
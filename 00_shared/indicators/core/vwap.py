@@ -18,6 +18,7 @@ from typing import List, Optional, Any
 
 from ..types import VWAPResult
 from .._utils import get_high, get_low, get_close, get_volume
+from ..bar_array import BarArray
 
 
 # =============================================================================
@@ -112,10 +113,10 @@ def calculate_vwap(
     up_to_index: Optional[int] = None,
 ) -> Optional[float]:
     """
-    Calculate VWAP from a list of bars (no daily reset).
+    Calculate VWAP from a list of bars or a BarArray (no daily reset).
 
     Args:
-        bars: List of bar data
+        bars: List of bar data, or a BarArray
         up_to_index: Calculate up to this index (inclusive)
 
     Returns:
@@ -127,6 +128,16 @@ def calculate_vwap(
     end_index = up_to_index if up_to_index is not None else len(bars) - 1
     end_index = min(end_index, len(bars) - 1)
 
+    if isinstance(bars, BarArray):
+        window = bars.up_to(end_index)
+        valid = ~(np.isnan(window.high) | np.isnan(window.low) | np.isnan(window.close))
+        volume = np.nan_to_num(window.volume[valid])
+        tp = (window.high[valid] + window.low[valid] + window.close[valid]) / 3.0
+        cumulative_vol = float(volume.sum())
+        if cumulative_vol == 0:
+            return None
+        return float(np.dot(tp, volume)) / cumulative_vol
+
     cumulative_tp_vol = 0.0
     cumulative_vol = 0
 
@@ -0,0 +1,417 @@
+"""
+================================================================================
+EPOCH TRADING SYSTEM - STREAMING INDICATORS
+Incremental, per-bar counterparts of the bar-list wrappers.
+XIII Trading LLC
+================================================================================
+
+Each stream keeps only the state its indicator needs (running sums and
+fixed-length windows), so update(bar) costs O(1) in the session length.
+Feeding bars 0..i one at a time returns exactly what the matching bar-list
+wrapper returns for up_to_index=i - same arithmetic in the same order, so
+the values are bit-identical, not just close.
+
+    Stream               Batch equivalent
+    VolumeDeltaStream    calculate_rolling_delta
+    VolumeROCStream      calculate_volume_roc
+    CVDStream            calculate_cvd_slope
+    ATRStream            calculate_atr
+    SMAStream            calculate_sma
+    SMASpreadStream      calculate_sma_spread (+ calculate_sma_momentum)
+    VWAPStream           calculate_vwap
+    CandleRangeStream    calculate_candle_range_from_bar
+    IndicatorStream      all of the above, one update per bar
+
+snapshot() / restore() copy the state out and back in. The usual live
+pattern: snapshot after the last closed bar, then restore + update each
+time the forming bar changes, so a revised bar replaces rather than
+double-counts its earlier version.
+
+Usage:
+    from shared.indicators.streaming import IndicatorStream
+    stream = IndicatorStream()
+    for bar in closed_bars:
+        stream.update(bar)
+    closed = stream.snapshot()
+    values = stream.update(forming_bar)   # dict of indicator results
+    stream.restore(closed)                # forming bar changed: redo it
+
+================================================================================
+"""
+
+import copy
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import CONFIG
+from .types import (
+    ATRResult,
+    CandleRangeResult,
+    CVDResult,
+    RollingDeltaResult,
+    SMAMomentumResult,
+    SMAResult,
+    VolumeDeltaResult,
+    VolumeROCResult,
+)
+from ._utils import get_close, get_high, get_low, get_volume, linear_regression_slope
+from .core.atr import calculate_true_range
+from .core.candle_range import calculate_candle_range_from_bar
+from .core.cvd import classify_cvd_trend
+from .core.volume_delta import calculate_bar_delta_from_bar
+from .core.volume_roc import classify_volume_roc
+
+
+# =============================================================================
+# BASE
+# =============================================================================
+
+class StreamingIndicator:
+    """
+    Base for incremental indicators.
+
+    Subclasses set their parameters in __init__, then call reset(), which
+    creates every attribute named in _state. snapshot()/restore() copy
+    exactly those attributes.
+    """
+
+    _state: Tuple[str, ...] = ()
+
+    def reset(self) -> None:
+        """Forget all bars."""
+        raise NotImplementedError
+
+    def update(self, bar: Any) -> Any:
+        """Add the next bar and return the indicator value at that bar."""
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the current state (windows are copied, not shared)."""
+        return {name: copy.copy(getattr(self, name)) for name in self._state}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Return to a state previously taken with snapshot()."""
+        for name in self._state:
+            setattr(self, name, copy.copy(snapshot[name]))
+
+
+# =============================================================================
+# VOLUME DELTA / VOLUME ROC / CVD
+# =============================================================================
+
+class VolumeDeltaStream(StreamingIndicator):
+    """Rolling volume delta (calculate_rolling_delta). last_delta holds the bar's own delta."""
+
+    _state = ("_deltas", "last_delta")
+
+    def __init__(self, rolling_period: Optional[int] = None):
+        self.period = rolling_period or CONFIG.volume_delta.rolling_period
+        self.reset()
+
+    def reset(self) -> None:
+        self._deltas = deque(maxlen=self.period)
+        self.last_delta: Optional[VolumeDeltaResult] = None
+
+    def update(self, bar: Any) -> RollingDeltaResult:
+        self.last_delta = calculate_bar_delta_from_bar(bar)
+        self._deltas.append(self.last_delta.bar_delta)
+
+        rolling_delta = sum(self._deltas, 0.0)
+        if rolling_delta > 0:
+            signal = "Bullish"
+        elif rolling_delta < 0:
+            signal = "Bearish"
+        else:
+            signal = "Neutral"
+        return RollingDeltaResult(rolling_delta=rolling_delta, signal=signal, bar_count=len(self._deltas))
+
+
+class VolumeROCStream(StreamingIndicator):
+    """Volume ROC vs the previous baseline_period bars (calculate_volume_roc)."""
+
+    _state = ("_volumes",)
+
+    def __init__(self, baseline_period: Optional[int] = None):
+        self.baseline = baseline_period or CONFIG.volume_roc.baseline_period
+        self.reset()
+
+    def reset(self) -> None:
+        self._volumes = deque(maxlen=self.baseline + 1)
+
+    def update(self, bar: Any) -> VolumeROCResult:
+        current_volume = get_volume(bar)
+        self._volumes.append(current_volume)
+
+        if len(self._volumes) <= self.baseline:
+            return VolumeROCResult(roc=None, signal="Average", current_volume=current_volume, baseline_avg=None)
+
+        baseline_volumes = list(self._volumes)[:-1]
+        baseline_avg = sum(baseline_volumes) / len(baseline_volumes)
+
+        if baseline_avg == 0:
+            return VolumeROCResult(roc=0.0, signal="Average", current_volume=current_volume, baseline_avg=baseline_avg)
+
+        roc = ((current_volume - baseline_avg) / baseline_avg) * 100.0
+        return VolumeROCResult(
+            roc=roc, signal=classify_volume_roc(roc),
+            current_volume=current_volume, baseline_avg=baseline_avg,
+        )
+
+
+class CVDStream(StreamingIndicator):
+    """Normalized CVD slope over the last `window` bars (calculate_cvd_slope)."""
+
+    _state = ("_cvd", "_recent", "_count")
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or CONFIG.cvd.window
+        self.reset()
+
+    def reset(self) -> None:
+        self._cvd = 0.0
+        self._recent = deque(maxlen=self.window)
+        self._count = 0
+
+    @property
+    def cvd(self) -> float:
+        """Cumulative volume delta through the last bar."""
+        return self._cvd
+
+    def update(self, bar: Any) -> CVDResult:
+        self._cvd += calculate_bar_delta_from_bar(bar).bar_delta
+        self._recent.append(self._cvd)
+        self._count += 1
+
+        # The batch version needs window + 1 bars before it reports a slope
+        if self._count <= self.window:
+            return CVDResult(slope=0.0, trend="Flat", cvd_values=[], window_size=0)
+
+        recent_cvd = np.array(self._recent)
+        if len(recent_cvd) < 3:
+            return CVDResult(slope=0.0, trend="Flat", cvd_values=recent_cvd.tolist(), window_size=len(recent_cvd))
+
+        slope = linear_regression_slope(recent_cvd)
+        cvd_range = recent_cvd.max() - recent_cvd.min()
+        normalized_slope = 0.0 if cvd_range == 0 else slope / cvd_range * len(recent_cvd)
+
+        cfg = CONFIG.cvd
+        normalized_slope = float(np.clip(normalized_slope, cfg.clamp_min, cfg.clamp_max))
+        return CVDResult(
+            slope=normalized_slope, trend=classify_cvd_trend(normalized_slope),
+            cvd_values=recent_cvd.tolist(), window_size=len(recent_cvd),
+        )
+
+
+# =============================================================================
+# ATR / SMA / VWAP / CANDLE RANGE
+# =============================================================================
+
+class ATRStream(StreamingIndicator):
+    """ATR as the SMA of the last `period` true ranges (calculate_atr)."""
+
+    _state = ("_prev_close", "_true_ranges", "_tr_count")
+
+    def __init__(self, period: Optional[int] = None):
+        self.period = period or CONFIG.atr.period
+        self.reset()
+
+    def reset(self) -> None:
+        self._prev_close: Optional[float] = None
+        self._true_ranges = deque(maxlen=self.period)
+        self._tr_count = 0
+
+    def update(self, bar: Any) -> ATRResult:
+        prev_close = self._prev_close
+        self._prev_close = get_close(bar, 0.0)
+        if prev_close is None:
+            return ATRResult(atr=None, true_range=None, period=self.period)
+
+        tr = calculate_true_range(get_high(bar, 0.0), get_low(bar, 0.0), prev_close)
+        self._true_ranges.append(tr)
+        self._tr_count += 1
+
+        if self._tr_count < self.period:
+            return ATRResult(atr=None, true_range=tr, period=self.period)
+        return ATRResult(atr=sum(self._true_ranges) / self.period, true_range=tr, period=self.period)
+
+
+class SMAStream(StreamingIndicator):
+    """Simple moving average of close (calculate_sma); None until `period` valid closes."""
+
+    _state = ("_closes",)
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self._closes = deque(maxlen=self.period)
+
+    def update(self, bar: Any) -> Optional[float]:
+        self._closes.append(get_close(bar))
+        if len(self._closes) < self.period:
+            return None
+
+        prices = [p for p in self._closes if p is not None]
+        if len(prices) < self.period:
+            return None
+        return sum(prices) / len(prices)
+
+
+class SMASpreadStream(StreamingIndicator):
+    """
+    Fast/slow SMA spread (calculate_sma_spread).
+
+    momentum holds the SMAMomentumResult for the same bar
+    (calculate_sma_momentum), from a short history of spreads.
+    """
+
+    _state = ("_spreads", "_count", "momentum")
+
+    def __init__(self):
+        cfg = CONFIG.sma
+        self.fast = SMAStream(cfg.fast_period)
+        self.slow = SMAStream(cfg.slow_period)
+        self.reset()
+
+    def reset(self) -> None:
+        self.fast.reset()
+        self.slow.reset()
+        self._spreads = deque(maxlen=CONFIG.sma.momentum_lookback + 1)
+        self._count = 0
+        self.momentum = SMAMomentumResult(spread_now=None, spread_prev=None, momentum="FLAT", ratio=None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["fast"] = self.fast.snapshot()
+        state["slow"] = self.slow.snapshot()
+        return state
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        super().restore(snapshot)
+        self.fast.restore(snapshot["fast"])
+        self.slow.restore(snapshot["slow"])
+
+    def update(self, bar: Any) -> SMAResult:
+        sma_fast = self.fast.update(bar)
+        sma_slow = self.slow.update(bar)
+        self._count += 1
+
+        if sma_fast is None or sma_slow is None:
+            result = SMAResult(sma9=sma_fast, sma21=sma_slow, spread=None, alignment=None, cross_estimate=None)
+        else:
+            result = SMAResult(
+                sma9=sma_fast, sma21=sma_slow, spread=sma_fast - sma_slow,
+                alignment="BULLISH" if sma_fast > sma_slow else "BEARISH",
+                cross_estimate=(sma_fast + sma_slow) / 2,
+            )
+        self._spreads.append(result.spread)
+        self.momentum = self._momentum(result.spread)
+        return result
+
+    def _momentum(self, spread_now: Optional[float]) -> SMAMomentumResult:
+        cfg = CONFIG.sma
+        if spread_now is None:
+            return SMAMomentumResult(spread_now=None, spread_prev=None, momentum="FLAT", ratio=None)
+
+        earlier_index = (self._count - 1) - cfg.momentum_lookback
+        spread_prev = self._spreads[0] if earlier_index >= cfg.slow_period else None
+        if spread_prev is None:
+            return SMAMomentumResult(spread_now=spread_now, spread_prev=None, momentum="FLAT", ratio=None)
+
+        abs_now = abs(spread_now)
+        abs_prev = abs(spread_prev)
+        if abs_prev == 0:
+            return SMAMomentumResult(spread_now=spread_now, spread_prev=spread_prev, momentum="FLAT", ratio=None)
+
+        ratio = abs_now / abs_prev
+        if ratio > cfg.widening_threshold:
+            momentum = "WIDENING"
+        elif ratio < cfg.narrowing_threshold:
+            momentum = "NARROWING"
+        else:
+            momentum = "FLAT"
+        return SMAMomentumResult(spread_now=spread_now, spread_prev=spread_prev, momentum=momentum, ratio=ratio)
+
+
+class VWAPStream(StreamingIndicator):
+    """Cumulative VWAP with no daily reset (calculate_vwap); bars missing h/l/c are skipped."""
+
+    _state = ("_tp_volume", "_volume")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._tp_volume = 0.0
+        self._volume = 0
+
+    def update(self, bar: Any) -> Optional[float]:
+        high, low, close = get_high(bar), get_low(bar), get_close(bar)
+        if high is not None and low is not None and close is not None:
+            volume = get_volume(bar)
+            self._tp_volume += ((high + low + close) / 3.0) * volume
+            self._volume += volume
+
+        if self._volume == 0:
+            return None
+        return self._tp_volume / self._volume
+
+
+class CandleRangeStream(StreamingIndicator):
+    """Candle range of the bar itself (calculate_candle_range_from_bar); stateless."""
+
+    def reset(self) -> None:
+        pass
+
+    def update(self, bar: Any) -> CandleRangeResult:
+        return calculate_candle_range_from_bar(bar)
+
+
+# =============================================================================
+# BUNDLE
+# =============================================================================
+
+class IndicatorStream(StreamingIndicator):
+    """
+    Every stream above, updated together.
+
+    update(bar) returns {"rolling_delta", "bar_delta", "volume_roc", "cvd",
+    "atr", "sma", "sma_momentum", "vwap", "candle_range"}.
+    """
+
+    def __init__(
+        self,
+        rolling_period: Optional[int] = None,
+        baseline_period: Optional[int] = None,
+        cvd_window: Optional[int] = None,
+        atr_period: Optional[int] = None,
+    ):
+        self.streams: Dict[str, StreamingIndicator] = {
+            "rolling_delta": VolumeDeltaStream(rolling_period),
+            "volume_roc": VolumeROCStream(baseline_period),
+            "cvd": CVDStream(cvd_window),
+            "atr": ATRStream(atr_period),
+            "sma": SMASpreadStream(),
+            "vwap": VWAPStream(),
+            "candle_range": CandleRangeStream(),
+        }
+
+    def reset(self) -> None:
+        for stream in self.streams.values():
+            stream.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: stream.snapshot() for name, stream in self.streams.items()}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        for name, stream in self.streams.items():
+            stream.restore(snapshot[name])
+
+    def update(self, bar: Any) -> Dict[str, Any]:
+        values = {name: stream.update(bar) for name, stream in self.streams.items()}
+        values["bar_delta"] = self.streams["rolling_delta"].last_delta
+        values["sma_momentum"] = self.streams["sma"].momentum
+        return values
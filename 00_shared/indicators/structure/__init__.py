@@ -7,8 +7,15 @@ Fractal-based market structure detection.
 Usage:
     from shared.indicators.structure import detect_fractals, get_market_structure
     from shared.indicators.structure import calculate_structure_from_bars
+    from shared.indicators.structure import fractal_flags, fractal_flags_batch
 """
 
+from .fractals import (
+    fractal_flags,
+    fractal_flags_batch,
+    pad_bars,
+)
+
 from .market_structure import (
     detect_fractals,
     get_swing_points,
@@ -19,6 +26,9 @@ from .market_structure import (
 )
 
 __all__ = [
+    "fractal_flags",
+    "fractal_flags_batch",
+    "pad_bars",
     "detect_fractals",
     "get_swing_points",
     "get_market_structure",
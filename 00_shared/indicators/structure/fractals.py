@@ -0,0 +1,115 @@
+"""
+================================================================================
+EPOCH TRADING SYSTEM - FRACTAL KERNEL (Canonical)
+Vectorized Williams fractal detection
+XIII Trading LLC
+================================================================================
+
+A fractal high is a bar whose high is strictly greater than the highs of
+the `length` bars on each side; a fractal low is a bar whose low is strictly
+lower than the lows on each side. The first and last `length` bars can never
+be fractals.
+
+Each bar's neighbours are viewed through a strided (2*length+1)-wide window
+(no copies), so detection is a pair of window max/min reductions instead of
+a Python loop per bar.
+
+A NaN anywhere in a bar's window means no fractal at that bar. This makes
+NaN the padding value for the batched form: tickers with different bar
+counts are stacked into one (tickers x bars) array padded with NaN.
+
+Used by:
+    shared.indicators.structure.market_structure
+    01_application/calculators/market_structure.py
+    03_backtest/.../m1_indicator_bars_2/structure.py
+
+================================================================================
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Sequence, Tuple
+
+
+def _flags(values: np.ndarray, length: int, highs: bool) -> np.ndarray:
+    """Fractal flags along the last axis of a 1-D or 2-D float array."""
+    n = values.shape[-1]
+    if length <= 0:
+        return np.ones(values.shape, dtype=bool)
+
+    flags = np.zeros(values.shape, dtype=bool)
+    if n < 2 * length + 1:
+        return flags
+
+    windows = sliding_window_view(values, 2 * length + 1, axis=-1)
+    center = windows[..., length]
+    if highs:
+        # np.max propagates NaN, and any comparison with NaN is False
+        left = windows[..., :length].max(axis=-1)
+        right = windows[..., length + 1:].max(axis=-1)
+        is_fractal = (center > left) & (center > right)
+    else:
+        left = windows[..., :length].min(axis=-1)
+        right = windows[..., length + 1:].min(axis=-1)
+        is_fractal = (center < left) & (center < right)
+
+    flags[..., length:n - length] = is_fractal
+    return flags
+
+
+def fractal_flags(
+    high: np.ndarray,
+    low: np.ndarray,
+    length: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Detect fractal highs and lows.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        length: Number of bars on each side (2 = classic 5-candle Williams fractal)
+
+    Returns:
+        Tuple of (fractal_highs, fractal_lows) as boolean arrays
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    return _flags(high, length, highs=True), _flags(low, length, highs=False)
+
+
+def fractal_flags_batch(
+    high: np.ndarray,
+    low: np.ndarray,
+    length: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Detect fractals for many tickers at once.
+
+    Args:
+        high: (tickers, bars) array of highs, NaN-padded (see pad_bars)
+        low: (tickers, bars) array of lows, NaN-padded
+        length: Number of bars on each side
+
+    Returns:
+        Tuple of (fractal_highs, fractal_lows) as (tickers, bars) boolean
+        arrays. Row i matches fractal_flags() on ticker i's unpadded bars.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    if high.ndim != 2 or high.shape != low.shape:
+        raise ValueError(f"Expected matching 2-D arrays, got {high.shape} and {low.shape}")
+    return _flags(high, length, highs=True), _flags(low, length, highs=False)
+
+
+def pad_bars(series: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Stack per-ticker price arrays into one NaN-padded (tickers, bars) array.
+
+    Rows are left-aligned; trailing positions of shorter rows are NaN.
+    """
+    width = max((len(s) for s in series), default=0)
+    padded = np.full((len(series), width), np.nan, dtype=np.float64)
+    for i, values in enumerate(series):
+        padded[i, :len(values)] = values
+    return padded
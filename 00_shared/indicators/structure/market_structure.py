@@ -24,6 +24,8 @@ Outputs:
 ================================================================================
 """
 
+from bisect import bisect_right
+
 import numpy as np
 import pandas as pd
 from typing import Tuple, Optional, List, Any
@@ -31,6 +33,7 @@ from typing import Tuple, Optional, List, Any
 from ..config import CONFIG
 from ..types import StructureResult
 from .._utils import get_high, get_low, get_close
+from .fractals import fractal_flags
 
 
 # =============================================================================
@@ -54,40 +57,12 @@ def _detect_fractals_core(
 
     A fractal high is a bar where high > all bars within `length` on each side.
     A fractal low is a bar where low < all bars within `length` on each side.
-
-    Args:
-        high: Array of high prices
-        low: Array of low prices
-        length: Number of bars on each side (2 = classic 5-candle Williams fractal)
+    Thin wrapper over the shared vectorized kernel (fractals.fractal_flags).
 
     Returns:
         Tuple of (fractal_highs, fractal_lows) as boolean arrays
     """
-    n = len(high)
-    frac_highs = np.zeros(n, dtype=bool)
-    frac_lows = np.zeros(n, dtype=bool)
-
-    if n < 2 * length + 1:
-        return frac_highs, frac_lows
-
-    for i in range(length, n - length):
-        # Check fractal high
-        is_high = True
-        for j in range(1, length + 1):
-            if high[i] <= high[i - j] or high[i] <= high[i + j]:
-                is_high = False
-                break
-        frac_highs[i] = is_high
-
-        # Check fractal low
-        is_low = True
-        for j in range(1, length + 1):
-            if low[i] >= low[i - j] or low[i] >= low[i + j]:
-                is_low = False
-                break
-        frac_lows[i] = is_low
-
-    return frac_highs, frac_lows
+    return fractal_flags(high, low, length)
 
 
 # =============================================================================
@@ -212,12 +187,17 @@ def _find_nearest_frac(
     target_type: int,
     min_bar: int,
     max_bar: int,
+    frac_bars: Optional[List[int]] = None,
 ) -> Tuple[Optional[float], Optional[int]]:
     """
     Find the most recent fractal of target_type with bar in [min_bar, max_bar].
-    Scans backward for efficiency.
+    Scans backward for efficiency; with frac_bars (the fractals' bar indexes)
+    the scan starts at max_bar instead of at the end of the list.
     """
-    for i in range(len(fractals) - 1, -1, -1):
+    last = len(fractals) - 1
+    if frac_bars is not None:
+        last = bisect_right(frac_bars, max_bar) - 1
+    for i in range(last, -1, -1):
         f_bar = fractals[i][0]
         if f_bar < min_bar:
             break
@@ -230,32 +210,21 @@ def _find_nearest_frac(
 # WALK-FORWARD STATE MACHINE
 # =============================================================================
 
-def _walk_forward(
-    fractals: List[Tuple[int, int, float]],
+def _walk_start(
     anchor: Tuple,
     high: np.ndarray,
     low: np.ndarray,
-    close: np.ndarray,
-    retrace_pct: float,
-) -> Tuple[int, Optional[float], Optional[float]]:
+) -> list:
     """
-    Walk forward from anchor bar-by-bar, tracking BOS/CHoCH events.
+    Walk state at the anchor bar, before any bar is processed.
 
     Returns:
-        (direction, strong_level, weak_level)
-        weak_level is None if not yet anchored via retracement.
+        [trend, strong_level, strong_bar, weak_level, weak_anchored, last_extreme]
     """
     anchor_bar = anchor[0]
-    anchor_type = anchor[1]
-    strong_price = anchor[2]
+    trend = anchor[1]
     weak_init_price = anchor[3]
 
-    trend = anchor_type
-    strong_level = strong_price
-    strong_bar = anchor_bar
-    weak_level = None
-    weak_anchored = False
-
     # Initialize last_extreme from anchor's initial weak or anchor bar
     if weak_init_price is not None:
         last_extreme = weak_init_price
@@ -263,165 +232,210 @@ def _walk_forward(
         last_extreme = (
             float(high[anchor_bar]) if trend == 1 else float(low[anchor_bar])
         )
+    return [trend, anchor[2], anchor_bar, None, False, last_extreme]
+
+
+def _walk_step(
+    state: list,
+    fractals: List[Tuple[int, int, float]],
+    b: int,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    retrace_pct: float,
+    max_frac_bar: Optional[int] = None,
+    frac_bars: Optional[List[int]] = None,
+) -> None:
+    """
+    Process bar b, tracking BOS/CHoCH events (updates state in place).
 
-    n_bars = len(high)
+    Only fractals with bar <= max_frac_bar are visible (default: b), which
+    lets a walk over a longer fractal list reproduce a shorter series.
+    """
+    trend, strong_level, strong_bar, weak_level, weak_anchored, last_extreme = state
+    frac_max = b if max_frac_bar is None else min(b, max_frac_bar)
+
+    b_high = float(high[b])
+    b_low = float(low[b])
+    b_close = float(close[b])
+
+    did_bos = False
+    did_choch = False
+
+    if trend == 1:
+        # ==================== BULL ====================
+
+        # BOS: close above confirmed weak high
+        if (
+            weak_anchored
+            and weak_level is not None
+            and b_close > weak_level
+        ):
+            did_bos = True
+            new_sl, new_sl_bar = _find_nearest_frac(
+                fractals, 1, strong_bar, frac_max, frac_bars
+            )
+            if new_sl is None:
+                new_sl = strong_level
+                new_sl_bar = strong_bar
+
+            strong_level = new_sl
+            strong_bar = new_sl_bar
+            weak_level = None
+            weak_anchored = False
+            last_extreme = b_high
+
+        # CHoCH: close below strong low -> flip to bear
+        if (
+            not did_bos
+            and not did_choch
+            and strong_level is not None
+            and b_close < strong_level
+        ):
+            did_choch = True
+            new_sh, new_sh_bar = _find_nearest_frac(
+                fractals, -1, strong_bar, frac_max, frac_bars
+            )
+            if new_sh is None:
+                new_sh = b_high
+                new_sh_bar = b
+
+            trend = -1
+            strong_level = new_sh
+            strong_bar = new_sh_bar
+            weak_level = None
+            weak_anchored = False
+            last_extreme = b_low
+
+        # Track new high (running extreme for retracement)
+        if (
+            not did_bos
+            and not did_choch
+            and last_extreme is not None
+            and b_high > last_extreme
+        ):
+            last_extreme = b_high
+
+        # 30% retracement check -> anchor weak at nearest swing high fractal
+        if (
+            not did_bos
+            and not did_choch
+            and not weak_anchored
+            and last_extreme is not None
+            and strong_level is not None
+        ):
+            rng = last_extreme - strong_level
+            if rng > 0:
+                threshold = last_extreme - (rng * retrace_pct)
+                if b_low <= threshold:
+                    f_wk, _ = _find_nearest_frac(
+                        fractals, -1, strong_bar, frac_max, frac_bars
+                    )
+                    if f_wk is not None:
+                        weak_level = f_wk
+                        weak_anchored = True
+
+    elif trend == -1:
+        # ==================== BEAR ====================
+
+        # BOS: close below confirmed weak low
+        if (
+            weak_anchored
+            and weak_level is not None
+            and b_close < weak_level
+        ):
+            did_bos = True
+            new_sh, new_sh_bar = _find_nearest_frac(
+                fractals, -1, strong_bar, frac_max, frac_bars
+            )
+            if new_sh is None:
+                new_sh = strong_level
+                new_sh_bar = strong_bar
+
+            strong_level = new_sh
+            strong_bar = new_sh_bar
+            weak_level = None
+            weak_anchored = False
+            last_extreme = b_low
+
+        # CHoCH: close above strong high -> flip to bull
+        if (
+            not did_bos
+            and not did_choch
+            and strong_level is not None
+            and b_close > strong_level
+        ):
+            did_choch = True
+            new_sl, new_sl_bar = _find_nearest_frac(
+                fractals, 1, strong_bar, frac_max, frac_bars
+            )
+            if new_sl is None:
+                new_sl = b_low
+                new_sl_bar = b
+
+            trend = 1
+            strong_level = new_sl
+            strong_bar = new_sl_bar
+            weak_level = None
+            weak_anchored = False
+            last_extreme = b_high
+
+        # Track new low (running extreme for retracement)
+        if (
+            not did_bos
+            and not did_choch
+            and last_extreme is not None
+            and b_low < last_extreme
+        ):
+            last_extreme = b_low
+
+        # 30% retracement check (upward for bear)
+        if (
+            not did_bos
+            and not did_choch
+            and not weak_anchored
+            and last_extreme is not None
+            and strong_level is not None
+        ):
+            rng = strong_level - last_extreme
+            if rng > 0:
+                threshold = last_extreme + (rng * retrace_pct)
+                if b_high >= threshold:
+                    f_wk, _ = _find_nearest_frac(
+                        fractals, 1, strong_bar, frac_max, frac_bars
+                    )
+                    if f_wk is not None:
+                        weak_level = f_wk
+                        weak_anchored = True
 
-    for b in range(anchor_bar, n_bars):
-        b_high = float(high[b])
-        b_low = float(low[b])
-        b_close = float(close[b])
+    state[:] = [trend, strong_level, strong_bar, weak_level, weak_anchored, last_extreme]
 
-        did_bos = False
-        did_choch = False
 
-        if trend == 1:
-            # ==================== BULL ====================
+def _walk_result(state: list) -> Tuple[int, Optional[float], Optional[float]]:
+    """(direction, strong_level, weak_level) of a walk state."""
+    trend, strong_level, _, weak_level, weak_anchored, _ = state
+    return trend, strong_level, (weak_level if weak_anchored else None)
 
-            # BOS: close above confirmed weak high
-            if (
-                weak_anchored
-                and weak_level is not None
-                and b_close > weak_level
-            ):
-                did_bos = True
-                new_sl, new_sl_bar = _find_nearest_frac(
-                    fractals, 1, strong_bar, b
-                )
-                if new_sl is None:
-                    new_sl = strong_level
-                    new_sl_bar = strong_bar
-
-                strong_level = new_sl
-                strong_bar = new_sl_bar
-                weak_level = None
-                weak_anchored = False
-                last_extreme = b_high
-
-            # CHoCH: close below strong low -> flip to bear
-            if (
-                not did_bos
-                and not did_choch
-                and strong_level is not None
-                and b_close < strong_level
-            ):
-                did_choch = True
-                new_sh, new_sh_bar = _find_nearest_frac(
-                    fractals, -1, strong_bar, b
-                )
-                if new_sh is None:
-                    new_sh = b_high
-                    new_sh_bar = b
-
-                trend = -1
-                strong_level = new_sh
-                strong_bar = new_sh_bar
-                weak_level = None
-                weak_anchored = False
-                last_extreme = b_low
-
-            # Track new high (running extreme for retracement)
-            if (
-                not did_bos
-                and not did_choch
-                and last_extreme is not None
-                and b_high > last_extreme
-            ):
-                last_extreme = b_high
-
-            # 30% retracement check -> anchor weak at nearest swing high fractal
-            if (
-                not did_bos
-                and not did_choch
-                and not weak_anchored
-                and last_extreme is not None
-                and strong_level is not None
-            ):
-                rng = last_extreme - strong_level
-                if rng > 0:
-                    threshold = last_extreme - (rng * retrace_pct)
-                    if b_low <= threshold:
-                        f_wk, _ = _find_nearest_frac(
-                            fractals, -1, strong_bar, b
-                        )
-                        if f_wk is not None:
-                            weak_level = f_wk
-                            weak_anchored = True
-
-        elif trend == -1:
-            # ==================== BEAR ====================
-
-            # BOS: close below confirmed weak low
-            if (
-                weak_anchored
-                and weak_level is not None
-                and b_close < weak_level
-            ):
-                did_bos = True
-                new_sh, new_sh_bar = _find_nearest_frac(
-                    fractals, -1, strong_bar, b
-                )
-                if new_sh is None:
-                    new_sh = strong_level
-                    new_sh_bar = strong_bar
-
-                strong_level = new_sh
-                strong_bar = new_sh_bar
-                weak_level = None
-                weak_anchored = False
-                last_extreme = b_low
-
-            # CHoCH: close above strong high -> flip to bull
-            if (
-                not did_bos
-                and not did_choch
-                and strong_level is not None
-                and b_close > strong_level
-            ):
-                did_choch = True
-                new_sl, new_sl_bar = _find_nearest_frac(
-                    fractals, 1, strong_bar, b
-                )
-                if new_sl is None:
-                    new_sl = b_low
-                    new_sl_bar = b
-
-                trend = 1
-                strong_level = new_sl
-                strong_bar = new_sl_bar
-                weak_level = None
-                weak_anchored = False
-                last_extreme = b_high
-
-            # Track new low (running extreme for retracement)
-            if (
-                not did_bos
-                and not did_choch
-                and last_extreme is not None
-                and b_low < last_extreme
-            ):
-                last_extreme = b_low
-
-            # 30% retracement check (upward for bear)
-            if (
-                not did_bos
-                and not did_choch
-                and not weak_anchored
-                and last_extreme is not None
-                and strong_level is not None
-            ):
-                rng = strong_level - last_extreme
-                if rng > 0:
-                    threshold = last_extreme + (rng * retrace_pct)
-                    if b_high >= threshold:
-                        f_wk, _ = _find_nearest_frac(
-                            fractals, 1, strong_bar, b
-                        )
-                        if f_wk is not None:
-                            weak_level = f_wk
-                            weak_anchored = True
-
-    final_weak = weak_level if weak_anchored else None
-    return trend, strong_level, final_weak
+
+def _walk_forward(
+    fractals: List[Tuple[int, int, float]],
+    anchor: Tuple,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    retrace_pct: float,
+) -> Tuple[int, Optional[float], Optional[float]]:
+    """
+    Walk forward from anchor bar-by-bar, tracking BOS/CHoCH events.
+
+    Returns:
+        (direction, strong_level, weak_level)
+        weak_level is None if not yet anchored via retracement.
+    """
+    state = _walk_start(anchor, high, low)
+    for b in range(anchor[0], len(high)):
+        _walk_step(state, fractals, b, high, low, close, retrace_pct)
+    return _walk_result(state)
 
 
 # =============================================================================
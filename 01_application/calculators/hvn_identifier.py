@@ -9,21 +9,186 @@ Key features:
 - 10 non-overlapping POCs ranked by volume (highest volume = poc1)
 - ATR/2 overlap prevention threshold
 - Includes all market hours (pre/post/RTH)
+- Columnar profile builder (CentVolumeProfile) fed chunk by chunk, cached
+  per ticker/anchor so an extended epoch only adds the new bars
 """
 import logging
-from datetime import date, datetime, timedelta
-from math import floor, ceil
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 
 from data import get_polygon_client, cache, get_cache_key
 from core import POCResult, HVNResult
-from config import CACHE_TTL_DAILY
+from config import CACHE_TTL_DAILY, CACHE_TTL_HVN_PROFILE
 
 logger = logging.getLogger(__name__)
 
+_DAILY_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+
+
+class CentVolumeProfile:
+    """
+    Volume profile at $0.01 granularity stored as a dense integer-cent window.
+
+    Bars are added in timestamp order, one chunk at a time. Each bar's volume
+    is spread evenly over the cent levels from floor(low) to ceil(high) using
+    np.add.at, which accumulates in input order - so every level total is
+    bit-identical to the original per-bar dict loop. The array only spans the
+    cent range actually traded and grows on demand.
+
+    First-touch order of each level is tracked so to_dict() reproduces the
+    dict insertion order (and therefore the tie-break order used by
+    _select_pocs_no_overlap).
+    """
+
+    PRICE_GRANULARITY = 0.01
+    GROW_PADDING = 500            # extra cents allocated on each side when growing
+    MAX_LEVELS_PER_BATCH = 2_000_000  # bound on expanded (bar, level) entries per pass
+    _UNSEEN = np.iinfo(np.int64).max
+
+    def __init__(self):
+        self.base_cent: int = 0
+        self.volume = np.zeros(0, dtype=np.float64)
+        self.first_seen = np.zeros(0, dtype=np.int64)
+        self.entries_added: int = 0
+        self.bars_added: int = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.covered_until: Optional[pd.Timestamp] = None
+        self.daily = pd.DataFrame()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.first_seen != self._UNSEEN))
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def add_bars(self, bars: pd.DataFrame) -> "CentVolumeProfile":
+        """
+        Add a chunk of bars (must be newer than anything already added).
+
+        Args:
+            bars: DataFrame with low/high/volume (and timestamp) columns,
+                  sorted by timestamp
+
+        Returns:
+            self, for chaining
+        """
+        if bars.empty:
+            return self
+
+        self.bars_added += len(bars)
+        if 'timestamp' in bars.columns:
+            self.last_timestamp = pd.Timestamp(bars['timestamp'].iloc[-1])
+            self._add_daily(bars)
+
+        low = bars['low'].to_numpy(dtype=np.float64)
+        high = bars['high'].to_numpy(dtype=np.float64)
+        volume = bars['volume'].to_numpy(dtype=np.float64)
+
+        # Skip invalid bars (NaN compares False, so NaNs drop out here too)
+        valid = (volume > 0) & (high > low)
+        if not np.any(valid):
+            return self
+        low, high, volume = low[valid], high[valid], volume[valid]
+
+        # Same float expressions as the scalar loop, kept as integer cents
+        g = self.PRICE_GRANULARITY
+        low_cent = np.floor(low / g)
+        high_cent = np.ceil(high / g)
+        num_levels = np.round((high_cent * g - low_cent * g) / g).astype(np.int64) + 1
+        per_level = volume / num_levels
+
+        keep = num_levels > 0
+        low_cent = low_cent[keep].astype(np.int64)
+        num_levels = num_levels[keep]
+        per_level = per_level[keep]
+
+        self._ensure_window(int(low_cent.min()), int((low_cent + num_levels - 1).max()))
+
+        # Expand bars into (cent, volume) entries in bounded batches
+        ends = np.cumsum(num_levels)
+        start = 0
+        while start < len(num_levels):
+            offset = ends[start - 1] if start else 0
+            stop = int(np.searchsorted(ends, offset + self.MAX_LEVELS_PER_BATCH, side='right'))
+            stop = max(stop, start + 1)
+            self._accumulate(low_cent[start:stop], num_levels[start:stop], per_level[start:stop])
+            start = stop
+
+        return self
+
+    def _accumulate(self, low_cent: np.ndarray, num_levels: np.ndarray, per_level: np.ndarray):
+        """Add one batch of bars' per-level volume to the dense window."""
+        total = int(num_levels.sum())
+        bar_start = np.repeat(np.cumsum(num_levels) - num_levels, num_levels)
+        cents = np.repeat(low_cent, num_levels) + (np.arange(total) - bar_start)
+        idx = cents - self.base_cent
+
+        np.add.at(self.volume, idx, np.repeat(per_level, num_levels))
+
+        # Record first-touch order for levels not seen before
+        uniq, first_pos = np.unique(idx, return_index=True)
+        new = self.first_seen[uniq] == self._UNSEEN
+        self.first_seen[uniq[new]] = self.entries_added + first_pos[new]
+        self.entries_added += total
+
+    def _ensure_window(self, lo_cent: int, hi_cent: int):
+        """Grow the dense cent window so it covers [lo_cent, hi_cent]."""
+        size = len(self.volume)
+        if size and self.base_cent <= lo_cent and hi_cent < self.base_cent + size:
+            return
+
+        if size:
+            new_lo = min(lo_cent, self.base_cent)
+            new_hi = max(hi_cent, self.base_cent + size - 1)
+        else:
+            new_lo, new_hi = lo_cent, hi_cent
+        new_lo -= self.GROW_PADDING
+        new_hi += self.GROW_PADDING
+
+        volume = np.zeros(new_hi - new_lo + 1, dtype=np.float64)
+        first_seen = np.full(new_hi - new_lo + 1, self._UNSEEN, dtype=np.int64)
+        if size:
+            at = self.base_cent - new_lo
+            volume[at:at + size] = self.volume
+            first_seen[at:at + size] = self.first_seen
+
+        self.base_cent, self.volume, self.first_seen = new_lo, volume, first_seen
+
+    def _add_daily(self, bars: pd.DataFrame):
+        """Keep a running daily OHLCV aggregate for the ATR fallback."""
+        daily = bars.set_index('timestamp').resample('D').agg(_DAILY_AGG)
+        if not self.daily.empty:
+            daily = pd.concat([self.daily, daily]).groupby(level=0).agg(_DAILY_AGG)
+        self.daily = daily
+
+    # -------------------------------------------------------------------------
+    # Views
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[float, float]:
+        """
+        Return the profile as {price: volume} in first-touch order.
+
+        Matches the dict built by the original per-bar loop, key for key.
+        """
+        touched = np.flatnonzero(self.first_seen != self._UNSEEN)
+        if len(touched) == 0:
+            return {}
+        order = touched[np.argsort(self.first_seen[touched], kind='stable')]
+        prices = (order + self.base_cent) / 100.0
+        return dict(zip(prices.tolist(), self.volume[order].tolist()))
+
 
 class HVNIdentifier:
     """
@@ -84,17 +249,16 @@ class HVNIdentifier:
             logger.info(f"Using cached HVN result for {ticker}")
             return cached
 
-        # Fetch minute data for the epoch
-        bars = self._fetch_minute_data(ticker, anchor_date, analysis_date, end_timestamp)
+        # Build (or extend a cached) $0.01 volume profile chunk by chunk
+        profile = self._build_profile_incremental(ticker, anchor_date, analysis_date, end_timestamp)
 
-        if bars.empty:
+        if profile.bars_added == 0:
             logger.error(f"No data available for {ticker} in epoch period")
             return self._empty_result(ticker, anchor_date, analysis_date)
 
-        logger.info(f"Loaded {len(bars)} minute bars for {ticker}")
+        logger.info(f"Loaded {profile.bars_added} minute bars for {ticker}")
 
-        # Build volume profile at $0.01 granularity
-        volume_profile = self._build_volume_profile(bars)
+        volume_profile = profile.to_dict()
 
         if not volume_profile:
             logger.error(f"Could not build volume profile for {ticker}")
@@ -104,7 +268,7 @@ class HVNIdentifier:
 
         # Determine ATR for overlap threshold
         if atr_value is None or atr_value <= 0:
-            atr_value = self._calculate_simple_atr(bars)
+            atr_value = self._atr_from_daily(profile.daily)
             logger.info(f"Calculated ATR from data: ${atr_value:.2f}")
         else:
             logger.info(f"Using provided ATR: ${atr_value:.2f}")
@@ -122,7 +286,7 @@ class HVNIdentifier:
             ticker=ticker,
             start_date=anchor_date,
             end_date=analysis_date,
-            bars_analyzed=len(bars),
+            bars_analyzed=profile.bars_added,
             total_volume=total_volume,
             price_range_low=price_range[0],
             price_range_high=price_range[1],
@@ -135,6 +299,89 @@ class HVNIdentifier:
 
         return result
 
+    def _build_profile_incremental(
+        self,
+        ticker: str,
+        anchor_date: date,
+        analysis_date: date,
+        end_timestamp: datetime = None
+    ) -> CentVolumeProfile:
+        """
+        Build the epoch volume profile one CHUNK_DAYS chunk at a time.
+
+        Reuses the cached profile for this ticker/anchor when it stops at or
+        before the requested end, fetching and adding only the newer bars.
+        Completed profiles are written back for the next extension.
+
+        Args:
+            ticker: Stock symbol
+            anchor_date: Epoch start date
+            analysis_date: Epoch end date
+            end_timestamp: Optional precise end timestamp for pre/post market mode
+
+        Returns:
+            CentVolumeProfile covering anchor_date through the requested end
+        """
+        covered_until = self._epoch_end_bound(analysis_date, end_timestamp)
+        profile_key = get_cache_key("hvn_profile", ticker, str(anchor_date))
+
+        profile = cache.get_object(profile_key, ttl_seconds=CACHE_TTL_HVN_PROFILE)
+        fetch_start = anchor_date
+        if (
+            isinstance(profile, CentVolumeProfile)
+            and profile.last_timestamp is not None
+            and profile.covered_until is not None
+            and profile.covered_until <= covered_until
+        ):
+            # Step back a day so timezone edges cannot skip bars; anything
+            # already in the profile is dropped by timestamp below
+            fetch_start = max(anchor_date, profile.last_timestamp.date() - timedelta(days=1))
+            logger.info(f"Extending cached HVN profile for {ticker} from {fetch_start}")
+        else:
+            profile = CentVolumeProfile()
+
+        chunks = self._iter_minute_data(ticker, fetch_start, analysis_date, end_timestamp)
+        self._add_chunks(profile, chunks, end_timestamp)
+        profile.covered_until = covered_until
+
+        # Only persist profiles whose bars can no longer change
+        if end_timestamp is not None or analysis_date < date.today():
+            cache.set_object(profile_key, profile)
+
+        return profile
+
+    @staticmethod
+    def _add_chunks(
+        profile: CentVolumeProfile,
+        chunks: Iterable[pd.DataFrame],
+        end_timestamp: datetime = None
+    ):
+        """
+        Feed chunks into the profile in timestamp order.
+
+        Applies the same guarantees as fetch_minute_bars_chunked(): no
+        duplicate timestamps and nothing at or after end_timestamp.
+        """
+        for chunk in chunks:
+            chunk = chunk.drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+            if end_timestamp is not None:
+                chunk = chunk[chunk['timestamp'] < end_timestamp]
+            if profile.last_timestamp is not None:
+                chunk = chunk[chunk['timestamp'] > profile.last_timestamp]
+            profile.add_bars(chunk.reset_index(drop=True))
+
+    @staticmethod
+    def _epoch_end_bound(analysis_date: date, end_timestamp: datetime = None) -> pd.Timestamp:
+        """Exclusive upper bound of the epoch as a UTC timestamp."""
+        if end_timestamp is not None:
+            bound = pd.Timestamp(end_timestamp)
+        else:
+            bound = pd.Timestamp(datetime.combine(analysis_date + timedelta(days=1), time()))
+            bound = bound.tz_localize("America/New_York")
+        if bound.tzinfo is None:
+            bound = bound.tz_localize("UTC")
+        return bound.tz_convert("UTC")
+
     def _fetch_minute_data(
         self,
         ticker: str,
@@ -161,6 +408,23 @@ class HVNIdentifier:
             end_timestamp=end_timestamp
         )
 
+    def _iter_minute_data(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        end_timestamp: datetime = None
+    ) -> Iterable[pd.DataFrame]:
+        """Yield 1-minute bars for the epoch one CHUNK_DAYS chunk at a time."""
+        return self.client.iter_minute_bars_chunked(
+            ticker,
+            start_date,
+            end_date,
+            multiplier=1,
+            chunk_days=self.CHUNK_DAYS,
+            end_timestamp=end_timestamp
+        )
+
     def _build_volume_profile(self, bars: pd.DataFrame) -> Dict[float, float]:
         """
         Build volume profile at $0.01 granularity.
@@ -174,41 +438,7 @@ class HVNIdentifier:
         Returns:
             Dict mapping price level (rounded to $0.01) to total volume
         """
-        volume_profile: Dict[float, float] = {}
-
-        for _, bar in bars.iterrows():
-            bar_low = bar['low']
-            bar_high = bar['high']
-            bar_volume = bar['volume']
-
-            # Skip invalid bars
-            if bar_volume <= 0 or bar_high <= bar_low:
-                continue
-
-            if pd.isna(bar_low) or pd.isna(bar_high) or pd.isna(bar_volume):
-                continue
-
-            # Round to $0.01 boundaries
-            low_level = floor(bar_low / self.PRICE_GRANULARITY) * self.PRICE_GRANULARITY
-            high_level = ceil(bar_high / self.PRICE_GRANULARITY) * self.PRICE_GRANULARITY
-
-            # Count number of $0.01 levels in this bar's range
-            num_levels = int(round((high_level - low_level) / self.PRICE_GRANULARITY)) + 1
-
-            if num_levels <= 0:
-                continue
-
-            # Distribute volume evenly across all levels
-            volume_per_level = bar_volume / num_levels
-
-            # Add volume to each price level
-            current = low_level
-            for _ in range(num_levels):
-                price_key = round(current, 2)
-                volume_profile[price_key] = volume_profile.get(price_key, 0) + volume_per_level
-                current += self.PRICE_GRANULARITY
-
-        return volume_profile
+        return CentVolumeProfile().add_bars(bars).to_dict()
 
     def _calculate_simple_atr(self, bars: pd.DataFrame, period: int = 14) -> float:
         """
@@ -228,19 +458,33 @@ class HVNIdentifier:
                 bars = bars.set_index('timestamp')
 
             # Resample to daily bars
-            daily = bars.resample('D').agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
+            daily = bars.resample('D').agg(_DAILY_AGG)
+        except Exception as e:
+            logger.warning(f"ATR calculation failed: {e}, using default")
+            return self.DEFAULT_ATR
+
+        return self._atr_from_daily(daily, period)
+
+    def _atr_from_daily(self, daily: pd.DataFrame, period: int = 14) -> float:
+        """
+        Calculate ATR from (possibly gappy) daily aggregates.
+
+        Args:
+            daily: Daily OHLCV DataFrame; calendar days with no bars are dropped
+            period: ATR lookback period (default 14 days)
+
+        Returns:
+            ATR value, or default if calculation fails
+        """
+        try:
+            daily = daily.dropna()
 
             if len(daily) < period:
                 logger.warning(f"Not enough daily bars for ATR ({len(daily)} < {period}), using default")
                 return self.DEFAULT_ATR
 
             # Calculate True Range
+            daily = daily.copy()
             daily['prev_close'] = daily['close'].shift(1)
             daily['tr1'] = daily['high'] - daily['low']
             daily['tr2'] = abs(daily['high'] - daily['prev_close'])
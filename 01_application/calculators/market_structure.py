@@ -18,6 +18,8 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from shared.indicators.structure.fractals import fractal_flags
+
 from data import get_polygon_client
 from core import MarketStructure, TimeframeStructure, Direction
 
@@ -240,37 +242,16 @@ class MarketStructureCalculator:
         - Bullish fractal (local low): all bars within p on each side have higher lows
 
         Excel uses: for j in range(1, p+1): df['high'].iloc[i-j] < df['high'].iloc[i]
+        Computed with the shared vectorized kernel, which applies the same
+        strict comparisons.
         """
         p = self.p  # Number of bars on each side (Excel: int(FRACTAL_LENGTH / 2) = 2)
-        n = len(df)
-
-        bullish_fractal = np.zeros(n, dtype=bool)
-        bearish_fractal = np.zeros(n, dtype=bool)
-
-        if n < self.length:
-            df = df.copy()
-            df['bearish_fractal'] = bearish_fractal
-            df['bullish_fractal'] = bullish_fractal
-            return df
-
-        for i in range(p, n - p):
-            # Bearish fractal (local high) - matches Excel exactly
-            # Excel: before_lower = all(df['high'].iloc[i-j] < df['high'].iloc[i] for j in range(1, p+1))
-            #        after_lower = all(df['high'].iloc[i+j] < df['high'].iloc[i] for j in range(1, p+1))
-            before_lower = all(df['high'].iloc[i - j] < df['high'].iloc[i] for j in range(1, p + 1))
-            after_lower = all(df['high'].iloc[i + j] < df['high'].iloc[i] for j in range(1, p + 1))
-
-            if before_lower and after_lower:
-                bearish_fractal[i] = True
-
-            # Bullish fractal (local low) - matches Excel exactly
-            # Excel: before_higher = all(df['low'].iloc[i-j] > df['low'].iloc[i] for j in range(1, p+1))
-            #        after_higher = all(df['low'].iloc[i+j] > df['low'].iloc[i] for j in range(1, p+1))
-            before_higher = all(df['low'].iloc[i - j] > df['low'].iloc[i] for j in range(1, p + 1))
-            after_higher = all(df['low'].iloc[i + j] > df['low'].iloc[i] for j in range(1, p + 1))
-
-            if before_higher and after_higher:
-                bullish_fractal[i] = True
+
+        bearish_fractal, bullish_fractal = fractal_flags(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            p,
+        )
 
         df = df.copy()
         df['bearish_fractal'] = bearish_fractal
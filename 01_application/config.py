@@ -14,6 +14,7 @@ import os
 MODULE_DIR = Path(__file__).parent
 EPOCH_DIR = MODULE_DIR.parent
 DATA_DIR = MODULE_DIR / "data" / "cache"
+CACHE_DIR = DATA_DIR / "frames"   # CacheManager entries only: compaction expires/evicts files here
 
 # Create cache directory if it doesn't exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -77,6 +78,14 @@ MAX_VOLUME_THRESHOLD_PCT = 0.20  # 20% dominance threshold
 # =============================================================================
 INDEX_TICKERS = ["SPY", "QQQ", "DIA"]
 
+# =============================================================================
+# PIPELINE PARALLELISM
+# =============================================================================
+PIPELINE_MAX_WORKERS = 1          # Tickers processed concurrently (1 = sequential)
+PIPELINE_EXECUTOR = "process"     # "process" (CPU stages use all cores) or "thread"
+PIPELINE_FETCH_WORKERS = 1        # Threads per ticker for independent fetch stages (1 = stages in order)
+PIPELINE_TICKER_TIMEOUT = 900     # Seconds before a running ticker is marked failed
+
 # =============================================================================
 # UI CONFIGURATION
 # =============================================================================
@@ -88,6 +97,15 @@ DEFAULT_TICKER_LIST = "sp500"
 # =============================================================================
 CACHE_TTL_INTRADAY = 3600   # 1 hour
 CACHE_TTL_DAILY = 86400     # 24 hours
+CACHE_TTL_HVN_PROFILE = 604800  # 7 days (completed epoch profiles, extended in place)
+CACHE_MAX_TTL = CACHE_TTL_HVN_PROFILE  # Longest TTL any reader uses; older entries are purged
+
+# =============================================================================
+# CACHE SIZE LIMITS
+# =============================================================================
+CACHE_MEMORY_BYTES = 256 * 1024 * 1024     # In-process LRU tier
+CACHE_DISK_BYTES = 2 * 1024 * 1024 * 1024  # On-disk tier (LRU eviction past this)
+CACHE_COMPACTION_INTERVAL = 600            # Seconds between background expiry passes
 
 # =============================================================================
 # LOGGING CONFIGURATION
@@ -90,6 +90,7 @@ def run_nightly(
     end_timestamp: Optional[datetime] = None,
     parallel_options: bool = True,
     options_workers: int = 4,
+    pipeline_workers: Optional[int] = None,
 ) -> Dict:
     """
     Run the full nightly pipeline for all universe tickers.
@@ -107,6 +108,8 @@ def run_nightly(
         end_timestamp: Optional data cutoff (defaults to None = full day)
         parallel_options: Whether to pre-compute options in parallel (default True)
         options_workers: Number of parallel threads for options (default 4)
+        pipeline_workers: Tickers processed concurrently by the pipeline
+            (default PIPELINE_MAX_WORKERS from config)
 
     Returns:
         Dict with success/fail counts and errors
@@ -170,7 +173,7 @@ def run_nightly(
         )
 
     # Phase 2: Run the existing pipeline headless (with pre-computed options)
-    runner = PipelineRunner(progress_callback=_cli_progress)
+    runner = PipelineRunner(progress_callback=_cli_progress, max_workers=pipeline_workers)
     results = runner.run(
         ticker_inputs=ticker_inputs,
         analysis_date=analysis_date,
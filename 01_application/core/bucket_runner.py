@@ -178,6 +178,13 @@ def main():
         default=None,
         help="Override ticker file path",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Tickers processed concurrently in the nightly pipeline "
+             "(defaults to PIPELINE_MAX_WORKERS in config).",
+    )
 
     args = parser.parse_args()
     analysis_date = _get_analysis_date(args.date)
@@ -201,7 +208,7 @@ def main():
 
     elif args.bucket == "nightly":
         from core.bucket_b_nightly import run_nightly
-        result = run_nightly(tickers, analysis_date)
+        result = run_nightly(tickers, analysis_date, pipeline_workers=args.workers)
 
     elif args.bucket == "morning":
         from core.bucket_c_morning import run_morning
@@ -10,18 +10,71 @@ Runs the complete analysis flow:
 5. Filter zones and identify setups
 
 Handles both custom tickers and index tickers (SPY, QQQ, DIA).
+
+Parallel mode (max_workers > 1):
+- Each ticker runs in its own worker process (max_workers at a time), or on
+  a thread pool, so the CPU-heavy stages (structure, HVN profile) use every core
+- With fetch_workers > 1 the independent fetch-bound stages of a ticker
+  (market structure, bar data) run together on a small thread pool
+- Results keep input order; progress is reported from the calling thread
+- Failures are isolated per ticker: exceptions, timeouts and crashed worker
+  processes become failed results instead of stopping the run
+- Worker processes share the Polygon rate limit through the cross-process
+  limiter
 """
 import logging
+import multiprocessing
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import date, datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from multiprocessing.connection import wait as connection_wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from config import INDEX_TICKERS
+from config import (
+    INDEX_TICKERS,
+    PIPELINE_EXECUTOR,
+    PIPELINE_FETCH_WORKERS,
+    PIPELINE_MAX_WORKERS,
+    PIPELINE_TICKER_TIMEOUT,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _run_ticker_job(job: Dict) -> Dict:
+    """
+    Process one ticker in a pool worker (module-level so it pickles).
+
+    Never raises: any failure becomes a failed result dict so one bad
+    ticker cannot take down the rest of the run.
+    """
+    runner = PipelineRunner(fetch_workers=job["fetch_workers"])
+    try:
+        result = runner._process_single_ticker(
+            ticker=job["ticker"],
+            anchor_date=job["anchor_date"],
+            analysis_date=job["analysis_date"],
+            end_timestamp=job["end_timestamp"],
+            precomputed_options=job["precomputed_options"],
+        )
+    except Exception as e:
+        logger.error(f"{job['ticker']}: {e}")
+        return runner._failed_result(job["ticker"], str(e), job["is_index"])
+
+    if job["is_index"]:
+        result["is_index"] = True
+    return result
+
+
+def _ticker_process_main(job: Dict, connection) -> None:
+    """Worker process entry point: run one ticker job and send back its result."""
+    try:
+        connection.send(_run_ticker_job(job))
+    finally:
+        connection.close()
+
+
 class PipelineRunner:
     """
     Orchestrates the full analysis pipeline for PyQt6 application.
@@ -31,16 +84,35 @@ class PipelineRunner:
     - Custom tickers with individual anchor dates
     - Progress updates via callback
     - End timestamp filtering for Pre-Market/Post-Market modes
+    - Optional ticker-level parallelism (see module docstring)
     """
 
-    def __init__(self, progress_callback: Optional[Callable[[int, str], None]] = None):
+    def __init__(
+        self,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        fetch_workers: Optional[int] = None,
+        ticker_timeout: Optional[float] = None,
+    ):
         """
         Initialize the pipeline runner.
 
         Args:
             progress_callback: Function(percent, message) to report progress
+            max_workers: Tickers processed concurrently (1 = sequential)
+            executor: "process" or "thread" pool for ticker jobs
+            fetch_workers: Threads per ticker for independent fetch stages
+            ticker_timeout: Seconds a running ticker may take before it is failed
         """
         self.progress_callback = progress_callback
+        self.max_workers = max_workers or PIPELINE_MAX_WORKERS
+        self.executor = executor or PIPELINE_EXECUTOR
+        self.fetch_workers = fetch_workers or PIPELINE_FETCH_WORKERS
+        self.ticker_timeout = ticker_timeout or PIPELINE_TICKER_TIMEOUT
+
+        if self.executor not in ("process", "thread"):
+            raise ValueError(f"Unknown executor '{self.executor}' (use 'process' or 'thread')")
 
     def _report_progress(self, percent: int, message: str):
         """Report progress via callback."""
@@ -86,6 +158,12 @@ class PipelineRunner:
         # Get default anchor for index tickers
         default_anchor = self._get_prior_month_anchor(analysis_date)
 
+        if self.max_workers > 1:
+            return self._run_parallel(
+                ticker_inputs, default_anchor, analysis_date,
+                end_timestamp, precomputed_options, start_time,
+            )
+
         # 1. Process index tickers first (SPY, QQQ, DIA with prior month anchor)
         self._report_progress(5, "Processing index tickers...")
         print("\n--- Processing Index Tickers (SPY, QQQ, DIA) ---")
@@ -141,11 +219,7 @@ class PipelineRunner:
             except Exception as e:
                 error_msg = f"{ticker}: {str(e)}"
                 logger.error(error_msg)
-                results["custom"].append({
-                    "ticker": ticker,
-                    "success": False,
-                    "error": str(e)
-                })
+                results["custom"].append(self._failed_result(ticker, str(e)))
                 print(f"    [FAIL] {ticker}: {str(e)}")
 
         # Complete
@@ -153,7 +227,7 @@ class PipelineRunner:
         successful = sum(1 for r in results["custom"] if r.get("success"))
         self._report_progress(100, f"Completed in {elapsed:.1f}s")
 
-        print(f"\n--- Pipeline Complete ---")
+        print("\n--- Pipeline Complete ---")
         print(f"Custom tickers: {successful}/{total_custom} successful")
         print(f"Total time: {elapsed:.1f}s")
 
@@ -197,16 +271,296 @@ class PipelineRunner:
             except Exception as e:
                 logger.error(f"Index ticker {ticker} error: {e}")
                 print(f"    [FAIL] {ticker}: {str(e)}")
-                results.append({
-                    "ticker": ticker,
-                    "success": False,
-                    "error": str(e),
-                    "direction": "ERROR",
-                    "is_index": True,
-                })
+                results.append(self._failed_result(ticker, str(e), is_index=True))
 
         return results
 
+    # =========================================================================
+    # PARALLEL EXECUTION
+    # =========================================================================
+
+    @staticmethod
+    def _failed_result(ticker: str, error: str, is_index: bool = False) -> Dict:
+        """Result dict for a ticker that could not be processed."""
+        if is_index:
+            return {
+                "ticker": ticker,
+                "success": False,
+                "error": error,
+                "direction": "ERROR",
+                "is_index": True,
+            }
+        return {
+            "ticker": ticker,
+            "success": False,
+            "error": error
+        }
+
+    def _build_jobs(
+        self,
+        ticker_inputs: List[Dict],
+        default_anchor: date,
+        analysis_date: date,
+        end_timestamp: Optional[datetime],
+        precomputed_options: Optional[Dict[str, list]],
+    ) -> List[Dict]:
+        """Index tickers then valid custom tickers, in input order."""
+        options = precomputed_options or {}
+        entries: List[Tuple[str, date, bool]] = [
+            (ticker, default_anchor, True) for ticker in INDEX_TICKERS
+        ]
+        for ticker_input in ticker_inputs:
+            if not (ticker_input.get("ticker") and ticker_input.get("anchor_date")):
+                continue
+            anchor_date = ticker_input["anchor_date"]
+            if isinstance(anchor_date, str):
+                anchor_date = datetime.strptime(anchor_date, '%Y-%m-%d').date()
+            entries.append((ticker_input["ticker"], anchor_date, False))
+
+        return [
+            {
+                "ticker": ticker,
+                "anchor_date": anchor_date,
+                "analysis_date": analysis_date,
+                "end_timestamp": end_timestamp,
+                "precomputed_options": options.get(ticker),
+                "is_index": is_index,
+                "fetch_workers": self.fetch_workers,
+            }
+            for ticker, anchor_date, is_index in entries
+        ]
+
+    def _run_parallel(
+        self,
+        ticker_inputs: List[Dict],
+        default_anchor: date,
+        analysis_date: date,
+        end_timestamp: Optional[datetime],
+        precomputed_options: Optional[Dict[str, list]],
+        start_time: float,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Run every ticker job on worker processes (or a thread pool).
+
+        Results are slotted back by job position, so ordering matches the
+        sequential run regardless of completion order.
+        """
+        jobs = self._build_jobs(
+            ticker_inputs, default_anchor, analysis_date,
+            end_timestamp, precomputed_options,
+        )
+        total = len(jobs)
+        print(f"\n--- Processing {total} Ticker(s) on {self.max_workers} "
+              f"{self.executor} workers ---")
+        self._report_progress(5, f"Processing {total} tickers ({self.max_workers} workers)...")
+
+        if self.executor == "process":
+            self._share_rate_limiter()
+            slots = self._run_processes(jobs)
+        else:
+            slots = self._run_threads(jobs)
+
+        results = {
+            "index": [r for r, job in zip(slots, jobs) if job["is_index"]],
+            "custom": [r for r, job in zip(slots, jobs) if not job["is_index"]],
+        }
+
+        elapsed = time.time() - start_time
+        successful = sum(1 for r in results["custom"] if r.get("success"))
+        self._report_progress(100, f"Completed in {elapsed:.1f}s")
+
+        print("\n--- Pipeline Complete ---")
+        print(f"Index tickers: {sum(1 for r in results['index'] if r.get('success'))}"
+              f"/{len(results['index'])} successful")
+        print(f"Custom tickers: {successful}/{len(results['custom'])} successful")
+        print(f"Total time: {elapsed:.1f}s")
+
+        return results
+
+    @staticmethod
+    def _share_rate_limiter():
+        """Put the Polygon rate limiter in cross-process mode before workers start."""
+        from shared.data.rate_limiter import share_across_processes
+        share_across_processes()
+
+    def _crashed_result(self, job: Dict, exitcode: Optional[int]) -> Dict:
+        return self._failed_result(
+            job["ticker"], f"worker process crashed (exit code {exitcode})", job["is_index"],
+        )
+
+    def _timed_out_result(self, job: Dict) -> Dict:
+        return self._failed_result(
+            job["ticker"], f"timed out after {self.ticker_timeout:.0f}s", job["is_index"],
+        )
+
+    def _run_processes(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Run each ticker job in its own worker process, max_workers at a time.
+
+        A process that crashes or outlives the timeout only fails its own
+        ticker: it is reported as failed and (on timeout) terminated.
+        """
+        context = multiprocessing.get_context()
+        slots: List[Optional[Dict]] = [None] * len(jobs)
+        queued = list(range(len(jobs)))
+        running: Dict[int, Tuple[Any, Any, float]] = {}
+        done_count = 0
+
+        try:
+            while queued or running:
+                while queued and len(running) < self.max_workers:
+                    i = queued.pop(0)
+                    reader, writer = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=_ticker_process_main, args=(jobs[i], writer),
+                        name=f"pipeline-{jobs[i]['ticker']}",
+                    )
+                    process.start()
+                    writer.close()
+                    running[i] = (process, reader, time.time())
+
+                connection_wait(
+                    [reader for _, reader, _ in running.values()]
+                    + [process.sentinel for process, _, _ in running.values()],
+                    timeout=1.0,
+                )
+                now = time.time()
+
+                for i, (process, reader, started) in list(running.items()):
+                    job = jobs[i]
+                    result = None
+                    # Liveness first: a worker that sent its result and exited
+                    # after this check is still drained by the poll() below
+                    alive = process.is_alive()
+                    if reader.poll():
+                        try:
+                            result = reader.recv()
+                        except (EOFError, OSError):
+                            pass    # pipe closed without a result: the worker died
+                        process.join(timeout=5)
+                        if result is None:
+                            result = self._crashed_result(job, process.exitcode)
+                    elif not alive:
+                        result = self._crashed_result(job, process.exitcode)
+                    elif now - started > self.ticker_timeout:
+                        process.terminate()
+                        process.join(timeout=5)
+                        result = self._timed_out_result(job)
+                    else:
+                        continue
+
+                    reader.close()
+                    del running[i]
+                    slots[i] = result
+                    done_count += 1
+                    self._report_ticker_done(result, done_count, len(jobs))
+        finally:
+            for process, reader, _ in running.values():
+                process.terminate()
+                reader.close()
+
+        return slots
+
+    def _run_threads(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Run ticker jobs on a thread pool.
+
+        A thread cannot be stopped, so a timed-out ticker is failed and the
+        pool is shut down without waiting for it.
+        """
+        slots: List[Optional[Dict]] = [None] * len(jobs)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        timed_out = False
+        try:
+            futures: Dict[Future, int] = {
+                pool.submit(_run_ticker_job, job): i for i, job in enumerate(jobs)
+            }
+            started: Dict[Future, float] = {}
+            pending = set(futures)
+            done_count = 0
+
+            while pending:
+                done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                now = time.time()
+
+                for future in done:
+                    i = futures[future]
+                    job = jobs[i]
+                    try:
+                        slots[i] = future.result()
+                    except Exception as e:
+                        slots[i] = self._failed_result(job["ticker"], str(e), job["is_index"])
+                    done_count += 1
+                    self._report_ticker_done(slots[i], done_count, len(jobs))
+
+                # Per-ticker timeout, measured from when the job started running
+                for future in list(pending):
+                    if future.running():
+                        started.setdefault(future, now)
+                    if future in started and now - started[future] > self.ticker_timeout:
+                        i = futures[future]
+                        future.cancel()
+                        pending.discard(future)
+                        timed_out = True
+                        slots[i] = self._timed_out_result(jobs[i])
+                        done_count += 1
+                        self._report_ticker_done(slots[i], done_count, len(jobs))
+        finally:
+            pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+        return slots
+
+    def _report_ticker_done(self, result: Dict, done_count: int, total: int):
+        """Progress line for one finished ticker (5% to 95%)."""
+        ticker = result.get("ticker", "?")
+        if result.get("success"):
+            print(f"    [OK] {ticker}: {result.get('zones_count', 0)} zones, "
+                  f"{result.get('direction', 'N/A')}")
+        else:
+            print(f"    [FAIL] {ticker}: {result.get('error')}")
+        progress = 5 + int(90 * (done_count / total))
+        self._report_progress(progress, f"Processed {ticker} ({done_count}/{total})")
+
+    def _fetch_structure_and_bar_data(
+        self,
+        ticker: str,
+        analysis_date: date,
+        end_timestamp: Optional[datetime] = None,
+    ) -> Tuple[Any, Any]:
+        """
+        Run Stage 1 (market structure) and Stage 2 (bar data).
+
+        With fetch_workers > 1 both stages run on a thread pool so their
+        Polygon requests overlap.
+        """
+        from calculators.bar_data import calculate_bar_data
+        from calculators.market_structure import calculate_market_structure
+
+        print("    Stage 1/6: Market structure...")
+        print("    Stage 2/6: Bar data...")
+
+        def _structure():
+            return calculate_market_structure(
+                ticker=ticker,
+                analysis_date=analysis_date,
+                end_timestamp=end_timestamp
+            )
+
+        def _bar_data():
+            return calculate_bar_data(
+                ticker=ticker,
+                analysis_date=analysis_date,
+                end_timestamp=end_timestamp
+            )
+
+        if self.fetch_workers <= 1:
+            return _structure(), _bar_data()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            structure_future = pool.submit(_structure)
+            bar_data_future = pool.submit(_bar_data)
+            return structure_future.result(), bar_data_future.result()
+
     def _process_single_ticker(
         self,
         ticker: str,
@@ -228,11 +582,9 @@ class PipelineRunner:
             Result dictionary with all analysis data
         """
         # Import calculators here to avoid circular imports
-        from calculators.bar_data import calculate_bar_data
         from calculators.hvn_identifier import calculate_hvn
         from calculators.zone_calculator import calculate_zones
         from calculators.zone_filter import filter_zones
-        from calculators.market_structure import calculate_market_structure
         from calculators.setup_analyzer import analyze_setups
         from calculators.options_calculator import calculate_options_levels
 
@@ -242,20 +594,9 @@ class PipelineRunner:
             et_display = end_timestamp.astimezone(eastern)
             print(f"    Data cutoff: {et_display.strftime('%Y-%m-%d %H:%M')} ET")
 
-        # Stage 1: Market Structure
-        print(f"    Stage 1/6: Market structure...")
-        market_structure = calculate_market_structure(
-            ticker=ticker,
-            analysis_date=analysis_date,
-            end_timestamp=end_timestamp
-        )
-
-        # Stage 2: Bar Data
-        print(f"    Stage 2/6: Bar data...")
-        bar_data = calculate_bar_data(
-            ticker=ticker,
-            analysis_date=analysis_date,
-            end_timestamp=end_timestamp
+        # Stages 1 and 2 are independent fetch-bound stages
+        market_structure, bar_data = self._fetch_structure_and_bar_data(
+            ticker, analysis_date, end_timestamp,
         )
 
         if not bar_data:
@@ -280,7 +621,7 @@ class PipelineRunner:
             bar_data.m15_weak = market_structure.m15.weak
 
         # Calculate options levels and add to bar_data
-        print(f"    Stage 2b/6: Options levels...")
+        print("    Stage 2b/6: Options levels...")
         if precomputed_options is not None:
             bar_data.options_levels = precomputed_options
             print(f"              Using {len(precomputed_options)} pre-computed options levels")
@@ -315,7 +656,7 @@ class PipelineRunner:
         print(f"             {len(hvn_result.pocs)} POCs from {hvn_result.bars_analyzed} bars")
 
         # Stage 4: Zone Calculation
-        print(f"    Stage 4/6: Zone calculation...")
+        print("    Stage 4/6: Zone calculation...")
         raw_zones = calculate_zones(
             bar_data=bar_data,
             hvn_result=hvn_result,
@@ -324,7 +665,7 @@ class PipelineRunner:
         )
 
         # Stage 5: Zone Filter
-        print(f"    Stage 5/6: Zone filtering...")
+        print("    Stage 5/6: Zone filtering...")
         direction = market_structure.composite
         filtered_zones = filter_zones(
             raw_zones=raw_zones,
@@ -343,7 +684,7 @@ class PipelineRunner:
         )
 
         # Stage 6: Setup Analysis
-        print(f"    Stage 6/6: Setup analysis...")
+        print("    Stage 6/6: Setup analysis...")
         primary_setup, secondary_setup = analyze_setups(
             filtered_zones=filtered_zones,
             hvn_result=hvn_result,
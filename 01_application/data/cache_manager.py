@@ -1,37 +1,105 @@
 """
 File-based caching for API responses.
 Reduces API calls and improves performance.
+
+Two tiers:
+- Memory: LRU bounded by bytes (CACHE_MEMORY_BYTES), checked first
+- Disk: parquet/pickle/json files bounded by CACHE_DISK_BYTES, evicted
+  least-recently-used (last access is recorded in the file's atime, so
+  every process sharing the directory sees the same order)
+
+Writes go to a temp file that is renamed into place, so concurrent pipeline
+workers never read a half-written entry. A background compaction pass
+purges entries older than CACHE_MAX_TTL and re-applies the disk budget.
+
+Entries live in their own directory (CACHE_DIR, not the shared DATA_DIR
+that also holds the ticker list), and expiry, eviction and byte accounting
+only touch files named like entries (*.parquet, *.pkl, *.json and their
+temp files).
 """
+import copy
+import fnmatch
 import json
 import hashlib
 import logging
+import os
 import pickle
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import pandas as pd
 
-from config import DATA_DIR, CACHE_TTL_DAILY, CACHE_TTL_INTRADAY
+from config import (
+    CACHE_DIR, CACHE_TTL_DAILY, CACHE_TTL_INTRADAY,
+    CACHE_MEMORY_BYTES, CACHE_DISK_BYTES, CACHE_MAX_TTL, CACHE_COMPACTION_INTERVAL
+)
 
 logger = logging.getLogger(__name__)
 
+TEMP_SUFFIX = ".tmp"
+STALE_TEMP_SECONDS = 3600   # Temp files older than this were left by a crashed writer
+# <key>.<parquet|pkl|json>, or its in-flight temp file <entry>.<pid>.<hex8>.tmp
+_ENTRY_NAME = re.compile(r"\.(parquet|pkl|json)(\.\d+\.[0-9a-f]{8}" + re.escape(TEMP_SUFFIX) + r")?$")
+
 
 class CacheManager:
     """
-    Manages file-based caching of API responses.
+    Manages two-tier (memory LRU over disk) caching of API responses.
     Supports DataFrame caching (parquet) and object caching (pickle).
     """
 
-    def __init__(self, cache_dir: Path = None):
+    def __init__(
+        self,
+        cache_dir: Path = None,
+        memory_bytes: int = CACHE_MEMORY_BYTES,
+        disk_bytes: int = CACHE_DISK_BYTES,
+        max_ttl_seconds: int = CACHE_MAX_TTL,
+        compaction_interval: Optional[int] = None
+    ):
         """
         Initialize cache manager.
 
         Args:
-            cache_dir: Directory for cache files (uses config default if not provided)
+            cache_dir: Directory for cache files (default: CACHE_DIR)
+            memory_bytes: Memory tier budget (0 disables the memory tier)
+            disk_bytes: Disk tier budget (0 = unbounded)
+            max_ttl_seconds: Entries older than this are purged by compaction
+            compaction_interval: Seconds between background compaction
+                passes (None = no background thread)
         """
-        self.cache_dir = cache_dir or DATA_DIR
+        self.cache_dir = Path(cache_dir or CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.max_ttl_seconds = max_ttl_seconds
+
+        self._lock = threading.RLock()
+        # filename -> (value, size, written_at); most recently used last
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_used = self._scan_disk_bytes()
+
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'bytes_read': 0,
+            'bytes_written': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+            'expired_purged': 0,
+        }
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compaction_interval:
+            self.start_compaction(compaction_interval)
 
     def _generate_cache_key(self, *args, **kwargs) -> str:
         """
@@ -53,23 +121,156 @@ class CacheManager:
         """Get the file path for a cache key."""
         return self.cache_dir / f"{key}.{extension}"
 
-    def _is_valid(self, cache_path: Path, ttl_seconds: int) -> bool:
+    # =========================================================================
+    # MEMORY TIER
+    # =========================================================================
+
+    def _memory_get(self, name: str, ttl_seconds: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(name)
+            if entry is None:
+                return None
+            value, size, written_at = entry
+            if time.time() - written_at >= ttl_seconds:
+                return None
+            self._memory.move_to_end(name)
+            self._stats['memory_hits'] += 1
+            return value
+
+    def _memory_put(self, name: str, value: Any, size: int, written_at: float):
+        with self._lock:
+            self._memory_drop(name)
+            # Entries bigger than a quarter of the budget would flush everything else
+            if size > self.memory_bytes // 4:
+                return
+            self._memory[name] = (value, size, written_at)
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes and self._memory:
+                _, (_, evicted_size, _) = self._memory.popitem(last=False)
+                self._memory_used -= evicted_size
+                self._stats['memory_evictions'] += 1
+
+    def _memory_drop(self, name: str):
+        with self._lock:
+            entry = self._memory.pop(name, None)
+            if entry is not None:
+                self._memory_used -= entry[1]
+
+    # =========================================================================
+    # DISK TIER
+    # =========================================================================
+
+    def _cache_files(self):
+        """Completed cache entries (temp files from in-flight writes excluded)."""
+        for path in self._entry_files():
+            if not path.name.endswith(TEMP_SUFFIX):
+                yield path
+
+    def _entry_files(self):
+        """Cache entries and their temp files; anything else in cache_dir is not ours."""
+        for path in self.cache_dir.iterdir():
+            if _ENTRY_NAME.search(path.name) and path.is_file():
+                yield path
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for path in self._cache_files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _disk_read(self, cache_path: Path, ttl_seconds: int, loader: Callable[[Path], Any]) -> Optional[tuple]:
         """
-        Check if a cache file is still valid (not expired).
+        Load an unexpired entry from disk and record the access for LRU eviction.
 
-        Args:
-            cache_path: Path to cache file
-            ttl_seconds: Time-to-live in seconds
+        Returns:
+            (value, write time) or None if missing/expired
+        """
+        try:
+            stat = cache_path.stat()
+        except OSError:
+            return None
+        if time.time() - stat.st_mtime >= ttl_seconds:
+            return None
+
+        value = loader(cache_path)
+        try:
+            # atime = last use; mtime stays the write time the TTL is measured from
+            os.utime(cache_path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+        with self._lock:
+            self._stats['disk_hits'] += 1
+            self._stats['bytes_read'] += stat.st_size
+        return value, stat.st_mtime
+
+    def _atomic_write(self, cache_path: Path, writer: Callable[[Path], None]) -> int:
+        """Write via a temp file renamed into place; returns bytes written."""
+        tmp_path = cache_path.with_name(
+            f"{cache_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}{TEMP_SUFFIX}"
+        )
+        try:
+            old_size = cache_path.stat().st_size if cache_path.exists() else 0
+            writer(tmp_path)
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, cache_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        with self._lock:
+            self._disk_used += size - old_size
+            self._stats['writes'] += 1
+            self._stats['bytes_written'] += size
+            over_budget = self.disk_bytes and self._disk_used > self.disk_bytes
+        if over_budget:
+            self.evict_disk()
+        return size
+
+    def evict_disk(self, target_bytes: Optional[int] = None) -> int:
+        """
+        Delete least-recently-used files until the disk tier fits its budget.
+
+        Evicts down to 90% of the budget so back-to-back writes do not
+        trigger a directory scan each.
 
         Returns:
-            True if cache is valid, False otherwise
+            Number of files deleted
         """
-        if not cache_path.exists():
-            return False
+        if target_bytes is None:
+            if not self.disk_bytes:
+                return 0
+            target_bytes = int(self.disk_bytes * 0.9)
 
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        age = datetime.now() - mtime
-        return age.total_seconds() < ttl_seconds
+        entries = []
+        for path in self._cache_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._memory_drop(path.name)
+            total -= size
+            deleted += 1
+
+        with self._lock:
+            self._disk_used = total
+            self._stats['disk_evictions'] += deleted
+        if deleted:
+            logger.info(f"Evicted {deleted} least-recently-used cache files")
+        return deleted
 
     # =========================================================================
     # DATAFRAME CACHING (Parquet format)
@@ -92,15 +293,24 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "parquet")
 
-        if self._is_valid(cache_path, ttl_seconds):
-            try:
-                df = pd.read_parquet(cache_path)
-                logger.debug(f"Cache hit: {key}")
-                return df
-            except Exception as e:
-                logger.warning(f"Cache read error for {key}: {e}")
-                return None
+        df = self._memory_get(cache_path.name, ttl_seconds)
+        if df is not None:
+            logger.debug(f"Cache hit (memory): {key}")
+            return df.copy()
+
+        try:
+            entry = self._disk_read(cache_path, ttl_seconds, pd.read_parquet)
+        except Exception as e:
+            logger.warning(f"Cache read error for {key}: {e}")
+            entry = None
+
+        if entry is not None:
+            df, written_at = entry
+            logger.debug(f"Cache hit: {key}")
+            self._memory_put(cache_path.name, df.copy(), int(df.memory_usage(deep=True).sum()), written_at)
+            return df
 
+        self._count_miss()
         logger.debug(f"Cache miss: {key}")
         return None
 
@@ -117,7 +327,8 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "parquet")
         try:
-            df.to_parquet(cache_path)
+            self._atomic_write(cache_path, df.to_parquet)
+            self._memory_put(cache_path.name, df.copy(), int(df.memory_usage(deep=True).sum()), time.time())
             logger.debug(f"Cached DataFrame: {key}")
             return True
         except Exception as e:
@@ -136,6 +347,10 @@ class CacheManager:
         """
         Retrieve a cached Python object.
 
+        The memory tier holds the pickled bytes, so every caller gets its
+        own copy and can mutate it freely (the HVN profile is extended in
+        place, for example).
+
         Args:
             key: Cache key
             ttl_seconds: Time-to-live in seconds
@@ -145,16 +360,28 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "pkl")
 
-        if self._is_valid(cache_path, ttl_seconds):
+        payload = self._memory_get(cache_path.name, ttl_seconds)
+        if payload is None:
             try:
-                with open(cache_path, 'rb') as f:
-                    obj = pickle.load(f)
+                entry = self._disk_read(cache_path, ttl_seconds, Path.read_bytes)
+            except Exception as e:
+                logger.warning(f"Cache read error for {key}: {e}")
+                entry = None
+            if entry is not None:
+                payload, written_at = entry
+                self._memory_put(cache_path.name, payload, len(payload), written_at)
+
+        if payload is not None:
+            try:
+                obj = pickle.loads(payload)
                 logger.debug(f"Cache hit: {key}")
                 return obj
             except Exception as e:
                 logger.warning(f"Cache read error for {key}: {e}")
+                self._memory_drop(cache_path.name)
                 return None
 
+        self._count_miss()
         logger.debug(f"Cache miss: {key}")
         return None
 
@@ -171,8 +398,9 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "pkl")
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(obj, f)
+            payload = pickle.dumps(obj)
+            self._atomic_write(cache_path, lambda path: path.write_bytes(payload))
+            self._memory_put(cache_path.name, payload, len(payload), time.time())
             logger.debug(f"Cached object: {key}")
             return True
         except Exception as e:
@@ -200,16 +428,24 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "json")
 
-        if self._is_valid(cache_path, ttl_seconds):
-            try:
-                with open(cache_path, 'r') as f:
-                    data = json.load(f)
-                logger.debug(f"Cache hit: {key}")
-                return data
-            except Exception as e:
-                logger.warning(f"Cache read error for {key}: {e}")
-                return None
+        data = self._memory_get(cache_path.name, ttl_seconds)
+        if data is not None:
+            logger.debug(f"Cache hit (memory): {key}")
+            return copy.deepcopy(data)
 
+        try:
+            entry = self._disk_read(cache_path, ttl_seconds, lambda path: path.read_text())
+            data = json.loads(entry[0]) if entry is not None else None
+        except Exception as e:
+            logger.warning(f"Cache read error for {key}: {e}")
+            data = None
+
+        if data is not None:
+            logger.debug(f"Cache hit: {key}")
+            self._memory_put(cache_path.name, copy.deepcopy(data), len(entry[0]), entry[1])
+            return data
+
+        self._count_miss()
         logger.debug(f"Cache miss: {key}")
         return None
 
@@ -226,8 +462,10 @@ class CacheManager:
         """
         cache_path = self._get_cache_path(key, "json")
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            text = json.dumps(data, indent=2, default=str)
+            self._atomic_write(cache_path, lambda path: path.write_text(text))
+            # Cache what a disk read would return (default=str applied)
+            self._memory_put(cache_path.name, json.loads(text), len(text), time.time())
             logger.debug(f"Cached JSON: {key}")
             return True
         except Exception as e:
@@ -238,9 +476,13 @@ class CacheManager:
     # CACHE MANAGEMENT
     # =========================================================================
 
+    def _count_miss(self):
+        with self._lock:
+            self._stats['misses'] += 1
+
     def clear(self, pattern: str = "*") -> int:
         """
-        Clear cache files matching a pattern.
+        Clear cache files (and their memory entries) matching a pattern.
 
         Args:
             pattern: Glob pattern for files to clear
@@ -248,13 +490,21 @@ class CacheManager:
         Returns:
             Number of files deleted
         """
+        with self._lock:
+            for name in [n for n in self._memory if fnmatch.fnmatch(n, pattern)]:
+                self._memory_drop(name)
+
         count = 0
         for path in self.cache_dir.glob(pattern):
+            if path.name.endswith(TEMP_SUFFIX) or not _ENTRY_NAME.search(path.name):
+                continue
             try:
                 path.unlink()
                 count += 1
             except Exception as e:
                 logger.warning(f"Could not delete {path}: {e}")
+        with self._lock:
+            self._disk_used = self._scan_disk_bytes()
         logger.info(f"Cleared {count} cache files matching '{pattern}'")
         return count
 
@@ -269,16 +519,62 @@ class CacheManager:
             Number of files deleted
         """
         count = 0
-        for path in self.cache_dir.iterdir():
-            if path.is_file() and not self._is_valid(path, ttl_seconds):
-                try:
+        now = time.time()
+        for path in list(self._entry_files()):
+            try:
+                age = now - path.stat().st_mtime
+                # Temp files only expire once their writer is clearly gone
+                limit = STALE_TEMP_SECONDS if path.name.endswith(TEMP_SUFFIX) else ttl_seconds
+                if age >= limit:
                     path.unlink()
+                    self._memory_drop(path.name)
                     count += 1
-                except Exception:
-                    pass
+            except OSError:
+                pass
+
+        with self._lock:
+            for name in [n for n, (_, _, written_at) in self._memory.items() if now - written_at >= ttl_seconds]:
+                self._memory_drop(name)
+            self._disk_used = self._scan_disk_bytes()
+            self._stats['expired_purged'] += count
         logger.info(f"Cleared {count} expired cache files")
         return count
 
+    def compact(self) -> dict:
+        """
+        Purge entries older than the longest TTL any reader uses, then
+        re-apply the disk budget (other processes may have added files).
+
+        Returns:
+            Dictionary with counts of purged and evicted files
+        """
+        purged = self.clear_expired(self.max_ttl_seconds)
+        evicted = self.evict_disk() if self.disk_bytes and self._scan_disk_bytes() > self.disk_bytes else 0
+        return {'expired_purged': purged, 'evicted': evicted}
+
+    def start_compaction(self, interval_seconds: int):
+        """Run compact() every interval_seconds in a daemon thread."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.warning(f"Cache compaction failed: {e}")
+
+        self._compactor = threading.Thread(target=loop, name="cache-compaction", daemon=True)
+        self._compactor.start()
+
+    def stop_compaction(self):
+        """Stop the background compaction thread."""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5)
+            self._compactor = None
+
     def get_cache_stats(self) -> dict:
         """
         Get cache statistics.
@@ -286,26 +582,40 @@ class CacheManager:
         Returns:
             Dictionary with cache stats
         """
-        files = list(self.cache_dir.iterdir())
-        total_size = sum(f.stat().st_size for f in files if f.is_file())
+        files = []
+        for path in self._cache_files():
+            try:
+                files.append(path.stat())
+            except OSError:
+                pass
+        total_size = sum(f.st_size for f in files)
+
+        with self._lock:
+            stats = dict(self._stats)
+            memory_entries = len(self._memory)
+            memory_used = self._memory_used
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        hits = stats['memory_hits'] + stats['disk_hits']
 
         return {
             'cache_dir': str(self.cache_dir),
             'file_count': len(files),
             'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'oldest_file': min(
-                (f.stat().st_mtime for f in files if f.is_file()),
-                default=None
-            ),
-            'newest_file': max(
-                (f.stat().st_mtime for f in files if f.is_file()),
-                default=None
-            )
+            'oldest_file': min((f.st_mtime for f in files), default=None),
+            'newest_file': max((f.st_mtime for f in files), default=None),
+            'disk_bytes': total_size,
+            'disk_budget_bytes': self.disk_bytes,
+            'memory_entries': memory_entries,
+            'memory_bytes': memory_used,
+            'memory_budget_bytes': self.memory_bytes,
+            'hit_rate': round(hits / lookups, 4) if lookups else None,
+            **stats,
         }
 
 
 # Global cache instance
-cache = CacheManager()
+cache = CacheManager(compaction_interval=CACHE_COMPACTION_INTERVAL)
 
 
 def get_cache_key(*args, **kwargs) -> str:
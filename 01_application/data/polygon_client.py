@@ -9,28 +9,130 @@ Ported and consolidated from:
 """
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
+import requests
 from polygon import RESTClient
 
-from config import POLYGON_API_KEY, VERBOSE
+from config import POLYGON_API_KEY, VERBOSE, CACHE_TTL_DAILY
+from .cache_manager import cache as response_cache, get_cache_key
 
 logger = logging.getLogger(__name__)
 
+_ET = ZoneInfo("America/New_York")
+
+# In-memory contract table built from chain snapshot pages
+OPTIONS_CHAIN_COLUMNS = ['expiration', 'contract_type', 'strike', 'open_interest']
+
+# One row per ticker from a grouped daily response
+GROUPED_DAILY_COLUMNS = ['ticker', 'open', 'high', 'low', 'close', 'volume']
+
+
+def options_chain_table(pages) -> pd.DataFrame:
+    """
+    Chain snapshot pages -> contract table (one row per contract).
+
+    Args:
+        pages: Iterable of /v3/snapshot/options response dicts
+
+    Returns:
+        DataFrame with OPTIONS_CHAIN_COLUMNS; missing open interest is 0
+    """
+    expiration, contract_type, strike, open_interest = [], [], [], []
+    for page in pages:
+        for contract in page.get('results') or []:
+            details = contract.get('details') or {}
+            if details.get('strike_price') is None:
+                continue
+            expiration.append(details.get('expiration_date'))
+            contract_type.append(details.get('contract_type'))
+            strike.append(details['strike_price'])
+            open_interest.append(contract.get('open_interest') or 0)
+
+    return pd.DataFrame({
+        'expiration': pd.Series(expiration, dtype=object),
+        'contract_type': pd.Series(contract_type, dtype=object),
+        'strike': np.asarray(strike, dtype=np.float64),
+        'open_interest': np.asarray(open_interest, dtype=np.int64),
+    })
+
+
+def grouped_daily_table(response: dict) -> pd.DataFrame:
+    """
+    Grouped daily response -> daily bar table (one row per ticker).
+
+    Args:
+        response: /v2/aggs/grouped/locale/us/market/stocks/{date} response dict
+
+    Returns:
+        DataFrame with GROUPED_DAILY_COLUMNS; empty for a day with no trading
+    """
+    results = [r for r in response.get('results') or [] if r.get('T')]
+    return pd.DataFrame({
+        'ticker': pd.Series([r['T'] for r in results], dtype=object),
+        **{
+            name: np.asarray([r.get(key, np.nan) for r in results], dtype=np.float64)
+            for key, name in (('o', 'open'), ('h', 'high'), ('l', 'low'), ('c', 'close'), ('v', 'volume'))
+        },
+    })
+
+
+def top_strikes_by_open_interest(
+    chain: pd.DataFrame,
+    min_strike: float,
+    max_strike: float,
+    num_levels: int = 10
+) -> List[float]:
+    """
+    Strikes in [min_strike, max_strike] ranked by total open interest.
+
+    Calls and puts (and all expirations in the table) are summed per
+    strike; strikes with no open interest are dropped. Ties rank the
+    lower strike first.
+
+    Returns:
+        Up to num_levels strikes, highest open interest first
+    """
+    strikes = chain['strike'].to_numpy(dtype=np.float64)
+    oi = chain['open_interest'].to_numpy(dtype=np.int64)
+    mask = (strikes >= min_strike) & (strikes <= max_strike) & (oi > 0)
+    if not mask.any():
+        return []
+
+    unique_strikes, inverse = np.unique(strikes[mask], return_inverse=True)
+    totals = np.bincount(inverse, weights=oi[mask])
+    order = np.lexsort((unique_strikes, -totals))[:num_levels]
+    return unique_strikes[order].tolist()
+
+
+def get_options_chain_key(ticker: str, exp_date: str, snapshot_day: date) -> str:
+    """Cache key of one expiration's chain table as seen on snapshot_day."""
+    return get_cache_key('options_chain', ticker.upper(), exp_date, snapshot_day.isoformat())
+
 
 class PolygonClient:
     """
     Unified wrapper for Polygon.io API calls.
     Handles rate limiting, retries, and data normalization.
+    Bar requests read through the shared local bar store; every API call
+    takes a token from the shared Polygon rate limiter.
     """
 
     # API Configuration
     BASE_URL = "https://api.polygon.io"
-    RATE_LIMIT_DELAY = 0.25  # 4 calls per second for free tier
     MAX_RETRIES = 3
     RETRY_DELAY = 2.0
+    MAX_WORKERS = 4  # Date chunks fetched concurrently by the chunked minute-bar methods
+    OPTIONS_CHAIN_PAGE_LIMIT = 250  # Contracts per chain snapshot page (Polygon maximum)
+
+    # Raw aggregate keys -> OHLCV column names (store order)
+    _OHLCV = [('t', 'timestamp'), ('o', 'open'), ('h', 'high'),
+              ('l', 'low'), ('c', 'close'), ('v', 'volume')]
 
     def __init__(self, api_key: str = None):
         """
@@ -45,17 +147,116 @@ class PolygonClient:
                 "POLYGON_API_KEY not set. Add to .env file or pass directly."
             )
         self.client = RESTClient(self.api_key)
-        self._last_call_time = 0
+        self._session = requests.Session()
+        self.options_cache = None  # CacheManager for chain tables (shared cache if None)
 
         if VERBOSE:
             logger.info("Polygon client initialized")
 
-    def _rate_limit(self):
-        """Enforce rate limiting between API calls."""
-        elapsed = time.time() - self._last_call_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_call_time = time.time()
+    def _rate_limit(self, endpoint: str = "default"):
+        """
+        Take a token from the shared Polygon rate limiter.
+
+        Shared with every other Polygon client (and, in cross-process mode,
+        other processes), so concurrent bar and options fetches stay within
+        the plan limit together.
+        """
+        from shared.data.rate_limiter import get_rate_limiter
+        get_rate_limiter().acquire(endpoint)
+
+    # =========================================================================
+    # BAR STORE ACCESS
+    # =========================================================================
+
+    def _aggs_upstream(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        from_date: date,
+        to_date: date
+    ) -> List[Dict]:
+        """Bar store upstream: raw adjusted aggregates via the REST client."""
+        self._rate_limit("aggs")
+        return [{
+            't': a.timestamp,
+            'o': a.open,
+            'h': a.high,
+            'l': a.low,
+            'c': a.close,
+            'v': a.volume,
+            'vw': a.vwap,
+            'n': a.transactions
+        } for a in self.client.list_aggs(
+            ticker=ticker,
+            multiplier=multiplier,
+            timespan=timespan,
+            from_=from_date.isoformat(),
+            to=to_date.isoformat(),
+            adjusted=True,
+            limit=50000
+        )]
+
+    def _read_raw(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        start_date: date,
+        end_date: date = None,
+        end_timestamp: datetime = None
+    ) -> pd.DataFrame:
+        """
+        Raw aggregates through the local bar store (network only for unseen dates).
+
+        Args:
+            ticker: Stock symbol
+            multiplier: Bar size multiplier
+            timespan: "minute", "hour", "day", "week", "month"
+            start_date: Start date
+            end_date: End date (defaults to today; ignored if end_timestamp provided)
+            end_timestamp: Optional exclusive cutoff (bars starting at or after it are dropped)
+
+        Returns:
+            DataFrame with raw aggregate columns (t in ms) sorted by t
+        """
+        from shared.data.bar_store import read_bars
+
+        end_ms = None
+        if end_timestamp is not None:
+            end_ms = int(end_timestamp.timestamp() * 1000)
+            end_date = datetime.fromtimestamp(end_ms / 1000, tz=_ET).date()
+        else:
+            end_date = end_date or date.today()
+
+        raw = read_bars(ticker, multiplier, timespan, start_date, end_date, self._aggs_upstream)
+        if end_ms is not None:
+            raw = raw[raw['t'] < end_ms]
+        return raw
+
+    def _read_aggs(
+        self,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        start_date: date,
+        end_date: date = None,
+        end_timestamp: datetime = None
+    ) -> list:
+        """
+        Aggregates through the local bar store as Agg records.
+
+        Args:
+            Same as _read_raw.
+
+        Returns:
+            List of records with timestamp (ms), open, high, low, close, volume
+        """
+        raw = self._read_raw(ticker, multiplier, timespan, start_date, end_date, end_timestamp)
+        raw = raw.rename(columns=dict(self._OHLCV))
+        return list(raw[[name for _, name in self._OHLCV]].itertuples(
+            index=False, name='Agg'
+        ))
 
     # =========================================================================
     # DAILY BAR DATA
@@ -79,19 +280,10 @@ class PolygonClient:
             DataFrame with columns: timestamp, open, high, low, close, volume, date
         """
         end_date = end_date or date.today()
-        self._rate_limit()
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=1,
-                    timespan="day",
-                    from_=start_date.isoformat(),
-                    to=end_date.isoformat(),
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, 1, "day", start_date, end_date)
 
                 if not aggs:
                     logger.warning(f"No daily data for {ticker}")
@@ -120,6 +312,44 @@ class PolygonClient:
 
         return pd.DataFrame()
 
+    def fetch_grouped_daily(self, day: date) -> Optional[pd.DataFrame]:
+        """
+        Daily bars for every US stock on one date, in a single request.
+
+        Completed days (before today, Eastern time) are cached, so a
+        screen of any size needs one request per date. Weekends and
+        holidays return an empty table.
+
+        Args:
+            day: Trading date
+
+        Returns:
+            DataFrame with GROUPED_DAILY_COLUMNS, or None if the request failed
+        """
+        cacheable = day < datetime.now(_ET).date()
+        key = get_cache_key('grouped_daily', day.isoformat())
+        if cacheable:
+            table = response_cache.get_dataframe(key, ttl_seconds=CACHE_TTL_DAILY)
+            if table is not None:
+                return table
+
+        url = f"{self.BASE_URL}/v2/aggs/grouped/locale/us/market/stocks/{day.isoformat()}"
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                self._rate_limit("aggs")
+                table = grouped_daily_table(self._get_json(url, {"adjusted": "true"}))
+                if cacheable:
+                    response_cache.set_dataframe(key, table)
+                return table
+            except Exception as e:
+                logger.warning(f"Grouped daily {day} attempt {attempt + 1} failed: {e}")
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(self.RETRY_DELAY)
+                else:
+                    logger.error(f"Error fetching grouped daily bars for {day}: {e}")
+
+        return None
+
     # =========================================================================
     # MINUTE BAR DATA
     # =========================================================================
@@ -145,28 +375,9 @@ class PolygonClient:
         Returns:
             DataFrame with OHLCV data
         """
-        # Use end_timestamp if provided, otherwise fall back to end_date
-        # Polygon API requires Unix timestamp in milliseconds for precise time cutoffs
-        # Subtract 1ms to make the cutoff exclusive (exclude bars starting at exactly end_timestamp)
-        if end_timestamp is not None:
-            to_param = int(end_timestamp.timestamp() * 1000) - 1  # Unix ms, exclusive
-        else:
-            end_date = end_date or date.today()
-            to_param = end_date.isoformat()
-
-        self._rate_limit()
-
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=multiplier,
-                    timespan="minute",
-                    from_=start_date.isoformat(),
-                    to=to_param,
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, multiplier, "minute", start_date, end_date, end_timestamp)
 
                 if not aggs:
                     logger.warning(f"No {multiplier}m data for {ticker}")
@@ -206,6 +417,12 @@ class PolygonClient:
         Fetch minute bars in chunks to handle large date ranges.
         Polygon has limits on data returned per request.
 
+        Chunks are fetched concurrently (MAX_WORKERS, one shared rate limit)
+        and retried individually; a chunk that still fails is logged and
+        contributes no bars. The chunks are copied into one preallocated
+        column buffer, then sorted by timestamp with the first occurrence of
+        each timestamp (in chunk order) kept.
+
         Args:
             ticker: Stock symbol
             start_date: Start date
@@ -217,44 +434,162 @@ class PolygonClient:
         Returns:
             Combined DataFrame with all bars
         """
+        chunks = list(self._iter_raw_minute_chunks(
+            ticker, start_date, end_date, multiplier, chunk_days, end_timestamp
+        ))
+        total = sum(len(chunk) for chunk in chunks)
+        if total == 0:
+            return pd.DataFrame()
+
+        buffer = {
+            raw: np.empty(total, dtype=np.int64 if raw == 't' else np.float64)
+            for raw, _ in self._OHLCV
+        }
+        offset = 0
+        for chunk in chunks:
+            n = len(chunk)
+            for raw, _ in self._OHLCV:
+                buffer[raw][offset:offset + n] = chunk[raw].to_numpy()
+            offset += n
+
+        # Stable sort keeps the earliest chunk's bar for a repeated timestamp
+        order = np.argsort(buffer['t'], kind='stable')
+        t_sorted = buffer['t'][order]
+        first = np.ones(total, dtype=bool)
+        first[1:] = t_sorted[1:] != t_sorted[:-1]
+        keep = order[first]
+
+        # Filter by end_timestamp if provided (belt and suspenders)
+        # Use < (not <=) to exclude bars starting exactly at end_timestamp
+        if end_timestamp is not None:
+            keep = keep[buffer['t'][keep] < int(end_timestamp.timestamp() * 1000)]
+        if len(keep) == 0:
+            return pd.DataFrame()
+
+        return self._minute_frame({raw: values[keep] for raw, values in buffer.items()})
+
+    def iter_minute_bars_chunked(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date = None,
+        multiplier: int = 1,
+        chunk_days: int = 5,
+        end_timestamp: datetime = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield minute bars one date chunk at a time, oldest chunk first.
+
+        Same chunking as fetch_minute_bars_chunked() but without holding the
+        whole range in memory: at most MAX_WORKERS chunks are fetched ahead
+        of the consumer. Empty chunks are skipped; callers handle
+        de-duplication and the end_timestamp cutoff.
+
+        Args:
+            ticker: Stock symbol
+            start_date: Start date
+            end_date: End date (ignored if end_timestamp provided)
+            multiplier: Bar size in minutes
+            chunk_days: Days per chunk
+            end_timestamp: Optional precise end timestamp (timezone-aware)
+
+        Yields:
+            DataFrame of OHLCV bars for each chunk
+        """
+        for chunk in self._iter_raw_minute_chunks(
+            ticker, start_date, end_date, multiplier, chunk_days, end_timestamp
+        ):
+            yield self._minute_frame({raw: chunk[raw].to_numpy() for raw, _ in self._OHLCV})
+
+    def _minute_chunks(
+        self,
+        start_date: date,
+        end_date: date = None,
+        chunk_days: int = 5,
+        end_timestamp: datetime = None
+    ) -> List[Tuple[date, date, Optional[datetime]]]:
+        """(start, end, end_timestamp) of each chunk; only the last carries the cutoff."""
         # Determine actual end date for chunking
         if end_timestamp is not None:
             actual_end_date = end_timestamp.date()
         else:
             actual_end_date = end_date or date.today()
 
-        all_data = []
-
+        chunks = []
         current_start = start_date
         while current_start <= actual_end_date:
             current_end = min(current_start + timedelta(days=chunk_days), actual_end_date)
 
             # On the last chunk, use end_timestamp if provided
             is_last_chunk = current_end >= actual_end_date
-            chunk_end_timestamp = end_timestamp if (is_last_chunk and end_timestamp) else None
-
-            chunk = self.fetch_minute_bars(
-                ticker, current_start, current_end, multiplier,
-                end_timestamp=chunk_end_timestamp
-            )
-            if not chunk.empty:
-                all_data.append(chunk)
+            chunks.append((current_start, current_end, end_timestamp if is_last_chunk else None))
 
             current_start = current_end + timedelta(days=1)
+        return chunks
 
-        if not all_data:
-            return pd.DataFrame()
-
-        df = pd.concat(all_data, ignore_index=True).drop_duplicates(
-            subset=['timestamp']
-        ).sort_values('timestamp').reset_index(drop=True)
+    def _fetch_raw_minute_chunk(
+        self,
+        ticker: str,
+        multiplier: int,
+        chunk: Tuple[date, date, Optional[datetime]]
+    ) -> pd.DataFrame:
+        """Raw minute aggregates for one chunk, retried on its own; empty on failure."""
+        start, end, chunk_end_timestamp = chunk
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                return self._read_raw(ticker, multiplier, "minute", start, end, chunk_end_timestamp)
+            except Exception as e:
+                logger.warning(f"Minute chunk {start}..{end} attempt {attempt + 1} failed: {e}")
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(self.RETRY_DELAY)
+                else:
+                    logger.error(f"Error fetching {multiplier}m bars for {ticker} {start}..{end}: {e}")
+        return pd.DataFrame(columns=[raw for raw, _ in self._OHLCV])
 
-        # Filter by end_timestamp if provided (belt and suspenders)
-        # Use < (not <=) to exclude bars starting exactly at end_timestamp
-        if end_timestamp is not None and not df.empty:
-            df = df[df['timestamp'] < end_timestamp]
+    def _iter_raw_minute_chunks(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date = None,
+        multiplier: int = 1,
+        chunk_days: int = 5,
+        end_timestamp: datetime = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Raw minute chunks in chunk order, fetched MAX_WORKERS at a time.
 
-        return df
+        Empty chunks are skipped. Closing the iterator early cancels chunks
+        not yet started.
+        """
+        chunks = self._minute_chunks(start_date, end_date, chunk_days, end_timestamp)
+        if not chunks:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as executor:
+            pending = [
+                executor.submit(self._fetch_raw_minute_chunk, ticker, multiplier, chunk)
+                for chunk in chunks[:self.MAX_WORKERS]
+            ]
+            queued = iter(chunks[self.MAX_WORKERS:])
+            try:
+                while pending:
+                    raw = pending.pop(0).result()
+                    next_chunk = next(queued, None)
+                    if next_chunk is not None:
+                        pending.append(executor.submit(
+                            self._fetch_raw_minute_chunk, ticker, multiplier, next_chunk
+                        ))
+                    if len(raw):
+                        yield raw
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _minute_frame(self, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Raw aggregate columns -> OHLCV DataFrame with UTC timestamps."""
+        df = pd.DataFrame({name: columns[raw] for raw, name in self._OHLCV})
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+        return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
 
     # =========================================================================
     # HOURLY BAR DATA
@@ -282,28 +617,9 @@ class PolygonClient:
         Returns:
             DataFrame with OHLCV data
         """
-        # Use end_timestamp if provided, otherwise fall back to end_date
-        # Polygon API requires Unix timestamp in milliseconds for precise time cutoffs
-        # Subtract 1ms to make the cutoff exclusive (exclude bars starting at exactly end_timestamp)
-        if end_timestamp is not None:
-            to_param = int(end_timestamp.timestamp() * 1000) - 1  # Unix ms, exclusive
-        else:
-            end_date = end_date or date.today()
-            to_param = end_date.isoformat()
-
-        self._rate_limit()
-
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=4,
-                    timespan="hour",
-                    from_=start_date.isoformat(),
-                    to=to_param,
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, 4, "hour", start_date, end_date, end_timestamp)
 
                 if not aggs:
                     logger.warning(f"No 4H data for {ticker}")
@@ -349,28 +665,9 @@ class PolygonClient:
         Returns:
             DataFrame with OHLCV data
         """
-        # Use end_timestamp if provided, otherwise fall back to end_date
-        # Polygon API requires Unix timestamp in milliseconds for precise time cutoffs
-        # Subtract 1ms to make the cutoff exclusive (exclude bars starting at exactly end_timestamp)
-        if end_timestamp is not None:
-            to_param = int(end_timestamp.timestamp() * 1000) - 1  # Unix ms, exclusive
-        else:
-            end_date = end_date or date.today()
-            to_param = end_date.isoformat()
-
-        self._rate_limit()
-
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=1,
-                    timespan="hour",
-                    from_=start_date.isoformat(),
-                    to=to_param,
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, 1, "hour", start_date, end_date, end_timestamp)
 
                 if not aggs:
                     logger.warning(f"No hourly data for {ticker}")
@@ -422,89 +719,110 @@ class PolygonClient:
         Returns:
             Dictionary with opt_01 through opt_10 keys
         """
-        reference_date = reference_date or date.today()
-
-        try:
-            # Get next 4 expiration dates (Fridays)
-            expiration_dates = self._get_nearest_expirations(reference_date, count=4)
+        levels = self.get_options_levels(
+            ticker, current_price, reference_date, num_levels, price_range_pct
+        )
+        results = {f'op_{i:02d}': float(strike) for i, strike in enumerate(levels, 1)}
 
-            # Aggregate open interest by strike across expirations
-            all_strikes_data: Dict[float, int] = {}
+        # Fill remaining slots with None
+        for i in range(len(levels) + 1, num_levels + 1):
+            results[f'op_{i:02d}'] = None
+        return results
 
-            for exp_date in expiration_dates:
-                strikes_for_exp = self._fetch_options_for_expiration(
-                    ticker, exp_date, current_price, price_range_pct
-                )
-                for strike, oi in strikes_for_exp.items():
-                    all_strikes_data[strike] = all_strikes_data.get(strike, 0) + oi
+    def get_options_levels(
+        self,
+        ticker: str,
+        current_price: float,
+        reference_date: date = None,
+        num_levels: int = 10,
+        price_range_pct: float = 0.15
+    ) -> List[float]:
+        """
+        Top strikes by open interest summed over the next 4 expirations.
 
-            # Sort by total open interest and take top N
-            sorted_strikes = sorted(
-                all_strikes_data.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:num_levels]
+        One chain snapshot per expiration (cached per ticker/expiration/day)
+        replaces the per-contract snapshot calls.
 
-            # Format results
-            results = {}
-            for i, (strike, oi) in enumerate(sorted_strikes, 1):
-                results[f'op_{i:02d}'] = float(strike)
+        Args:
+            Same as fetch_options_levels.
 
-            # Fill remaining slots with None
-            for i in range(len(sorted_strikes) + 1, num_levels + 1):
-                results[f'op_{i:02d}'] = None
+        Returns:
+            Strike prices, highest total open interest first
+        """
+        reference_date = reference_date or date.today()
 
-            logger.info(f"Found {len(sorted_strikes)} options levels for {ticker}")
-            return results
+        try:
+            # Get next 4 expiration dates (Fridays)
+            expiration_dates = self._get_nearest_expirations(reference_date, count=4)
+            chains = [self.fetch_options_chain(ticker, exp_date) for exp_date in expiration_dates]
+            levels = top_strikes_by_open_interest(
+                pd.concat(chains, ignore_index=True),
+                current_price * (1 - price_range_pct),
+                current_price * (1 + price_range_pct),
+                num_levels
+            )
+            logger.info(f"Found {len(levels)} options levels for {ticker}")
+            return levels
 
         except Exception as e:
             logger.error(f"Error fetching options levels for {ticker}: {e}")
-            return {f'op_{i:02d}': None for i in range(1, num_levels + 1)}
+            return []
 
-    def _fetch_options_for_expiration(
-        self,
-        ticker: str,
-        exp_date: str,
-        current_price: float,
-        price_range_pct: float
-    ) -> Dict[float, int]:
-        """Fetch options data for a specific expiration date."""
-        strikes_data = {}
-        self._rate_limit()
+    def fetch_options_chain(self, ticker: str, exp_date: str) -> pd.DataFrame:
+        """
+        Contract table for one expiration from the chain snapshot.
 
-        try:
-            min_strike = current_price * (1 - price_range_pct)
-            max_strike = current_price * (1 + price_range_pct)
-
-            contracts = list(self.client.list_options_contracts(
-                underlying_ticker=ticker.upper(),
-                expiration_date=exp_date,
-                strike_price_gte=min_strike,
-                strike_price_lte=max_strike,
-                limit=500
-            ))
-
-            for contract in contracts:
-                try:
-                    self._rate_limit()
-                    snapshot = self.client.get_snapshot_option(
-                        ticker.upper(),
-                        contract.ticker
-                    )
-
-                    if snapshot and hasattr(snapshot, 'open_interest'):
-                        oi = snapshot.open_interest
-                        if oi and oi > 0:
-                            strike = float(contract.strike_price)
-                            strikes_data[strike] = strikes_data.get(strike, 0) + int(oi)
-
-                except Exception:
-                    continue
+        Pages of up to OPTIONS_CHAIN_PAGE_LIMIT contracts are followed via
+        next_url, one rate-limited request each. The table is cached per
+        ticker / expiration / snapshot day, so repeat runs the same day
+        make no requests. A chain that cannot be fetched is logged and
+        returned empty (not cached).
 
-        except Exception as e:
-            logger.warning(f"Error fetching options for {exp_date}: {e}")
+        Args:
+            ticker: Underlying symbol
+            exp_date: Expiration date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame with OPTIONS_CHAIN_COLUMNS
+        """
+        ticker = ticker.upper()
+        cache = self.options_cache if self.options_cache is not None else response_cache
+        key = get_options_chain_key(ticker, exp_date, datetime.now(_ET).date())
+
+        chain = cache.get_dataframe(key, ttl_seconds=CACHE_TTL_DAILY)
+        if chain is not None:
+            return chain
 
-        return strikes_data
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                chain = options_chain_table(self._options_chain_pages(ticker, exp_date))
+                cache.set_dataframe(key, chain)
+                return chain
+            except Exception as e:
+                logger.warning(f"Options chain {ticker} {exp_date} attempt {attempt + 1} failed: {e}")
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(self.RETRY_DELAY)
+                else:
+                    logger.error(f"Error fetching options chain for {ticker} {exp_date}: {e}")
+
+        return options_chain_table([])
+
+    def _options_chain_pages(self, ticker: str, exp_date: str) -> Iterator[dict]:
+        """Raw chain snapshot pages for one expiration, following next_url."""
+        url = f"{self.BASE_URL}/v3/snapshot/options/{ticker}"
+        params = {"expiration_date": exp_date, "limit": self.OPTIONS_CHAIN_PAGE_LIMIT}
+        while url:
+            self._rate_limit("options_snapshot")
+            page = self._get_json(url, params)
+            yield page
+            url = page.get("next_url")
+            params = {}
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        """GET a Polygon REST URL and return the decoded JSON body."""
+        response = self._session.get(url, params={**params, "apiKey": self.api_key}, timeout=30)
+        response.raise_for_status()
+        return response.json()
 
     def _get_nearest_expirations(self, reference_date: date, count: int = 4) -> List[str]:
         """Get the nearest option expiration dates (Fridays)."""
@@ -529,7 +847,7 @@ class PolygonClient:
 
     def get_previous_close(self, ticker: str) -> Optional[float]:
         """Get previous day's close price."""
-        self._rate_limit()
+        self._rate_limit("aggs")
 
         try:
             prev = self.client.get_previous_close_agg(ticker.upper())
@@ -640,19 +958,10 @@ class PolygonClient:
             DataFrame with OHLCV data
         """
         end_date = end_date or date.today()
-        self._rate_limit()
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=1,
-                    timespan="week",
-                    from_=start_date.isoformat(),
-                    to=end_date.isoformat(),
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, 1, "week", start_date, end_date)
 
                 if not aggs:
                     logger.warning(f"No weekly data for {ticker}")
@@ -699,19 +1008,10 @@ class PolygonClient:
             DataFrame with OHLCV data
         """
         end_date = end_date or date.today()
-        self._rate_limit()
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                aggs = list(self.client.list_aggs(
-                    ticker=ticker.upper(),
-                    multiplier=1,
-                    timespan="month",
-                    from_=start_date.isoformat(),
-                    to=end_date.isoformat(),
-                    adjusted=True,
-                    limit=50000
-                ))
+                aggs = self._read_aggs(ticker, 1, "month", start_date, end_date)
 
                 if not aggs:
                     logger.warning(f"No monthly data for {ticker}")
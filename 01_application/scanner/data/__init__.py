@@ -8,10 +8,12 @@ Data fetching and management for market scanner.
 from .ticker_manager import TickerManager, TickerList
 from .overnight_fetcher import OvernightDataFetcher
 from .short_interest_fetcher import ShortInterestFetcher
+from .universe_table import UniverseTable
 
 __all__ = [
     'TickerManager',
     'TickerList',
     'OvernightDataFetcher',
-    'ShortInterestFetcher'
+    'ShortInterestFetcher',
+    'UniverseTable'
 ]
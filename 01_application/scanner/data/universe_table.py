@@ -0,0 +1,152 @@
+"""
+Universe Daily Table
+Epoch Trading System v2.0 - XIII Trading LLC
+
+Daily bars for every US stock, one grouped daily request per date.
+Completed dates (before today, Eastern time) are written to one parquet
+file each under the scanner cache directory and reused by later scans, so
+a repeat scan of the same history makes no requests at all.
+
+The bars are split-adjusted, and a split rewrites every earlier date, so
+a file is only trusted for max_age_seconds (one day by default) before the
+date is fetched again. An expired file is still used if the refetch fails.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import CACHE_TTL_DAILY
+from scanner.config import scanner_config
+
+logger = logging.getLogger(__name__)
+
+_ET = ZoneInfo("America/New_York")
+
+UNIVERSE_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class UniverseTable:
+    """Grouped daily bars per date, kept in memory and on disk between scans."""
+
+    def __init__(self, polygon_client, cache_dir: Path = None, max_age_seconds: int = CACHE_TTL_DAILY):
+        """
+        Initialize with a PolygonClient instance.
+
+        Args:
+            polygon_client: PolygonClient from data/polygon_client.py
+            cache_dir: Directory for per-date parquet files
+                       (default: scanner cache dir / grouped_daily)
+            max_age_seconds: Refetch a date whose bars were fetched longer ago
+                             than this, so later split adjustments are picked up
+        """
+        self.client = polygon_client
+        self.cache_dir = Path(cache_dir or scanner_config.DATA_CACHE_DIR / "grouped_daily")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self._days: Dict[date, Tuple[pd.DataFrame, float]] = {}   # day -> (table, fetch time)
+        self._lock = threading.Lock()
+
+    def _path(self, day: date) -> Path:
+        return self.cache_dir / f"{day.isoformat()}.parquet"
+
+    def day(self, day: date) -> Optional[pd.DataFrame]:
+        """
+        Daily bars of every ticker on one date.
+
+        Returns:
+            DataFrame with polygon_client.GROUPED_DAILY_COLUMNS (empty for weekends and
+            holidays), or None if the date could not be fetched
+        """
+        with self._lock:
+            cached = self._days.get(day)
+        if cached is not None and self._fresh(cached[1]):
+            return cached[0]
+
+        completed = day < datetime.now(_ET).date()
+        path = self._path(day)
+        table = stale = None
+        if completed and path.exists():
+            try:
+                fetched_at = path.stat().st_mtime
+                if self._fresh(fetched_at):
+                    table = pd.read_parquet(path)
+                else:
+                    stale = path
+            except Exception as e:
+                logger.warning(f"Unreadable universe file {path.name}: {e}")
+
+        if table is None:
+            table = self.client.fetch_grouped_daily(day)
+            fetched_at = time.time()
+            if table is None:
+                if stale is None:
+                    return None
+                logger.warning(f"Using expired universe file {stale.name}: refetch failed")
+                try:
+                    return pd.read_parquet(stale)
+                except Exception as e:
+                    logger.warning(f"Unreadable universe file {stale.name}: {e}")
+                    return None
+            if completed:
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                try:
+                    table.to_parquet(tmp)
+                    os.replace(tmp, path)
+                except Exception as e:
+                    logger.warning(f"Could not write universe file {path.name}: {e}")
+
+        if completed:
+            with self._lock:
+                self._days[day] = (table, fetched_at)
+        return table
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.max_age_seconds
+
+    def daily_bars(
+        self,
+        start_date: date,
+        end_date: date,
+        tickers: List[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Long daily bar table for a date range.
+
+        Args:
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            tickers: Keep only these tickers (default: all)
+
+        Returns:
+            DataFrame with UNIVERSE_COLUMNS sorted by ticker then date, or
+            None if any weekday in the range could not be fetched
+        """
+        frames = []
+        wanted = set(tickers) if tickers is not None else None
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5:
+                table = self.day(day)
+                if table is None:
+                    logger.warning(f"Grouped daily bars unavailable for {day}")
+                    return None
+                if wanted is not None:
+                    table = table[table['ticker'].isin(wanted)]
+                if not table.empty:
+                    frames.append(table.assign(date=day))
+            day += timedelta(days=1)
+
+        if not frames:
+            return pd.DataFrame(columns=UNIVERSE_COLUMNS)
+        daily = pd.concat(frames, ignore_index=True)[UNIVERSE_COLUMNS]
+        return daily.sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
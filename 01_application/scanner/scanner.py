@@ -20,6 +20,7 @@ from scanner.filters import FilterPhase, RankingWeights
 from scanner.data.ticker_manager import TickerManager, TickerList
 from scanner.data.overnight_fetcher import OvernightDataFetcher
 from scanner.data.short_interest_fetcher import ShortInterestFetcher
+from scanner.data.universe_table import UniverseTable
 from data.polygon_client import PolygonClient
 
 logger = logging.getLogger(__name__)
@@ -31,8 +32,16 @@ class TwoPhaseScanner:
 
     Phase 1: Hard filters (ATR, price, gap)
     Phase 2: Ranking by overnight volume and composite score
+
+    The ATR filter runs on grouped daily bars for the whole ticker list at
+    once; only its survivors are fetched per ticker for the overnight
+    price and volumes (price and gap filters) and short interest. Without
+    grouped daily bars every ticker is fetched individually.
     """
 
+    ATR_PERIOD = 14
+    HISTORY_DAYS = 20
+
     def __init__(self,
                  ticker_list: TickerList = None,
                  filter_phase: FilterPhase = None,
@@ -57,6 +66,7 @@ class TwoPhaseScanner:
         self.polygon_client = PolygonClient()
         self.overnight_fetcher = OvernightDataFetcher(self.polygon_client)
         self.short_fetcher = ShortInterestFetcher(scanner_config.POLYGON_API_KEY)
+        self.universe_table = UniverseTable(self.polygon_client)
 
         # Load tickers
         self.tickers = self.ticker_manager.get_tickers(self.ticker_list)
@@ -94,15 +104,21 @@ class TwoPhaseScanner:
 
         logger.info(f"Starting two-phase scan for {scan_date.strftime('%Y-%m-%d')} at 12:00 UTC")
 
-        # Load short interest data for ONLY the tickers we're scanning
-        logger.info(f"Loading short interest data for {len(self.tickers)} tickers as of {scan_date.date()}")
-        self.short_fetcher.load_short_data_for_tickers(self.tickers, scan_date)
+        # Phase 1a: ATR filter over the whole list from grouped daily bars
+        daily_history = self._daily_history(scan_date)
+        candidates = self.tickers if daily_history is None else list(daily_history.index)
+        if daily_history is not None:
+            logger.info(f"Daily filter: {len(candidates)}/{len(self.tickers)} tickers passed ATR filter")
+
+        # Load short interest data for ONLY the tickers that can still pass
+        logger.info(f"Loading short interest data for {len(candidates)} tickers as of {scan_date.date()}")
+        self.short_fetcher.load_short_data_for_tickers(candidates, scan_date)
 
         if self._cancelled:
             return pd.DataFrame()
 
-        # Phase 1: Fetch data and apply filters
-        filtered_data = self._phase1_filter(scan_date, progress_callback)
+        # Phase 1b: Fetch overnight data and apply price and gap filters
+        filtered_data = self._phase1_filter(scan_date, progress_callback, daily_history)
 
         if filtered_data.empty:
             logger.warning("No tickers passed Phase 1 filters")
@@ -124,19 +140,84 @@ class TwoPhaseScanner:
 
         return ranked_data
 
+    def _daily_history(self, scan_date: datetime) -> Optional[pd.DataFrame]:
+        """
+        Prior close and ATR of every ticker from grouped daily bars.
+
+        The ATR filter is applied as column expressions over the whole
+        list, with the same ATR as _calculate_atr.
+
+        Returns:
+            DataFrame indexed by ticker (prior_close, atr) for tickers passing
+            the ATR filter, or None if grouped daily bars are unavailable
+        """
+        history_end = scan_date.date() - timedelta(days=1)
+        history_start = history_end - timedelta(days=self.HISTORY_DAYS)
+
+        try:
+            daily = self.universe_table.daily_bars(history_start, history_end, self.tickers)
+        except Exception as e:
+            logger.warning(f"Grouped daily bars failed, fetching per ticker: {e}")
+            return None
+        if daily is None:
+            return None
+
+        # True range per ticker (the first bar of each ticker has no prior close)
+        tickers = daily['ticker']
+        prev_close = daily.groupby('ticker', sort=False)['close'].shift(1)
+        true_range = pd.concat([
+            daily['high'] - daily['low'],
+            (daily['high'] - prev_close).abs(),
+            (daily['low'] - prev_close).abs(),
+        ], axis=1).max(axis=1)
+        atr = (
+            true_range.groupby(tickers, sort=False)
+            .ewm(span=self.ATR_PERIOD, adjust=False).mean()
+            .reset_index(level=0, drop=True)
+            .reindex(daily.index)
+        )
+
+        last = ~tickers.duplicated(keep='last')
+        history = pd.DataFrame({
+            'prior_close': daily['close'][last].to_numpy(),
+            'atr': atr[last].to_numpy(),
+            'bars': tickers.value_counts()[tickers[last]].to_numpy(),
+        }, index=tickers[last].to_numpy())
+
+        passed = (history['bars'] >= 2) & (history['atr'] >= self.filter_phase.min_atr)
+        return history.loc[passed, ['prior_close', 'atr']]
+
     def _phase1_filter(self,
                        scan_date: datetime,
-                       progress_callback: Callable = None) -> pd.DataFrame:
-        """Phase 1: Apply hard filters."""
+                       progress_callback: Callable = None,
+                       daily_history: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Phase 1: Apply hard filters.
+
+        With daily_history (from _daily_history) only its tickers are
+        processed, and tickers it already filtered out count as completed.
+        """
         passed_tickers = []
+        total = len(self.tickers)
+
+        if daily_history is None:
+            candidates = {ticker: None for ticker in self.tickers}
+        else:
+            candidates = {
+                row.Index: (row.prior_close, row.atr)
+                for row in daily_history.itertuples()
+            }
+
+        completed = total - len(candidates)
+        if completed and progress_callback:
+            progress_callback(completed, total, "daily bars")
 
         with ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
             futures = {
-                executor.submit(self._process_ticker, ticker, scan_date): ticker
-                for ticker in self.tickers
+                executor.submit(self._process_ticker, ticker, scan_date, history): ticker
+                for ticker, history in candidates.items()
             }
 
-            completed = 0
             for future in as_completed(futures):
                 if self._cancelled:
                     executor.shutdown(wait=False)
@@ -146,7 +227,7 @@ class TwoPhaseScanner:
                 completed += 1
 
                 if progress_callback:
-                    progress_callback(completed, len(self.tickers), ticker)
+                    progress_callback(completed, total, ticker)
 
                 try:
                     ticker_data = future.result()
@@ -156,34 +237,46 @@ class TwoPhaseScanner:
                     logger.error(f"Error processing {ticker}: {e}")
 
                 if completed % 50 == 0:
-                    logger.info(f"Processed {completed}/{len(self.tickers)} tickers...")
+                    logger.info(f"Processed {completed}/{total} tickers...")
 
         return pd.DataFrame(passed_tickers)
 
-    def _process_ticker(self, ticker: str, scan_date: datetime) -> Optional[Dict]:
-        """Process a single ticker through Phase 1 filters."""
-        try:
-            # Get prior day's daily data for ATR and closing price
-            history_end = scan_date.date() - timedelta(days=1)
-            history_start = history_end - timedelta(days=20)
-
-            historical_df = self.polygon_client.fetch_daily_bars(
-                ticker,
-                history_start,
-                history_end
-            )
-
-            if historical_df.empty or len(historical_df) < 2:
-                return None
-
-            # Calculate ATR
-            atr = self._calculate_atr(historical_df)
-
-            # Apply ATR filter early
-            if atr < self.filter_phase.min_atr:
-                return None
+    def _process_ticker(self, ticker: str, scan_date: datetime,
+                        daily_history: tuple = None) -> Optional[Dict]:
+        """
+        Process a single ticker through Phase 1 filters.
 
-            prior_close = historical_df['close'].iloc[-1]
+        Args:
+            ticker: Stock symbol
+            scan_date: Scan date (12:00 UTC)
+            daily_history: (prior_close, atr) already past the ATR filter,
+                           or None to fetch the daily bars here
+        """
+        try:
+            if daily_history is not None:
+                prior_close, atr = daily_history
+            else:
+                # Get prior day's daily data for ATR and closing price
+                history_end = scan_date.date() - timedelta(days=1)
+                history_start = history_end - timedelta(days=self.HISTORY_DAYS)
+
+                historical_df = self.polygon_client.fetch_daily_bars(
+                    ticker,
+                    history_start,
+                    history_end
+                )
+
+                if historical_df.empty or len(historical_df) < 2:
+                    return None
+
+                # Calculate ATR
+                atr = self._calculate_atr(historical_df, self.ATR_PERIOD)
+
+                # Apply ATR filter early
+                if atr < self.filter_phase.min_atr:
+                    return None
+
+                prior_close = historical_df['close'].iloc[-1]
 
             # Get overnight volumes and current price
             overnight_data = self.overnight_fetcher.fetch_overnight_volumes(ticker, scan_date)
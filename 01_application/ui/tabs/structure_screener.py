@@ -38,7 +38,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from ui.tabs.base_tab import BaseTab
 from ui.styles import COLORS
 from scanner import TickerManager, TickerList
-from shared.calculations.pdv import calculate_pdv, Alignment
+from shared.calculations.pdv import PDVBatch, Alignment
 
 logger = logging.getLogger(__name__)
 
@@ -342,6 +342,9 @@ class StructureScreenerWorker(QThread):
             results: List[dict] = []
             total = len(tickers)
 
+            # PDV daily bars for the whole universe (one grouped request per date)
+            pdv_batch = PDVBatch(tickers, end_date, polygon_client=polygon).prepare()
+
             def _process_one(ticker: str) -> Optional[dict]:
                 if self._cancelled:
                     return None
@@ -421,7 +424,7 @@ class StructureScreenerWorker(QThread):
 
                     # PDV alignment
                     try:
-                        pdv = calculate_pdv(ticker, end_date, polygon_client=polygon)
+                        pdv = pdv_batch.calculate(ticker)
                         row["pdv_alignment"] = pdv.alignment.value if pdv.alignment else "—"
                     except Exception as pdv_exc:
                         logger.debug(f"PDV skip {ticker}: {pdv_exc}")
@@ -1,3 +1,5 @@
 """Analyzer modules for batch processing."""
 from .claude_client import ClaudeBatchClient
 from .response_parser import ResponseParser
+from .rate_limiter import TokenBucketLimiter
+from .concurrent_analyzer import BatchCheckpoint, ConcurrentBatchAnalyzer
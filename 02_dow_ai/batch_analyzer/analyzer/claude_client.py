@@ -1,8 +1,13 @@
 """
 Claude Batch Client
 Handles Claude API calls with rate limiting for batch processing.
+
+Sequential callers use the built-in per-minute spacing. Concurrent callers
+share a TokenBucketLimiter instead, which budgets requests and tokens
+across threads and backs off adaptively on 429s.
 """
 
+import threading
 import time
 import anthropic
 from typing import Optional, Tuple
@@ -17,6 +22,7 @@ from config import (
     CLAUDE_MODEL,
     REQUESTS_PER_MINUTE,
     MAX_RETRIES,
+    MAX_RATE_LIMIT_RETRIES,
     RETRY_DELAY_SECONDS,
     MAX_OUTPUT_TOKENS
 )
@@ -35,7 +41,10 @@ class ClaudeBatchClient:
         self,
         api_key: Optional[str] = None,
         model: str = CLAUDE_MODEL,
-        requests_per_minute: int = REQUESTS_PER_MINUTE
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
+        limiter=None,
+        base_url: Optional[str] = None
     ):
         """
         Initialize Claude client.
@@ -43,18 +52,29 @@ class ClaudeBatchClient:
         Args:
             api_key: Anthropic API key (defaults to config)
             model: Claude model to use
-            requests_per_minute: Rate limit
+            requests_per_minute: Rate limit (sequential spacing, ignored with limiter)
+            max_tokens: Output token cap per request
+            limiter: Shared TokenBucketLimiter for concurrent use (thread-safe path)
+            base_url: API base URL override (e.g. a FakeMessagesServer)
         """
         self.api_key = api_key or ANTHROPIC_API_KEY
         self.model = model
         self.requests_per_minute = requests_per_minute
+        self.max_tokens = max_tokens
+        self.limiter = limiter
 
-        # Initialize client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Initialize client (with a limiter, retries and backoff are ours)
+        client_kwargs = {'api_key': self.api_key}
+        if base_url:
+            client_kwargs['base_url'] = base_url
+        if limiter is not None:
+            client_kwargs['max_retries'] = 0
+        self.client = anthropic.Anthropic(**client_kwargs)
 
         # Rate limiting
         self._request_times = []
         self._min_interval = 60.0 / requests_per_minute
+        self._stats_lock = threading.Lock()
 
         # Helpers
         self.prompt_builder = BatchPromptBuilder()
@@ -76,9 +96,6 @@ class ClaudeBatchClient:
         Returns:
             AIPrediction object
         """
-        # Rate limiting
-        self._wait_for_rate_limit()
-
         # Build prompt
         prompt = self.prompt_builder.build_prompt(trade)
 
@@ -86,30 +103,56 @@ class ClaudeBatchClient:
         start_time = time.time()
 
         # Make API call with retries
-        response_text = None
-        tokens_input = 0
-        tokens_output = 0
+        sent = self.send(prompt)
+        response_text, tokens_input, tokens_output = sent if sent else (None, 0, 0)
+
+        # Calculate processing time
+        processing_time_ms = int((time.time() - start_time) * 1000)
+
+        # Parse response
+        if response_text:
+            prediction = self.response_parser.parse_response(
+                response_text=response_text,
+                trade=trade,
+                model_used=self.model,
+                tokens_input=tokens_input,
+                tokens_output=tokens_output,
+                processing_time_ms=processing_time_ms
+            )
+        else:
+            prediction = self.response_parser.create_rule_based_prediction(trade)
+
+        return prediction
+
+    def send(self, prompt: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Send one prompt with rate limiting and retries.
+
+        Thread-safe when the client was built with a limiter.
+
+        Args:
+            prompt: User message text
+
+        Returns:
+            (response_text, tokens_input, tokens_output), or None when
+            retries are exhausted
+        """
+        if self.limiter is not None:
+            return self._send_limited(prompt)
+
+        # Rate limiting
+        self._wait_for_rate_limit()
 
         for attempt in range(MAX_RETRIES):
             try:
                 response = self.client.messages.create(
                     model=self.model,
-                    max_tokens=MAX_OUTPUT_TOKENS,
+                    max_tokens=self.max_tokens,
                     messages=[
                         {"role": "user", "content": prompt}
                     ]
                 )
-
-                response_text = response.content[0].text
-                tokens_input = response.usage.input_tokens
-                tokens_output = response.usage.output_tokens
-
-                # Update stats
-                self.total_requests += 1
-                self.total_tokens_input += tokens_input
-                self.total_tokens_output += tokens_output
-
-                break
+                return self._record_response(response)
 
             except anthropic.RateLimitError:
                 print(f"  Rate limited, waiting {RETRY_DELAY_SECONDS * (attempt + 1)}s...")
@@ -117,29 +160,63 @@ class ClaudeBatchClient:
 
             except anthropic.APIError as e:
                 print(f"  API error: {e}")
-                self.total_errors += 1
-                if attempt == MAX_RETRIES - 1:
-                    # Use rule-based fallback
-                    return self.response_parser.create_rule_based_prediction(trade)
-                time.sleep(RETRY_DELAY_SECONDS)
+                self._count_error()
+                if attempt < MAX_RETRIES - 1:
+                    time.sleep(RETRY_DELAY_SECONDS)
 
-        # Calculate processing time
-        processing_time_ms = int((time.time() - start_time) * 1000)
+        return None
 
-        # Parse response
-        if response_text:
-            prediction = self.response_parser.parse_response(
-                response_text=response_text,
-                trade=trade,
-                model_used=self.model,
-                tokens_input=tokens_input,
-                tokens_output=tokens_output,
-                processing_time_ms=processing_time_ms
-            )
-        else:
-            prediction = self.response_parser.create_rule_based_prediction(trade)
+    def _send_limited(self, prompt: str) -> Optional[Tuple[str, int, int]]:
+        """Send through the shared limiter: reserve tokens, settle actual usage, back off on 429."""
+        estimated = len(prompt) // 4 + self.max_tokens
+        api_errors = 0
+        rate_limits = 0
 
-        return prediction
+        while api_errors < MAX_RETRIES and rate_limits <= MAX_RATE_LIMIT_RETRIES:
+            self.limiter.acquire(estimated)
+            try:
+                response = self.client.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+            except anthropic.RateLimitError as e:
+                self.limiter.settle(estimated, 0)
+                rate_limits += 1
+                pause = self.limiter.on_rate_limit(_retry_after(e))
+                print(f"  Rate limited, all requests paused {pause:.1f}s...", flush=True)
+                continue
+            except anthropic.APIError as e:
+                self.limiter.settle(estimated, 0)
+                api_errors += 1
+                print(f"  API error: {e}", flush=True)
+                self._count_error()
+                if api_errors < MAX_RETRIES:
+                    time.sleep(RETRY_DELAY_SECONDS)
+                continue
+
+            result = self._record_response(response)
+            self.limiter.settle(estimated, result[1] + result[2])
+            self.limiter.on_success()
+            return result
+
+        return None
+
+    def _record_response(self, response) -> Tuple[str, int, int]:
+        """Extract text and usage from a response and update stats."""
+        tokens_input = response.usage.input_tokens
+        tokens_output = response.usage.output_tokens
+        with self._stats_lock:
+            self.total_requests += 1
+            self.total_tokens_input += tokens_input
+            self.total_tokens_output += tokens_output
+        return response.content[0].text, tokens_input, tokens_output
+
+    def _count_error(self):
+        with self._stats_lock:
+            self.total_errors += 1
 
     def _wait_for_rate_limit(self):
         """Wait if necessary to respect rate limits."""
@@ -197,3 +274,13 @@ class ClaudeBatchClient:
             'output_cost': round(output_cost, 4),
             'total_cost': round(input_cost + output_cost, 4),
         }
+
+
+def _retry_after(error) -> Optional[float]:
+    """retry-after header (seconds) from an API error response, if present."""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
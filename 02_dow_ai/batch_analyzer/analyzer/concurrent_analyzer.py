@@ -0,0 +1,223 @@
+"""
+Concurrent Batch Analyzer
+Keeps a bounded window of Claude requests in flight and stores predictions in batches.
+
+Each trade is analyzed by a caller-supplied function (normally a
+ClaudeBatchClient-backed analyzer sharing a TokenBucketLimiter), so at most
+`max_in_flight` requests are outstanding at any time. Finished predictions
+are written through PredictionStorage.save_predictions_batch every
+`write_batch_size` trades, and only trades whose batch was stored are
+recorded in the on-disk checkpoint. A killed run therefore resumes without
+re-sending any trade that already reached the database.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CHECKPOINT
+# =============================================================================
+
+class BatchCheckpoint:
+    """
+    On-disk record of trade_ids whose predictions are stored.
+
+    The file is rewritten atomically after every stored batch and deleted
+    once a run finishes cleanly, so it only ever describes an interrupted
+    run. A checkpoint written under a different run_key (model, prompt
+    version and load arguments) is ignored, so a different run never skips
+    trades.
+    """
+
+    def __init__(self, path: Path, run_key: str = ""):
+        self.path = Path(path)
+        self.run_key = run_key
+        self.completed: Set[str] = set()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return
+        if data.get('run_key', '') == self.run_key:
+            self.completed = set(data.get('processed_ids', []))
+
+    def mark(self, trade_ids: List[str]):
+        """Record stored trades and persist the checkpoint."""
+        self.completed.update(trade_ids)
+        self._save()
+
+    def reset(self):
+        """Forget all completed trades (fresh run)."""
+        self.completed.clear()
+        self._save()
+
+    def clear(self):
+        """Delete the checkpoint (run finished with every trade stored)."""
+        self.completed.clear()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'run_key': self.run_key,
+            'processed_ids': sorted(self.completed),
+            'last_run': datetime.now().isoformat(),
+        }
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+# =============================================================================
+# ANALYZER
+# =============================================================================
+
+@dataclass
+class BatchRunStats:
+    """Counters for one ConcurrentBatchAnalyzer.run."""
+    total: int = 0
+    resumed: int = 0          # skipped via checkpoint
+    analyzed: int = 0
+    errors: int = 0
+    saved: int = 0
+    save_failures: int = 0
+    max_in_flight_seen: int = 0
+
+
+class ConcurrentBatchAnalyzer:
+    """
+    Bounded-window concurrent runner for per-trade Claude analysis.
+
+    analyze_fn(trade) must return (prediction, trade_context) as accepted by
+    PredictionStorage.save_predictions_batch; any exception counts as an
+    error for that trade, which stays out of the checkpoint and is retried
+    on the next run.
+    """
+
+    def __init__(
+        self,
+        analyze_fn: Callable[[Any], Tuple[Any, Any]],
+        storage,
+        checkpoint: Optional[BatchCheckpoint] = None,
+        max_in_flight: int = 8,
+        write_batch_size: int = 25,
+        progress_callback: Optional[Callable] = None,
+        trade_id_fn: Callable[[Any], str] = lambda trade: trade.trade_id
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            analyze_fn: Per-trade analysis, returns (prediction, trade_context)
+            storage: Object with save_predictions_batch(list of tuples) -> int
+            checkpoint: Resume record, None to disable
+            max_in_flight: Maximum concurrent analyze_fn calls
+            write_batch_size: Predictions per storage write
+            progress_callback: callback(index, total, trade, prediction, error)
+            trade_id_fn: Extracts the checkpoint key from a trade
+        """
+        self.analyze_fn = analyze_fn
+        self.storage = storage
+        self.checkpoint = checkpoint
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.write_batch_size = max(1, int(write_batch_size))
+        self.progress_callback = progress_callback
+        self.trade_id_fn = trade_id_fn
+
+        self._buffer: List[Tuple[str, Any, Any]] = []
+
+    def run(self, trades: List[Any]) -> BatchRunStats:
+        """
+        Analyze all trades not yet in the checkpoint.
+
+        Stored results are flushed even if the run is interrupted.
+        """
+        stats = BatchRunStats(total=len(trades))
+        done_ids = self.checkpoint.completed if self.checkpoint else set()
+        todo = [t for t in trades if self.trade_id_fn(t) not in done_ids]
+        stats.resumed = len(trades) - len(todo)
+        if stats.resumed:
+            logger.info(f"Resuming: {stats.resumed} trades already stored, {len(todo)} remaining")
+
+        self._buffer = []
+        pending = iter(enumerate(todo, 1))
+        in_flight = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+        def fill_window():
+            while len(in_flight) < self.max_in_flight:
+                item = next(pending, None)
+                if item is None:
+                    break
+                in_flight[pool.submit(self.analyze_fn, item[1])] = item
+            stats.max_in_flight_seen = max(stats.max_in_flight_seen, len(in_flight))
+
+        try:
+            fill_window()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, trade = in_flight.pop(future)
+                    try:
+                        prediction, context = future.result()
+                    except Exception as e:
+                        stats.errors += 1
+                        logger.error(f"Analysis failed for {self.trade_id_fn(trade)}: {e}")
+                        self._report(index, len(todo), trade, None, e)
+                        continue
+
+                    stats.analyzed += 1
+                    self._buffer.append((self.trade_id_fn(trade), prediction, context))
+                    self._report(index, len(todo), trade, prediction, None)
+
+                    if len(self._buffer) >= self.write_batch_size:
+                        self._flush(stats)
+                fill_window()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._flush(stats)
+
+        return stats
+
+    def _report(self, index, total, trade, prediction, error):
+        if self.progress_callback:
+            self.progress_callback(index, total, trade, prediction, error)
+
+    def _flush(self, stats: BatchRunStats):
+        """Write buffered predictions; checkpoint them only if the batch was stored."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+
+        try:
+            saved = self.storage.save_predictions_batch([(p, c) for _, p, c in batch])
+        except Exception as e:
+            logger.error(f"Batch write of {len(batch)} predictions failed: {e}")
+            saved = 0
+
+        if saved == len(batch):
+            stats.saved += saved
+            if self.checkpoint is not None:
+                self.checkpoint.mark([trade_id for trade_id, _, _ in batch])
+        else:
+            stats.save_failures += len(batch)
+            logger.error(f"Stored {saved}/{len(batch)} predictions; batch left out of checkpoint")
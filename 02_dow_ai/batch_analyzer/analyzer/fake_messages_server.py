@@ -0,0 +1,168 @@
+"""
+Fake Messages Server
+Local stand-in for the Anthropic Messages API, for offline batch runs and tests.
+
+Serves POST /v1/messages on 127.0.0.1 with Messages API shaped JSON, so a
+ClaudeBatchClient pointed at `base_url` runs unchanged. It enforces its own
+sliding-window request limit (429 + retry-after, like the real API) and
+records peak concurrency so callers can check their in-flight window.
+
+Usage:
+    with FakeMessagesServer(latency=0.05, requests_per_window=20, window_seconds=1.0) as server:
+        client = ClaudeBatchClient(api_key="test", base_url=server.base_url, limiter=limiter)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+def default_reply(prompt: str) -> str:
+    """Deterministic Pass 2 style reply derived from the prompt text."""
+    digest = hashlib.sha1(prompt.encode('utf-8')).digest()
+    decision = 'TRADE' if digest[0] % 2 == 0 else 'NO_TRADE'
+    confidence = ('HIGH', 'MEDIUM', 'LOW')[digest[1] % 3]
+    return (
+        f"DECISION: {decision}\n"
+        f"CONFIDENCE: {confidence}\n"
+        f"REASONING: Offline reply {digest.hex()[:8]}.\n\n"
+        f"Avg Candle Range: 0.{digest[2] % 50:02d}% -> [NEUTRAL]\n"
+    )
+
+
+class FakeMessagesServer:
+    """
+    Threaded HTTP server answering /v1/messages.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        requests_per_window: Optional[int] = None,
+        window_seconds: float = 60.0,
+        retry_after: float = 0.1,
+        reply: Callable[[str], str] = default_reply
+    ):
+        """
+        Initialize server (call start() or use as a context manager).
+
+        Args:
+            latency: Seconds each accepted request takes
+            requests_per_window: Accepted requests per window, None = unlimited
+            window_seconds: Sliding window length for the request limit
+            retry_after: retry-after header value on 429 responses
+            reply: Maps the user prompt to the reply text
+        """
+        self.latency = latency
+        self.requests_per_window = requests_per_window
+        self.window_seconds = window_seconds
+        self.retry_after = retry_after
+        self.reply = reply
+
+        self._lock = threading.Lock()
+        self._accepted = deque()
+        self._active = 0
+
+        # Stats
+        self.requests = 0
+        self.rate_limited = 0
+        self.max_concurrent = 0
+        self.prompts = []
+
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeMessagesServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('content-length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if not self.path.rstrip('/').endswith('/v1/messages'):
+                    self._send(404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': self.path}})
+                    return
+                status, payload, headers = server._handle(body)
+                self._send(status, payload, headers)
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('content-type', 'application/json')
+                self.send_header('content-length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'FakeMessagesServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, body: dict):
+        """Apply the request limit, then answer after `latency` seconds."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            while self._accepted and now - self._accepted[0] >= self.window_seconds:
+                self._accepted.popleft()
+            if self.requests_per_window is not None and len(self._accepted) >= self.requests_per_window:
+                self.rate_limited += 1
+                return 429, {
+                    'type': 'error',
+                    'error': {'type': 'rate_limit_error', 'message': 'Number of requests has exceeded your rate limit'},
+                }, {'retry-after': str(self.retry_after)}
+            self._accepted.append(now)
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+
+        prompt = ''
+        try:
+            prompt = ''.join(
+                m['content'] if isinstance(m.get('content'), str)
+                else ''.join(block.get('text', '') for block in m.get('content', []))
+                for m in body.get('messages', [])
+            )
+            time.sleep(self.latency)
+            text = self.reply(prompt)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.prompts.append(prompt)
+
+        return 200, {
+            'id': f"msg_fake_{self.requests:06d}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model', 'fake'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': max(1, len(prompt) // 4), 'output_tokens': max(1, len(text) // 4)},
+        }, {}
@@ -0,0 +1,165 @@
+"""
+Token Bucket Rate Limiter
+Shared request/token budget for concurrent Claude API calls.
+
+Two buckets refill continuously: one counts requests, one counts tokens
+(input + output). A caller reserves an estimate before sending and settles
+the real usage afterwards. A 429 pauses every caller and halves the refill
+rate; successes restore it gradually (additive increase, multiplicative
+decrease), so a run settles just under the account's real limits.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe request + token bucket with adaptive backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        base_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+        min_scale: float = 0.1,
+        recovery_step: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            requests_per_minute: Request budget (bucket capacity and refill rate)
+            tokens_per_minute: Token budget, None to count requests only
+            base_backoff: Pause after the first consecutive 429 (seconds)
+            max_backoff: Cap on the doubling pause (seconds)
+            min_scale: Lowest fraction of the configured rates after 429s
+            recovery_step: Rate fraction restored per successful request
+            clock: Monotonic time source (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute) if tokens_per_minute else None
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._requests = self.requests_per_minute
+        self._tokens = self.tokens_per_minute or 0.0
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+        self.scale = 1.0
+
+        # Stats
+        self.total_waited = 0.0
+        self.rate_limit_events = 0
+
+    def _refill(self, now: float):
+        """Top up both buckets for the time elapsed since the last update."""
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.scale * self.requests_per_minute / 60.0
+        )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.scale * self.tokens_per_minute / 60.0
+            )
+
+    def _wait_time(self, now: float, tokens: float) -> float:
+        """Seconds until one request and `tokens` tokens are available (0 = now)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        wait = 0.0
+        if self._requests < 1.0:
+            rate = self.scale * self.requests_per_minute / 60.0
+            wait = max(wait, (1.0 - self._requests) / rate)
+        if self.tokens_per_minute:
+            # A request larger than the whole bucket waits for a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                rate = self.scale * self.tokens_per_minute / 60.0
+                wait = max(wait, (needed - self._tokens) / rate)
+        return wait
+
+    def acquire(self, tokens: float = 0.0) -> float:
+        """
+        Block until one request and `tokens` estimated tokens are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._wait_time(now, tokens)
+                if wait <= 0:
+                    self._requests -= 1.0
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    self.total_waited += waited
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def settle(self, estimated: float, actual: float):
+        """Replace a reservation with the tokens actually used (may go into debt)."""
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._tokens = min(self.tokens_per_minute, self._tokens + estimated - actual)
+
+    def on_success(self):
+        """Record a successful request and recover part of the refill rate."""
+        with self._lock:
+            self._consecutive_limits = 0
+            self.scale = min(1.0, self.scale + self.recovery_step)
+
+    def on_rate_limit(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429: pause all callers and halve the refill rate.
+
+        Args:
+            retry_after: Server's retry-after hint in seconds, if any
+
+        Returns:
+            Pause applied (seconds)
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._consecutive_limits += 1
+            self.rate_limit_events += 1
+            self.scale = max(self.min_scale, self.scale * 0.5)
+
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self._consecutive_limits - 1))
+            pause = max(backoff, retry_after or 0.0)
+            self._paused_until = max(self._paused_until, now + pause)
+
+            # Buckets restart empty so callers resume at the reduced rate
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+            return pause
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics."""
+        return {
+            'scale': round(self.scale, 3),
+            'rate_limit_events': self.rate_limit_events,
+            'total_waited_s': round(self.total_waited, 2),
+        }
@@ -51,6 +51,12 @@ MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 2.0
 BATCH_SIZE = 100  # Checkpoint every N trades
 
+# Concurrent production runs (shared TokenBucketLimiter)
+MAX_IN_FLIGHT = 8  # Requests outstanding at once
+TOKENS_PER_MINUTE = 80000  # Input + output token budget
+MAX_RATE_LIMIT_RETRIES = 8  # 429s tolerated per request before giving up
+PREDICTION_WRITE_BATCH = 25  # Predictions per ai_predictions insert
+
 # Token limits
 MAX_INPUT_TOKENS = 1500
 MAX_OUTPUT_TOKENS = 300
@@ -66,6 +72,7 @@ M1_RAMPUP_BARS = 15
 
 # Checkpoint file for resuming interrupted batches
 CHECKPOINT_FILE = MODULE_DIR / "data" / "batch_checkpoint.json"
+PRODUCTION_CHECKPOINT_FILE = MODULE_DIR / "data" / "production_checkpoint.json"
 
 # =============================================================================
 # Prediction Thresholds (for rule-based fallback)
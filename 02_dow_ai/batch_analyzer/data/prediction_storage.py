@@ -18,6 +18,19 @@ from models.prediction import AIPrediction
 from models.trade_context import TradeContext
 
 
+_INSERT_COLUMNS = """
+            trade_id, ticker, trade_date, direction, model, zone_type,
+            entry_price, entry_time,
+            prediction, confidence, reasoning,
+            candle_pct, candle_status,
+            vol_delta, vol_delta_status,
+            vol_roc, vol_roc_status,
+            sma, h1_struct, snapshot,
+            actual_outcome, actual_pnl_r,
+            model_used, prompt_version, tokens_input, tokens_output, processing_time_ms
+"""
+
+
 class PredictionStorage:
     """Stores and retrieves AI predictions from Supabase - matches live format."""
 
@@ -35,18 +48,8 @@ class PredictionStorage:
         """
         # Simple INSERT - no upsert logic, all predictions stored
         # Unique constraint on trade_id must be removed from Supabase for this to work
-        query = """
-        INSERT INTO ai_predictions (
-            trade_id, ticker, trade_date, direction, model, zone_type,
-            entry_price, entry_time,
-            prediction, confidence, reasoning,
-            candle_pct, candle_status,
-            vol_delta, vol_delta_status,
-            vol_roc, vol_roc_status,
-            sma, h1_struct, snapshot,
-            actual_outcome, actual_pnl_r,
-            model_used, prompt_version, tokens_input, tokens_output, processing_time_ms
-        ) VALUES (
+        query = f"""
+        INSERT INTO ai_predictions ({_INSERT_COLUMNS}) VALUES (
             %s, %s, %s, %s, %s, %s,
             %s, %s,
             %s, %s, %s,
@@ -59,9 +62,62 @@ class PredictionStorage:
         )
         """
 
+        params = self._prediction_params(prediction, trade)
+
+        try:
+            conn = psycopg2.connect(**DB_CONFIG)
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"Error saving prediction for {trade.trade_id}: {e}", flush=True)
+            print(f"  candle_status={prediction.candle_status}, vol_delta_status={prediction.vol_delta_status}", flush=True)
+            print(f"  vol_roc_status={prediction.vol_roc_status}, sma={prediction.sma}, h1_struct={prediction.h1_struct}", flush=True)
+            return False
+
+    def save_predictions_batch(
+        self,
+        predictions: List[tuple]  # List of (AIPrediction, TradeContext)
+    ) -> int:
+        """
+        Save multiple predictions in one INSERT and one transaction.
+
+        All rows are stored or none are, so callers can checkpoint a batch
+        as a unit.
+
+        Args:
+            predictions: List of (prediction, trade) tuples
+
+        Returns:
+            Number of predictions saved (len(predictions) or 0)
+        """
+        if not predictions:
+            return 0
+
+        query = f"INSERT INTO ai_predictions ({_INSERT_COLUMNS}) VALUES %s"
+        rows = [self._prediction_params(prediction, trade) for prediction, trade in predictions]
+
+        try:
+            conn = psycopg2.connect(**DB_CONFIG)
+            try:
+                with conn.cursor() as cur:
+                    execute_values(cur, query, rows, page_size=len(rows))
+                conn.commit()
+            finally:
+                conn.close()
+            return len(rows)
+        except Exception as e:
+            print(f"Error saving batch of {len(rows)} predictions: {e}", flush=True)
+            return 0
+
+    @staticmethod
+    def _prediction_params(prediction: AIPrediction, trade: TradeContext) -> tuple:
+        """Row values for one ai_predictions insert (column order of _INSERT_COLUMNS)."""
         outcome = 'WIN' if trade.is_winner else 'LOSS'
 
-        params = (
+        return (
             trade.trade_id,
             trade.ticker,
             trade.trade_date,
@@ -94,38 +150,6 @@ class PredictionStorage:
             prediction.processing_time_ms,
         )
 
-        try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-            conn.commit()
-            conn.close()
-            return True
-        except Exception as e:
-            print(f"Error saving prediction for {trade.trade_id}: {e}", flush=True)
-            print(f"  candle_status={prediction.candle_status}, vol_delta_status={prediction.vol_delta_status}", flush=True)
-            print(f"  vol_roc_status={prediction.vol_roc_status}, sma={prediction.sma}, h1_struct={prediction.h1_struct}", flush=True)
-            return False
-
-    def save_predictions_batch(
-        self,
-        predictions: List[tuple]  # List of (AIPrediction, TradeContext)
-    ) -> int:
-        """
-        Save multiple predictions in a batch.
-
-        Args:
-            predictions: List of (prediction, trade) tuples
-
-        Returns:
-            Number of predictions saved
-        """
-        saved = 0
-        for prediction, trade in predictions:
-            if self.save_prediction(prediction, trade):
-                saved += 1
-        return saved
-
     def get_processed_trade_ids(self) -> set:
         """Get set of trade_ids that have already been processed."""
         query = "SELECT trade_id FROM ai_predictions"
@@ -7,6 +7,9 @@ PRODUCTION MODE: Single-pass analysis using Pass 2 logic only.
 - Runs Pass 2 (with backtested context) on all trades
 - Stores results in ai_predictions table
 - Used for weekly batch processing of new trades
+- Keeps up to --workers requests in flight under a shared request/token
+  budget, writes predictions in batches, and checkpoints stored trades so an
+  interrupted run resumes where it stopped
 
 For validation runs (dual-pass), use batch_analyze_v3.py instead.
 
@@ -24,6 +27,12 @@ Options:
     --dry-run           Show what would be processed without calling API
     --save-results      Save results to timestamped txt file
     --output-dir DIR    Output directory for results (default: test/)
+    --workers N         Requests in flight at once (default: MAX_IN_FLIGHT)
+    --fresh             Ignore the checkpoint from an earlier interrupted run
+
+The checkpoint only resumes an interrupted run with the same model, prompt
+version and filters (including --reprocess); it is deleted when a run
+stores every trade.
 """
 
 import argparse
@@ -46,8 +55,6 @@ sys.path.insert(0, str(BATCH_DIR / 'data'))
 sys.path.insert(0, str(DOW_AI_DIR))
 sys.path.insert(0, str(DOW_AI_DIR / 'ai_context'))
 
-import anthropic
-
 # Import batch_analyzer config using importlib to avoid collision
 _batch_config_path = BATCH_DIR / "config.py"
 _spec = importlib.util.spec_from_file_location("batch_config", _batch_config_path)
@@ -60,6 +67,11 @@ PROMPT_VERSION = _batch_config.PROMPT_VERSION
 MAX_OUTPUT_TOKENS = _batch_config.MAX_OUTPUT_TOKENS
 BATCH_SIZE = _batch_config.BATCH_SIZE
 DB_CONFIG = _batch_config.DB_CONFIG
+REQUESTS_PER_MINUTE = _batch_config.REQUESTS_PER_MINUTE
+TOKENS_PER_MINUTE = _batch_config.TOKENS_PER_MINUTE
+MAX_IN_FLIGHT = _batch_config.MAX_IN_FLIGHT
+PREDICTION_WRITE_BATCH = _batch_config.PREDICTION_WRITE_BATCH
+PRODUCTION_CHECKPOINT_FILE = _batch_config.PRODUCTION_CHECKPOINT_FILE
 
 # Import from batch_analyzer/data (direct import since path is set)
 from trade_loader_v3 import TradeLoaderV3
@@ -68,6 +80,12 @@ from prediction_storage import PredictionStorage
 # Import from batch_analyzer/models
 sys.path.insert(0, str(BATCH_DIR / 'models'))
 from prediction import AIPrediction
+from models.trade_context import TradeContext
+
+# Import from batch_analyzer/analyzer
+from analyzer.claude_client import ClaudeBatchClient
+from analyzer.rate_limiter import TokenBucketLimiter
+from analyzer.concurrent_analyzer import BatchCheckpoint, ConcurrentBatchAnalyzer
 
 # Import v3.0 prompt components (from ai_context)
 from prompt_v3 import (
@@ -135,6 +153,9 @@ class ProductionAnalyzer:
     - Backtested edges from ai_context
     - Zone performance data
     - Model statistics
+
+    API calls go through ClaudeBatchClient; pass a shared TokenBucketLimiter
+    to call analyze_trade from several threads at once.
     """
 
     def __init__(
@@ -142,9 +163,17 @@ class ProductionAnalyzer:
         api_key: str,
         model: str = CLAUDE_MODEL,
         max_tokens: int = MAX_OUTPUT_TOKENS,
-        ai_context: Optional[Dict[str, Any]] = None
+        ai_context: Optional[Dict[str, Any]] = None,
+        limiter: Optional[TokenBucketLimiter] = None,
+        base_url: Optional[str] = None
     ):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = ClaudeBatchClient(
+            api_key=api_key,
+            model=model,
+            max_tokens=max_tokens,
+            limiter=limiter,
+            base_url=base_url
+        )
         self.model = model
         self.max_tokens = max_tokens
         self.ai_context = ai_context or {}
@@ -171,47 +200,36 @@ class ProductionAnalyzer:
 
         start_time = time.time()
 
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            latency_ms = int((time.time() - start_time) * 1000)
-
-            # Parse response
-            result = parse_pass2_response(response.content[0].text)
-
-            return {
-                'decision': result.decision,
-                'confidence': result.confidence,
-                'reasoning': result.reasoning,
-                'raw_response': result.raw_response,
-                'input_tokens': response.usage.input_tokens,
-                'output_tokens': response.usage.output_tokens,
-                'latency_ms': latency_ms,
-                # Extracted indicators
-                'candle_pct': result.candle_pct,
-                'candle_status': result.candle_status,
-                'vol_delta': result.vol_delta,
-                'vol_delta_status': result.vol_delta_status,
-                'vol_roc': result.vol_roc,
-                'vol_roc_status': result.vol_roc_status,
-                'sma_spread': result.sma_spread,
-                'sma_status': result.sma_status,
-                'h1_structure': result.h1_structure,
-                'h1_status': result.h1_status,
-            }
-
-        except anthropic.RateLimitError:
-            logger.warning("Rate limited, waiting 60 seconds...")
-            time.sleep(60)
-            return self.analyze_trade(trade)
-
-        except Exception as e:
-            logger.error(f"API error for {trade.trade_id}: {e}")
-            raise
+        sent = self.client.send(prompt)
+        if sent is None:
+            raise RuntimeError(f"API request failed for {trade.trade_id} after retries")
+        response_text, input_tokens, output_tokens = sent
+
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        # Parse response
+        result = parse_pass2_response(response_text)
+
+        return {
+            'decision': result.decision,
+            'confidence': result.confidence,
+            'reasoning': result.reasoning,
+            'raw_response': result.raw_response,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'latency_ms': latency_ms,
+            # Extracted indicators
+            'candle_pct': result.candle_pct,
+            'candle_status': result.candle_status,
+            'vol_delta': result.vol_delta,
+            'vol_delta_status': result.vol_delta_status,
+            'vol_roc': result.vol_roc,
+            'vol_roc_status': result.vol_roc_status,
+            'sma_spread': result.sma_spread,
+            'sma_status': result.sma_status,
+            'h1_structure': result.h1_structure,
+            'h1_status': result.h1_status,
+        }
 
 
 def create_ai_prediction(result: Dict[str, Any], trade: TradeForAnalysis) -> AIPrediction:
@@ -279,6 +297,22 @@ def create_ai_prediction(result: Dict[str, Any], trade: TradeForAnalysis) -> AIP
     )
 
 
+def build_trade_context(trade: TradeForAnalysis) -> TradeContext:
+    """Trade metadata in the TradeContext shape PredictionStorage expects."""
+    return TradeContext(
+        trade_id=trade.trade_id,
+        ticker=trade.ticker,
+        trade_date=datetime.strptime(trade.trade_date, '%Y-%m-%d').date(),
+        entry_time=datetime.strptime(trade.entry_time, '%H:%M:%S').time() if isinstance(trade.entry_time, str) else trade.entry_time,
+        direction=trade.direction,
+        model=trade.model,
+        zone_type=trade.zone_type,
+        entry_price=trade.entry_price,
+        is_winner=trade.is_winner,
+        pnl_r=trade.pnl_r
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="DOW AI v3.0 Production Batch Analyzer")
     parser.add_argument('--limit', type=int, help='Max trades to process')
@@ -291,6 +325,8 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be processed')
     parser.add_argument('--save-results', action='store_true', help='Save results to file')
     parser.add_argument('--output-dir', type=str, help='Output directory')
+    parser.add_argument('--workers', type=int, default=MAX_IN_FLIGHT, help='Requests in flight at once')
+    parser.add_argument('--fresh', action='store_true', help='Ignore checkpoint from an interrupted run')
 
     args = parser.parse_args()
 
@@ -320,6 +356,7 @@ def main():
     output.log(f"  Model: {args.model or 'ALL'}")
     output.log(f"  Date Range: {args.date_from or 'ANY'} to {args.date_to or 'ANY'}")
     output.log(f"  Reprocess: {args.reprocess}")
+    output.log(f"  Workers: {args.workers}")
     output.log("")
 
     # Initialize components
@@ -397,14 +434,30 @@ def main():
     context_keys = [k for k in ai_context.keys() if not k.startswith('_')]
     output.log(f"  Loaded: {', '.join(context_keys)}")
 
-    # Initialize analyzer
+    # Initialize analyzer (one request/token budget shared by all workers)
     output.log("\nInitializing production analyzer...")
+    limiter = TokenBucketLimiter(
+        requests_per_minute=REQUESTS_PER_MINUTE,
+        tokens_per_minute=TOKENS_PER_MINUTE
+    )
     analyzer = ProductionAnalyzer(
         api_key=ANTHROPIC_API_KEY,
         model=CLAUDE_MODEL,
-        ai_context=ai_context
+        ai_context=ai_context,
+        limiter=limiter
     )
 
+    # Checkpoint: trades stored by an interrupted run with the same model/prompt and load arguments
+    run_key = "|".join(str(part) for part in (
+        CLAUDE_MODEL, PROMPT_VERSION, args.reprocess, args.ticker, args.direction, args.model,
+        args.date_from, args.date_to,
+    ))
+    checkpoint = BatchCheckpoint(PRODUCTION_CHECKPOINT_FILE, run_key=run_key)
+    if args.fresh:
+        checkpoint.reset()
+    elif checkpoint.completed:
+        output.log(f"Checkpoint: {len(checkpoint.completed)} trades already stored, will be skipped")
+
     # Process trades
     output.log("")
     output.log("=" * 80)
@@ -415,74 +468,59 @@ def main():
     results = []
     total_input_tokens = 0
     total_output_tokens = 0
-    errors = 0
 
-    for i, trade in enumerate(trades, 1):
-        output.log(f"[{i}/{len(trades)}] {trade.trade_id}")
-        output.log(f"  {trade.ticker} {trade.direction} | {trade.trade_date} {trade.entry_time}")
-        output.log(f"  Entry: ${trade.entry_price:.2f} | Model: {trade.model} | Zone: {trade.zone_type}")
+    def analyze(trade: TradeForAnalysis):
+        result = analyzer.analyze_trade(trade)
+        return create_ai_prediction(result, trade), build_trade_context(trade)
 
-        try:
-            # Analyze trade
-            result = analyzer.analyze_trade(trade)
-
-            # Determine correctness
-            actual = trade.actual_outcome
-            correct = (result['decision'] == 'TRADE' and actual == 'WIN') or \
-                     (result['decision'] == 'NO_TRADE' and actual == 'LOSS')
-            correct_str = "[+]" if correct else "[-]"
-
-            output.log(f"  Decision: {result['decision']} ({result['confidence']}) {correct_str}")
-            output.log(f"  Actual: {actual}")
-            output.log(f"  Reasoning: {result['reasoning'][:100]}...")
-
-            # Create prediction object and save
-            prediction = create_ai_prediction(result, trade)
-
-            # Need to create a compatible trade context for storage
-            from models.trade_context import TradeContext
-            trade_ctx = TradeContext(
-                trade_id=trade.trade_id,
-                ticker=trade.ticker,
-                trade_date=datetime.strptime(trade.trade_date, '%Y-%m-%d').date(),
-                entry_time=datetime.strptime(trade.entry_time, '%H:%M:%S').time() if isinstance(trade.entry_time, str) else trade.entry_time,
-                direction=trade.direction,
-                model=trade.model,
-                zone_type=trade.zone_type,
-                entry_price=trade.entry_price,
-                is_winner=trade.is_winner,
-                pnl_r=trade.pnl_r
-            )
-
-            if storage.save_prediction(prediction, trade_ctx):
-                output.log(f"  Saved to ai_predictions")
-            else:
-                output.log(f"  FAILED to save")
-                errors += 1
-
-            # Track totals
-            total_input_tokens += result['input_tokens']
-            total_output_tokens += result['output_tokens']
-
-            results.append({
-                'trade_id': trade.trade_id,
-                'decision': result['decision'],
-                'confidence': result['confidence'],
-                'actual': actual,
-                'correct': correct,
-            })
+    def report(i, total, trade, prediction, error):
+        nonlocal total_input_tokens, total_output_tokens
 
-            output.log("-" * 60)
-
-            # Rate limiting - 1 API call per trade
-            if i < len(trades):
-                time.sleep(1.2)  # ~50 req/min
+        output.log(f"[{i}/{total}] {trade.trade_id}")
+        output.log(f"  {trade.ticker} {trade.direction} | {trade.trade_date} {trade.entry_time}")
+        output.log(f"  Entry: ${trade.entry_price:.2f} | Model: {trade.model} | Zone: {trade.zone_type}")
 
-        except Exception as e:
-            output.log(f"  ERROR: {e}")
-            errors += 1
+        if error is not None:
+            output.log(f"  ERROR: {error}")
             output.log("-" * 60)
-            continue
+            return
+
+        # Determine correctness
+        actual = trade.actual_outcome
+        correct = (prediction.prediction == 'TRADE' and actual == 'WIN') or \
+                 (prediction.prediction == 'NO_TRADE' and actual == 'LOSS')
+        correct_str = "[+]" if correct else "[-]"
+
+        output.log(f"  Decision: {prediction.prediction} ({prediction.confidence}) {correct_str}")
+        output.log(f"  Actual: {actual}")
+        output.log(f"  Reasoning: {(prediction.snapshot or '')[:100]}...")
+        output.log("-" * 60)
+
+        # Track totals
+        total_input_tokens += prediction.tokens_input
+        total_output_tokens += prediction.tokens_output
+
+        results.append({
+            'trade_id': trade.trade_id,
+            'decision': prediction.prediction,
+            'confidence': prediction.confidence,
+            'actual': actual,
+            'correct': correct,
+        })
+
+    runner = ConcurrentBatchAnalyzer(
+        analyze_fn=analyze,
+        storage=storage,
+        checkpoint=checkpoint,
+        max_in_flight=args.workers,
+        write_batch_size=PREDICTION_WRITE_BATCH,
+        progress_callback=report
+    )
+    run_stats = runner.run(trades)
+    errors = run_stats.errors + run_stats.save_failures
+    if errors == 0:
+        # Every trade is stored; the next run starts from ai_predictions, not the checkpoint
+        checkpoint.clear()
 
     # Summary
     output.log("")
@@ -498,6 +536,7 @@ def main():
         wins = sum(1 for r in results if r['actual'] == 'WIN')
 
         output.log(f"Trades Analyzed: {total}")
+        output.log(f"Saved to ai_predictions: {run_stats.saved}")
         output.log(f"Errors: {errors}")
         output.log(f"Actual Win Rate: {wins}/{total} ({100*wins/total:.1f}%)")
         output.log("")
@@ -509,6 +548,7 @@ def main():
         output.log("API USAGE:")
         output.log(f"  Input tokens: {total_input_tokens:,}")
         output.log(f"  Output tokens: {total_output_tokens:,}")
+        output.log(f"  Rate limit events: {limiter.rate_limit_events}")
 
         # Cost estimate (Sonnet pricing)
         cost = (total_input_tokens * 0.003 / 1000) + (total_output_tokens * 0.015 / 1000)
@@ -27,8 +27,10 @@ from calculations.sma_config import (
     PricePosition,
     WIDE_SPREAD_THRESHOLD
 )
+from calculations.indicator_stream import M1IndicatorStream, M1IndicatorStreamCache
 from calculations.h1_structure import (
     calculate_structure_for_bars,
+    StructureTracker,
     MarketStructure,
     H1StructureCache,
     StructureCache
@@ -6,13 +6,27 @@ Delegates structure calculation to shared.indicators.structure (canonical fracta
 Preserves the MarketStructure enum, caching classes, and dict-based return format
 for backward compatibility with data_worker.
 
+StructureTracker keeps the fractals and walk-forward state of its HTF bars
+keyed by timestamp, so an M1 bar is a bisect + memo lookup and a refresh
+(including a rolling window that drops its oldest bar) only walks bars that
+are new or changed.
+
 SWH-6: Single source of truth - shared.indicators
 """
-from typing import List, Optional, Dict, Any
+from bisect import bisect_right
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 from datetime import datetime
 
+import numpy as np
+
 from shared.indicators.structure import calculate_structure_from_bars
+from shared.indicators.structure.fractals import fractal_flags
+from shared.indicators.structure.market_structure import (
+    STRUCTURE_LABELS, _build_fractal_list, _find_anchor,
+    _walk_start, _walk_step, _walk_result,
+)
+from shared.indicators._utils import get_high, get_low, get_close
 from shared.indicators.config import CONFIG
 
 
@@ -78,6 +92,177 @@ def get_h1_bar_for_timestamp(
     return h1_bars[-1] if h1_bars else None
 
 
+def _bar_key(bar: dict) -> Tuple:
+    """Identity of an HTF bar (a forming bar changes OHLC under the same timestamp)."""
+    return (
+        bar.get('timestamp', 0), bar.get('open'), bar.get('high'),
+        bar.get('low'), bar.get('close'),
+    )
+
+
+class StructureTracker:
+    """
+    Stateful HTF structure tracker for one ticker/timeframe.
+
+    Consumes HTF bars in timestamp order and exposes the structure as of any
+    timestamp, matching calculate_structure() on the tracked bars up to it.
+
+    update() computes the fractals of the whole window once. The walk-forward
+    from each anchor is kept as one state per bar, keyed by timestamp, and
+    survives updates for every bar whose fractal neighbourhood is unchanged,
+    including when the window rolls forward (the api_client fetchers return
+    the latest N bars). A prefix then costs an anchor lookup plus `lookback`
+    steps past its last confirmed fractal.
+    """
+
+    def __init__(self, lookback: int = 5):
+        self.lookback = lookback
+        self._bars: List[dict] = []
+        self._keys: List[Tuple] = []
+        self._timestamps: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._high = self._low = self._close = np.empty(0)
+        self._fractals: List[Tuple[int, int, float]] = []
+        self._frac_bars: List[int] = []
+        # anchor (timestamp, type, strong, weak) -> walk state after each bar from the anchor on
+        self._walks: Dict[Tuple, List[tuple]] = {}
+        self._anchors: Dict[int, Optional[tuple]] = {}
+        self._memo: Dict[int, MarketStructure] = {}
+
+    @property
+    def bars(self) -> List[dict]:
+        """HTF bars currently tracked (ascending timestamp)."""
+        return self._bars
+
+    def update(self, bars: List[dict]):
+        """
+        Replace the tracked HTF bars, keeping walk state that is still valid.
+
+        Args:
+            bars: HTF bars sorted by ascending 'timestamp'
+        """
+        keys = [_bar_key(b) for b in bars]
+
+        # First position where the new window stops repeating a run of old bars
+        old_positions = self._positions
+        changed = len(keys)
+        previous = None
+        for p, key in enumerate(keys):
+            i = old_positions.get(key[0])
+            if i is None or self._keys[i] != key or (previous is not None and i != previous + 1):
+                changed = p
+                break
+            previous = i
+
+        self._bars = list(bars)
+        self._keys = keys
+        self._timestamps = [k[0] for k in keys]
+        self._positions = {ts: p for p, ts in enumerate(self._timestamps)}
+
+        # A walk state after bar p depends on bars up to p + lookback
+        walks = {}
+        for anchor_key, states in self._walks.items():
+            a = self._positions.get(anchor_key[0])
+            if a is not None and a < changed:
+                walks[anchor_key] = states[:max(0, changed - self.lookback - a)]
+        self._walks = walks
+
+        self._high = np.array([get_high(b, 0.0) for b in bars], dtype=np.float64)
+        self._low = np.array([get_low(b, 0.0) for b in bars], dtype=np.float64)
+        self._close = np.array([get_close(b, 0.0) for b in bars], dtype=np.float64)
+        frac_highs, frac_lows = fractal_flags(self._high, self._low, self.lookback)
+        self._fractals = _build_fractal_list(self._high, self._low, frac_highs, frac_lows)
+        self._frac_bars = [f[0] for f in self._fractals]
+        self._anchors = {}
+        self._memo = {}
+
+    def append(self, bar: dict):
+        """Consume one newly closed HTF bar (must be newer than the last)."""
+        self.update(self._bars + [bar])
+
+    def structure_at(self, timestamp: int) -> MarketStructure:
+        """Structure using every tracked HTF bar with timestamp <= the given one."""
+        count = bisect_right(self._timestamps, timestamp)
+        if count < 2 * self.lookback + 1:
+            return MarketStructure.NEUTRAL
+
+        structure = self._memo.get(count)
+        if structure is None:
+            structure = self._prefix_structure(count)
+            self._memo[count] = structure
+        return structure
+
+    def _anchor(self, cutoff: int) -> Optional[tuple]:
+        """Anchor over the window's fractals from cutoff on (memoized per update)."""
+        if cutoff not in self._anchors:
+            self._anchors[cutoff] = _find_anchor(self._fractals, cutoff)
+        return self._anchors[cutoff]
+
+    def _prefix_structure(self, count: int) -> MarketStructure:
+        """calculate_structure(bars[:count]) from the window's fractals and walks."""
+        # Fractals the prefix can see: a full `lookback` bars on each side
+        confirmed = count - 1 - self.lookback
+
+        # The scan stops at the first anchor, so a window anchor at or before
+        # `confirmed` is also the prefix's anchor (and a later one means none)
+        anchor = None
+        for tier in CONFIG.structure.lookback_tiers:
+            found = self._anchor(max(0, count - tier))
+            if found is not None and found[0] <= confirmed:
+                anchor = found
+                break
+        if anchor is None:
+            return MarketStructure.NEUTRAL
+
+        state = self._walk_state(anchor, confirmed)
+        for b in range(confirmed + 1, count):
+            _walk_step(state, self._fractals, b, self._high, self._low, self._close,
+                       CONFIG.structure.retrace_pct, max_frac_bar=confirmed,
+                       frac_bars=self._frac_bars)
+        direction, _, _ = _walk_result(state)
+        return _STRUCTURE_MAP.get(STRUCTURE_LABELS.get(direction), MarketStructure.NEUTRAL)
+
+    def _walk_state(self, anchor: tuple, position: int) -> list:
+        """Walk state after bar `position`, extending the anchor's stored walk."""
+        a = anchor[0]
+        states = self._walks.setdefault((self._timestamps[a],) + tuple(anchor[1:4]), [])
+        if states:
+            state = self._from_stored(states[-1])
+        else:
+            state = _walk_start(anchor, self._high, self._low)
+        for b in range(a + len(states), position + 1):
+            _walk_step(state, self._fractals, b, self._high, self._low, self._close,
+                       CONFIG.structure.retrace_pct, frac_bars=self._frac_bars)
+            states.append(self._to_stored(state))
+        return self._from_stored(states[position - a])
+
+    def _to_stored(self, state: list) -> tuple:
+        """Walk state with its strong bar as a timestamp (stable across windows)."""
+        stored = list(state)
+        stored[2] = self._timestamps[state[2]]
+        return tuple(stored)
+
+    def _from_stored(self, stored: tuple) -> list:
+        state = list(stored)
+        state[2] = self._positions[stored[2]]
+        return state
+
+    def structure_for_bars(self, m1_bars: List[dict]) -> List[dict]:
+        """Per-M1-bar structure in the calculate_structure_for_bars() format."""
+        if not self._bars:
+            return [{'h1_structure': MarketStructure.NEUTRAL, 'h1_display': 'N'}
+                    for _ in m1_bars]
+
+        results = []
+        for m1_bar in m1_bars:
+            structure = self.structure_at(m1_bar.get('timestamp', 0))
+            results.append({
+                'h1_structure': structure,
+                'h1_display': structure.value
+            })
+        return results
+
+
 def calculate_structure_for_bars(
     h1_bars: List[dict],
     m1_bars: List[dict],
@@ -87,39 +272,20 @@ def calculate_structure_for_bars(
     Calculate HTF structure for each M1 bar using canonical fractal detection.
 
     For each M1 bar, finds HTF bars up to that point and calculates
-    the structure based on fractal swing analysis.
+    the structure based on fractal swing analysis. Each distinct HTF prefix
+    is computed once (see StructureTracker).
 
     Args:
-        h1_bars: List of HTF bar dictionaries
+        h1_bars: List of HTF bar dictionaries (ascending timestamp)
         m1_bars: List of M1 bar dictionaries with 'timestamp' key
         lookback: Fractal length (bars each side)
 
     Returns:
         List of dicts with 'h1_structure' and 'h1_display' keys for each M1 bar
     """
-    results = []
-
-    if not h1_bars:
-        return [{'h1_structure': MarketStructure.NEUTRAL, 'h1_display': 'N'}
-                for _ in m1_bars]
-
-    for m1_bar in m1_bars:
-        m1_ts = m1_bar.get('timestamp', 0)
-
-        # Find HTF bars up to this M1 timestamp
-        relevant_bars = [b for b in h1_bars if b.get('timestamp', 0) <= m1_ts]
-
-        if len(relevant_bars) >= 2 * lookback + 1:
-            structure = calculate_structure(relevant_bars, lookback)
-        else:
-            structure = MarketStructure.NEUTRAL
-
-        results.append({
-            'h1_structure': structure,
-            'h1_display': structure.value
-        })
-
-    return results
+    tracker = StructureTracker(lookback)
+    tracker.update(h1_bars or [])
+    return tracker.structure_for_bars(m1_bars)
 
 
 class StructureCache:
@@ -133,6 +299,7 @@ class StructureCache:
     def __init__(self, timeframe_ms: int):
         self.timeframe_ms = timeframe_ms
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._trackers: Dict[str, StructureTracker] = {}
 
     def get_bars(self, ticker: str) -> Optional[List[dict]]:
         """Get cached bars for a ticker."""
@@ -148,6 +315,14 @@ class StructureCache:
             'last_update': datetime.now(),
             'last_bar_ts': last_bar_ts
         }
+        self._trackers.setdefault(ticker, StructureTracker()).update(bars)
+
+    def structure_for_bars(self, ticker: str, m1_bars: List[dict]) -> List[dict]:
+        """Per-M1-bar structure from the cached bars (memoized per ticker)."""
+        tracker = self._trackers.get(ticker)
+        if tracker is None:
+            return calculate_structure_for_bars([], m1_bars)
+        return tracker.structure_for_bars(m1_bars)
 
     def needs_refresh(self, ticker: str, current_bar_ts: int) -> bool:
         """Check if data needs to be refreshed."""
@@ -160,8 +335,10 @@ class StructureCache:
         """Clear cache for a ticker or all tickers."""
         if ticker:
             self._cache.pop(ticker, None)
+            self._trackers.pop(ticker, None)
         else:
             self._cache.clear()
+            self._trackers.clear()
 
 
 class H1StructureCache:
@@ -172,6 +349,7 @@ class H1StructureCache:
 
     def __init__(self):
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._trackers: Dict[str, StructureTracker] = {}
 
     def get_bars(self, ticker: str) -> Optional[List[dict]]:
         """Get cached H1 bars for a ticker."""
@@ -187,6 +365,14 @@ class H1StructureCache:
             'last_update': datetime.now(),
             'last_h1_ts': last_h1_ts
         }
+        self._trackers.setdefault(ticker, StructureTracker()).update(bars)
+
+    def structure_for_bars(self, ticker: str, m1_bars: List[dict]) -> List[dict]:
+        """Per-M1-bar structure from the cached H1 bars (memoized per ticker)."""
+        tracker = self._trackers.get(ticker)
+        if tracker is None:
+            return calculate_structure_for_bars([], m1_bars)
+        return tracker.structure_for_bars(m1_bars)
 
     def needs_refresh(self, ticker: str, current_h1_ts: int) -> bool:
         """Check if H1 data needs to be refreshed."""
@@ -199,5 +385,7 @@ class H1StructureCache:
         """Clear cache for a ticker or all tickers."""
         if ticker:
             self._cache.pop(ticker, None)
+            self._trackers.pop(ticker, None)
         else:
             self._cache.clear()
+            self._trackers.clear()
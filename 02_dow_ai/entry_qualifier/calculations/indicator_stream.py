@@ -0,0 +1,209 @@
+"""
+Incremental M1 Indicator Rows - Thin Adapter
+Epoch Trading System - XIII Trading LLC
+
+Delegates to shared.indicators.streaming (canonical incremental state).
+Produces the same per-bar dicts as calculate_all_deltas,
+calculate_all_candle_ranges, calculate_all_volume_roc and
+calculate_all_sma_configs combined, but a refresh only feeds the bars that
+arrived since the previous one instead of recomputing the whole window.
+
+Each refresh fetches the latest PREFETCH_BARS bars. All but the newest are
+treated as closed: the stream state after the last closed bar is kept, and
+the newest (possibly still forming) bar is re-applied on top of it every
+refresh. If the window no longer contains the last closed bar (first
+fetch, or the gap since the last refresh is longer than the window), or
+holds an earlier bar the stream never saw (a late backfill) or a closed
+bar whose OHLCV changed since it was fed (a revised print), the stream
+starts over from the window, which is exactly the batch result.
+Rows for bars that arrived while the stream already had history keep the
+values computed then, so they are never left in warm-up.
+
+For well-formed Polygon bars (numeric OHLC, whole-share volume) every
+value is bit-identical to the batch functions.
+
+SWH-6: Single source of truth - shared.indicators
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.indicators.streaming import (
+    CandleRangeStream,
+    SMASpreadStream,
+    VolumeDeltaStream,
+    VolumeROCStream,
+)
+
+from calculations.sma_config import (
+    calculate_sma_spread_pct,
+    format_sma_display,
+    get_price_position,
+    get_sma_config,
+)
+from calculations.volume_roc import DEFAULT_LOOKBACK, is_elevated_volume
+
+
+_EMPTY_SMA = {
+    'sma9': None,
+    'sma21': None,
+    'sma_config': None,
+    'sma_spread_pct': None,
+    'price_position': None,
+    'sma_display': None
+}
+
+
+def _bar_key(bar: dict) -> tuple:
+    """Timestamp and OHLCV of a bar; a changed key means Polygon revised the bar."""
+    return (
+        bar.get('timestamp'),
+        bar.get('open', bar.get('o')),
+        bar.get('high', bar.get('h')),
+        bar.get('low', bar.get('l')),
+        bar.get('close', bar.get('c')),
+        bar.get('volume', bar.get('v')),
+    )
+
+
+class M1IndicatorStream:
+    """
+    Per-ticker incremental state for the entry qualifier's M1 indicator columns.
+
+    sync(bars) returns one row per bar with the keys of the calculate_all_*
+    dicts: raw_delta, roll_delta, candle_range_pct, is_absorption,
+    volume_roc, is_elevated, sma9, sma21, sma_config, sma_spread_pct,
+    price_position, sma_display.
+    """
+
+    def __init__(self, roll_period: int = 5, lookback: int = DEFAULT_LOOKBACK):
+        self.roll_period = roll_period
+        self.delta = VolumeDeltaStream(roll_period)
+        self.volume_roc = VolumeROCStream(lookback)
+        self.sma = SMASpreadStream()
+        self.candle_range = CandleRangeStream()
+
+        self._rows: Dict[Any, Tuple[tuple, dict]] = {}   # bar timestamp -> (bar key fed, row)
+        self._closed_ts: Optional[Any] = None     # timestamp of the last closed bar fed
+        self._closed_state: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget all bars."""
+        for stream in (self.delta, self.volume_roc, self.sma):
+            stream.reset()
+        self._rows = {}
+        self._closed_ts = None
+        self._closed_state = None
+
+    def sync(self, bars: List[dict]) -> List[dict]:
+        """
+        Bring the stream up to date with a fetch window and return its rows.
+
+        Args:
+            bars: Latest M1 bars, oldest first, with a 'timestamp' key
+
+        Returns:
+            List of row dicts aligned with bars
+        """
+        if not bars:
+            return []
+
+        with self._lock:
+            positions = {bar.get('timestamp'): i for i, bar in enumerate(bars)}
+            closed_pos = None if self._closed_ts is None else positions.get(self._closed_ts)
+            # Replay if a bar up to the last closed one is new or was revised
+            if closed_pos is not None and any(
+                    self._rows.get(key[0], (None,))[0] != key
+                    for key in map(_bar_key, bars[:closed_pos + 1])):
+                closed_pos = None
+
+            if closed_pos is None:
+                self.reset()
+                start = 0
+            else:
+                self._restore()
+                start = closed_pos + 1
+
+            # Everything before the newest bar is closed
+            for bar in bars[start:-1]:
+                self._rows[bar.get('timestamp')] = (_bar_key(bar), self._update(bar))
+            if start < len(bars) - 1:
+                self._closed_ts = bars[-2].get('timestamp')
+                self._closed_state = self._snapshot()
+
+            self._rows[bars[-1].get('timestamp')] = (_bar_key(bars[-1]), self._update(bars[-1]))
+
+            # Drop rows that fell out of the window
+            self._rows = {ts: self._rows[ts] for ts in positions}
+            return [self._rows[bar.get('timestamp')][1] for bar in bars]
+
+    def _snapshot(self) -> dict:
+        return {
+            'delta': self.delta.snapshot(),
+            'volume_roc': self.volume_roc.snapshot(),
+            'sma': self.sma.snapshot(),
+        }
+
+    def _restore(self):
+        self.delta.restore(self._closed_state['delta'])
+        self.volume_roc.restore(self._closed_state['volume_roc'])
+        self.sma.restore(self._closed_state['sma'])
+
+    def _update(self, bar: dict) -> dict:
+        """Feed one bar and build its row."""
+        rolling = self.delta.update(bar)
+        candle_range = self.candle_range.update(bar)
+        roc = self.volume_roc.update(bar).roc
+        sma = self.sma.update(bar)
+
+        row = {
+            'raw_delta': self.delta.last_delta.bar_delta,
+            'roll_delta': rolling.rolling_delta if rolling.bar_count >= self.roll_period else None,
+            'candle_range_pct': candle_range.candle_range_pct,
+            'is_absorption': candle_range.is_absorption,
+            'volume_roc': roc,
+            'is_elevated': roc is not None and is_elevated_volume(roc),
+        }
+
+        if sma.sma9 is None or sma.sma21 is None:
+            row.update(_EMPTY_SMA)
+        else:
+            close = bar.get('close', bar.get('c', 0))
+            config = get_sma_config(sma.sma9, sma.sma21)
+            spread_pct = calculate_sma_spread_pct(sma.sma9, sma.sma21, close)
+            row.update({
+                'sma9': sma.sma9,
+                'sma21': sma.sma21,
+                'sma_config': config,
+                'sma_spread_pct': spread_pct,
+                'price_position': get_price_position(close, sma.sma9, sma.sma21),
+                'sma_display': format_sma_display(config, spread_pct)
+            })
+        return row
+
+
+class M1IndicatorStreamCache:
+    """One M1IndicatorStream per ticker, shared across DataWorker threads."""
+
+    def __init__(self, roll_period: int = 5, lookback: int = DEFAULT_LOOKBACK):
+        self.roll_period = roll_period
+        self.lookback = lookback
+        self._streams: Dict[str, M1IndicatorStream] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str) -> M1IndicatorStream:
+        """Stream for ticker, created on first use."""
+        with self._lock:
+            stream = self._streams.get(ticker)
+            if stream is None:
+                stream = M1IndicatorStream(self.roll_period, self.lookback)
+                self._streams[ticker] = stream
+            return stream
+
+    def clear(self, ticker: Optional[str] = None):
+        """Drop one ticker's stream, or all of them."""
+        with self._lock:
+            if ticker is None:
+                self._streams.clear()
+            else:
+                self._streams.pop(ticker, None)
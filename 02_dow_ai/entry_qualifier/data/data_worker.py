@@ -19,12 +19,8 @@ from PyQt6.QtCore import QThread, pyqtSignal
 from typing import Dict, List, Any
 
 from data.api_client import PolygonClient
-from calculations.volume_delta import calculate_all_deltas
-from calculations.candle_range import calculate_all_candle_ranges
-from calculations.volume_roc import calculate_all_volume_roc
-from calculations.sma_config import calculate_all_sma_configs
+from calculations.indicator_stream import M1IndicatorStreamCache
 from calculations.h1_structure import (
-    calculate_structure_for_bars,
     H1StructureCache,
     StructureCache,
     MarketStructure
@@ -37,6 +33,9 @@ _h1_cache = H1StructureCache()
 _m5_cache = StructureCache(300_000)    # 5 minutes in ms
 _m15_cache = StructureCache(900_000)   # 15 minutes in ms
 
+# Per-ticker incremental M1 indicator state (shared across workers)
+_indicator_streams = M1IndicatorStreamCache(roll_period=VOL_DELTA_ROLL_PERIOD, lookback=VOL_ROC_LOOKBACK)
+
 
 class DataWorker(QThread):
     """
@@ -110,17 +109,9 @@ class DataWorker(QThread):
             self.error_occurred.emit(ticker, "No data available")
             return
 
-        # Calculate deltas
-        delta_results = calculate_all_deltas(bars, roll_period=VOL_DELTA_ROLL_PERIOD)
-
-        # Calculate candle ranges
-        range_results = calculate_all_candle_ranges(bars)
-
-        # Calculate volume ROC
-        vol_roc_results = calculate_all_volume_roc(bars, lookback=VOL_ROC_LOOKBACK)
-
-        # Calculate SMA configurations
-        sma_results = calculate_all_sma_configs(bars)
+        # Delta, candle range, volume ROC and SMA config - only bars new
+        # since the last refresh are computed
+        indicator_rows = _indicator_streams.get(ticker).sync(bars)
 
         # Fetch/use cached structure bars and calculate structure for each timeframe
         h1_results = self._get_h1_structure(ticker, bars)
@@ -129,8 +120,8 @@ class DataWorker(QThread):
 
         # Combine bar data with calculations
         processed_bars = []
-        for i, (bar, delta, candle_range, vol_roc, sma, h1, m5, m15) in enumerate(
-            zip(bars, delta_results, range_results, vol_roc_results, sma_results, h1_results, m5_results, m15_results)
+        for i, (bar, row, h1, m5, m15) in enumerate(
+            zip(bars, indicator_rows, h1_results, m5_results, m15_results)
         ):
             processed_bars.append({
                 'timestamp': bar['timestamp'],
@@ -139,16 +130,16 @@ class DataWorker(QThread):
                 'low': bar['low'],
                 'close': bar['close'],
                 'volume': bar['volume'],
-                'raw_delta': delta['raw_delta'],
-                'roll_delta': delta['roll_delta'],
-                'candle_range_pct': candle_range['candle_range_pct'],
-                'is_absorption': candle_range['is_absorption'],
-                'volume_roc': vol_roc['volume_roc'],
-                'is_elevated_volume': vol_roc['is_elevated'],
-                'sma_config': sma['sma_config'],
-                'sma_spread_pct': sma['sma_spread_pct'],
-                'sma_display': sma['sma_display'],
-                'price_position': sma['price_position'],
+                'raw_delta': row['raw_delta'],
+                'roll_delta': row['roll_delta'],
+                'candle_range_pct': row['candle_range_pct'],
+                'is_absorption': row['is_absorption'],
+                'volume_roc': row['volume_roc'],
+                'is_elevated_volume': row['is_elevated'],
+                'sma_config': row['sma_config'],
+                'sma_spread_pct': row['sma_spread_pct'],
+                'sma_display': row['sma_display'],
+                'price_position': row['price_position'],
                 'm5_structure': m5['h1_structure'],    # reuses h1_structure key from calculate_structure_for_bars
                 'm5_display': m5['h1_display'],
                 'm15_structure': m15['h1_structure'],
@@ -196,8 +187,8 @@ class DataWorker(QThread):
                 return [{'h1_structure': MarketStructure.NEUTRAL, 'h1_display': 'N'}
                         for _ in m1_bars]
 
-        # Calculate structure for each M1 bar
-        return calculate_structure_for_bars(h1_bars, m1_bars)
+        # Structure for each M1 bar (memoized per HTF prefix in the cache)
+        return _h1_cache.structure_for_bars(ticker, m1_bars)
 
     def _get_m5_structure(self, ticker: str, m1_bars: List[dict]) -> List[dict]:
         """
@@ -231,7 +222,7 @@ class DataWorker(QThread):
                 return [{'h1_structure': MarketStructure.NEUTRAL, 'h1_display': 'N'}
                         for _ in m1_bars]
 
-        return calculate_structure_for_bars(m5_bars, m1_bars)
+        return _m5_cache.structure_for_bars(ticker, m1_bars)
 
     def _get_m15_structure(self, ticker: str, m1_bars: List[dict]) -> List[dict]:
         """
@@ -265,7 +256,7 @@ class DataWorker(QThread):
                 return [{'h1_structure': MarketStructure.NEUTRAL, 'h1_display': 'N'}
                         for _ in m1_bars]
 
-        return calculate_structure_for_bars(m15_bars, m1_bars)
+        return _m15_cache.structure_for_bars(ticker, m1_bars)
 
     def set_force_h1_refresh(self, force: bool = True):
         """Set flag to force H1 data refresh on next fetch."""
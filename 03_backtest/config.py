@@ -34,6 +34,18 @@ API_DELAY = 0.25  # Seconds between API calls
 API_RETRIES = 3
 API_RETRY_DELAY = 2.0
 
+# =============================================================================
+# PARALLEL BACKTEST (multi-date / multi-ticker runs)
+# =============================================================================
+BACKTEST_WORKERS = 4             # Worker processes for ticker-date jobs
+BACKTEST_CHUNKS_PER_WORKER = 4   # Job chunks per worker (load balancing)
+
+# =============================================================================
+# SECONDARY PIPELINE (in-process secondary processors)
+# =============================================================================
+SECONDARY_WORKERS = 4                           # Processor nodes run concurrently
+SECONDARY_WATERMARK_TABLE = "secondary_watermarks_2"  # Trade IDs settled per node
+
 # =============================================================================
 # TRADING SESSION TIMES (Eastern Time)
 # =============================================================================
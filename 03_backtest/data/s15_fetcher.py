@@ -7,16 +7,18 @@ XIII Trading LLC
 
 Fetches S15 (15-second) bar data from Polygon API for refined entry detection.
 Used in hybrid model where S15 bars trigger entries and M5 bars manage exits.
+Bars are read through the shared local bar store, so backtest replays only
+hit the API for ticker-dates never fetched before.
 ================================================================================
 """
 import sys
 from pathlib import Path
-import requests
-import time as time_module
 from datetime import datetime, date, time, timedelta
 from dataclasses import dataclass
 from typing import List, Optional
+import pandas as pd
 import pytz
+from shared.data.bar_store import PolygonAggsUpstream, UpstreamError, read_bars
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -47,17 +49,19 @@ class S15Fetcher:
     EASTERN = pytz.timezone('America/New_York')
     MIN_PREMARKET_BARS = 800
 
-    def __init__(self, api_key: str = None, rate_limit_delay: float = 0.25):
+    def __init__(self, api_key: str = None, rate_limit_delay: float = None, limiter=None):
+        """
+        Args:
+            api_key: Polygon API key (uses config if not provided)
+            rate_limit_delay: Deprecated; extra spacing between this fetcher's
+                requests (seconds) on top of the shared limiter
+            limiter: RateLimiter to pace requests (defaults to the shared one)
+        """
         self.api_key = api_key or POLYGON_API_KEY
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
-
-    def _rate_limit(self):
-        """Enforce rate limiting between API calls."""
-        elapsed = time_module.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time_module.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time_module.time()
+        self._upstream = PolygonAggsUpstream(
+            self.api_key, rate_limit_delay=rate_limit_delay, limiter=limiter
+        )
 
     def _get_prior_trading_day(self, trade_date: date) -> date:
         """Get the prior trading day (skip weekends)."""
@@ -85,54 +89,36 @@ class S15Fetcher:
 
     def fetch_bars(self, ticker: str, from_date: str, to_date: str,
                    from_time: str = "00:00", to_time: str = "23:59") -> List[S15Bar]:
-        """Fetch S15 bars from Polygon API."""
-        url = f"{self.BASE_URL}/v2/aggs/ticker/{ticker}/range/15/second/{from_date}/{to_date}"
-
-        params = {
-            'apiKey': self.api_key,
-            'adjusted': 'true',
-            'sort': 'asc',
-            'limit': 50000
-        }
-
+        """Fetch S15 bars (read through the shared local bar store)."""
         try:
-            self._rate_limit()
-            response = requests.get(url, params=params, timeout=30)
-
-            if response.status_code != 200:
-                print(f"  S15 API error: {response.status_code}")
-                return []
-
-            data = response.json()
-
-            if data.get('status') not in ['OK', 'DELAYED']:
-                print(f"  S15 API status: {data.get('status')}")
-                return []
-
-            if 'results' not in data or not data['results']:
-                return []
-
-            bars = []
-            for result in data['results']:
-                ts = datetime.fromtimestamp(result['t'] / 1000, tz=self.EASTERN)
-                bar = S15Bar(
-                    timestamp=ts,
-                    open=result['o'],
-                    high=result['h'],
-                    low=result['l'],
-                    close=result['c'],
-                    volume=int(result['v']),
-                    vwap=result.get('vw'),
-                    transactions=result.get('n')
-                )
-                bars.append(bar)
-
-            return bars
-
+            raw = read_bars(
+                ticker, 15, 'second',
+                self._parse_date(from_date), self._parse_date(to_date),
+                self._upstream,
+            )
+        except UpstreamError as e:
+            print(f"  S15 API error: {e}")
+            return []
         except Exception as e:
             print(f"  S15 fetch error: {e}")
             return []
 
+        bars = []
+        for t, o, h, l, c, v, vw, n in raw[['t', 'o', 'h', 'l', 'c', 'v', 'vw', 'n']].itertuples(index=False):
+            bar = S15Bar(
+                timestamp=datetime.fromtimestamp(t / 1000, tz=self.EASTERN),
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=int(v),
+                vwap=None if pd.isna(vw) else vw,
+                transactions=None if pd.isna(n) else int(n)
+            )
+            bars.append(bar)
+
+        return bars
+
     def fetch_bars_extended(self, ticker: str, trade_date: str,
                             include_premarket: bool = True,
                             include_afterhours: bool = True) -> List[S15Bar]:
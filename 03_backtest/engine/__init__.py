@@ -1,3 +1,4 @@
 # Engine package
 from .trade_simulator import TradeSimulator, EntryRecord
-from .entry_models import EntryDetector, EntrySignal
+from .entry_models import EntryDetector, EntrySignal, detect_session_signals
+from .backtest_scheduler import BacktestScheduler, TickerDateJob, JobResult, detect_entries
@@ -0,0 +1,338 @@
+"""
+================================================================================
+EPOCH TRADING SYSTEM - MODULE 03: BACKTEST RUNNER v4.0
+Backtest Scheduler - Parallel Entry Detection over Ticker-Dates
+XIII Trading LLC
+================================================================================
+
+Runs S15 entry detection for every (date, ticker) in a date range across a
+process pool.
+
+- One job per ticker-date; jobs are ordered by date, then ticker (the order
+  run_backtest_for_date walks them)
+- Jobs are grouped into chunks; each chunk runs in one worker, which fetches
+  the next job's S15 bars on a background thread while the current job is
+  simulated
+- Every job gets its own TradeSimulator (and so its own EntryDetector); no
+  detector state crosses ticker-dates or workers
+- Results are slotted back by job index, so the EntryRecord list (and every
+  trade_id) is identical to the sequential run regardless of completion order
+- The Polygon rate limiter is switched to cross-process mode before the
+  process pool starts, so all workers draw from one request budget
+
+USAGE:
+    scheduler = BacktestScheduler(max_workers=4)
+    entries = scheduler.run("2026-01-05", "2026-01-23")
+================================================================================
+"""
+import math
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import BACKTEST_WORKERS, BACKTEST_CHUNKS_PER_WORKER
+from shared.indicators import BarArray
+from engine.trade_simulator import TradeSimulator, EntryRecord
+
+
+@dataclass
+class TickerDateJob:
+    """One ticker on one trading date, with its zones."""
+    index: int
+    trade_date: str
+    ticker: str
+    primary_zone: Optional[dict]
+    secondary_zone: Optional[dict]
+
+
+@dataclass
+class JobResult:
+    """Entries detected for one job (error set if its fetch or detection failed)."""
+    index: int
+    ticker: str
+    trade_date: str
+    entries: List[EntryRecord]
+    bar_count: int = 0
+    error: Optional[str] = None
+
+
+def detect_entries(ticker: str, trade_date: str, s15_bars: List,
+                   primary_zone: Optional[dict],
+                   secondary_zone: Optional[dict]) -> List[EntryRecord]:
+    """
+    Run entry detection for one ticker-date on a fresh simulator.
+
+    Shared by run_backtest_for_date and the scheduler workers so both walk
+    the bars identically. The whole session is evaluated in batch mode.
+    """
+    simulator = TradeSimulator(ticker=ticker, trade_date=trade_date)
+    simulator.set_zones(primary_zone=primary_zone, secondary_zone=secondary_zone)
+
+    # One column pass over the S15Bar list; the detector reads the columns directly
+    bars = BarArray.from_bars(s15_bars, timestamps=False)
+    simulator.process_session_entries_only(
+        [bar.timestamp for bar in s15_bars], bars.open, bars.high, bars.low, bars.close,
+    )
+
+    return simulator.get_entries()
+
+
+def trading_dates(start_date: Union[str, date], end_date: Union[str, date, None] = None) -> List[str]:
+    """Weekdays in [start_date, end_date] as YYYY-MM-DD strings."""
+    start = datetime.strptime(start_date, '%Y-%m-%d').date() if isinstance(start_date, str) else start_date
+    if end_date is None:
+        end = start
+    else:
+        end = datetime.strptime(end_date, '%Y-%m-%d').date() if isinstance(end_date, str) else end_date
+
+    dates = []
+    current = start
+    while current <= end:
+        if current.weekday() < 5:
+            dates.append(current.strftime('%Y-%m-%d'))
+        current += timedelta(days=1)
+    return dates
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+def default_fetcher_factory():
+    """S15 fetcher used by workers unless another factory is given."""
+    from config import POLYGON_API_KEY
+    from data.s15_fetcher import S15Fetcher
+    return S15Fetcher(POLYGON_API_KEY)
+
+
+# One fetcher per worker process (per factory), created on first use
+_worker_fetchers: Dict[Callable, object] = {}
+_worker_fetchers_lock = threading.Lock()
+
+
+def _worker_fetcher(fetcher_factory: Callable):
+    with _worker_fetchers_lock:
+        if fetcher_factory not in _worker_fetchers:
+            _worker_fetchers[fetcher_factory] = fetcher_factory()
+        return _worker_fetchers[fetcher_factory]
+
+
+def run_job_chunk(jobs: List[TickerDateJob], fetcher_factory: Callable = default_fetcher_factory) -> List[JobResult]:
+    """
+    Worker entry point: run a chunk of jobs in order.
+
+    The next job's S15 bars are fetched on a background thread while the
+    current job is simulated. A failed fetch or detection fails only its
+    own job.
+    """
+    fetcher = _worker_fetcher(fetcher_factory)
+    results = []
+
+    def fetch(job: TickerDateJob):
+        return fetcher.fetch_bars_extended(job.ticker, job.trade_date)
+
+    with ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending = prefetch.submit(fetch, jobs[0]) if jobs else None
+
+        for position, job in enumerate(jobs):
+            try:
+                s15_bars, error = pending.result(), None
+            except Exception as e:
+                s15_bars, error = [], f"S15 fetch failed: {e}"
+
+            if position + 1 < len(jobs):
+                pending = prefetch.submit(fetch, jobs[position + 1])
+
+            entries = []
+            if s15_bars:
+                try:
+                    entries = detect_entries(
+                        job.ticker, job.trade_date, s15_bars,
+                        job.primary_zone, job.secondary_zone
+                    )
+                except Exception as e:
+                    error = f"Entry detection failed: {e}"
+            results.append(JobResult(
+                index=job.index,
+                ticker=job.ticker,
+                trade_date=job.trade_date,
+                entries=entries,
+                bar_count=len(s15_bars or []),
+                error=error,
+            ))
+
+    return results
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class BacktestScheduler:
+    """
+    Runs entry detection for a date range and ticker set across a pool.
+    """
+
+    def __init__(self, max_workers: int = BACKTEST_WORKERS, executor: str = "process",
+                 chunks_per_worker: int = BACKTEST_CHUNKS_PER_WORKER,
+                 fetcher_factory: Callable = default_fetcher_factory,
+                 progress_callback: Optional[Callable[[JobResult, int, int], None]] = None):
+        """
+        Args:
+            max_workers: Pool size (1 runs every job in this process)
+            executor: "process" or "thread"
+            chunks_per_worker: Chunks per worker; more chunks balance load
+                better, fewer give each worker longer prefetch runs
+            fetcher_factory: Picklable zero-arg callable returning an object
+                with fetch_bars_extended(ticker, trade_date)
+            progress_callback: Called as (result, done_count, total) per job
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"executor must be 'process' or 'thread', got {executor!r}")
+        self.max_workers = max(1, max_workers)
+        self.executor = executor
+        self.chunks_per_worker = max(1, chunks_per_worker)
+        self.fetcher_factory = fetcher_factory
+        self.progress_callback = progress_callback
+
+    def build_jobs(self, start_date: Union[str, date], end_date: Union[str, date, None] = None,
+                   tickers: Optional[Iterable[str]] = None,
+                   zone_loader_cls=None) -> List[TickerDateJob]:
+        """
+        Load zones for every date and build the ordered job list.
+
+        Args:
+            start_date: First trading date
+            end_date: Last trading date (defaults to start_date)
+            tickers: Restrict to these tickers (default: every ticker with zones)
+            zone_loader_cls: Zone loader class (default SupabaseZoneLoader)
+
+        Returns:
+            Jobs ordered by date, then ticker
+        """
+        if zone_loader_cls is None:
+            from data.supabase_zone_loader import SupabaseZoneLoader
+            zone_loader_cls = SupabaseZoneLoader
+        wanted = {t.upper() for t in tickers} if tickers else None
+
+        jobs = []
+        for trade_date in trading_dates(start_date, end_date):
+            try:
+                zone_loader = zone_loader_cls(trade_date, verbose=False)
+            except Exception as e:
+                print(f"  {trade_date}: failed to load zones: {e}")
+                continue
+            try:
+                primary_zones, secondary_zones = zone_loader.load_all_zones()
+                day_tickers = sorted({z.ticker for z in primary_zones} | {z.ticker for z in secondary_zones})
+                for ticker in day_tickers:
+                    if wanted is not None and ticker.upper() not in wanted:
+                        continue
+                    primary = next((z for z in primary_zones if z.ticker == ticker), None)
+                    secondary = next((z for z in secondary_zones if z.ticker == ticker), None)
+                    jobs.append(TickerDateJob(
+                        index=len(jobs),
+                        trade_date=trade_date,
+                        ticker=ticker,
+                        primary_zone=zone_loader.get_zone_dict(primary) if primary else None,
+                        secondary_zone=zone_loader.get_zone_dict(secondary) if secondary else None,
+                    ))
+            finally:
+                zone_loader.close()
+        return jobs
+
+    def chunk_jobs(self, jobs: List[TickerDateJob]) -> List[List[TickerDateJob]]:
+        """Split jobs into contiguous chunks (consecutive jobs share a worker)."""
+        if not jobs:
+            return []
+        n_chunks = min(len(jobs), self.max_workers * self.chunks_per_worker)
+        size = math.ceil(len(jobs) / n_chunks)
+        return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+    def run_jobs(self, jobs: List[TickerDateJob]) -> List[JobResult]:
+        """
+        Run jobs and return one JobResult per job, in job order.
+
+        A chunk whose worker raised (or crashed) marks each of its jobs
+        failed; the rest of the run continues.
+        """
+        results: List[Optional[JobResult]] = [None] * len(jobs)
+        position = {job.index: i for i, job in enumerate(jobs)}
+        done = 0
+
+        def collect(chunk_results: List[JobResult]):
+            nonlocal done
+            for result in chunk_results:
+                results[position[result.index]] = result
+                done += 1
+                if self.progress_callback:
+                    self.progress_callback(result, done, len(jobs))
+
+        chunks = self.chunk_jobs(jobs)
+        if self.max_workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                collect(self._run_chunk_safely(chunk))
+            return results
+
+        if self.executor == "process":
+            self._share_rate_limiter()
+        pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=min(self.max_workers, len(chunks))) as pool:
+            futures = {pool.submit(run_job_chunk, chunk, self.fetcher_factory): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_results = future.result()
+                except Exception as e:
+                    chunk_results = self._failed_chunk(futures[future], f"Worker failed: {e}")
+                collect(chunk_results)
+
+        return results
+
+    @staticmethod
+    def _share_rate_limiter():
+        """Put the Polygon rate limiter in cross-process mode before workers start."""
+        from shared.data.rate_limiter import share_across_processes
+        share_across_processes()
+
+    def _run_chunk_safely(self, chunk: List[TickerDateJob]) -> List[JobResult]:
+        try:
+            return run_job_chunk(chunk, self.fetcher_factory)
+        except Exception as e:
+            return self._failed_chunk(chunk, f"Worker failed: {e}")
+
+    @staticmethod
+    def _failed_chunk(chunk: List[TickerDateJob], error: str) -> List[JobResult]:
+        return [JobResult(job.index, job.ticker, job.trade_date, [], error=error) for job in chunk]
+
+    def run(self, start_date: Union[str, date], end_date: Union[str, date, None] = None,
+            tickers: Optional[Iterable[str]] = None) -> List[EntryRecord]:
+        """
+        Entry detection for every ticker-date in the range.
+
+        Returns:
+            EntryRecords in the order the sequential per-date run produces them
+        """
+        return flatten_entries(self.run_jobs(self.build_jobs(start_date, end_date, tickers)))
+
+
+def flatten_entries(results: List[JobResult]) -> List[EntryRecord]:
+    """Concatenate job entries in job order."""
+    entries = []
+    for result in results:
+        entries.extend(result.entries)
+    return entries
+
+
+def group_by_date(entries: List[EntryRecord]) -> Dict[str, List[EntryRecord]]:
+    """EntryRecords keyed by trade date (insertion-ordered)."""
+    grouped: Dict[str, List[EntryRecord]] = {}
+    for entry in entries:
+        grouped.setdefault(entry.date, []).append(entry)
+    return grouped
@@ -17,14 +17,22 @@ EPCH2 - PRIMARY ZONE REJECTION (price rejecting from zone):
 
 EPCH3 - SECONDARY ZONE CONTINUATION: Same as EPCH1, using Secondary Zone
 EPCH4 - SECONDARY ZONE REJECTION: Same as EPCH2, using Secondary Zone
+
+MODES:
+    EntryDetector           - streaming, one bar at a time (live use)
+    detect_session_signals  - batch, a whole session of OHLC arrays at once
+                              (backtests); emits the same signals in the same
+                              order as the streaming detector
 ================================================================================
 """
 import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Sequence
 from datetime import datetime
 
+import numpy as np
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -271,3 +279,135 @@ class EntryDetector:
     def reset(self):
         """Reset detector state"""
         self.bar_history.clear()
+
+
+# =============================================================================
+# BATCH MODE (whole session)
+# =============================================================================
+
+def _history_lengths(n: int) -> np.ndarray:
+    """
+    Bars held in EntryDetector.bar_history when bar i is evaluated.
+
+    The streaming history grows to MAX_LOOKBACK_BARS + 11 entries and is
+    then cut back to MAX_LOOKBACK_BARS, so once full its length cycles with
+    period 11. Price-origin lookups only see that window.
+    """
+    idx = np.arange(n)
+    trim_at = MAX_LOOKBACK_BARS + 10
+    period = trim_at + 1 - MAX_LOOKBACK_BARS
+    return np.where(idx <= trim_at, idx, MAX_LOOKBACK_BARS + (idx - trim_at - 1) % period)
+
+
+def _price_origins(closes: np.ndarray, zone_high: float, zone_low: float,
+                   lengths: np.ndarray):
+    """
+    Price origin for every bar, as (below, above) masks.
+
+    The most recent prior close outside the zone comes from a running
+    maximum of outside-bar indices, so every lookup is O(1).
+    """
+    n = len(closes)
+    idx = np.arange(n)
+    outside = (closes < zone_low) | (closes > zone_high)
+    last_outside = np.maximum.accumulate(np.where(outside, idx, -1))
+    prior = np.empty(n, dtype=np.int64)
+    prior[:1] = -1
+    prior[1:] = last_outside[:-1]
+
+    found = (prior >= 0) & (prior >= idx - lengths)
+    prior_below = closes[np.maximum(prior, 0)] < zone_low
+    return found & prior_below, found & ~prior_below
+
+
+def _zone_signal_masks(opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                       closes: np.ndarray, zone_high: float, zone_low: float,
+                       lengths: np.ndarray):
+    """EPCH continuation/rejection LONG/SHORT masks for one zone, in streaming order."""
+    opens_below = opens < zone_low
+    opens_above = opens > zone_high
+    opens_inside = (zone_low <= opens) & (opens <= zone_high)
+    closes_above = closes > zone_high
+    closes_below = closes < zone_low
+    origin_below, origin_above = _price_origins(closes, zone_high, zone_low, lengths)
+
+    inside_up = opens_inside & closes_above
+    inside_down = opens_inside & closes_below
+    return [
+        ('continuation', 'LONG', (opens_below & closes_above) | (inside_up & origin_below)),
+        ('continuation', 'SHORT', (opens_above & closes_below) | (inside_down & origin_above)),
+        ('rejection', 'LONG', (opens_above & (lows <= zone_high) & closes_above) | (inside_up & origin_above)),
+        ('rejection', 'SHORT', (opens_below & (highs >= zone_low) & closes_below) | (inside_down & origin_below)),
+    ]
+
+
+def detect_session_signals(times: Sequence[datetime], opens, highs, lows, closes,
+                           primary_zone: Optional[dict] = None,
+                           secondary_zone: Optional[dict] = None) -> List[EntrySignal]:
+    """
+    Evaluate EPCH1-4 over a whole session at once.
+
+    Equivalent to feeding every bar through a fresh EntryDetector
+    (check_all_entries, then update_prior_bar), including the bounded
+    price-origin lookback.
+
+    Args:
+        times: Bar timestamps (bar_index is the position in this sequence)
+        opens, highs, lows, closes: Bar prices, same length as times
+        primary_zone: Dict with zone_high/zone_low (EPCH1/2)
+        secondary_zone: Dict with zone_high/zone_low (EPCH3/4)
+
+    Returns:
+        Signals ordered by bar, then in check_all_entries order
+    """
+    n = len(times)
+    if n == 0:
+        return []
+    opens = np.asarray(opens, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+
+    in_window = np.fromiter(
+        (ENTRY_START_TIME <= t.time() <= ENTRY_END_TIME for t in times), dtype=bool, count=n
+    )
+    lengths = _history_lengths(n)
+
+    models = {
+        ('PRIMARY', 'continuation'): 'EPCH1', ('PRIMARY', 'rejection'): 'EPCH2',
+        ('SECONDARY', 'continuation'): 'EPCH3', ('SECONDARY', 'rejection'): 'EPCH4',
+    }
+    kinds = []
+    bar_parts, kind_parts = [], []
+    for zone_type, zone in (('PRIMARY', primary_zone), ('SECONDARY', secondary_zone)):
+        if not zone:
+            continue
+        zone_high, zone_low = zone['zone_high'], zone['zone_low']
+        for setup, direction, mask in _zone_signal_masks(opens, highs, lows, closes,
+                                                         zone_high, zone_low, lengths):
+            bars = np.flatnonzero(mask & in_window)
+            bar_parts.append(bars)
+            kind_parts.append(np.full(len(bars), len(kinds)))
+            kinds.append((models[(zone_type, setup)], zone_type, direction, zone_high, zone_low))
+
+    if not kinds:
+        return []
+    bars = np.concatenate(bar_parts)
+    kind_ids = np.concatenate(kind_parts)
+    order = np.lexsort((kind_ids, bars))
+
+    signals = []
+    for bar_idx, kind_id in zip(bars[order].tolist(), kind_ids[order].tolist()):
+        model_name, zone_type, direction, zone_high, zone_low = kinds[kind_id]
+        signals.append(EntrySignal(
+            model=ENTRY_MODELS[model_name],
+            model_name=model_name,
+            zone_type=zone_type,
+            direction=direction,
+            entry_price=float(closes[bar_idx]),
+            entry_time=times[bar_idx],
+            bar_index=bar_idx,
+            zone_high=zone_high,
+            zone_low=zone_low
+        ))
+    return signals
@@ -17,14 +17,14 @@ TRADE_ID FORMAT: {ticker}_{MMDDYY}_{model}_{HHMM}
 import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from datetime import datetime
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import VERBOSE
-from engine.entry_models import EntrySignal, EntryDetector
+from engine.entry_models import EntrySignal, EntryDetector, detect_session_signals
 
 
 @dataclass
@@ -83,32 +83,51 @@ class TradeSimulator:
         )
 
         for signal in signals:
-            trade_id = generate_trade_id(self.ticker, signal.entry_time, signal.model_name)
-
-            record = EntryRecord(
-                trade_id=trade_id,
-                date=self.trade_date,
-                ticker=self.ticker,
-                model=signal.model_name,
-                zone_type=signal.zone_type,
-                direction=signal.direction,
-                zone_high=signal.zone_high,
-                zone_low=signal.zone_low,
-                entry_price=signal.entry_price,
-                entry_time=signal.entry_time
-            )
-
-            self.entries.append(record)
-            new_entries.append(record)
-
-            if VERBOSE:
-                print(f"  [{bar_time.strftime('%H:%M:%S')}] ENTRY {signal.direction} {signal.model_name} "
-                      f"@ ${signal.entry_price:.2f}")
+            new_entries.append(self._record(signal))
 
         self.entry_detector.update_prior_bar(bar_open, bar_high, bar_low, bar_close)
 
         return new_entries
 
+    def process_session_entries_only(self, bar_times: Sequence[datetime],
+                                     opens, highs, lows, closes) -> List[EntryRecord]:
+        """
+        Process a whole session of S15 bars at once (batch entry detection).
+
+        Produces the same entries as calling process_bar_entries_only for
+        every bar on a fresh simulator. Returns new entries found.
+        """
+        signals = detect_session_signals(
+            bar_times, opens, highs, lows, closes,
+            self.primary_zone, self.secondary_zone
+        )
+        return [self._record(signal) for signal in signals]
+
+    def _record(self, signal: EntrySignal) -> EntryRecord:
+        """Convert a signal to an EntryRecord and collect it."""
+        trade_id = generate_trade_id(self.ticker, signal.entry_time, signal.model_name)
+
+        record = EntryRecord(
+            trade_id=trade_id,
+            date=self.trade_date,
+            ticker=self.ticker,
+            model=signal.model_name,
+            zone_type=signal.zone_type,
+            direction=signal.direction,
+            zone_high=signal.zone_high,
+            zone_low=signal.zone_low,
+            entry_price=signal.entry_price,
+            entry_time=signal.entry_time
+        )
+
+        self.entries.append(record)
+
+        if VERBOSE:
+            print(f"  [{signal.entry_time.strftime('%H:%M:%S')}] ENTRY {signal.direction} {signal.model_name} "
+                  f"@ ${signal.entry_price:.2f}")
+
+        return record
+
     def get_entries(self) -> List[EntryRecord]:
         """Get all detected entries."""
         return self.entries
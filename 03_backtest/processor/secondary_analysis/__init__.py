@@ -15,6 +15,9 @@ Pipeline Order:
     4. m5_atr_stop_2/        - M5 ATR Stop Analysis (R-multiple targets 1R-5R)
     5. trades_m5_r_win_2/    - Trades Consolidated (denormalized for trade_reel)
 
+pipeline.py runs the processors in one process as a DAG (shared connection
+pool and M1 bar frame, concurrent independent nodes, per-node watermarks).
+
 Version: 2.1.0
 ================================================================================
 """
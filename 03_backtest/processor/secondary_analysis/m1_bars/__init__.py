@@ -47,7 +47,7 @@ from .config import (
     TRADE_DAY_END,
     SOURCE_TABLE,
     TARGET_TABLE,
-    BATCH_INSERT_SIZE
+    BULK_BATCH_SIZE
 )
 
 from .m1_bars_storage import M1BarsStorage, M1BarFetcher
@@ -63,7 +63,7 @@ __all__ = [
     'TRADE_DAY_END',
     'SOURCE_TABLE',
     'TARGET_TABLE',
-    'BATCH_INSERT_SIZE',
+    'BULK_BATCH_SIZE',
 
     # Storage
     'M1BarsStorage',
@@ -76,7 +76,7 @@ TARGET_TABLE = "m1_bars_2"       # Store 1-minute bars here (v2 extended session
 # =============================================================================
 # BATCH CONFIGURATION
 # =============================================================================
-BATCH_INSERT_SIZE = 500  # Insert bars in batches of 500
+BULK_BATCH_SIZE = 50000  # Rows per COPY + merge (shared.data.bulk_writer)
 
 # =============================================================================
 # LOGGING
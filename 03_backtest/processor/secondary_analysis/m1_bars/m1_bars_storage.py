@@ -13,22 +13,23 @@ Key Features:
 - Fetches prior day 16:00 ET through trade day 16:00 ET
 - Captures after-hours, overnight, pre-market, and full regular session
 - Fetches only missing ticker-date combinations (incremental updates)
-- Batch inserts for efficiency
+- Reads through the shared local bar store (no re-download of seen dates)
+- COPY-based bulk inserts (shared.data.bulk_writer)
 - All bars stored under the trade_date (bar_date = trade_date)
 
 Version: 2.0.0
 ================================================================================
 """
 
-import requests
 import psycopg2
-from psycopg2.extras import execute_values
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, timedelta
 from typing import List, Dict, Set, Tuple, Any, Optional
-import time as time_module
+import math
 import sys
 from pathlib import Path
 import pytz
+from shared.data.bar_store import PolygonAggsUpstream, UpstreamError, read_bars
+from shared.data.bulk_writer import bulk_write
 
 # Ensure we import from our local config
 MODULE_DIR = Path(__file__).parent
@@ -38,12 +39,11 @@ sys.path.insert(0, str(MODULE_DIR))
 from config import (
     DB_CONFIG,
     POLYGON_API_KEY,
-    API_DELAY,
     API_RETRIES,
     API_RETRY_DELAY,
     TARGET_TABLE,
     SOURCE_TABLE,
-    BATCH_INSERT_SIZE,
+    BULK_BATCH_SIZE,
     PRIOR_DAY_START,
     TRADE_DAY_END,
     VERBOSE
@@ -53,6 +53,11 @@ from config import (
 ET = pytz.timezone('America/New_York')
 UTC = pytz.UTC
 
+INSERT_COLUMNS = (
+    'ticker', 'bar_date', 'bar_time', 'bar_timestamp',
+    'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions'
+)
+
 
 def _get_prior_trading_day(trade_date: date) -> date:
     """
@@ -83,79 +88,42 @@ class M1BarFetcher:
 
     def __init__(self, api_key: str = None):
         self.api_key = api_key or POLYGON_API_KEY
-        self.last_request_time = 0
-
-    def _rate_limit(self):
-        """Enforce rate limiting between API calls."""
-        if API_DELAY > 0:
-            elapsed = time_module.time() - self.last_request_time
-            if elapsed < API_DELAY:
-                time_module.sleep(API_DELAY - elapsed)
-        self.last_request_time = time_module.time()
+        self._upstream = PolygonAggsUpstream(
+            self.api_key,
+            max_retries=API_RETRIES,
+            retry_delay=API_RETRY_DELAY,
+        )
 
     def _fetch_raw(self, ticker: str, from_date: str, to_date: str) -> List[dict]:
         """
-        Fetch raw M1 bars from Polygon API.
+        Fetch raw M1 bars (read through the shared local bar store).
 
         Returns list of bar dicts with 'timestamp', 'open', 'high', 'low',
         'close', 'volume', 'vwap', 'transactions'.
         """
-        url = f"{self.BASE_URL}/v2/aggs/ticker/{ticker}/range/1/minute/{from_date}/{to_date}"
-
-        params = {
-            'apiKey': self.api_key,
-            'adjusted': 'true',
-            'sort': 'asc',
-            'limit': 50000
-        }
+        try:
+            raw = read_bars(ticker, 1, 'minute', from_date, to_date, self._upstream)
+        except UpstreamError as e:
+            print(f"    API error: {e}")
+            return []
+        except Exception as e:
+            print(f"    Fetch error: {e}")
+            return []
 
-        for attempt in range(API_RETRIES):
-            try:
-                self._rate_limit()
-                response = requests.get(url, params=params, timeout=30)
-
-                if response.status_code == 429:
-                    wait_time = API_RETRY_DELAY * (attempt + 1)
-                    print(f"    Rate limited, waiting {wait_time}s...")
-                    time_module.sleep(wait_time)
-                    continue
-
-                if response.status_code != 200:
-                    print(f"    API error: {response.status_code}")
-                    return []
-
-                data = response.json()
-
-                if data.get('status') not in ['OK', 'DELAYED']:
-                    return []
-
-                if 'results' not in data or not data['results']:
-                    return []
-
-                bars = []
-                for r in data['results']:
-                    ts = _convert_polygon_timestamp(r['t'])
-                    bars.append({
-                        'timestamp': ts,
-                        'open': r['o'],
-                        'high': r['h'],
-                        'low': r['l'],
-                        'close': r['c'],
-                        'volume': int(r['v']),
-                        'vwap': r.get('vw'),
-                        'transactions': r.get('n')
-                    })
-
-                return bars
-
-            except requests.exceptions.Timeout:
-                print(f"    Timeout on attempt {attempt + 1}, retrying...")
-                time_module.sleep(API_RETRY_DELAY)
-            except Exception as e:
-                print(f"    Fetch error: {e}")
-                return []
-
-        return []
+        bars = []
+        for t, o, h, l, c, v, vw, n in raw[['t', 'o', 'h', 'l', 'c', 'v', 'vw', 'n']].itertuples(index=False):
+            bars.append({
+                'timestamp': _convert_polygon_timestamp(t),
+                'open': o,
+                'high': h,
+                'low': l,
+                'close': c,
+                'volume': int(v),
+                'vwap': None if math.isnan(vw) else vw,
+                'transactions': None if math.isnan(n) else int(n)
+            })
+
+        return bars
 
     def fetch_extended_session(self, ticker: str, trade_date: date) -> List[dict]:
         """
@@ -207,16 +175,19 @@ class M1BarsStorage:
     4. Insert into m1_bars table
     """
 
-    def __init__(self, fetcher: M1BarFetcher = None, verbose: bool = None):
+    def __init__(self, fetcher: M1BarFetcher = None, verbose: bool = None, bar_frame=None):
         """
         Initialize the storage manager.
 
         Args:
             fetcher: M1BarFetcher instance (creates one if not provided)
             verbose: Enable verbose logging (defaults to config value)
+            bar_frame: Optional shared M1 bar frame; stored bars are added to
+                it so downstream processors do not re-read them
         """
         self.fetcher = fetcher or M1BarFetcher()
         self.verbose = verbose if verbose is not None else VERBOSE
+        self.bar_frame = bar_frame
         self.stats = {
             'ticker_dates_processed': 0,
             'ticker_dates_skipped': 0,
@@ -231,26 +202,29 @@ class M1BarsStorage:
             prefix = {'error': '!', 'warning': '?', 'info': ' ', 'debug': '  '}
             print(f"  {prefix.get(level, ' ')} {message}")
 
-    def get_required_ticker_dates(self, conn) -> List[Tuple[str, date]]:
+    def get_required_ticker_dates(self, conn, trade_ids: List[str] = None) -> List[Tuple[str, date]]:
         """
         Get all unique (ticker, date) pairs from the trades_2 table.
 
         Args:
             conn: Database connection
+            trade_ids: Only consider these trades (default: all)
 
         Returns:
             List of (ticker, date) tuples
         """
+        trade_filter = "AND trade_id = ANY(%s)" if trade_ids is not None else ""
         query = f"""
             SELECT DISTINCT ticker, date
             FROM {SOURCE_TABLE}
             WHERE ticker IS NOT NULL
               AND date IS NOT NULL
+              {trade_filter}
             ORDER BY date DESC, ticker
         """
 
         with conn.cursor() as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             results = cur.fetchall()
 
         return [(row[0], row[1]) for row in results]
@@ -282,7 +256,8 @@ class M1BarsStorage:
     def get_missing_ticker_dates(
         self,
         conn,
-        limit: int = None
+        limit: int = None,
+        trade_ids: List[str] = None
     ) -> List[Tuple[str, date]]:
         """
         Get (ticker, date) pairs that need bar data loaded.
@@ -290,11 +265,12 @@ class M1BarsStorage:
         Args:
             conn: Database connection
             limit: Maximum number of pairs to return
+            trade_ids: Only consider ticker-dates of these trades
 
         Returns:
             List of (ticker, date) tuples not yet in m1_bars
         """
-        required = self.get_required_ticker_dates(conn)
+        required = self.get_required_ticker_dates(conn, trade_ids)
         loaded = self.get_loaded_ticker_dates(conn)
 
         missing = [td for td in required if td not in loaded]
@@ -360,20 +336,17 @@ class M1BarsStorage:
                 bar.get('transactions')
             ))
 
-        # Batch insert
-        insert_query = f"""
-            INSERT INTO {TARGET_TABLE}
-                (ticker, bar_date, bar_time, bar_timestamp,
-                 open, high, low, close, volume, vwap, transactions)
-            VALUES %s
-            ON CONFLICT (ticker, bar_timestamp) DO NOTHING
-        """
-
+        # Bulk insert (COPY into staging + merge)
         try:
-            with conn.cursor() as cur:
-                execute_values(cur, insert_query, insert_data, page_size=BATCH_INSERT_SIZE)
+            result = bulk_write(
+                conn, TARGET_TABLE, INSERT_COLUMNS, insert_data,
+                conflict_columns=('ticker', 'bar_timestamp'),
+                batch_size=BULK_BATCH_SIZE
+            )
             conn.commit()
-            self.stats['bars_inserted'] += bar_count
+            self.stats['bars_inserted'] += result.merged
+            if self.bar_frame is not None:
+                self.bar_frame.put(ticker, trade_date, INSERT_COLUMNS, insert_data)
             return bar_count
         except Exception as e:
             conn.rollback()
@@ -384,7 +357,9 @@ class M1BarsStorage:
     def run_batch_storage(
         self,
         limit: int = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        conn=None,
+        trade_ids: List[str] = None
     ) -> Dict[str, Any]:
         """
         Main entry point. Fetch and store bars for all missing ticker-dates.
@@ -392,6 +367,8 @@ class M1BarsStorage:
         Args:
             limit: Maximum ticker-date pairs to process
             dry_run: If True, fetch but don't insert
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only load ticker-dates of these trades
 
         Returns:
             Dictionary with execution statistics
@@ -416,16 +393,17 @@ class M1BarsStorage:
             'errors': []
         }
 
-        conn = None
+        owns_conn = conn is None
         try:
             # Connect to database
             print("[1/4] Connecting to Supabase...")
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             print("  Connected successfully")
 
             # Get missing ticker-dates
             print(f"\n[2/4] Finding missing ticker-date pairs (source: {SOURCE_TABLE})...")
-            missing = self.get_missing_ticker_dates(conn, limit)
+            missing = self.get_missing_ticker_dates(conn, limit, trade_ids)
             print(f"  Found {len(missing)} ticker-dates needing bar data")
 
             if not missing:
@@ -468,7 +446,7 @@ class M1BarsStorage:
             raise
 
         finally:
-            if conn:
+            if conn and owns_conn:
                 conn.close()
 
     def _finalize_stats(self, start_time: datetime) -> Dict[str, Any]:
@@ -25,7 +25,6 @@ from typing import Dict, List, Optional, Any
 import logging
 import pandas as pd
 import numpy as np
-import psycopg2
 
 # Use explicit path imports to avoid collisions with 03_indicators modules
 import importlib.util
@@ -134,7 +133,8 @@ class M1IndicatorBarsCalculator:
         self,
         indicator_calculator: M1IndicatorCalculator = None,
         structure_analyzer: StructureAnalyzer = None,
-        verbose: bool = True
+        verbose: bool = True,
+        bar_frame=None
     ):
         """
         Initialize the calculator.
@@ -143,10 +143,12 @@ class M1IndicatorBarsCalculator:
             indicator_calculator: M1IndicatorCalculator instance
             structure_analyzer: StructureAnalyzer instance
             verbose: Enable verbose logging
+            bar_frame: Optional shared M1 bar frame (read instead of the DB)
         """
         self.indicator_calculator = indicator_calculator or M1IndicatorCalculator()
         self.structure_analyzer = structure_analyzer or StructureAnalyzer()
         self.verbose = verbose
+        self.bar_frame = bar_frame
         self.logger = logging.getLogger(__name__)
 
     def _log(self, message: str, level: str = 'info'):
@@ -160,7 +162,8 @@ class M1IndicatorBarsCalculator:
         Read M1 bars from m1_bars_2 table for a given ticker-date.
 
         All bars stored under this bar_date are returned (prior day 16:00
-        through trade day 16:00), already sorted by bar_timestamp.
+        through trade day 16:00), already sorted by bar_timestamp. Served
+        from the shared bar frame when one is attached.
 
         Args:
             ticker: Stock symbol
@@ -169,6 +172,11 @@ class M1IndicatorBarsCalculator:
         Returns:
             DataFrame with columns: bar_date, bar_time, open, high, low, close, volume, vwap
         """
+        if self.bar_frame is not None:
+            return self.bar_frame.get(ticker, trade_date)[
+                ['bar_date', 'bar_time', 'open', 'high', 'low', 'close', 'volume', 'vwap']
+            ].copy()
+
         query = f"""
             SELECT bar_date, bar_time, open, high, low, close, volume, vwap
             FROM {M1_BARS_TABLE}
@@ -176,12 +184,9 @@ class M1IndicatorBarsCalculator:
             ORDER BY bar_timestamp ASC
         """
 
-        conn = psycopg2.connect(**DB_CONFIG)
-        try:
-            df = pd.read_sql_query(query, conn, params=(ticker, trade_date))
-            return df
-        finally:
-            conn.close()
+        # Pooled, column-decoded read (no connection setup per ticker-date)
+        from shared.data.db_pool import get_db_pool
+        return get_db_pool(DB_CONFIG).query_frame(query, (ticker, trade_date), label=M1_BARS_TABLE)
 
     def calculate_for_ticker_date(
         self,
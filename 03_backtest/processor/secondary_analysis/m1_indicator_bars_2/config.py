@@ -133,7 +133,7 @@ HTF_LOOKBACK_DAYS = {
 # =============================================================================
 # BATCH CONFIGURATION
 # =============================================================================
-BATCH_INSERT_SIZE = 500  # Insert bars in batches of 500
+BULK_BATCH_SIZE = 50000  # Rows per COPY + merge (shared.data.bulk_writer)
 
 # =============================================================================
 # LOGGING
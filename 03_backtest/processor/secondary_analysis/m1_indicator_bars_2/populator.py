@@ -12,7 +12,8 @@ Key Features:
 - Queries trades_2 for unique (ticker, date) pairs
 - INNER JOIN on m1_bars_2 to ensure raw data exists
 - LEFT JOIN to m1_indicator_bars_2 to find pairs not yet calculated
-- Batch insert with ON CONFLICT handling
+- Bulk COPY + merge with ON CONFLICT handling (shared.data.bulk_writer),
+  committed in whole ticker-dates of up to BULK_BATCH_SIZE rows
 - Incremental updates (only processes missing pairs)
 
 Version: 2.0.0
@@ -20,12 +21,14 @@ Version: 2.0.0
 """
 
 import psycopg2
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
 from datetime import datetime, date, time
 from typing import Dict, List, Any, Optional
 import logging
 import numpy as np
 
+from shared.data.bulk_writer import BulkWriter
+
 # Use explicit path imports to avoid collisions with 03_indicators modules
 import importlib.util
 from pathlib import Path
@@ -40,7 +43,7 @@ DB_CONFIG = _config.DB_CONFIG
 SOURCE_TABLE = _config.SOURCE_TABLE
 M1_BARS_TABLE = _config.M1_BARS_TABLE
 TARGET_TABLE = _config.TARGET_TABLE
-BATCH_INSERT_SIZE = _config.BATCH_INSERT_SIZE
+BULK_BATCH_SIZE = _config.BULK_BATCH_SIZE
 VERBOSE = _config.VERBOSE
 
 # Load local calculator
@@ -50,6 +53,20 @@ _calc_spec.loader.exec_module(_calc_mod)
 M1IndicatorBarsCalculator = _calc_mod.M1IndicatorBarsCalculator
 M1IndicatorBarResult = _calc_mod.M1IndicatorBarResult
 
+# Target columns, in the row order built by insert_results
+INSERT_COLUMNS = (
+    'ticker', 'bar_date', 'bar_time',
+    'open', 'high', 'low', 'close', 'volume',
+    'candle_range_pct', 'vol_delta_raw', 'vol_delta_roll', 'vol_delta_norm', 'vol_roc',
+    'sma9', 'sma21', 'sma_config', 'sma_spread_pct', 'price_position',
+    'vwap', 'sma_spread', 'sma_momentum_ratio', 'sma_momentum_label', 'cvd_slope',
+    'h4_structure', 'h1_structure', 'm15_structure', 'm5_structure', 'm1_structure',
+    'health_score', 'long_score', 'short_score',
+    'atr_m1', 'atr_m5', 'atr_m15',
+    'bars_in_calculation',
+)
+CONFLICT_COLUMNS = ('ticker', 'bar_date', 'bar_time')
+
 
 class M1IndicatorBarsPopulator:
     """
@@ -60,18 +77,22 @@ class M1IndicatorBarsPopulator:
     2. INNER JOIN on m1_bars_2 to ensure raw data is available
     3. LEFT JOIN to m1_indicator_bars_2 to find missing pairs
     4. For each missing pair, calculate all M1 indicator bars
-    5. Batch insert results
+    5. Bulk insert results (COPY + merge every BULK_BATCH_SIZE rows)
     """
 
-    def __init__(self, verbose: bool = None):
+    def __init__(self, verbose: bool = None, bar_frame=None):
         """
         Initialize the populator.
 
         Args:
             verbose: Enable verbose logging (defaults to config)
+            bar_frame: Optional shared M1 bar frame to read bars from
+                instead of querying m1_bars_2 per ticker-date
         """
         self.verbose = verbose if verbose is not None else VERBOSE
+        self.bar_frame = bar_frame
         self.logger = logging.getLogger(__name__)
+        self._merged_committed = 0
 
         # Statistics
         self.stats = {
@@ -107,7 +128,8 @@ class M1IndicatorBarsPopulator:
     def get_ticker_dates_needing_calculation(
         self,
         conn,
-        limit: int = None
+        limit: int = None,
+        trade_ids: List[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get unique (ticker, date) pairs that need M1 indicator bar calculation.
@@ -118,16 +140,19 @@ class M1IndicatorBarsPopulator:
         Args:
             conn: Database connection
             limit: Maximum number of ticker-dates to return
+            trade_ids: Only consider ticker-dates of these trades
 
         Returns:
             List of dicts with 'ticker' and 'date' keys
         """
+        trade_filter = "AND trade_id = ANY(%s)" if trade_ids is not None else ""
         query = f"""
             WITH unique_ticker_dates AS (
                 SELECT DISTINCT ticker, date
                 FROM {SOURCE_TABLE}
                 WHERE date IS NOT NULL
                   AND ticker IS NOT NULL
+                  {trade_filter}
             ),
             has_m1_bars AS (
                 SELECT DISTINCT ticker, bar_date as date
@@ -151,44 +176,32 @@ class M1IndicatorBarsPopulator:
             query += f" LIMIT {limit}"
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             rows = cur.fetchall()
 
         return [dict(row) for row in rows]
 
     def insert_results(
         self,
-        conn,
+        writer: BulkWriter,
         results: List[M1IndicatorBarResult]
     ) -> int:
         """
-        Insert calculation results into m1_indicator_bars_2 table.
+        Queue calculation results for m1_indicator_bars_2 on the bulk writer.
+
+        Rows are COPY'd and merged (ON CONFLICT DO NOTHING) once the writer
+        holds BULK_BATCH_SIZE rows.
 
         Args:
-            conn: Database connection
+            writer: BulkWriter for the target table
             results: List of M1IndicatorBarResult objects
 
         Returns:
-            Number of records inserted
+            Number of rows flushed to the database by this call
         """
         if not results:
             return 0
 
-        query = f"""
-            INSERT INTO {TARGET_TABLE} (
-                ticker, bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct, vol_delta_raw, vol_delta_roll, vol_delta_norm, vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct, price_position,
-                vwap, sma_spread, sma_momentum_ratio, sma_momentum_label, cvd_slope,
-                h4_structure, h1_structure, m15_structure, m5_structure, m1_structure,
-                health_score, long_score, short_score,
-                atr_m1, atr_m5, atr_m15,
-                bars_in_calculation
-            ) VALUES %s
-            ON CONFLICT (ticker, bar_date, bar_time) DO NOTHING
-        """
-
         values = []
         for r in results:
             row = (
@@ -230,10 +243,71 @@ class M1IndicatorBarsPopulator:
             )
             values.append(row)
 
-        with conn.cursor() as cur:
-            execute_values(cur, query, values, page_size=BATCH_INSERT_SIZE)
+        return writer.write(values)
 
-        return len(values)
+    def _queue_ticker_date(
+        self,
+        conn,
+        writer: BulkWriter,
+        batch: List[tuple],
+        ticker: str,
+        trade_date: date,
+        results: List[M1IndicatorBarResult]
+    ):
+        """
+        Queue one ticker-date's rows, committing whole ticker-dates only.
+
+        The open batch is committed before this ticker-date's rows would
+        spill past BULK_BATCH_SIZE, so a ticker-date is never half written
+        (get_ticker_dates_needing_calculation would treat it as done).
+
+        Args:
+            conn: Database connection
+            writer: BulkWriter for the target table
+            batch: (ticker, date) pairs buffered or flushed but not committed
+            ticker: Ticker symbol
+            trade_date: Trade date
+            results: Calculation results for this ticker-date
+        """
+        if writer.pending and writer.pending + len(results) > writer.batch_size:
+            self._commit_batch(conn, writer, batch)
+
+        batch.append((ticker, trade_date))
+        try:
+            flushed = self.insert_results(writer, results)
+        except Exception as e:
+            self._fail_batch(conn, writer, batch, e)
+            return
+
+        if flushed and not writer.pending:
+            self._commit_batch(conn, writer, batch)
+
+    def _commit_batch(self, conn, writer: BulkWriter, batch: List[tuple]):
+        """Flush and commit the open batch, counting its ticker-dates as processed."""
+        try:
+            writer.flush()
+            conn.commit()
+        except Exception as e:
+            self._fail_batch(conn, writer, batch, e)
+            return
+
+        self.stats['ticker_dates_processed'] += len(batch)
+        self.stats['bars_inserted'] += writer.result.merged - self._merged_committed
+        self._merged_committed = writer.result.merged
+        batch.clear()
+
+    def _fail_batch(self, conn, writer: BulkWriter, batch: List[tuple], error: Exception):
+        """Roll back the open batch and report every ticker-date in it as failed."""
+        conn.rollback()
+        writer.discard()
+        # Merges of the rolled-back transaction never reached the table
+        self._merged_committed = writer.result.merged
+
+        self.stats['ticker_dates_skipped'] += len(batch)
+        for ticker, trade_date in batch:
+            self.stats['errors'].append(f"{ticker} {trade_date}: {str(error)}")
+        self._log(f"Write failed, rolled back {len(batch)} ticker-dates: {error}", 'error')
+        batch.clear()
 
     def get_status(self, conn) -> Dict[str, Any]:
         """
@@ -282,7 +356,9 @@ class M1IndicatorBarsPopulator:
     def run_batch_population(
         self,
         limit: int = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        conn=None,
+        trade_ids: List[str] = None
     ) -> Dict[str, Any]:
         """
         Main entry point. Process all ticker-dates needing M1 indicator bar calculation.
@@ -290,6 +366,8 @@ class M1IndicatorBarsPopulator:
         Args:
             limit: Max ticker-dates to process
             dry_run: If True, calculate but don't write to DB
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only process ticker-dates of these trades
 
         Returns:
             Dictionary with execution statistics
@@ -315,19 +393,27 @@ class M1IndicatorBarsPopulator:
             'api_calls_made': 0,
             'errors': []
         }
+        self._merged_committed = 0
 
-        conn = None
+        owns_conn = conn is None
         calculator = None
+        writer = None
 
         try:
             # Connect to database
             print("[1/4] Connecting to Supabase...")
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             print("  Connected successfully")
+            writer = BulkWriter(
+                conn, TARGET_TABLE, INSERT_COLUMNS,
+                conflict_columns=CONFLICT_COLUMNS,
+                batch_size=BULK_BATCH_SIZE
+            )
 
             # Get ticker-dates needing calculation
             print("\n[2/4] Querying ticker-dates needing M1 indicator calculation...")
-            ticker_dates = self.get_ticker_dates_needing_calculation(conn, limit)
+            ticker_dates = self.get_ticker_dates_needing_calculation(conn, limit, trade_ids)
             print(f"  Found {len(ticker_dates)} ticker-dates to process")
 
             if not ticker_dates:
@@ -336,13 +422,16 @@ class M1IndicatorBarsPopulator:
 
             # Initialize calculator
             print("\n[3/4] Initializing calculator...")
-            calculator = M1IndicatorBarsCalculator(verbose=False)
+            calculator = M1IndicatorBarsCalculator(verbose=False, bar_frame=self.bar_frame)
             print("  Calculator ready")
 
             # Process each ticker-date
             print("\n[4/4] Processing ticker-dates...")
             total = len(ticker_dates)
 
+            # Ticker-dates whose rows are buffered or flushed but not committed
+            batch = []
+
             for i, td in enumerate(ticker_dates, 1):
                 ticker = td['ticker']
                 trade_date = td['date']
@@ -352,33 +441,35 @@ class M1IndicatorBarsPopulator:
                 try:
                     # Calculate all M1 bars for this ticker-date
                     results = calculator.calculate_for_ticker_date(ticker, trade_date)
-
+                except Exception as e:
+                    self.stats['ticker_dates_skipped'] += 1
+                    self.stats['errors'].append(f"{ticker} {trade_date}: {str(e)}")
+                    self._log(f"Error processing {ticker} {trade_date}: {e}", 'error')
+                else:
                     if results:
-                        self.stats['ticker_dates_processed'] += 1
-
                         if dry_run:
+                            self.stats['ticker_dates_processed'] += 1
                             self._log(f"[DRY-RUN] Would insert {len(results)} bars")
                         else:
-                            inserted = self.insert_results(conn, results)
-                            conn.commit()
-                            self.stats['bars_inserted'] += inserted
-                            self._log(f"Inserted {inserted} bars")
+                            self._queue_ticker_date(conn, writer, batch, ticker, trade_date, results)
+                            self._log(f"Queued {len(results)} bars ({writer.pending} pending)")
 
                         print(f"  [{i}/{total}] {ticker} {trade_date}: {len(results)} bars")
                     else:
                         self.stats['ticker_dates_skipped'] += 1
                         self._log(f"Skipped {ticker} {trade_date} (no bars)", 'debug')
 
-                except Exception as e:
-                    # Rollback to clear the aborted transaction state
-                    conn.rollback()
-                    self.stats['ticker_dates_skipped'] += 1
-                    self.stats['errors'].append(f"{ticker} {trade_date}: {str(e)}")
-                    self._log(f"Error processing {ticker} {trade_date}: {e}", 'error')
-
                 # Clear caches between ticker-dates to manage memory
                 calculator.clear_caches()
 
+            # Write the remaining partial batch
+            if not dry_run:
+                self._commit_batch(conn, writer, batch)
+                print(
+                    f"\n  Bulk write: {writer.result.staged} rows staged, "
+                    f"{writer.result.merged} inserted, {writer.result.skipped} already present"
+                )
+
             return self._build_result(start_time)
 
         except Exception as e:
@@ -390,7 +481,9 @@ class M1IndicatorBarsPopulator:
         finally:
             if calculator:
                 calculator.clear_caches()
-            if conn:
+            if writer:
+                writer.close()
+            if conn and owns_conn:
                 conn.close()
 
     def _build_result(self, start_time: datetime) -> Dict[str, Any]:
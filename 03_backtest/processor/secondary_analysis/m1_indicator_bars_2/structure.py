@@ -25,10 +25,10 @@ from datetime import datetime, date, time, timedelta
 import requests
 import time as time_module
 import pandas as pd
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import pytz
 
+from shared.indicators.structure.fractals import fractal_flags
+
 # Timezone constants for Polygon timestamp conversion
 _ET = pytz.timezone('America/New_York')
 _UTC = pytz.UTC
@@ -99,46 +99,12 @@ class MarketStructureCalculator:
         Returns:
             Tuple of (bullish_fractals, bearish_fractals) as boolean lists
         """
-        n = len(bars)
-        p = self.p
-
-        bullf = [False] * n
-        bearf = [False] * n
-
-        if n < self.length:
-            return bullf, bearf
-
-        for i in range(p, n - p):
-            high_i = float(bars[i].get('high', 0))
-            low_i = float(bars[i].get('low', 0))
-
-            # Bearish fractal (local high)
-            before_lower = all(
-                float(bars[i - j].get('high', 0)) < high_i
-                for j in range(1, p + 1)
-            )
-            after_lower = all(
-                float(bars[i + j].get('high', 0)) < high_i
-                for j in range(1, p + 1)
-            )
-
-            if before_lower and after_lower:
-                bearf[i] = True
-
-            # Bullish fractal (local low)
-            before_higher = all(
-                float(bars[i - j].get('low', 0)) > low_i
-                for j in range(1, p + 1)
-            )
-            after_higher = all(
-                float(bars[i + j].get('low', 0)) > low_i
-                for j in range(1, p + 1)
-            )
+        highs = np.array([float(b.get('high', 0)) for b in bars], dtype=np.float64)
+        lows = np.array([float(b.get('low', 0)) for b in bars], dtype=np.float64)
 
-            if before_higher and after_higher:
-                bullf[i] = True
+        bearf, bullf = fractal_flags(highs, lows, self.p)
 
-        return bullf, bearf
+        return bullf.tolist(), bearf.tolist()
 
     def calculate(self, bars: List[Dict]) -> StructureResult:
         """
@@ -433,11 +399,9 @@ class HTFBarFetcher:
         """
 
         try:
-            conn = psycopg2.connect(**self.db_config)
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (ticker, from_date, trade_date))
-                rows = cur.fetchall()
-            conn.close()
+            from shared.data.db_pool import get_db_pool
+            rows = get_db_pool(self.db_config).query_records(
+                query, (ticker, from_date, trade_date), label="h1_bars")
 
             if not rows:
                 return []
@@ -15,7 +15,7 @@ Pipeline:
     2. For each trade: query 25 bars from m1_indicator_bars_2 ending at
        the bar just before entry candle
     3. Assign bar_sequence 0-24 (chronological order)
-    4. INSERT with ON CONFLICT DO UPDATE
+    4. Bulk upsert (COPY into staging + INSERT ... ON CONFLICT DO UPDATE)
 
 Look-ahead protection: The entry candle has NOT closed when the trade is
 entered. Bar_sequence 24 is the LAST COMPLETED M1 bar before the entry
@@ -35,16 +35,28 @@ from decimal import Decimal
 from typing import List, Dict, Tuple, Optional
 
 import psycopg2
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
+from shared.data.bulk_writer import bulk_write
 
 # Self-contained imports
 from config import (
     DB_CONFIG, SOURCE_TABLES, TARGET_TABLE,
-    INDICATOR_COLUMNS, RAMP_UP_BARS, BATCH_SIZE
+    INDICATOR_COLUMNS, RAMP_UP_BARS, BULK_BATCH_SIZE
 )
 
 logger = logging.getLogger(__name__)
 
+# Target columns, in build_row order
+INSERT_COLUMNS = (
+    'trade_id', 'bar_sequence', 'ticker', 'bar_date', 'bar_time', 'open',
+    'high', 'low', 'close', 'volume', 'candle_range_pct', 'vol_delta_raw',
+    'vol_delta_roll', 'vol_delta_norm', 'vol_roc', 'sma9', 'sma21',
+    'sma_config', 'sma_spread_pct', 'sma_momentum_label', 'price_position',
+    'cvd_slope', 'm5_structure', 'm15_structure', 'h1_structure',
+    'health_score', 'long_score', 'short_score',
+)
+CONFLICT_COLUMNS = ('trade_id', 'bar_sequence')
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -110,7 +122,8 @@ class M1RampUpIndicatorPopulator:
     # STEP 1: Get eligible trades
     # -----------------------------------------------------------------
 
-    def get_eligible_trades(self, conn, limit: Optional[int] = None) -> List[dict]:
+    def get_eligible_trades(self, conn, limit: Optional[int] = None,
+                            trade_ids: Optional[List[str]] = None) -> List[dict]:
         """
         Query trades that have outcomes but are not yet in m1_ramp_up_indicator_2.
 
@@ -119,6 +132,7 @@ class M1RampUpIndicatorPopulator:
         """
         trades_table = SOURCE_TABLES['trades']
         m5_table = SOURCE_TABLES['m5_atr_stop']
+        trade_filter = "AND t.trade_id = ANY(%s)" if trade_ids is not None else ""
 
         query = f"""
             SELECT
@@ -138,6 +152,7 @@ class M1RampUpIndicatorPopulator:
                 SELECT 1 FROM {TARGET_TABLE} ru
                 WHERE ru.trade_id = t.trade_id
             )
+            {trade_filter}
             ORDER BY t.date, t.ticker, t.entry_time
         """
 
@@ -145,7 +160,7 @@ class M1RampUpIndicatorPopulator:
             query += f" LIMIT {limit}"
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             rows = cur.fetchall()
 
         if self.verbose:
@@ -192,7 +207,7 @@ class M1RampUpIndicatorPopulator:
         Build rows for m1_ramp_up_indicator_2 from a trade's ramp-up bars.
 
         Each bar gets a bar_sequence from 0 (oldest) to len(bars)-1 (newest).
-        Returns list of tuples ready for execute_values INSERT.
+        Returns list of tuples ready for bulk_write (INSERT_COLUMNS order).
         """
         rows = []
         trade_id = trade['trade_id']
@@ -246,58 +261,14 @@ class M1RampUpIndicatorPopulator:
         if not rows:
             return 0
 
-        query = f"""
-            INSERT INTO {TARGET_TABLE} (
-                trade_id, bar_sequence,
-                ticker, bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct,
-                vol_delta_raw, vol_delta_roll, vol_delta_norm,
-                vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct,
-                sma_momentum_label, price_position,
-                cvd_slope,
-                m5_structure, m15_structure, h1_structure,
-                health_score, long_score, short_score
-            ) VALUES %s
-            ON CONFLICT (trade_id, bar_sequence) DO UPDATE SET
-                ticker = EXCLUDED.ticker,
-                bar_date = EXCLUDED.bar_date,
-                bar_time = EXCLUDED.bar_time,
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume,
-                candle_range_pct = EXCLUDED.candle_range_pct,
-                vol_delta_raw = EXCLUDED.vol_delta_raw,
-                vol_delta_roll = EXCLUDED.vol_delta_roll,
-                vol_delta_norm = EXCLUDED.vol_delta_norm,
-                vol_roc = EXCLUDED.vol_roc,
-                sma9 = EXCLUDED.sma9,
-                sma21 = EXCLUDED.sma21,
-                sma_config = EXCLUDED.sma_config,
-                sma_spread_pct = EXCLUDED.sma_spread_pct,
-                sma_momentum_label = EXCLUDED.sma_momentum_label,
-                price_position = EXCLUDED.price_position,
-                cvd_slope = EXCLUDED.cvd_slope,
-                m5_structure = EXCLUDED.m5_structure,
-                m15_structure = EXCLUDED.m15_structure,
-                h1_structure = EXCLUDED.h1_structure,
-                health_score = EXCLUDED.health_score,
-                long_score = EXCLUDED.long_score,
-                short_score = EXCLUDED.short_score,
-                calculated_at = NOW()
-        """
-
-        total_inserted = 0
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i:i + BATCH_SIZE]
-            with conn.cursor() as cur:
-                execute_values(cur, query, batch)
-            total_inserted += len(batch)
-
-        return total_inserted
+        result = bulk_write(
+            conn, TARGET_TABLE, INSERT_COLUMNS, rows,
+            conflict_columns=CONFLICT_COLUMNS,
+            on_conflict='update',
+            update_extra={'calculated_at': 'NOW()'},
+            batch_size=BULK_BATCH_SIZE
+        )
+        return result.rows
 
     # -----------------------------------------------------------------
     # STATUS: Show pipeline state
@@ -351,7 +322,8 @@ class M1RampUpIndicatorPopulator:
     # -----------------------------------------------------------------
 
     def run(self, limit: Optional[int] = None,
-            dry_run: bool = False) -> Dict:
+            dry_run: bool = False, conn=None,
+            trade_ids: Optional[List[str]] = None) -> Dict:
         """
         Main entry point: populate m1_ramp_up_indicator_2.
 
@@ -363,6 +335,8 @@ class M1RampUpIndicatorPopulator:
         Args:
             limit: Maximum trades to process (None = all)
             dry_run: If True, compute but don't write to DB
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only consider these trades
 
         Returns:
             Dict with processing stats
@@ -377,14 +351,15 @@ class M1RampUpIndicatorPopulator:
             'errors': 0,
         }
 
-        conn = None
+        owns_conn = conn is None
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             conn.autocommit = False
 
             # Step 1: Get eligible trades
             print(f"\n[1/4] Querying eligible trades (with outcomes, not yet populated)...")
-            trades = self.get_eligible_trades(conn, limit)
+            trades = self.get_eligible_trades(conn, limit, trade_ids)
             stats['total_eligible'] = len(trades)
 
             if not trades:
@@ -477,7 +452,7 @@ class M1RampUpIndicatorPopulator:
             raise
 
         finally:
-            if conn:
+            if conn and owns_conn:
                 conn.close()
 
         return stats
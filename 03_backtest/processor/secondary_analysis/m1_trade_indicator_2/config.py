@@ -73,5 +73,5 @@ INDICATOR_COLUMNS = [
 # =============================================================================
 # PROCESSING
 # =============================================================================
-BATCH_SIZE = 500  # Rows per execute_values batch
+BULK_BATCH_SIZE = 50000  # Rows per COPY + merge (shared.data.bulk_writer)
 VERBOSE = True
@@ -14,7 +14,7 @@ Pipeline:
     2. For each trade: find the M1 bar from m1_indicator_bars_2 that closed
        just before the entry candle (entry_time floored to minute - 1 minute)
     3. Merge trade context + outcome + indicator values into single row
-    4. INSERT with ON CONFLICT DO UPDATE
+    4. Bulk upsert (COPY into staging + INSERT ... ON CONFLICT DO UPDATE)
 
 No indicator calculations - pure data reshaping from existing tables.
 
@@ -31,13 +31,36 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 import psycopg2
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
+from shared.data.bulk_writer import bulk_write
 
 # Self-contained imports
-from config import DB_CONFIG, SOURCE_TABLES, TARGET_TABLE, INDICATOR_COLUMNS, BATCH_SIZE
+from config import DB_CONFIG, SOURCE_TABLES, TARGET_TABLE, INDICATOR_COLUMNS, BULK_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Target columns, in build_row order
+INSERT_COLUMNS = (
+    'trade_id', 'ticker', 'date', 'direction', 'model', 'zone_type',
+    'entry_time', 'entry_price', 'is_winner', 'pnl_r', 'max_r_achieved',
+    'bar_date', 'bar_time', 'open', 'high', 'low', 'close', 'volume',
+    'candle_range_pct', 'vol_delta_raw', 'vol_delta_roll', 'vol_delta_norm',
+    'vol_roc', 'sma9', 'sma21', 'sma_config', 'sma_spread_pct',
+    'sma_momentum_label', 'price_position', 'cvd_slope', 'm5_structure',
+    'm15_structure', 'h1_structure', 'health_score', 'long_score',
+    'short_score',
+)
+CONFLICT_COLUMNS = ('trade_id',)
+# Trade context columns keep their first-written values on re-run
+UPDATE_COLUMNS = (
+    'is_winner', 'pnl_r', 'max_r_achieved', 'bar_date', 'bar_time', 'open',
+    'high', 'low', 'close', 'volume', 'candle_range_pct', 'vol_delta_raw',
+    'vol_delta_roll', 'vol_delta_norm', 'vol_roc', 'sma9', 'sma21',
+    'sma_config', 'sma_spread_pct', 'sma_momentum_label', 'price_position',
+    'cvd_slope', 'm5_structure', 'm15_structure', 'h1_structure',
+    'health_score', 'long_score', 'short_score',
+)
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -103,7 +126,8 @@ class M1TradeIndicatorPopulator:
     # STEP 1: Get eligible trades (have outcomes, not yet populated)
     # -----------------------------------------------------------------
 
-    def get_eligible_trades(self, conn, limit: Optional[int] = None) -> List[dict]:
+    def get_eligible_trades(self, conn, limit: Optional[int] = None,
+                            trade_ids: Optional[List[str]] = None) -> List[dict]:
         """
         Query trades that have outcomes but are not yet in m1_trade_indicator_2.
 
@@ -112,6 +136,7 @@ class M1TradeIndicatorPopulator:
         """
         trades_table = SOURCE_TABLES['trades']
         m5_table = SOURCE_TABLES['m5_atr_stop']
+        trade_filter = "AND t.trade_id = ANY(%s)" if trade_ids is not None else ""
 
         query = f"""
             SELECT
@@ -132,6 +157,7 @@ class M1TradeIndicatorPopulator:
                 SELECT 1 FROM {TARGET_TABLE} ti
                 WHERE ti.trade_id = t.trade_id
             )
+            {trade_filter}
             ORDER BY t.date, t.ticker, t.entry_time
         """
 
@@ -139,7 +165,7 @@ class M1TradeIndicatorPopulator:
             query += f" LIMIT {limit}"
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             rows = cur.fetchall()
 
         if self.verbose:
@@ -182,7 +208,7 @@ class M1TradeIndicatorPopulator:
         Build a single row for m1_trade_indicator_2.
 
         Merges trade context + outcome + indicator values.
-        Returns a tuple ready for execute_values INSERT.
+        Returns a tuple ready for bulk_write (INSERT_COLUMNS order).
         """
         # Outcome
         is_winner = (trade['result'] == 'WIN')
@@ -245,63 +271,15 @@ class M1TradeIndicatorPopulator:
         if not rows:
             return 0
 
-        query = f"""
-            INSERT INTO {TARGET_TABLE} (
-                trade_id,
-                ticker, date, direction, model, zone_type,
-                entry_time, entry_price,
-                is_winner, pnl_r, max_r_achieved,
-                bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct,
-                vol_delta_raw, vol_delta_roll, vol_delta_norm,
-                vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct,
-                sma_momentum_label, price_position,
-                cvd_slope,
-                m5_structure, m15_structure, h1_structure,
-                health_score, long_score, short_score
-            ) VALUES %s
-            ON CONFLICT (trade_id) DO UPDATE SET
-                is_winner = EXCLUDED.is_winner,
-                pnl_r = EXCLUDED.pnl_r,
-                max_r_achieved = EXCLUDED.max_r_achieved,
-                bar_date = EXCLUDED.bar_date,
-                bar_time = EXCLUDED.bar_time,
-                open = EXCLUDED.open,
-                high = EXCLUDED.high,
-                low = EXCLUDED.low,
-                close = EXCLUDED.close,
-                volume = EXCLUDED.volume,
-                candle_range_pct = EXCLUDED.candle_range_pct,
-                vol_delta_raw = EXCLUDED.vol_delta_raw,
-                vol_delta_roll = EXCLUDED.vol_delta_roll,
-                vol_delta_norm = EXCLUDED.vol_delta_norm,
-                vol_roc = EXCLUDED.vol_roc,
-                sma9 = EXCLUDED.sma9,
-                sma21 = EXCLUDED.sma21,
-                sma_config = EXCLUDED.sma_config,
-                sma_spread_pct = EXCLUDED.sma_spread_pct,
-                sma_momentum_label = EXCLUDED.sma_momentum_label,
-                price_position = EXCLUDED.price_position,
-                cvd_slope = EXCLUDED.cvd_slope,
-                m5_structure = EXCLUDED.m5_structure,
-                m15_structure = EXCLUDED.m15_structure,
-                h1_structure = EXCLUDED.h1_structure,
-                health_score = EXCLUDED.health_score,
-                long_score = EXCLUDED.long_score,
-                short_score = EXCLUDED.short_score,
-                calculated_at = NOW()
-        """
-
-        total_inserted = 0
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i:i + BATCH_SIZE]
-            with conn.cursor() as cur:
-                execute_values(cur, query, batch)
-            total_inserted += len(batch)
-
-        return total_inserted
+        result = bulk_write(
+            conn, TARGET_TABLE, INSERT_COLUMNS, rows,
+            conflict_columns=CONFLICT_COLUMNS,
+            on_conflict='update',
+            update_columns=UPDATE_COLUMNS,
+            update_extra={'calculated_at': 'NOW()'},
+            batch_size=BULK_BATCH_SIZE
+        )
+        return result.rows
 
     # -----------------------------------------------------------------
     # STATUS: Show pipeline state
@@ -355,7 +333,8 @@ class M1TradeIndicatorPopulator:
     # -----------------------------------------------------------------
 
     def run(self, limit: Optional[int] = None,
-            dry_run: bool = False) -> Dict:
+            dry_run: bool = False, conn=None,
+            trade_ids: Optional[List[str]] = None) -> Dict:
         """
         Main entry point: populate m1_trade_indicator_2.
 
@@ -367,6 +346,8 @@ class M1TradeIndicatorPopulator:
         Args:
             limit: Maximum trades to process (None = all)
             dry_run: If True, compute but don't write to DB
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only consider these trades
 
         Returns:
             Dict with processing stats
@@ -379,14 +360,15 @@ class M1TradeIndicatorPopulator:
             'errors': 0,
         }
 
-        conn = None
+        owns_conn = conn is None
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             conn.autocommit = False
 
             # Step 1: Get eligible trades
             print(f"\n[1/4] Querying eligible trades (with outcomes, not yet populated)...")
-            trades = self.get_eligible_trades(conn, limit)
+            trades = self.get_eligible_trades(conn, limit, trade_ids)
             stats['total_eligible'] = len(trades)
 
             if not trades:
@@ -473,7 +455,7 @@ class M1TradeIndicatorPopulator:
             raise
 
         finally:
-            if conn:
+            if conn and owns_conn:
                 conn.close()
 
         return stats
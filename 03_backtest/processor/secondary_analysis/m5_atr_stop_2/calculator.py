@@ -16,7 +16,8 @@ LOGIC:
     2. Fetch pre-computed atr_m5 from m1_indicator_bars_2 at adjusted entry candle
     3. Set stop = entry -/+ atr_m5 (no multiplier) => this distance = 1R
     4. Set R-level targets at entry +/- (N * 1R) for N = 1..5
-    5. Walk M1 bars from entry to 15:30 ET:
+    5. Walk M1 bars from entry to 15:30 ET (all trades of a ticker-date in one
+       vectorized pass, shared.calculations.atr_stop):
        - R targets: hit when price high/low touches target (price-based)
        - Stop: hit when M1 bar CLOSES beyond stop level (close-based)
        - Same-candle conflict: if R-level hit AND close beyond stop => LOSS
@@ -38,11 +39,13 @@ import psycopg2
 from psycopg2.extras import execute_values
 import numpy as np
 from datetime import datetime, date, time, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from decimal import Decimal
 import logging
 
+from shared.calculations.atr_stop import prepare_bars, simulate_outcomes
+
 from config import (
     DB_CONFIG, EOD_CUTOFF, R_LEVELS, SOURCE_TABLES, TARGET_TABLE
 )
@@ -205,12 +208,13 @@ class M5AtrStopCalculator:
     2. Adjusts entry time to containing M1 candle
     3. Fetches pre-computed atr_m5 from m1_indicator_bars_2
     4. Calculates stop price and R-level targets (wider than M1 ATR)
-    5. Walks M1 bars to detect R-level hits and stop triggers
+    5. Resolves R-level hits and stop triggers per ticker-date batch
     6. Writes results to m5_atr_stop_2 table
     """
 
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, bar_frame=None):
         self.verbose = verbose
+        self.bar_frame = bar_frame  # Optional shared M1 bar frame (read instead of m1_bars_2)
         self.logger = logging.getLogger(__name__)
         self.stats = {
             'trades_processed': 0,
@@ -229,11 +233,18 @@ class M5AtrStopCalculator:
     # DATABASE OPERATIONS
     # =========================================================================
 
-    def get_trades_needing_calculation(self, conn, limit: int = None) -> List[Dict[str, Any]]:
+    def get_trades_needing_calculation(
+        self,
+        conn,
+        limit: int = None,
+        trade_ids: List[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Query trades_2 for trades not yet processed in m5_atr_stop_2.
-        Requires entry_time and entry_price to be populated.
+        Requires entry_time and entry_price to be populated; trade_ids
+        restricts the candidates to those trades.
         """
+        trade_filter = "AND t.trade_id = ANY(%s)" if trade_ids is not None else ""
         query = f"""
             SELECT
                 t.trade_id,
@@ -247,6 +258,7 @@ class M5AtrStopCalculator:
             FROM {SOURCE_TABLES['trades']} t
             WHERE t.entry_time IS NOT NULL
               AND t.entry_price IS NOT NULL
+              {trade_filter}
               AND NOT EXISTS (
                   SELECT 1 FROM {TARGET_TABLE} r
                   WHERE r.trade_id = t.trade_id
@@ -258,45 +270,43 @@ class M5AtrStopCalculator:
             query += f" LIMIT {limit}"
 
         with conn.cursor() as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             columns = [desc[0] for desc in cur.description]
             rows = cur.fetchall()
 
         return [dict(zip(columns, row)) for row in rows]
 
-    def get_m5_atr_at_entry(
+    def get_m5_atr_by_candle(
         self,
         conn,
         ticker: str,
-        trade_date: date,
-        m1_candle_time: time
-    ) -> Optional[float]:
+        trade_date: date
+    ) -> Dict[time, float]:
         """
-        Fetch pre-computed atr_m5 from m1_indicator_bars_2 at the adjusted entry candle.
+        Fetch pre-computed atr_m5 from m1_indicator_bars_2 for every M1 candle of a ticker/date.
+
+        One query per ticker-date replaces a lookup per trade; callers index
+        the result by the adjusted entry candle.
 
         Args:
             conn: Database connection
             ticker: Stock symbol
             trade_date: Trading date
-            m1_candle_time: M1 candle time (seconds truncated)
 
         Returns:
-            atr_m5 value or None if not available
+            Dict of M1 candle time -> atr_m5 (candles with NULL ATR omitted)
         """
         query = f"""
-            SELECT atr_m5
+            SELECT bar_time, atr_m5
             FROM {SOURCE_TABLES['m1_indicator_bars']}
-            WHERE ticker = %s AND bar_date = %s AND bar_time = %s
+            WHERE ticker = %s AND bar_date = %s AND atr_m5 IS NOT NULL
         """
 
         with conn.cursor() as cur:
-            cur.execute(query, (ticker, trade_date, m1_candle_time))
-            row = cur.fetchone()
-
-        if row is None or row[0] is None:
-            return None
+            cur.execute(query, (ticker, trade_date))
+            rows = cur.fetchall()
 
-        return float(row[0])
+        return {_timedelta_to_time(bar_time): float(atr) for bar_time, atr in rows}
 
     def get_m1_bars(
         self,
@@ -304,7 +314,11 @@ class M5AtrStopCalculator:
         ticker: str,
         trade_date: date
     ) -> List[Dict[str, Any]]:
-        """Fetch M1 bars for a ticker/date from m1_bars_2."""
+        """Fetch M1 bars for a ticker/date from m1_bars_2 (or the shared bar frame)."""
+        if self.bar_frame is not None:
+            bars = self.bar_frame.get(ticker, trade_date)
+            return bars[['bar_date', 'bar_time', 'open', 'high', 'low', 'close', 'volume']].to_dict('records')
+
         query = f"""
             SELECT bar_date, bar_time, open, high, low, close, volume
             FROM {SOURCE_TABLES['m1_bars']}
@@ -404,21 +418,17 @@ class M5AtrStopCalculator:
     # CORE CALCULATION LOGIC
     # =========================================================================
 
-    def calculate_single_trade(
+    def _init_trade(
         self,
         trade: Dict[str, Any],
-        m1_bars: List[Dict[str, Any]],
         m5_atr_value: float
-    ) -> Optional[M5AtrStopResult]:
+    ) -> Optional[Tuple[M5AtrStopResult, float, bool, float, List[float]]]:
         """
-        Calculate M5 ATR Stop outcome for a single trade.
+        Build the result (stop and R-level prices) for one trade before simulation.
 
-        Walk M1 bars sequentially from entry to 15:30:
-        - Check R-level targets (price-based: high/low touch)
-        - Check stop (close-based: M1 close beyond stop)
-        - Same-candle conflict: R-level hit + close beyond stop => stop takes priority
-        - max_r = highest R-level hit before stop_time
-        - result = WIN if R1 hit before stop, LOSS otherwise
+        Returns:
+            (result, entry_minutes, is_long, stop_price, r_prices) or None if
+            the entry time cannot be parsed
         """
         trade_id = trade['trade_id']
 
@@ -475,119 +485,64 @@ class M5AtrStopCalculator:
             r5_price=round(r_prices[5], 4),
         )
 
-        # Walk M1 bars from entry to EOD
         entry_minutes = _time_to_minutes(entry_time)
-        eod_minutes = _time_to_minutes(EOD_CUTOFF)
-
         if entry_minutes is None:
             self._log(f"Skipping {trade_id}: could not parse entry time", 'warning')
             return None
 
-        # Track state during walk
-        r_levels_hit = {}  # {r_level: bar_time}
-        stop_triggered = False
-        bar_count = 0
-
-        # Sort M1 bars by time
-        sorted_m1 = sorted(m1_bars, key=lambda b: _time_to_minutes(b.get('bar_time')) or 0)
-
-        for bar in sorted_m1:
-            bar_minutes = _time_to_minutes(bar.get('bar_time'))
-            if bar_minutes is None:
-                continue
-
-            # Only process bars after entry and up to EOD cutoff
-            if bar_minutes <= entry_minutes:
-                continue
-            if bar_minutes > eod_minutes:
-                break
-
-            bar_count += 1
-            bar_high = _safe_float(bar.get('high'))
-            bar_low = _safe_float(bar.get('low'))
-            bar_close = _safe_float(bar.get('close'))
-            bar_time = _timedelta_to_time(bar.get('bar_time'))
-
-            # --- Check stop (close-based) ---
-            stop_on_this_bar = False
-            if is_long:
-                if bar_close <= stop_price:
-                    stop_on_this_bar = True
-            else:
-                if bar_close >= stop_price:
-                    stop_on_this_bar = True
-
-            # --- Check R-level targets (price-based: high/low touch) ---
-            new_r_hits_this_bar = []
-            for r in R_LEVELS:
-                if r in r_levels_hit:
-                    continue  # Already hit this level
-
-                target = r_prices[r]
-                target_hit = False
-                if is_long:
-                    if bar_high >= target:
-                        target_hit = True
-                else:
-                    if bar_low <= target:
-                        target_hit = True
-
-                if target_hit:
-                    new_r_hits_this_bar.append(r)
-
-            # --- Same-candle conflict resolution ---
-            # If stop triggers on this bar, R-level hits on this SAME bar
-            # are invalidated. The stop takes priority.
-            if stop_on_this_bar:
-                stop_triggered = True
-                result.stop_hit = True
-                result.stop_time = bar_time
-                result.stop_bars_from_entry = bar_count
-                # Do NOT credit R-levels hit on this same bar
-                break
-
-            # If no stop on this bar, credit R-level hits
-            for r in new_r_hits_this_bar:
-                r_levels_hit[r] = bar_time
-                if r == 1:
-                    result.r1_hit = True
-                    result.r1_time = bar_time
-                    result.r1_bars_from_entry = bar_count
-                elif r == 2:
-                    result.r2_hit = True
-                    result.r2_time = bar_time
-                    result.r2_bars_from_entry = bar_count
-                elif r == 3:
-                    result.r3_hit = True
-                    result.r3_time = bar_time
-                    result.r3_bars_from_entry = bar_count
-                elif r == 4:
-                    result.r4_hit = True
-                    result.r4_time = bar_time
-                    result.r4_bars_from_entry = bar_count
-                elif r == 5:
-                    result.r5_hit = True
-                    result.r5_time = bar_time
-                    result.r5_bars_from_entry = bar_count
-
-            # All R-levels hit, no need to continue
-            if len(r_levels_hit) == len(R_LEVELS):
-                break
-
-        # --- Determine result and max_r ---
-        # WIN = R1 hit before stop, LOSS = everything else
-        # max_r: -1 for LOSS (allows direct use in R-multiple calculations)
-        #        1-5 for WIN (highest R-level hit before stop_time)
-        if result.r1_hit:
-            # R1 was hit (and it was before stop, since same-candle conflict
-            # prevents R-hits on the stop bar)
-            result.result = 'WIN'
-            result.max_r = max(r_levels_hit.keys())
-        else:
-            result.result = 'LOSS'
-            result.max_r = -1
+        return result, entry_minutes, is_long, stop_price, [r_prices[r] for r in R_LEVELS]
 
-        return result
+    def calculate_trades(
+        self,
+        trades: List[Dict[str, Any]],
+        m1_bars: List[Dict[str, Any]],
+        m5_atr_values: List[float]
+    ) -> List[Optional[M5AtrStopResult]]:
+        """
+        Calculate M5 ATR Stop outcomes for all trades of one ticker-date.
+
+        The M1 bars are sorted once and every trade is resolved in one
+        vectorized pass (shared.calculations.atr_stop), with the same rules
+        as the sequential bar walk from entry to 15:30:
+        - Check R-level targets (price-based: high/low touch)
+        - Check stop (close-based: M1 close beyond stop)
+        - Same-candle conflict: R-level hit + close beyond stop => stop takes priority
+        - max_r = highest R-level hit before stop_time
+        - result = WIN if R1 hit before stop, LOSS otherwise
+
+        Returns:
+            One result per trade, None where the entry time cannot be parsed
+        """
+        prepared = [
+            self._init_trade(trade, atr)
+            for trade, atr in zip(trades, m5_atr_values)
+        ]
+        valid = [p for p in prepared if p is not None]
+
+        if valid:
+            bars = prepare_bars(m1_bars)
+            outcome = simulate_outcomes(
+                bars,
+                entry_minutes=[p[1] for p in valid],
+                stop_prices=[p[3] for p in valid],
+                r_prices=[p[4] for p in valid],
+                is_long=[p[2] for p in valid],
+                eod_minutes=_time_to_minutes(EOD_CUTOFF),
+                levels=R_LEVELS,
+            )
+            for i, p in enumerate(valid):
+                outcome.apply(i, p[0], bars)
+
+        return [p[0] if p is not None else None for p in prepared]
+
+    def calculate_single_trade(
+        self,
+        trade: Dict[str, Any],
+        m1_bars: List[Dict[str, Any]],
+        m5_atr_value: float
+    ) -> Optional[M5AtrStopResult]:
+        """Calculate M5 ATR Stop outcome for a single trade (see calculate_trades)."""
+        return self.calculate_trades([trade], m1_bars, [m5_atr_value])[0]
 
     # =========================================================================
     # BATCH PROCESSING
@@ -596,7 +551,9 @@ class M5AtrStopCalculator:
     def run_batch_calculation(
         self,
         limit: int = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        conn=None,
+        trade_ids: List[str] = None
     ) -> Dict[str, Any]:
         """
         Main entry point. Process all trades needing M5 ATR Stop calculation.
@@ -604,6 +561,8 @@ class M5AtrStopCalculator:
         Args:
             limit: Max trades to process (for testing)
             dry_run: If True, calculate but don't write to DB
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only consider these trades
 
         Returns:
             Dictionary with execution statistics
@@ -629,16 +588,17 @@ class M5AtrStopCalculator:
             'errors': []
         }
 
-        conn = None
+        owns_conn = conn is None
         try:
             # Connect to database
             print("[1/4] Connecting to Supabase...")
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             print("  Connected successfully")
 
             # Get trades needing calculation
             print("\n[2/4] Querying trades needing calculation...")
-            trades = self.get_trades_needing_calculation(conn, limit)
+            trades = self.get_trades_needing_calculation(conn, limit, trade_ids)
             print(f"  Found {len(trades)} trades to process")
 
             if not trades:
@@ -649,8 +609,12 @@ class M5AtrStopCalculator:
             print("\n[3/4] Processing trades...")
             all_results = []
 
-            # Cache M1 bars by ticker+date to minimize DB queries
+            # Cache M1 bars and ATR values by ticker+date to minimize DB queries
             m1_cache = {}
+            atr_cache = {}
+
+            # Trades grouped by ticker+date: [(idx, trade, m5_atr), ...]
+            groups = {}
 
             for idx, trade in enumerate(trades):
                 trade_id = trade['trade_id']
@@ -664,8 +628,11 @@ class M5AtrStopCalculator:
                     self.stats['trades_skipped'] += 1
                     continue
 
-                # Step 2: Fetch M5 ATR at adjusted entry candle
-                m5_atr = self.get_m5_atr_at_entry(conn, ticker, trade_date, m1_candle)
+                # Step 2: M5 ATR at adjusted entry candle (one query per ticker+date)
+                m1_key = f"{ticker}_{trade_date}"
+                if m1_key not in atr_cache:
+                    atr_cache[m1_key] = self.get_m5_atr_by_candle(conn, ticker, trade_date)
+                m5_atr = atr_cache[m1_key].get(m1_candle)
                 if m5_atr is None or m5_atr <= 0:
                     self._log(
                         f"Skipping {trade_id}: no M5 ATR at {ticker} {trade_date} {m1_candle}",
@@ -675,20 +642,31 @@ class M5AtrStopCalculator:
                     continue
 
                 # Step 3: Get M1 bars (cached by ticker+date)
-                m1_key = f"{ticker}_{trade_date}"
                 if m1_key not in m1_cache:
                     m1_cache[m1_key] = self.get_m1_bars(conn, ticker, trade_date)
-                m1_bars = m1_cache[m1_key]
 
-                if not m1_bars:
+                if not m1_cache[m1_key]:
                     self._log(f"Skipping {trade_id}: no M1 bars", 'warning')
                     self.stats['trades_skipped'] += 1
                     continue
 
-                # Step 4: Calculate
+                groups.setdefault(m1_key, []).append((idx, trade, m5_atr))
+
+            # Step 4: Calculate all trades of a ticker+date in one pass
+            for m1_key, group in groups.items():
                 try:
-                    result = self.calculate_single_trade(trade, m1_bars, m5_atr)
+                    results = self.calculate_trades(
+                        [trade for _, trade, _ in group],
+                        m1_cache[m1_key],
+                        [atr for _, _, atr in group]
+                    )
+                except Exception as e:
+                    for _, trade, _ in group:
+                        self.stats['errors'].append(f"{trade['trade_id']}: {str(e)}")
+                        self._log(f"Error processing {trade['trade_id']}: {e}", 'error')
+                    continue
 
+                for (idx, trade, _), result in zip(group, results):
                     if result is not None:
                         all_results.append(result)
                         self.stats['trades_processed'] += 1
@@ -712,14 +690,10 @@ class M5AtrStopCalculator:
                         self.stats['trades_skipped'] += 1
                         print(
                             f"  [{idx + 1}/{len(trades)}] "
-                            f"{trade_id:<35s} "
+                            f"{trade['trade_id']:<35s} "
                             f"SKIPPED"
                         )
 
-                except Exception as e:
-                    self.stats['errors'].append(f"{trade_id}: {str(e)}")
-                    self._log(f"Error processing {trade_id}: {e}", 'error')
-
             # Write results to database
             print(f"\n[4/4] Writing results to database...")
             if dry_run:
@@ -739,7 +713,7 @@ class M5AtrStopCalculator:
             raise
 
         finally:
-            if conn:
+            if conn and owns_conn:
                 conn.close()
 
     def _build_result(self, start_time: datetime) -> Dict[str, Any]:
@@ -0,0 +1,517 @@
+"""
+================================================================================
+EPOCH TRADING SYSTEM - SECONDARY ANALYSIS
+Secondary Pipeline - In-Process DAG Runner
+XIII Trading LLC
+================================================================================
+
+Runs the secondary processors in one process instead of one runner.py
+subprocess after another.
+
+- Each processor is a ProcessorNode that declares the tables it reads and
+  writes; a node starts once every selected node writing one of its inputs
+  has finished, so independent nodes (m1_atr_stop and m5_atr_stop, then
+  trades_consolidated and the three indicator populators) run concurrently
+- Nodes share the process-wide connection pool (shared.data.db_pool) and
+  one in-memory M1 bar frame: bars stored by m1_bars are served from
+  memory to m1_indicators and both ATR stop calculators instead of being
+  re-read from m1_bars_2
+- Per-node watermarks (secondary_watermarks_2) record the trade IDs each
+  node has settled. A rerun hands every node only trade IDs it has not
+  settled, and skips nodes with nothing new
+- A node settles a trade only if it finished without errors, every
+  upstream node in the run has settled that trade too, and the trade has
+  rows in the node's output table (processors skip trades without bars or
+  ATR and report success); anything else is retried on the next run (the
+  processors' own NOT EXISTS checks keep retries from writing duplicates)
+
+USAGE:
+    pipeline = SecondaryPipeline()
+    results = pipeline.run()                                 # every node
+    results = pipeline.run(["m1_atr_stop", "m5_atr_stop"])   # a subset
+================================================================================
+"""
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+# Add 03_backtest to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import DB_CONFIG, SECONDARY_WORKERS, SECONDARY_WATERMARK_TABLE
+
+PACKAGE_DIR = Path(__file__).parent
+SCHEMA_DIR = PACKAGE_DIR / "schema"
+TRADES_TABLE = "trades_2"
+M1_BARS_TABLE = "m1_bars_2"
+
+
+# =============================================================================
+# NODES
+# =============================================================================
+
+@dataclass(frozen=True)
+class ProcessorNode:
+    """One secondary processor and the tables it reads and writes."""
+    name: str
+    directory: str                    # Processor directory under secondary_analysis/
+    module: str                       # Module defining the processor class
+    class_name: str
+    method: str                       # Entry point taking limit, dry_run, conn, trade_ids
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    uses_bar_frame: bool = False      # Class takes bar_frame= (reads or fills M1 bars)
+    settle_by: str = "trade_id"       # Output rows carry trade_id, or "ticker_date" (bar tables)
+
+
+NODES: Tuple[ProcessorNode, ...] = (
+    ProcessorNode("m1_bars", "m1_bars", "m1_bars_storage", "M1BarsStorage", "run_batch_storage",
+                  inputs=("trades_2",), outputs=("m1_bars_2",), uses_bar_frame=True, settle_by="ticker_date"),
+    ProcessorNode("m1_indicators", "m1_indicator_bars_2", "populator", "M1IndicatorBarsPopulator",
+                  "run_batch_population",
+                  inputs=("trades_2", "m1_bars_2"), outputs=("m1_indicator_bars_2",), uses_bar_frame=True,
+                  settle_by="ticker_date"),
+    ProcessorNode("m1_atr_stop", "m1_atr_stop_2", "calculator", "M1AtrStopCalculator", "run_batch_calculation",
+                  inputs=("trades_2", "m1_bars_2", "m1_indicator_bars_2"), outputs=("m1_atr_stop_2",),
+                  uses_bar_frame=True),
+    ProcessorNode("m5_atr_stop", "m5_atr_stop_2", "calculator", "M5AtrStopCalculator", "run_batch_calculation",
+                  inputs=("trades_2", "m1_bars_2", "m1_indicator_bars_2"), outputs=("m5_atr_stop_2",),
+                  uses_bar_frame=True),
+    ProcessorNode("trades_consolidated", "trades_m5_r_win_2", "calculator", "TradesM5RWin2Calculator",
+                  "run_batch_consolidation",
+                  inputs=("trades_2", "m5_atr_stop_2", "m1_bars_2"), outputs=("trades_m5_r_win_2",)),
+    ProcessorNode("m1_trade_indicator", "m1_trade_indicator_2", "populator", "M1TradeIndicatorPopulator", "run",
+                  inputs=("trades_2", "m5_atr_stop_2", "m1_indicator_bars_2"), outputs=("m1_trade_indicator_2",)),
+    ProcessorNode("m1_ramp_up", "m1_ramp_up_indicator_2", "populator", "M1RampUpIndicatorPopulator", "run",
+                  inputs=("trades_2", "m5_atr_stop_2", "m1_indicator_bars_2"), outputs=("m1_ramp_up_indicator_2",)),
+    ProcessorNode("m1_post_trade", "m1_post_trade_indicator_2", "populator", "M1PostTradeIndicatorPopulator", "run",
+                  inputs=("trades_2", "m5_atr_stop_2", "m1_indicator_bars_2"),
+                  outputs=("m1_post_trade_indicator_2",)),
+)
+
+NODE_NAMES = tuple(node.name for node in NODES)
+
+
+def dependencies(nodes: Sequence[ProcessorNode]) -> Dict[str, Set[str]]:
+    """Upstream node names of each node (nodes writing one of its inputs)."""
+    writers: Dict[str, Set[str]] = {}
+    for node in nodes:
+        for table in node.outputs:
+            writers.setdefault(table, set()).add(node.name)
+    return {
+        node.name: {w for table in node.inputs for w in writers.get(table, ()) if w != node.name}
+        for node in nodes
+    }
+
+
+def topological_layers(nodes: Sequence[ProcessorNode]) -> List[List[str]]:
+    """
+    Group nodes into layers whose members depend only on earlier layers.
+
+    Raises:
+        ValueError: If the declared inputs and outputs form a cycle
+    """
+    deps = dependencies(nodes)
+    placed: Set[str] = set()
+    layers = []
+    while len(placed) < len(nodes):
+        layer = [n.name for n in nodes if n.name not in placed and deps[n.name] <= placed]
+        if not layer:
+            cycle = sorted(n.name for n in nodes if n.name not in placed)
+            raise ValueError(f"Secondary processors form a cycle: {', '.join(cycle)}")
+        layers.append(layer)
+        placed.update(layer)
+    return layers
+
+
+def load_processor(node: ProcessorNode):
+    """
+    Import a processor class from its own directory.
+
+    Every processor has top-level `config`, `calculator` or `populator`
+    modules; names from the node's directory are set aside before the
+    import and restored after, so processors load side by side.
+    """
+    directory = PACKAGE_DIR / node.directory
+    local = {p.stem for p in directory.iterdir() if p.suffix == ".py"}
+    saved_path = list(sys.path)
+    saved = {name: sys.modules.pop(name) for name in list(sys.modules) if name.split(".")[0] in local}
+    sys.path.insert(0, str(directory))
+    try:
+        return getattr(importlib.import_module(node.module), node.class_name)
+    finally:
+        sys.path[:] = saved_path
+        for name in list(sys.modules):
+            if name.split(".")[0] in local:
+                del sys.modules[name]
+        sys.modules.update(saved)
+
+
+# =============================================================================
+# SHARED M1 BAR FRAME
+# =============================================================================
+
+class M1BarFrame:
+    """
+    M1 bars per ticker-date, shared by every node of one pipeline run.
+
+    Bars enter either from m1_bars (the rows it just stored) or, on first
+    request, from one m1_bars_2 query. Frames are ordered by bar_timestamp,
+    like the processors' own reads, and must be treated as read-only.
+    """
+
+    COLUMNS = ('bar_date', 'bar_time', 'bar_timestamp', 'open', 'high', 'low', 'close', 'volume', 'vwap')
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'vwap')
+
+    def __init__(self, connection: Callable):
+        """
+        Args:
+            connection: Zero-arg callable returning a context manager that
+                yields a database connection (used on cache misses)
+        """
+        self._connection = connection
+        self._frames: Dict[Tuple[str, date], pd.DataFrame] = {}
+        self._key_locks: Dict[Tuple[str, date], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: Tuple[str, date]) -> bool:
+        return key in self._frames
+
+    @classmethod
+    def _to_frame(cls, columns: Sequence[str], rows: Sequence[Sequence]) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(list(rows), columns=list(columns))
+        df = df.reindex(columns=list(cls.COLUMNS))
+        for col in cls.PRICE_COLUMNS:
+            df[col] = df[col].astype(float)
+        return df.sort_values('bar_timestamp', kind='stable').reset_index(drop=True)
+
+    def put(self, ticker: str, trade_date: date, columns: Sequence[str], rows: Sequence[Sequence]):
+        """Store a ticker-date's bars (rows as written to m1_bars_2)."""
+        frame = self._to_frame(columns, rows)
+        with self._lock:
+            self._frames[(ticker, trade_date)] = frame
+
+    def get(self, ticker: str, trade_date: date) -> pd.DataFrame:
+        """Bars for a ticker-date, loaded from m1_bars_2 once on first request."""
+        key = (ticker, trade_date)
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One loader per key; concurrent readers of the same key wait for it
+        with key_lock:
+            with self._lock:
+                if key in self._frames:
+                    return self._frames[key]
+            query = f"""
+                SELECT {', '.join(self.COLUMNS)}
+                FROM {M1_BARS_TABLE}
+                WHERE ticker = %s AND bar_date = %s
+                ORDER BY bar_timestamp ASC
+            """
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(query, (ticker, trade_date))
+                    rows = cur.fetchall()
+            frame = self._to_frame(self.COLUMNS, rows)
+            with self._lock:
+                self._frames[key] = frame
+                self.loads += 1
+            return frame
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._key_locks.clear()
+
+
+# =============================================================================
+# WATERMARKS
+# =============================================================================
+
+class WatermarkStore:
+    """Trade IDs each node has settled, kept in secondary_watermarks_2."""
+
+    def __init__(self, table: str = SECONDARY_WATERMARK_TABLE):
+        self.table = table
+
+    def ensure(self, conn):
+        """Create the watermark table if it does not exist."""
+        schema = (SCHEMA_DIR / "secondary_watermarks_2.sql").read_text()
+        with conn.cursor() as cur:
+            cur.execute(schema.replace("secondary_watermarks_2", self.table))
+        conn.commit()
+
+    def settled(self, conn, node: str) -> Set[str]:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT trade_id FROM {self.table} WHERE node = %s", (node,))
+            return {row[0] for row in cur.fetchall()}
+
+    def record(self, conn, node: str, trade_ids: Iterable[str]):
+        from shared.data.bulk_writer import bulk_write
+        rows = [(node, trade_id) for trade_id in trade_ids]
+        if rows:
+            bulk_write(conn, self.table, ('node', 'trade_id'), rows, conflict_columns=('node', 'trade_id'))
+            conn.commit()
+
+    def reset(self, conn, node: Optional[str] = None):
+        """Forget settled trades for one node (or every node)."""
+        with conn.cursor() as cur:
+            if node is None:
+                cur.execute(f"DELETE FROM {self.table}")
+            else:
+                cur.execute(f"DELETE FROM {self.table} WHERE node = %s", (node,))
+        conn.commit()
+
+
+def load_trade_ids(conn) -> Set[str]:
+    """Every trade ID in trades_2."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT trade_id FROM {TRADES_TABLE}")
+        return {row[0] for row in cur.fetchall()}
+
+
+def load_written_trade_ids(conn, node: ProcessorNode, trade_ids: Sequence[str]) -> Set[str]:
+    """
+    Trade IDs among trade_ids with rows in every output table of a node.
+
+    Trade-level tables are matched on trade_id; bar tables (settle_by
+    "ticker_date") on the trade's ticker and date.
+    """
+    written = set(trade_ids)
+    for table in node.outputs:
+        if not written:
+            break
+        if node.settle_by == "ticker_date":
+            query = f"""
+                SELECT t.trade_id
+                FROM {TRADES_TABLE} t
+                WHERE t.trade_id = ANY(%s)
+                  AND EXISTS (
+                      SELECT 1 FROM {table} o
+                      WHERE o.ticker = t.ticker AND o.bar_date = t.date
+                  )
+            """
+        else:
+            query = f"SELECT DISTINCT trade_id FROM {table} WHERE trade_id = ANY(%s)"
+        with conn.cursor() as cur:
+            cur.execute(query, (sorted(written),))
+            written = {row[0] for row in cur.fetchall()}
+    return written
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+@dataclass
+class NodeResult:
+    """Outcome of one node in a pipeline run."""
+    name: str
+    status: str                          # ok, errors, failed, skipped, up_to_date
+    pending: int = 0                     # Trade IDs handed to the node
+    settled: int = 0                     # Trade IDs added to its watermark
+    seconds: float = 0.0
+    stats: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def _error_count(stats: Dict[str, Any]) -> int:
+    """Processors report errors either as a list or as a count."""
+    errors = (stats or {}).get('errors', 0)
+    return len(errors) if isinstance(errors, (list, tuple)) else int(errors or 0)
+
+
+class SecondaryPipeline:
+    """
+    Runs secondary processors as a DAG in this process.
+    """
+
+    def __init__(self, nodes: Sequence[ProcessorNode] = NODES, max_workers: int = SECONDARY_WORKERS,
+                 pool=None, watermarks: Optional[WatermarkStore] = None,
+                 loader: Callable[[ProcessorNode], type] = load_processor,
+                 trade_id_loader: Callable = load_trade_ids,
+                 written_loader: Callable = load_written_trade_ids, verbose: bool = False):
+        """
+        Args:
+            nodes: Declared processor nodes
+            max_workers: Nodes run at once
+            pool: Connection pool with getconn()/putconn() (default: the
+                shared DB_CONFIG pool from shared.data.db_pool)
+            watermarks: Watermark store (default WatermarkStore())
+            loader: Returns the processor class of a node
+            trade_id_loader: Returns every trade ID in trades_2 given a connection
+            written_loader: Returns the trade IDs a node wrote output rows for,
+                given a connection, the node and its candidate trade IDs
+            verbose: Passed to every processor
+        """
+        self.nodes = {node.name: node for node in nodes}
+        self.max_workers = max(1, max_workers)
+        self._pool = pool
+        self._pool_lock = threading.Lock()
+        self.watermarks = watermarks or WatermarkStore()
+        self.loader = loader
+        self.trade_id_loader = trade_id_loader
+        self.written_loader = written_loader
+        self.verbose = verbose
+        self.bar_frame = M1BarFrame(self.connection)
+
+    # -------------------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------------------
+
+    @property
+    def pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                from shared.data.db_pool import get_db_pool
+                self._pool = get_db_pool(DB_CONFIG)
+            return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; an open transaction is rolled back on return."""
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            try:
+                conn.rollback()
+            finally:
+                self.pool.putconn(conn)
+
+    def close(self):
+        """Drop cached bars (pooled connections stay open for other clients)."""
+        self.bar_frame.clear()
+
+    # -------------------------------------------------------------------------
+    # Running
+    # -------------------------------------------------------------------------
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[ProcessorNode]:
+        """Nodes to run, in declaration order."""
+        if names is None:
+            return list(self.nodes.values())
+        wanted = set(names)
+        unknown = wanted - set(self.nodes)
+        if unknown:
+            raise ValueError(f"Unknown secondary processors: {', '.join(sorted(unknown))}")
+        return [node for node in self.nodes.values() if node.name in wanted]
+
+    def _run_node(self, node: ProcessorNode, processor_cls, trade_ids: List[str],
+                  limit: Optional[int], dry_run: bool) -> Dict[str, Any]:
+        kwargs = {'verbose': self.verbose}
+        if node.uses_bar_frame:
+            kwargs['bar_frame'] = self.bar_frame
+        processor = processor_cls(**kwargs)
+        with self.connection() as conn:
+            return getattr(processor, node.method)(
+                limit=limit, dry_run=dry_run, conn=conn, trade_ids=trade_ids
+            )
+
+    def run(self, names: Optional[Iterable[str]] = None, dry_run: bool = False,
+            limit: Optional[int] = None, full: bool = False) -> Dict[str, NodeResult]:
+        """
+        Run the selected nodes (default: all) and return their results.
+
+        Args:
+            names: Node names to run; upstream nodes left out are assumed done
+            dry_run: Passed to every processor; watermarks are not advanced
+            limit: Passed to every processor; watermarks are not advanced
+                (a limited run covers only part of each node's trades)
+            full: Hand every node every trade ID, ignoring watermarks
+
+        Returns:
+            NodeResult per node name, in declaration order
+        """
+        selected = self.select(names)
+        topological_layers(selected)
+        deps = dependencies(selected)
+        classes = {node.name: self.loader(node) for node in selected}
+        advance = not dry_run and limit is None
+
+        with self.connection() as conn:
+            self.watermarks.ensure(conn)
+            all_ids = set(self.trade_id_loader(conn))
+            settled = {node.name: set() if full else self.watermarks.settled(conn, node.name)
+                       for node in selected}
+
+        results: Dict[str, NodeResult] = {}
+        pending: Dict[str, Set[str]] = {}
+        running = {}
+        waiting = [node.name for node in selected]
+
+        def finish(name: str, result: NodeResult):
+            results[name] = result
+            label = f"{result.status} ({result.pending} trades, {result.seconds:.1f}s)"
+            print(f"[PIPELINE] {name}: {label}" + (f" - {result.error}" if result.error else ""))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while waiting or running:
+                    for name in [n for n in waiting if deps[n] <= set(results)]:
+                        waiting.remove(name)
+                        failed = sorted(d for d in deps[name] if results[d].status in ('failed', 'skipped'))
+                        if failed:
+                            finish(name, NodeResult(name, 'skipped', error=f"upstream failed: {', '.join(failed)}"))
+                            continue
+                        pending[name] = all_ids - settled[name]
+                        if not pending[name]:
+                            finish(name, NodeResult(name, 'up_to_date'))
+                            continue
+                        print(f"[PIPELINE] {name}: starting ({len(pending[name])} trades)")
+                        future = executor.submit(self._run_node, self.nodes[name], classes[name],
+                                                 sorted(pending[name]), limit, dry_run)
+                        running[future] = (name, time.perf_counter())
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, started = running.pop(future)
+                        result = NodeResult(name, 'ok', pending=len(pending[name]),
+                                            seconds=time.perf_counter() - started)
+                        try:
+                            result.stats = future.result() or {}
+                            if _error_count(result.stats):
+                                result.status = 'errors'
+                        except Exception as e:
+                            result.status, result.error = 'failed', str(e)
+
+                        if result.status == 'ok' and advance:
+                            newly = set(pending[name])
+                            for upstream in deps[name]:
+                                newly &= settled[upstream]
+                            with self.connection() as conn:
+                                if newly:
+                                    newly &= self.written_loader(conn, self.nodes[name], sorted(newly))
+                                self.watermarks.record(conn, name, sorted(newly))
+                            settled[name] |= newly
+                            result.settled = len(newly)
+                        finish(name, result)
+        finally:
+            self.bar_frame.clear()
+
+        return {node.name: results[node.name] for node in selected}
+
+
+def print_results(results: Dict[str, NodeResult]):
+    """One line per node."""
+    print(f"\n{'Node':<22}{'Status':<12}{'Trades':>8}{'Settled':>9}{'Seconds':>9}")
+    print("-" * 60)
+    for result in results.values():
+        print(f"{result.name:<22}{result.status:<12}{result.pending:>8}{result.settled:>9}{result.seconds:>9.1f}")
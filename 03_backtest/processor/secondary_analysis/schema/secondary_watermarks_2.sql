@@ -0,0 +1,14 @@
+-- ============================================================================
+-- EPOCH TRADING SYSTEM - Secondary Pipeline Watermarks v2
+-- Trade IDs each secondary processor node has settled
+-- A rerun of the pipeline hands each node only trade IDs not listed here
+-- XIII Trading LLC
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS secondary_watermarks_2 (
+    node                VARCHAR(40) NOT NULL,       -- Pipeline node name (e.g. m1_atr_stop)
+    trade_id            VARCHAR(50) NOT NULL,       -- trades_2.trade_id
+    settled_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (node, trade_id)
+);
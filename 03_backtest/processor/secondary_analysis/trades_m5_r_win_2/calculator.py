@@ -120,15 +120,18 @@ class TradesM5RWin2Calculator:
     # STEP 1: Get trades needing consolidation
     # -----------------------------------------------------------------
 
-    def get_trades_needing_consolidation(self, conn, limit: Optional[int] = None) -> List[dict]:
+    def get_trades_needing_consolidation(self, conn, limit: Optional[int] = None,
+                                         trade_ids: Optional[List[str]] = None) -> List[dict]:
         """
         Query trades from m5_atr_stop_2 that are NOT yet in trades_m5_r_win_2.
-        JOINs with trades_2 for zone_high/zone_low.
+        JOINs with trades_2 for zone_high/zone_low. trade_ids restricts the
+        candidates to those trades.
 
         Returns list of dicts with all columns needed for the target table.
         """
         trades_table = SOURCE_TABLES['trades']
         m5_table = SOURCE_TABLES['m5_atr_stop']
+        trade_filter = "AND m5.trade_id = ANY(%s)" if trade_ids is not None else ""
 
         query = f"""
             SELECT
@@ -161,6 +164,7 @@ class TradesM5RWin2Calculator:
                 SELECT 1 FROM {TARGET_TABLE} tw
                 WHERE tw.trade_id = m5.trade_id
             )
+            {trade_filter}
             ORDER BY m5.date, m5.ticker, m5.entry_time
         """
 
@@ -168,7 +172,7 @@ class TradesM5RWin2Calculator:
             query += f" LIMIT {limit}"
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
+            cur.execute(query, (list(trade_ids),) if trade_ids is not None else None)
             rows = cur.fetchall()
 
         if self.verbose:
@@ -396,13 +400,16 @@ class TradesM5RWin2Calculator:
     # -----------------------------------------------------------------
 
     def run_batch_consolidation(self, limit: Optional[int] = None,
-                                 dry_run: bool = False) -> Dict:
+                                 dry_run: bool = False, conn=None,
+                                 trade_ids: Optional[List[str]] = None) -> Dict:
         """
         Main entry point: consolidate trades from source tables.
 
         Args:
             limit: Maximum number of trades to process (None = all)
             dry_run: If True, compute but don't write to DB
+            conn: Open connection to use (left open); connects if None
+            trade_ids: Only consider these trades
 
         Returns:
             Dict with processing stats
@@ -415,14 +422,15 @@ class TradesM5RWin2Calculator:
             'skipped': 0,
         }
 
-        conn = None
+        owns_conn = conn is None
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
+            if owns_conn:
+                conn = psycopg2.connect(**DB_CONFIG)
             conn.autocommit = False
 
             # Step 1: Get trades needing consolidation
             print(f"\n[1/4] Querying trades needing consolidation...")
-            trades = self.get_trades_needing_consolidation(conn, limit)
+            trades = self.get_trades_needing_consolidation(conn, limit, trade_ids)
             stats['total_source'] = len(trades)
 
             if not trades:
@@ -489,7 +497,7 @@ class TradesM5RWin2Calculator:
             raise
 
         finally:
-            if conn:
+            if conn and owns_conn:
                 conn.close()
             self._eod_cache.clear()
 
@@ -8,7 +8,8 @@ XIII Trading LLC
 
 Runs entry detection for a specific date using S15 bars and EPCH1-4 models.
 Exports detected entries to trades_2 table.
-Optionally runs secondary processors (M1 bars storage, etc.)
+Optionally runs secondary processors (M1 bars storage, etc.) in-process
+through the secondary pipeline (processor/secondary_analysis/pipeline.py).
 Designed to be called from the PyQt6 GUI via QProcess.
 
 USAGE:
@@ -18,6 +19,10 @@ USAGE:
     python run_backtest.py 2026-01-20 --m1-bars    # Also fetch/store M1 bars
     python run_backtest.py 2026-01-20 --m1-atr-stop  # Run M1 ATR stop analysis
     python run_backtest.py 2026-01-20 --m5-atr-stop  # Run M5 ATR stop analysis
+    python run_backtest.py 2026-01-20 --m1-bars --m1-indicators --m1-atr-stop --m5-atr-stop
+                                                   # Secondary processors run in-process as a DAG
+    python run_backtest.py 2026-01-05 --end-date 2026-01-23 --workers 8
+    python run_backtest.py 2026-01-05 --end-date 2026-01-23 --tickers SPY,NVDA
 
 MODEL:
     - S15 (15-second) bar close triggers EPCH1-4 entry detection
@@ -26,32 +31,35 @@ MODEL:
 ================================================================================
 """
 import sys
-import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import argparse
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import POLYGON_API_KEY
+from config import POLYGON_API_KEY, BACKTEST_WORKERS
 from data.supabase_zone_loader import SupabaseZoneLoader
 from data.s15_fetcher import S15Fetcher
 from data.trades_exporter import export_trades
-from engine.trade_simulator import TradeSimulator, EntryRecord
-
-# Secondary processor paths
-M1_BARS_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_bars"
-M1_INDICATORS_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_indicator_bars_2"
-M1_ATR_STOP_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_atr_stop_2"
-M5_ATR_STOP_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m5_atr_stop_2"
-TRADES_M5_R_WIN_2_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "trades_m5_r_win_2"
-
-# Indicator phase processors (run after m5_atr_stop_2 for outcomes)
-M1_TRADE_INDICATOR_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_trade_indicator_2"
-M1_RAMP_UP_INDICATOR_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_ramp_up_indicator_2"
-M1_POST_TRADE_INDICATOR_PROCESSOR = Path(__file__).parent.parent / "processor" / "secondary_analysis" / "m1_post_trade_indicator_2"
+from engine.trade_simulator import EntryRecord
+from engine.backtest_scheduler import (
+    BacktestScheduler, JobResult, detect_entries, flatten_entries, group_by_date
+)
+from processor.secondary_analysis.pipeline import SecondaryPipeline, print_results as print_pipeline_results
+
+# CLI flag -> secondary pipeline node
+SECONDARY_FLAGS = {
+    'm1_bars': 'm1_bars',
+    'm1_indicators': 'm1_indicators',
+    'm1_atr_stop': 'm1_atr_stop',
+    'm5_atr_stop': 'm5_atr_stop',
+    'trades_consolidated': 'trades_consolidated',
+    'm1_trade_ind': 'm1_trade_indicator',
+    'm1_ramp_up': 'm1_ramp_up',
+    'm1_post_trade': 'm1_post_trade',
+}
 
 
 def run_backtest_for_date(trade_date: str, dry_run: bool = False) -> List[EntryRecord]:
@@ -117,23 +125,8 @@ def run_backtest_for_date(trade_date: str, dry_run: bool = False) -> List[EntryR
             print(f"  No S15 data available - skipping")
             continue
 
-        # Initialize simulator (entry detection only)
-        simulator = TradeSimulator(ticker=ticker, trade_date=trade_date)
-        simulator.set_zones(primary_zone=primary_dict, secondary_zone=secondary_dict)
-
-        # Process S15 bars for entry detection
-        for s15_idx, s15_bar in enumerate(s15_bars):
-            simulator.process_bar_entries_only(
-                bar_idx=s15_idx,
-                bar_time=s15_bar.timestamp,
-                bar_open=s15_bar.open,
-                bar_high=s15_bar.high,
-                bar_low=s15_bar.low,
-                bar_close=s15_bar.close
-            )
-
-        # Collect entries
-        ticker_entries = simulator.get_entries()
+        # Entry detection on a fresh simulator
+        ticker_entries = detect_entries(ticker, trade_date, s15_bars, primary_dict, secondary_dict)
         all_entries.extend(ticker_entries)
 
         print(f"  Detected {len(ticker_entries)} entries for {ticker}")
@@ -147,6 +140,55 @@ def run_backtest_for_date(trade_date: str, dry_run: bool = False) -> List[EntryR
     return all_entries
 
 
+def run_backtest_for_range(start_date: str, end_date: Optional[str] = None,
+                           tickers: Optional[List[str]] = None,
+                           workers: int = BACKTEST_WORKERS) -> List[EntryRecord]:
+    """
+    Run entry detection for every ticker-date in a date range across a process pool.
+
+    Entries (and trade IDs) are identical to calling run_backtest_for_date
+    for each date in order.
+
+    Returns: List of all detected entries, ordered by date then ticker
+    """
+    def report(result: JobResult, done: int, total: int):
+        if result.error:
+            status = result.error
+        elif not result.bar_count:
+            status = "no S15 data - skipped"
+        else:
+            status = f"{len(result.entries)} entries"
+        print(f"  [{done}/{total}] {result.trade_date} {result.ticker}: {status}")
+
+    scheduler = BacktestScheduler(max_workers=workers, progress_callback=report)
+
+    print(f"\n[1/2] Loading zones for {start_date} -> {end_date or start_date}...")
+    jobs = scheduler.build_jobs(start_date, end_date, tickers)
+    if not jobs:
+        print("  No zones found - nothing to run")
+        return []
+    print(f"  {len(jobs)} ticker-dates across {len({j.trade_date for j in jobs})} dates")
+
+    print(f"\n[2/2] Detecting entries ({scheduler.max_workers} workers)...")
+    return flatten_entries(scheduler.run_jobs(jobs))
+
+
+def export_entries_by_date(entries: List[EntryRecord]):
+    """Export entries to trades_2, one export per trade date."""
+    for trade_date_str, day_entries in group_by_date(entries).items():
+        try:
+            trade_date = datetime.strptime(trade_date_str, '%Y-%m-%d').date()
+            export_stats = export_trades(day_entries, trade_date, verbose=True)
+
+            if export_stats.success:
+                print(f"\n  {trade_date_str}: exported {export_stats.trades_exported} entries successfully")
+            else:
+                print(f"\n  {trade_date_str}: export failed: {export_stats.errors}")
+
+        except Exception as e:
+            print(f"\n  {trade_date_str}: export error: {e}")
+
+
 def print_summary(entries: List[EntryRecord]):
     """Print entry detection summary."""
     if not entries:
@@ -179,260 +221,31 @@ def print_summary(entries: List[EntryRecord]):
         print(f"  {model}: {by_model[model]} entries")
 
 
-def run_m1_bars_processor():
-    """Run the M1 bars secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M1 BARS] Fetching M1 bar data (Prior Day 16:00 -> Trade Day 16:00)")
-    print(f"{'='*70}")
-
-    runner_script = M1_BARS_PROCESSOR / "m1_bars_runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 bars runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_BARS_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 BARS] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 BARS] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M1 BARS] Error: {e}")
-        return False
-
-
-def run_m1_indicators_processor():
-    """Run the M1 indicator bars secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M1 INDICATORS] Calculating M1 indicator bars from m1_bars_2")
-    print(f"{'='*70}")
-
-    runner_script = M1_INDICATORS_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 indicators runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_INDICATORS_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 INDICATORS] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 INDICATORS] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M1 INDICATORS] Error: {e}")
-        return False
-
-
-def run_m1_atr_stop_processor():
-    """Run the M1 ATR Stop secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M1 ATR STOP] Calculating M1 ATR stop outcomes (R-multiple targets)")
-    print(f"{'='*70}")
-
-    runner_script = M1_ATR_STOP_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 ATR Stop runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_ATR_STOP_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 ATR STOP] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 ATR STOP] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M1 ATR STOP] Error: {e}")
-        return False
-
-
-def run_m5_atr_stop_processor():
-    """Run the M5 ATR Stop secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M5 ATR STOP] Calculating M5 ATR stop outcomes (R-multiple targets)")
-    print(f"{'='*70}")
-
-    runner_script = M5_ATR_STOP_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M5 ATR Stop runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M5_ATR_STOP_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M5 ATR STOP] Completed successfully")
-            return True
-        else:
-            print(f"\n[M5 ATR STOP] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M5 ATR STOP] Error: {e}")
-        return False
-
-
-def run_trades_consolidated_processor():
-    """Run the trades consolidation secondary processor."""
-    print(f"\n{'='*70}")
-    print("[TRADES CONSOLIDATED] Consolidating trades into trades_m5_r_win_2")
-    print(f"{'='*70}")
-
-    runner_script = TRADES_M5_R_WIN_2_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: Trades consolidated runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(TRADES_M5_R_WIN_2_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[TRADES CONSOLIDATED] Completed successfully")
-            return True
-        else:
-            print(f"\n[TRADES CONSOLIDATED] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[TRADES CONSOLIDATED] Error: {e}")
-        return False
-
-
-def run_m1_trade_indicator_processor():
-    """Run the M1 trade indicator secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M1 TRADE IND] Populating m1_trade_indicator_2 (entry bar snapshots)")
-    print(f"{'='*70}")
-
-    runner_script = M1_TRADE_INDICATOR_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 trade indicator runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_TRADE_INDICATOR_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 TRADE IND] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 TRADE IND] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M1 TRADE IND] Error: {e}")
-        return False
+def run_secondary_processors(names: List[str], full: bool = False) -> bool:
+    """
+    Run the selected secondary processors in-process as a DAG.
 
+    Processors share one connection pool and the M1 bars just stored;
+    independent processors run concurrently, and each one only sees trade
+    IDs it has not settled on an earlier run (unless full is set).
 
-def run_m1_ramp_up_indicator_processor():
-    """Run the M1 ramp-up indicator secondary processor."""
+    Returns: True if every processor finished without errors
+    """
     print(f"\n{'='*70}")
-    print("[M1 RAMP-UP] Populating m1_ramp_up_indicator_2 (25-bar pre-entry)")
+    print(f"[SECONDARY] Running {', '.join(names)}")
     print(f"{'='*70}")
 
-    runner_script = M1_RAMP_UP_INDICATOR_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 ramp-up indicator runner not found: {runner_script}")
-        return False
-
+    pipeline = SecondaryPipeline(verbose=True)
     try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_RAMP_UP_INDICATOR_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 RAMP-UP] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 RAMP-UP] Failed with exit code {result.returncode}")
-            return False
-
+        results = pipeline.run(names, full=full)
     except Exception as e:
-        print(f"\n[M1 RAMP-UP] Error: {e}")
+        print(f"\n[SECONDARY] Error: {e}")
         return False
+    finally:
+        pipeline.close()
 
-
-def run_m1_post_trade_indicator_processor():
-    """Run the M1 post-trade indicator secondary processor."""
-    print(f"\n{'='*70}")
-    print("[M1 POST-TRADE] Populating m1_post_trade_indicator_2 (25-bar post-entry)")
-    print(f"{'='*70}")
-
-    runner_script = M1_POST_TRADE_INDICATOR_PROCESSOR / "runner.py"
-
-    if not runner_script.exists():
-        print(f"  ERROR: M1 post-trade indicator runner not found: {runner_script}")
-        return False
-
-    try:
-        result = subprocess.run(
-            [sys.executable, str(runner_script), "--verbose"],
-            cwd=str(M1_POST_TRADE_INDICATOR_PROCESSOR),
-            capture_output=False,
-            text=True
-        )
-
-        if result.returncode == 0:
-            print(f"\n[M1 POST-TRADE] Completed successfully")
-            return True
-        else:
-            print(f"\n[M1 POST-TRADE] Failed with exit code {result.returncode}")
-            return False
-
-    except Exception as e:
-        print(f"\n[M1 POST-TRADE] Error: {e}")
-        return False
+    print_pipeline_results(results)
+    return all(r.status in ('ok', 'up_to_date') for r in results.values())
 
 
 def main():
@@ -446,10 +259,17 @@ Examples:
   python run_backtest.py 2026-01-20 --dry-run    # Preview without DB writes
   python run_backtest.py 2026-01-20 --no-export  # Skip Supabase export
   python run_backtest.py 2026-01-20 --m1-bars    # Also fetch/store M1 bars
+  python run_backtest.py 2026-01-05 --end-date 2026-01-23 --workers 8
         """
     )
 
-    parser.add_argument('date', help='Trading date (YYYY-MM-DD)')
+    parser.add_argument('date', help='Trading date (YYYY-MM-DD); start date with --end-date')
+    parser.add_argument('--end-date', default=None,
+                        help='Last trading date (YYYY-MM-DD); runs ticker-dates in parallel')
+    parser.add_argument('--tickers', default=None,
+                        help='Comma-separated tickers to run (default: all with zones)')
+    parser.add_argument('--workers', type=int, default=BACKTEST_WORKERS,
+                        help=f'Worker processes for multi-date runs (default: {BACKTEST_WORKERS})')
     parser.add_argument('--dry-run', action='store_true',
                         help='Preview without database writes')
     parser.add_argument('--no-export', action='store_true',
@@ -470,6 +290,8 @@ Examples:
                         help='Populate m1_ramp_up_indicator_2 (25-bar pre-entry indicators)')
     parser.add_argument('--m1-post-trade', action='store_true',
                         help='Populate m1_post_trade_indicator_2 (25-bar post-entry indicators)')
+    parser.add_argument('--ignore-watermarks', action='store_true',
+                        help='Hand secondary processors every trade, not only unsettled ones')
 
     args = parser.parse_args()
 
@@ -479,7 +301,17 @@ Examples:
     print("XIII Trading LLC")
     print("=" * 70)
 
-    print(f"\nDate: {args.date}")
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()] if args.tickers else None
+    parallel = args.end_date is not None or tickers is not None
+
+    if args.end_date:
+        print(f"\nDates: {args.date} -> {args.end_date}")
+    else:
+        print(f"\nDate: {args.date}")
+    if tickers:
+        print(f"Tickers: {', '.join(tickers)}")
+    if parallel:
+        print(f"Workers: {args.workers}")
     print(f"Mode: {'DRY RUN (no writes)' if args.dry_run else 'LIVE'}")
     print(f"Export: {'Disabled' if args.no_export else 'Enabled'}")
     print(f"M1 Bars: {'Enabled' if args.m1_bars else 'Disabled'}")
@@ -492,7 +324,10 @@ Examples:
     print(f"M1 Post-Trade Indicator: {'Enabled' if args.m1_post_trade else 'Disabled'}")
 
     # Run entry detection
-    entries = run_backtest_for_date(args.date, dry_run=args.dry_run)
+    if parallel:
+        entries = run_backtest_for_range(args.date, args.end_date, tickers, workers=args.workers)
+    else:
+        entries = run_backtest_for_date(args.date, dry_run=args.dry_run)
 
     # Print results
     print(f"\n{'='*70}")
@@ -508,49 +343,12 @@ Examples:
             print("EXPORTING TO SUPABASE (trades_2)")
             print(f"{'='*70}")
 
-            try:
-                from datetime import datetime as dt
-                trade_date = dt.strptime(args.date, '%Y-%m-%d').date()
-                export_stats = export_trades(entries, trade_date, verbose=True)
-
-                if export_stats.success:
-                    print(f"\n  Exported {export_stats.trades_exported} entries successfully")
-                else:
-                    print(f"\n  Export failed: {export_stats.errors}")
-
-            except Exception as e:
-                print(f"\n  Export error: {e}")
-
-        # Run M1 bars processor if requested
-        if args.m1_bars and not args.dry_run:
-            run_m1_bars_processor()
-
-        # Run M1 indicators processor if requested
-        if args.m1_indicators and not args.dry_run:
-            run_m1_indicators_processor()
-
-        # Run M1 ATR Stop processor if requested
-        if args.m1_atr_stop and not args.dry_run:
-            run_m1_atr_stop_processor()
-
-        # Run M5 ATR Stop processor if requested
-        if args.m5_atr_stop and not args.dry_run:
-            run_m5_atr_stop_processor()
-
-        # Run trades consolidation processor if requested
-        if args.trades_consolidated and not args.dry_run:
-            run_trades_consolidated_processor()
-
-        # Run indicator phase processors if requested
-        # (These require m5_atr_stop_2 outcomes to exist)
-        if args.m1_trade_ind and not args.dry_run:
-            run_m1_trade_indicator_processor()
-
-        if args.m1_ramp_up and not args.dry_run:
-            run_m1_ramp_up_indicator_processor()
+            export_entries_by_date(entries)
 
-        if args.m1_post_trade and not args.dry_run:
-            run_m1_post_trade_indicator_processor()
+        # Run requested secondary processors (one in-process DAG run)
+        secondary = [node for flag, node in SECONDARY_FLAGS.items() if getattr(args, flag)]
+        if secondary and not args.dry_run:
+            run_secondary_processors(secondary, full=args.ignore_watermarks)
 
     else:
         print("\nNo entries detected.")
@@ -8,15 +8,11 @@ XIII Trading LLC
 Provides all indicator data needed by the 5 analysis tabs.
 Sources: m1_trade_indicator_2, m1_ramp_up_indicator_2, m1_post_trade_indicator_2
 """
-import warnings
-import psycopg2
-import psycopg2.extras
 import pandas as pd
 from datetime import date
 from typing import Optional, Dict, List, Tuple
 
-# Silence pandas warning about psycopg2 not being a tested DBAPI2 connector
-warnings.filterwarnings("ignore", message=".*pandas only supports SQLAlchemy.*")
+from shared.data.db_pool import get_db_pool
 
 from config import (
     DB_CONFIG, TABLE_TRADES, TABLE_M5_ATR,
@@ -28,33 +24,33 @@ class DataProvider:
     """Provides all data needed by indicator analysis tabs."""
 
     def __init__(self):
-        self._conn = None
+        self._pool = None
 
     # ------------------------------------------------------------------
-    # Connection
+    # Connection (pooled - shared.data.db_pool)
     # ------------------------------------------------------------------
     def connect(self) -> bool:
         try:
-            self._conn = psycopg2.connect(**DB_CONFIG)
+            self._pool = get_db_pool(DB_CONFIG)
+            with self._pool.connection():
+                pass
             return True
         except Exception as e:
             print(f"[DataProvider] Connection failed: {e}")
             return False
 
     def close(self):
-        if self._conn and not self._conn.closed:
-            self._conn.close()
+        self._pool = None
 
     def _query(self, sql: str, params=None) -> pd.DataFrame:
-        if not self._conn or self._conn.closed:
-            self.connect()
+        if self._pool is None:
+            self._pool = get_db_pool(DB_CONFIG)
         try:
-            return pd.read_sql_query(sql, self._conn, params=params)
+            return self._pool.query_frame(sql, params)
         except Exception as e:
             print(f"[DataProvider] Query error: {e}")
-            # Try reconnecting once
-            self.connect()
-            return pd.read_sql_query(sql, self._conn, params=params)
+            # Retry once - a stale pooled connection is dropped on failure
+            return self._pool.query_frame(sql, params)
 
     # ------------------------------------------------------------------
     # Filter support
@@ -9,11 +9,12 @@ Provides the shared database connection and base query infrastructure.
 Individual question modules use provider._query() for their own SQL.
 """
 import json
-import psycopg2
 import pandas as pd
 from datetime import date, datetime
 from typing import Optional, Dict
 
+from shared.data.db_pool import get_db_pool
+
 from config import DB_CONFIG, TABLE_TRADES
 
 # Export table for question results
@@ -24,37 +25,43 @@ class DataProvider:
     """Core data access layer for system analysis questions."""
 
     def __init__(self):
-        self._conn = None
+        self._pool = None
 
     # ------------------------------------------------------------------
-    # Connection
+    # Connection (pooled - shared.data.db_pool)
     # ------------------------------------------------------------------
     def connect(self) -> bool:
         try:
-            self._conn = psycopg2.connect(**DB_CONFIG)
+            self._pool = get_db_pool(DB_CONFIG)
+            with self._pool.connection():
+                pass
             return True
         except Exception as e:
             print(f"[DataProvider] Connection failed: {e}")
             return False
 
     def close(self):
-        if self._conn and not self._conn.closed:
-            self._conn.close()
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = get_db_pool(DB_CONFIG)
+        return self._pool
 
     def query(self, sql: str, params=None) -> pd.DataFrame:
         """Execute a SQL query and return a DataFrame.
 
-        Auto-reconnects on connection failure. Available to question modules
-        for custom queries.
+        Runs on a pooled connection (retried once on failure), so question
+        modules may query from several threads at once. Available to
+        question modules for custom queries.
         """
-        if not self._conn or self._conn.closed:
-            self.connect()
         try:
-            return pd.read_sql_query(sql, self._conn, params=params)
+            return self.pool.query_frame(sql, params)
         except Exception as e:
             print(f"[DataProvider] Query error: {e}")
-            self.connect()
-            return pd.read_sql_query(sql, self._conn, params=params)
+            # Retry once - a stale pooled connection is dropped on failure
+            return self.pool.query_frame(sql, params)
 
     # ------------------------------------------------------------------
     # Common queries used across questions
@@ -118,16 +125,14 @@ class DataProvider:
             ALTER TABLE {TABLE_EXPORT}
             ADD COLUMN IF NOT EXISTS batch_id UUID;
         """
-        if not self._conn or self._conn.closed:
-            self.connect()
         try:
-            with self._conn.cursor() as cur:
-                cur.execute(sql_create)
-                cur.execute(sql_migrate)
-            self._conn.commit()
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql_create)
+                    cur.execute(sql_migrate)
+                conn.commit()
         except Exception as e:
             print(f"[DataProvider] Failed to create export table: {e}")
-            self._conn.rollback()
 
     def export_question_result(self, question_id: str, question_text: str,
                                 time_period: str, result: dict,
@@ -149,22 +154,17 @@ class DataProvider:
                  metadata_json, batch_id, computed_at)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        if not self._conn or self._conn.closed:
-            self.connect()
         try:
-            with self._conn.cursor() as cur:
-                cur.execute(sql, (
-                    question_id,
-                    question_text,
-                    time_period,
-                    json.dumps(result, default=str),
-                    json.dumps(metadata, default=str) if metadata else None,
-                    batch_id,
-                    datetime.now(),
-                ))
-            self._conn.commit()
+            self.pool.execute(sql, (
+                question_id,
+                question_text,
+                time_period,
+                json.dumps(result, default=str),
+                json.dumps(metadata, default=str) if metadata else None,
+                batch_id,
+                datetime.now(),
+            ), label="export_question_result")
             return True
         except Exception as e:
             print(f"[DataProvider] Export failed: {e}")
-            self._conn.rollback()
             return False
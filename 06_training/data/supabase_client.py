@@ -1,14 +1,18 @@
 """
 Epoch Trading System - Supabase Client for Training Module
 Handles trade fetching for the training module.
+
+The connection is borrowed from the shared pool (shared.data.db_pool), so
+a reconnect after a stale session reuses a warm pooled connection.
 """
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
 import logging
 
+from shared.data.db_pool import get_db_pool
+
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,13 +30,16 @@ class SupabaseClient:
     """
 
     def __init__(self):
-        """Initialize the client (connection created on demand)."""
+        """Initialize the client (connection borrowed on demand)."""
         self.conn = None
+        self._pool = None
 
     def connect(self) -> bool:
-        """Establish database connection."""
+        """Borrow a database connection from the shared pool."""
+        self.disconnect()
         try:
-            self.conn = psycopg2.connect(**DB_CONFIG)
+            self._pool = get_db_pool(DB_CONFIG)
+            self.conn = self._pool.getconn()
             logger.info("Connected to Supabase")
             return True
         except Exception as e:
@@ -40,9 +47,9 @@ class SupabaseClient:
             return False
 
     def disconnect(self):
-        """Close database connection."""
+        """Return the connection to the pool (uncommitted work is rolled back)."""
         if self.conn:
-            self.conn.close()
+            self._pool.putconn(self.conn)
             self.conn = None
 
     def _ensure_connected(self):
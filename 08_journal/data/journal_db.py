@@ -5,6 +5,10 @@ Follows patterns from:
 - 00_shared/data/supabase/client.py (connection management, context manager)
 - 06_training/data/supabase_client.py (_ensure_connected, RealDictCursor)
 
+The connection is borrowed from the shared pool (shared.data.db_pool) on
+connect() and returned on close(), so repeated `with JournalDB()` blocks
+reuse one warm connection instead of reconnecting each time.
+
 Table: journal_trades
     - Separate from existing `trades` table to avoid conflicts
     - Stores aggregated trade data (fills are ephemeral)
@@ -16,12 +20,13 @@ Usage:
         trades = db.get_trades_by_date(date(2026, 1, 28))
 """
 
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import date
 from typing import List, Optional, Dict
 import logging
 
+from shared.data.db_pool import get_db_pool
+
 logger = logging.getLogger(__name__)
 
 # DB config — matches 00_shared/config/credentials.py and 06_training/config.py
@@ -54,11 +59,14 @@ class JournalDB:
 
     def __init__(self):
         self.conn = None
+        self._pool = None
 
     def connect(self) -> bool:
-        """Establish database connection."""
+        """Borrow a database connection from the shared pool."""
+        self.close()
         try:
-            self.conn = psycopg2.connect(**DB_CONFIG)
+            self._pool = get_db_pool(DB_CONFIG)
+            self.conn = self._pool.getconn()
             logger.info("Connected to Supabase")
             return True
         except Exception as e:
@@ -66,9 +74,9 @@ class JournalDB:
             return False
 
     def close(self):
-        """Close database connection."""
+        """Return the connection to the pool (uncommitted work is rolled back)."""
         if self.conn:
-            self.conn.close()
+            self._pool.putconn(self.conn)
             self.conn = None
 
     def __enter__(self):
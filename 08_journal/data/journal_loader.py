@@ -7,29 +7,26 @@ journal_trades if j_trades_m5_r_win is not yet populated).
 
 Follows the same pattern as 11_trade_reel/data/highlight_loader.py:
 - Singleton class with _ensure_connected
-- RealDictCursor for dict-based row access
-- Reconnect-on-stale for long-running PyQt sessions
+- Dict rows for trades / setups, DataFrames for bar data
+
+Every query runs on a connection borrowed from the shared pool
+(shared.data.db_pool), so viewer widgets can load ramp-up, post-trade and
+VbP data from several threads at once, and a stale connection is dropped
+instead of poisoning the session. Bar queries decode straight to float
+columns (no Decimal, no per-row dicts).
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
 from datetime import date, time
 from typing import List, Optional, Tuple, Dict
-from decimal import Decimal
 import logging
 import pandas as pd
 
-logger = logging.getLogger(__name__)
+from shared.data.db_pool import get_db_pool
 
-# DB config — matches journal_db.py and 00_shared/config/credentials.py
-DB_CONFIG = {
-    "host": "db.pdbmcskznoaiybdiobje.supabase.co",
-    "port": 5432,
-    "database": "postgres",
-    "user": "postgres",
-    "password": "guid-saltation-covet",
-    "sslmode": "require",
-}
+from .journal_db import DB_CONFIG
+
+logger = logging.getLogger(__name__)
 
 
 class JournalTradeLoader:
@@ -51,27 +48,28 @@ class JournalTradeLoader:
     """
 
     def __init__(self):
-        self.conn = None
+        self._pool = None
 
     def connect(self) -> bool:
-        """Establish database connection."""
+        """Attach to the shared pool and check the database is reachable."""
         try:
-            self.conn = psycopg2.connect(**DB_CONFIG)
+            self._pool = get_db_pool(DB_CONFIG)
+            with self._pool.connection():
+                pass
             logger.info("JournalTradeLoader: Connected to Supabase")
             return True
         except Exception as e:
             logger.error(f"JournalTradeLoader: Failed to connect: {e}")
+            self._pool = None
             return False
 
     def disconnect(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Detach from the pool (its connections stay open for other clients)."""
+        self._pool = None
 
     def _ensure_connected(self) -> bool:
-        """Reconnect if needed. Returns True if connected."""
-        if not self.conn or self.conn.closed:
+        """Connect if needed. Returns True if connected."""
+        if self._pool is None:
             return self.connect()
         return True
 
@@ -102,7 +100,7 @@ class JournalTradeLoader:
             account: Filter by account (SIM/LIVE)
 
         Returns:
-            List of trade dicts (RealDictCursor rows)
+            List of trade dicts
         """
         if not self._ensure_connected():
             logger.warning("Skipping fetch_trades - no database connection")
@@ -149,18 +147,12 @@ class JournalTradeLoader:
         query += " ORDER BY trade_date, entry_time"
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                return [dict(row) for row in cur.fetchall()]
+            return self._pool.query_records(query, params)
         except psycopg2.errors.UndefinedTable:
             logger.warning("Table j_trades_m5_r_win does not exist yet")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return []
         except Exception as e:
             logger.error(f"Error fetching from j_trades_m5_r_win: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return []
 
     def _fetch_from_journal(
@@ -193,13 +185,9 @@ class JournalTradeLoader:
         query += " ORDER BY trade_date, entry_time"
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                return [dict(row) for row in cur.fetchall()]
+            return self._pool.query_records(query, params)
         except Exception as e:
             logger.error(f"Error fetching from journal_trades: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return []
 
     # =========================================================================
@@ -232,13 +220,9 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (ticker.upper(), trade_date))
-                return [dict(row) for row in cur.fetchall()]
+            return self._pool.query_records(query, (ticker.upper(), trade_date))
         except Exception as e:
             logger.error(f"Error fetching setups for {ticker} on {trade_date}: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return []
 
     def fetch_hvn_pocs(self, ticker: str, trade_date: date) -> List[float]:
@@ -258,13 +242,11 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor() as cur:
+            with self._pool.connection() as conn, conn.cursor() as cur:
                 cur.execute(query, (ticker.upper(), trade_date))
                 return [float(row[0]) for row in cur.fetchall() if row[0] is not None]
         except Exception as e:
             logger.error(f"Error fetching hvn_pocs for {ticker}: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return []
 
     # =========================================================================
@@ -298,30 +280,21 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (ticker.upper(), trade_date, entry_time))
-                rows = cur.fetchall()
-
-                if not rows:
-                    return pd.DataFrame()
+            df = self._pool.query_frame(query, (ticker.upper(), trade_date, entry_time),
+                                        label="journal_rampup")
+            if df.empty:
+                return pd.DataFrame()
 
-                df = pd.DataFrame([dict(r) for r in rows])
-                df = self._convert_decimal_columns(df)
+            # Reverse to chronological order
+            df = df.iloc[::-1].reset_index(drop=True)
 
-                # Reverse to chronological order
-                df = df.iloc[::-1].reset_index(drop=True)
-
-                logger.info(f"Rampup: {ticker} {trade_date} < {entry_time} ({len(df)} bars)")
-                return df
+            logger.info(f"Rampup: {ticker} {trade_date} < {entry_time} ({len(df)} bars)")
+            return df
         except psycopg2.errors.UndefinedTable:
             logger.warning("Table j_m1_indicator_bars does not exist yet")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
         except Exception as e:
             logger.error(f"Error fetching rampup data: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
 
     def fetch_posttrade_data(self, ticker: str, trade_date: date, entry_time: time) -> pd.DataFrame:
@@ -351,27 +324,18 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (ticker.upper(), trade_date, entry_time))
-                rows = cur.fetchall()
-
-                if not rows:
-                    return pd.DataFrame()
+            df = self._pool.query_frame(query, (ticker.upper(), trade_date, entry_time),
+                                        label="journal_posttrade")
+            if df.empty:
+                return pd.DataFrame()
 
-                df = pd.DataFrame([dict(r) for r in rows])
-                df = self._convert_decimal_columns(df)
-
-                logger.info(f"Posttrade: {ticker} {trade_date} >= {entry_time} ({len(df)} bars)")
-                return df
+            logger.info(f"Posttrade: {ticker} {trade_date} >= {entry_time} ({len(df)} bars)")
+            return df
         except psycopg2.errors.UndefinedTable:
             logger.warning("Table j_m1_indicator_bars does not exist yet")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
         except Exception as e:
             logger.error(f"Error fetching posttrade data: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
 
     # =========================================================================
@@ -400,7 +364,7 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor() as cur:
+            with self._pool.connection() as conn, conn.cursor() as cur:
                 cur.execute(query, (ticker.upper(), trade_date))
                 row = cur.fetchone()
                 if row and row[0]:
@@ -408,8 +372,6 @@ class JournalTradeLoader:
                 return None
         except Exception as e:
             logger.error(f"Error fetching epoch_start_date for {ticker}: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return None
 
     def fetch_intraday_vbp_bars(self, ticker: str, trade_date: date, entry_time: time) -> pd.DataFrame:
@@ -440,27 +402,18 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (ticker.upper(), trade_date, entry_time))
-                rows = cur.fetchall()
-
-                if not rows:
-                    return pd.DataFrame()
+            df = self._pool.query_frame(query, (ticker.upper(), trade_date, entry_time),
+                                        label="journal_vbp_bars")
+            if df.empty:
+                return pd.DataFrame()
 
-                df = pd.DataFrame([dict(r) for r in rows])
-                df = self._convert_decimal_columns(df)
-
-                logger.info(f"Intraday VbP: {ticker} {trade_date} 04:00->{entry_time} ({len(df)} M1 bars)")
-                return df
+            logger.info(f"Intraday VbP: {ticker} {trade_date} 04:00->{entry_time} ({len(df)} M1 bars)")
+            return df
         except psycopg2.errors.UndefinedTable:
             logger.warning("Table j_m1_bars does not exist yet")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
         except Exception as e:
             logger.error(f"Error fetching intraday vbp bars: {e}")
-            if self.conn and not self.conn.closed:
-                self.conn.rollback()
             return pd.DataFrame()
 
     # =========================================================================
@@ -485,7 +438,7 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor() as cur:
+            with self._pool.connection() as conn, conn.cursor() as cur:
                 cur.execute(query, (date_from, date_to))
                 return [row[0] for row in cur.fetchall()]
         except Exception as e:
@@ -510,7 +463,7 @@ class JournalTradeLoader:
         """
 
         try:
-            with self.conn.cursor() as cur:
+            with self._pool.connection() as conn, conn.cursor() as cur:
                 cur.execute(query)
                 return [row[0] for row in cur.fetchall()]
         except Exception as e:
@@ -531,7 +484,7 @@ class JournalTradeLoader:
         query = "SELECT MIN(trade_date), MAX(trade_date) FROM journal_trades"
 
         try:
-            with self.conn.cursor() as cur:
+            with self._pool.connection() as conn, conn.cursor() as cur:
                 cur.execute(query)
                 row = cur.fetchone()
                 if row:
@@ -541,20 +494,6 @@ class JournalTradeLoader:
             logger.error(f"Error fetching date range: {e}")
             return None, None
 
-    # =========================================================================
-    # UTILITIES
-    # =========================================================================
-
-    @staticmethod
-    def _convert_decimal_columns(df: pd.DataFrame) -> pd.DataFrame:
-        """Convert Decimal columns to float for Plotly compatibility."""
-        for col in df.columns:
-            if df[col].dtype == object and len(df) > 0:
-                sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
-                if isinstance(sample, Decimal):
-                    df[col] = df[col].apply(lambda x: float(x) if isinstance(x, Decimal) else x)
-        return df
-
 
 # =============================================================================
 # Singleton
@@ -111,6 +111,7 @@ POST_TRADE_BARS = 25
 # BATCH CONFIGURATION
 # =============================================================================
 BATCH_INSERT_SIZE = 500
+BULK_BATCH_SIZE = 50000  # Rows per COPY + merge (shared.data.bulk_writer)
 
 # =============================================================================
 # LOGGING
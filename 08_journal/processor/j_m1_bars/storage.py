@@ -19,7 +19,6 @@ Version: 1.0.0
 
 import requests
 import psycopg2
-from psycopg2.extras import execute_values
 from datetime import datetime, date, time, timedelta
 from typing import List, Dict, Set, Tuple, Any, Optional
 import time as time_module
@@ -32,14 +31,20 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from db_config import (
     DB_CONFIG, POLYGON_API_KEY, API_DELAY, API_RETRIES, API_RETRY_DELAY,
-    SOURCE_TABLE, J_M1_BARS_TABLE, BATCH_INSERT_SIZE,
+    SOURCE_TABLE, J_M1_BARS_TABLE, BULK_BATCH_SIZE,
     PRIOR_DAY_START, TRADE_DAY_END, VERBOSE,
     JOURNAL_SYMBOL_COL, JOURNAL_DATE_COL
 )
+from shared.data.bulk_writer import bulk_write
 
 ET = pytz.timezone('America/New_York')
 UTC = pytz.UTC
 
+INSERT_COLUMNS = (
+    'ticker', 'bar_date', 'bar_time', 'bar_timestamp',
+    'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions'
+)
+
 
 def _get_prior_trading_day(trade_date: date) -> date:
     """Get the prior trading day (skip weekends)."""
@@ -264,19 +269,14 @@ class JM1BarsStorage:
                 bar.get('transactions')
             ))
 
-        insert_query = f"""
-            INSERT INTO {J_M1_BARS_TABLE}
-                (ticker, bar_date, bar_time, bar_timestamp,
-                 open, high, low, close, volume, vwap, transactions)
-            VALUES %s
-            ON CONFLICT (ticker, bar_timestamp) DO NOTHING
-        """
-
         try:
-            with conn.cursor() as cur:
-                execute_values(cur, insert_query, insert_data, page_size=BATCH_INSERT_SIZE)
+            result = bulk_write(
+                conn, J_M1_BARS_TABLE, INSERT_COLUMNS, insert_data,
+                conflict_columns=('ticker', 'bar_timestamp'),
+                batch_size=BULK_BATCH_SIZE
+            )
             conn.commit()
-            self.stats['bars_inserted'] += bar_count
+            self.stats['bars_inserted'] += result.merged
             return bar_count
         except Exception as e:
             conn.rollback()
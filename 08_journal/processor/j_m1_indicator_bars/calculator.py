@@ -21,7 +21,7 @@ Version: 2.0.0 (SWH-6 migration)
 """
 
 import psycopg2
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
 from datetime import datetime, date, time
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
@@ -37,7 +37,7 @@ _PROC_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(_PROC_DIR))
 from db_config import (
     DB_CONFIG, SOURCE_TABLE, J_M1_BARS_TABLE, J_M1_INDICATOR_BARS_TABLE,
-    BATCH_INSERT_SIZE, VERBOSE, JOURNAL_SYMBOL_COL, JOURNAL_DATE_COL,
+    BULK_BATCH_SIZE, VERBOSE, JOURNAL_SYMBOL_COL, JOURNAL_DATE_COL,
     POLYGON_API_KEY, ATR_PERIOD,
 )
 
@@ -48,6 +48,7 @@ from db_config import (
 from shared.indicators.config import CONFIG
 from shared.indicators.core.atr import calculate_true_range
 from shared.indicators.structure import calculate_structure_from_bars
+from shared.data.bulk_writer import bulk_write
 
 # =============================================================================
 # IMPORT FROM BACKTEST (M1IndicatorCalculator + StructureAnalyzer)
@@ -74,6 +75,19 @@ StructureResult = _structure_mod.StructureResult
 STRUCTURE_LABELS = _structure_mod.STRUCTURE_LABELS
 
 
+# j_m1_indicator_bars columns, in insert_results row order
+INSERT_COLUMNS = (
+    'ticker', 'bar_date', 'bar_time', 'open', 'high', 'low', 'close',
+    'volume', 'candle_range_pct', 'vol_delta_raw', 'vol_delta_roll',
+    'vol_roc', 'sma9', 'sma21', 'sma_config', 'sma_spread_pct',
+    'price_position', 'vwap', 'sma_spread', 'sma_momentum_ratio',
+    'sma_momentum_label', 'cvd_slope', 'h4_structure', 'h1_structure',
+    'm15_structure', 'm5_structure', 'm1_structure', 'health_score',
+    'long_score', 'short_score', 'atr_m1', 'atr_m5', 'atr_m15',
+    'bars_in_calculation',
+)
+
+
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
@@ -582,21 +596,6 @@ class JM1IndicatorBarsPopulator:
         if not results:
             return 0
 
-        query = f"""
-            INSERT INTO {J_M1_INDICATOR_BARS_TABLE} (
-                ticker, bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct, vol_delta_raw, vol_delta_roll, vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct, price_position,
-                vwap, sma_spread, sma_momentum_ratio, sma_momentum_label, cvd_slope,
-                h4_structure, h1_structure, m15_structure, m5_structure, m1_structure,
-                health_score, long_score, short_score,
-                atr_m1, atr_m5, atr_m15,
-                bars_in_calculation
-            ) VALUES %s
-            ON CONFLICT (ticker, bar_date, bar_time) DO NOTHING
-        """
-
         values = []
         for r in results:
             row = (
@@ -632,10 +631,12 @@ class JM1IndicatorBarsPopulator:
             )
             values.append(row)
 
-        with conn.cursor() as cur:
-            execute_values(cur, query, values, page_size=BATCH_INSERT_SIZE)
-
-        return len(values)
+        result = bulk_write(
+            conn, J_M1_INDICATOR_BARS_TABLE, INSERT_COLUMNS, values,
+            conflict_columns=('ticker', 'bar_date', 'bar_time'),
+            batch_size=BULK_BATCH_SIZE
+        )
+        return result.rows
 
     def get_status(self, conn) -> Dict[str, Any]:
         """Get current table status."""
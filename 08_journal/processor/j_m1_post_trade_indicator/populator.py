@@ -24,7 +24,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import psycopg2
-from psycopg2.extras import execute_values
+from shared.data.bulk_writer import bulk_write
 from datetime import datetime, date, time, timedelta
 from typing import Dict, List, Any, Optional
 from decimal import Decimal
@@ -33,7 +33,7 @@ import logging
 from db_config import (
     DB_CONFIG, SOURCE_TABLE, J_M1_INDICATOR_BARS_TABLE,
     J_M1_POST_TRADE_INDICATOR_TABLE, J_M5_ATR_STOP_TABLE,
-    BATCH_INSERT_SIZE, VERBOSE, POST_TRADE_BARS,
+    BULK_BATCH_SIZE, VERBOSE, POST_TRADE_BARS,
     JOURNAL_SYMBOL_COL, JOURNAL_DATE_COL,
     SCHEMA_DIR
 )
@@ -90,6 +90,17 @@ def _safe_int(value, default=None):
         return default
 
 
+# Target columns, in insert order (row dict keys match column names)
+INSERT_COLUMNS = (
+    'trade_id', 'bar_sequence', 'ticker', 'bar_date', 'bar_time', 'open',
+    'high', 'low', 'close', 'volume', 'candle_range_pct', 'vol_delta_raw',
+    'vol_delta_roll', 'vol_roc', 'sma9', 'sma21', 'sma_config',
+    'sma_spread_pct', 'sma_momentum_label', 'price_position', 'cvd_slope',
+    'm5_structure', 'm15_structure', 'h1_structure', 'health_score',
+    'long_score', 'short_score', 'is_winner', 'pnl_r', 'max_r_achieved',
+)
+
+
 # =============================================================================
 # POPULATOR CLASS
 # =============================================================================
@@ -243,39 +254,13 @@ class JM1PostTradeIndicatorPopulator:
         if not rows:
             return 0
 
-        query = f"""
-            INSERT INTO {J_M1_POST_TRADE_INDICATOR_TABLE} (
-                trade_id, bar_sequence, ticker, bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct, vol_delta_raw, vol_delta_roll, vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct, sma_momentum_label,
-                price_position, cvd_slope,
-                m5_structure, m15_structure, h1_structure,
-                health_score, long_score, short_score,
-                is_winner, pnl_r, max_r_achieved
-            ) VALUES %s
-            ON CONFLICT (trade_id, bar_sequence) DO NOTHING
-        """
-
-        values = [
-            (
-                r['trade_id'], r['bar_sequence'], r['ticker'], r['bar_date'], r['bar_time'],
-                r['open'], r['high'], r['low'], r['close'], r['volume'],
-                r['candle_range_pct'], r['vol_delta_raw'], r['vol_delta_roll'], r['vol_roc'],
-                r['sma9'], r['sma21'], r['sma_config'], r['sma_spread_pct'],
-                r['sma_momentum_label'],
-                r['price_position'], r['cvd_slope'],
-                r['m5_structure'], r['m15_structure'], r['h1_structure'],
-                r['health_score'], r['long_score'], r['short_score'],
-                r['is_winner'], r['pnl_r'], r['max_r_achieved'],
-            )
-            for r in rows
-        ]
-
-        with conn.cursor() as cur:
-            execute_values(cur, query, values, page_size=BATCH_INSERT_SIZE)
-
-        return len(values)
+        values = (tuple(r[c] for c in INSERT_COLUMNS) for r in rows)
+        result = bulk_write(
+            conn, J_M1_POST_TRADE_INDICATOR_TABLE, INSERT_COLUMNS, values,
+            conflict_columns=('trade_id', 'bar_sequence'),
+            batch_size=BULK_BATCH_SIZE
+        )
+        return result.rows
 
     # =========================================================================
     # STATUS
@@ -441,8 +426,8 @@ class JM1PostTradeIndicatorPopulator:
                 if all_rows:
                     # Insert in batches to avoid memory issues
                     total_inserted = 0
-                    for batch_start in range(0, len(all_rows), BATCH_INSERT_SIZE):
-                        batch = all_rows[batch_start:batch_start + BATCH_INSERT_SIZE]
+                    for batch_start in range(0, len(all_rows), BULK_BATCH_SIZE):
+                        batch = all_rows[batch_start:batch_start + BULK_BATCH_SIZE]
                         inserted = self.insert_results(conn, batch)
                         conn.commit()
                         total_inserted += inserted
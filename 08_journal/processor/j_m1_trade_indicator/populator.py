@@ -22,7 +22,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import psycopg2
-from psycopg2.extras import execute_values
+from shared.data.bulk_writer import bulk_write
 from datetime import datetime, date, time, timedelta
 from typing import Dict, List, Any, Optional
 from decimal import Decimal
@@ -31,7 +31,7 @@ import logging
 from db_config import (
     DB_CONFIG, SOURCE_TABLE, J_M1_INDICATOR_BARS_TABLE,
     J_M1_TRADE_INDICATOR_TABLE, J_M5_ATR_STOP_TABLE,
-    BATCH_INSERT_SIZE, VERBOSE,
+    BULK_BATCH_SIZE, VERBOSE,
     JOURNAL_SYMBOL_COL, JOURNAL_DATE_COL,
     SCHEMA_DIR
 )
@@ -88,6 +88,18 @@ def _safe_int(value, default=None):
         return default
 
 
+# Target columns, in insert order (row dict keys match column names)
+INSERT_COLUMNS = (
+    'trade_id', 'ticker', 'trade_date', 'direction', 'model', 'entry_time',
+    'entry_price', 'is_winner', 'pnl_r', 'max_r_achieved', 'bar_date',
+    'bar_time', 'open', 'high', 'low', 'close', 'volume',
+    'candle_range_pct', 'vol_delta_raw', 'vol_delta_roll', 'vol_roc',
+    'sma9', 'sma21', 'sma_config', 'sma_spread_pct', 'sma_momentum_label',
+    'price_position', 'cvd_slope', 'm5_structure', 'm15_structure',
+    'h1_structure', 'health_score', 'long_score', 'short_score',
+)
+
+
 # =============================================================================
 # POPULATOR CLASS
 # =============================================================================
@@ -240,43 +252,13 @@ class JM1TradeIndicatorPopulator:
         if not rows:
             return 0
 
-        query = f"""
-            INSERT INTO {J_M1_TRADE_INDICATOR_TABLE} (
-                trade_id, ticker, trade_date, direction, model,
-                entry_time, entry_price,
-                is_winner, pnl_r, max_r_achieved,
-                bar_date, bar_time,
-                open, high, low, close, volume,
-                candle_range_pct, vol_delta_raw, vol_delta_roll, vol_roc,
-                sma9, sma21, sma_config, sma_spread_pct, sma_momentum_label,
-                price_position, cvd_slope,
-                m5_structure, m15_structure, h1_structure,
-                health_score, long_score, short_score
-            ) VALUES %s
-            ON CONFLICT (trade_id) DO NOTHING
-        """
-
-        values = [
-            (
-                r['trade_id'], r['ticker'], r['trade_date'], r['direction'], r['model'],
-                r['entry_time'], r['entry_price'],
-                r['is_winner'], r['pnl_r'], r['max_r_achieved'],
-                r['bar_date'], r['bar_time'],
-                r['open'], r['high'], r['low'], r['close'], r['volume'],
-                r['candle_range_pct'], r['vol_delta_raw'], r['vol_delta_roll'], r['vol_roc'],
-                r['sma9'], r['sma21'], r['sma_config'], r['sma_spread_pct'],
-                r['sma_momentum_label'],
-                r['price_position'], r['cvd_slope'],
-                r['m5_structure'], r['m15_structure'], r['h1_structure'],
-                r['health_score'], r['long_score'], r['short_score'],
-            )
-            for r in rows
-        ]
-
-        with conn.cursor() as cur:
-            execute_values(cur, query, values, page_size=BATCH_INSERT_SIZE)
-
-        return len(values)
+        values = (tuple(r[c] for c in INSERT_COLUMNS) for r in rows)
+        result = bulk_write(
+            conn, J_M1_TRADE_INDICATOR_TABLE, INSERT_COLUMNS, values,
+            conflict_columns=('trade_id',),
+            batch_size=BULK_BATCH_SIZE
+        )
+        return result.rows
 
     # =========================================================================
     # STATUS
@@ -4,6 +4,8 @@ Epoch Trading System - XIII Trading LLC
 
 Extracted from 11_trade_reel/ui/main_window.py into standalone module.
 Provides bar fetching + M5 ATR(14) calculation for trade analysis.
+Bars are read through the shared local bar store, so re-opening a trade
+only hits Polygon for dates that were never fetched.
 
 Functions:
     fetch_bars()       - Intraday bars (M1, M5, M15, H1)
@@ -12,23 +14,65 @@ Functions:
 """
 
 import logging
-import time as time_module
 from datetime import date, time, timedelta
 from typing import Optional
 
 import pandas as pd
 import numpy as np
-import requests
+from shared.data.bar_store import PolygonAggsUpstream, UpstreamError, read_bars
 
-from .config import POLYGON_API_KEY, API_DELAY, API_RETRIES, API_RETRY_DELAY, DISPLAY_TIMEZONE
+from .config import POLYGON_API_KEY, API_RETRIES, API_RETRY_DELAY, DISPLAY_TIMEZONE
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# Bar Fetching (Polygon API)
+# Bar Fetching (Polygon API via the shared local bar store)
 # =============================================================================
 
+_UPSTREAM = PolygonAggsUpstream(
+    POLYGON_API_KEY,
+    max_retries=API_RETRIES,
+    retry_delay=API_RETRY_DELAY,
+)
+
+
+def _read_bars(
+    ticker: str,
+    multiplier: int,
+    timespan: str,
+    start_date: date,
+    end_date: date,
+) -> pd.DataFrame:
+    """
+    Read bars through the bar store and convert to the viewer format.
+
+    Returns:
+        DataFrame with columns [open, high, low, close, volume],
+        datetime index in Eastern time. Empty DataFrame on failure.
+    """
+    try:
+        raw = read_bars(ticker, multiplier, timespan, start_date, end_date, _UPSTREAM)
+    except UpstreamError as e:
+        logger.warning(f"{timespan} bar fetch failed for {ticker}: {e}")
+        return pd.DataFrame()
+    except Exception as e:
+        logger.error(f"Unexpected {timespan} bar fetch error: {e}")
+        return pd.DataFrame()
+
+    if raw.empty:
+        return pd.DataFrame()
+
+    df = raw.rename(columns={
+        't': 'timestamp', 'o': 'open', 'h': 'high',
+        'l': 'low', 'c': 'close', 'v': 'volume',
+    })
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+    df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
+    df.set_index('timestamp', inplace=True)
+    return df[['open', 'high', 'low', 'close', 'volume']]
+
+
 def fetch_bars(
     ticker: str,
     end_date: date,
@@ -49,48 +93,7 @@ def fetch_bars(
         datetime index in Eastern time. Empty DataFrame on failure.
     """
     start = end_date - timedelta(days=lookback_days)
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range"
-        f"/{tf_minutes}/minute/{start:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-    )
-    params = {
-        'apiKey': POLYGON_API_KEY,
-        'adjusted': 'true',
-        'sort': 'asc',
-        'limit': 50000,
-    }
-
-    for attempt in range(API_RETRIES):
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if data.get('status') not in ('OK', 'DELAYED') or not data.get('results'):
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data['results'])
-            df = df.rename(columns={
-                't': 'timestamp', 'o': 'open', 'h': 'high',
-                'l': 'low', 'c': 'close', 'v': 'volume',
-            })
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-            df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
-            df.set_index('timestamp', inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-
-            time_module.sleep(API_DELAY)
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Bar fetch attempt {attempt + 1} failed: {e}")
-            if attempt < API_RETRIES - 1:
-                time_module.sleep(API_RETRY_DELAY)
-        except Exception as e:
-            logger.error(f"Unexpected bar fetch error: {e}")
-            break
-
-    return pd.DataFrame()
+    return _read_bars(ticker, tf_minutes, 'minute', start, end_date)
 
 
 def fetch_daily_bars(
@@ -110,48 +113,7 @@ def fetch_daily_bars(
         DataFrame with columns [open, high, low, close, volume],
         datetime index in Eastern time. Empty DataFrame on failure.
     """
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range"
-        f"/1/day/{start_date:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-    )
-    params = {
-        'apiKey': POLYGON_API_KEY,
-        'adjusted': 'true',
-        'sort': 'asc',
-        'limit': 50000,
-    }
-
-    for attempt in range(API_RETRIES):
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if data.get('status') not in ('OK', 'DELAYED') or not data.get('results'):
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data['results'])
-            df = df.rename(columns={
-                't': 'timestamp', 'o': 'open', 'h': 'high',
-                'l': 'low', 'c': 'close', 'v': 'volume',
-            })
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-            df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
-            df.set_index('timestamp', inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-
-            time_module.sleep(API_DELAY)
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Daily bar fetch attempt {attempt + 1} failed: {e}")
-            if attempt < API_RETRIES - 1:
-                time_module.sleep(API_RETRY_DELAY)
-        except Exception as e:
-            logger.error(f"Unexpected daily bar fetch error: {e}")
-            break
-
-    return pd.DataFrame()
+    return _read_bars(ticker, 1, 'day', start_date, end_date)
 
 
 # =============================================================================
@@ -8,8 +8,6 @@ from typing import List, Optional
 from pathlib import Path
 
 import pandas as pd
-import requests
-import time as time_module
 from datetime import datetime, date, timedelta
 
 from PyQt6.QtWidgets import (
@@ -51,9 +49,10 @@ BaseWindow = _load_base_window()
 
 # Module-level imports (app.py adds MODULE_DIR to sys.path)
 import pytz
+from shared.data.bar_store import PolygonAggsUpstream, UpstreamError, read_bars
 
 from config import (
-    TV_DARK_QSS, POLYGON_API_KEY, API_DELAY, API_RETRIES,
+    TV_DARK_QSS, POLYGON_API_KEY, API_RETRIES,
     API_RETRY_DELAY, DISPLAY_TIMEZONE, EXPORT_DIR, TV_COLORS,
 )
 
@@ -82,123 +81,52 @@ logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# BAR FETCHER (inline - adapted from 06_training/data/polygon_client.py)
+# BAR FETCHER (reads through the shared local bar store)
 # =============================================================================
 
+_UPSTREAM = PolygonAggsUpstream(
+    POLYGON_API_KEY,
+    max_retries=API_RETRIES,
+    retry_delay=API_RETRY_DELAY,
+)
+
+
+def _read_bars(ticker: str, multiplier: int, timespan: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """Read bars through the bar store; OHLCV frame indexed by display-timezone timestamp."""
+    try:
+        raw = read_bars(ticker, multiplier, timespan, start_date, end_date, _UPSTREAM)
+    except UpstreamError as e:
+        logger.warning(f"{timespan} bar fetch failed for {ticker}: {e}")
+        return pd.DataFrame()
+    except Exception as e:
+        logger.error(f"Unexpected {timespan} bar fetch error: {e}")
+        return pd.DataFrame()
+
+    if raw.empty:
+        return pd.DataFrame()
+
+    df = raw.rename(columns={'t': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'})
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+    df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
+    df.set_index('timestamp', inplace=True)
+    return df[['open', 'high', 'low', 'close', 'volume']]
+
+
 def _fetch_bars(ticker: str, end_date: date, tf_minutes: int, lookback_days: int) -> pd.DataFrame:
     """Fetch bars from Polygon API for a single timeframe."""
     start = end_date - timedelta(days=lookback_days)
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range"
-        f"/{tf_minutes}/minute/{start:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-    )
-    params = {'apiKey': POLYGON_API_KEY, 'adjusted': 'true', 'sort': 'asc', 'limit': 50000}
-
-    for attempt in range(API_RETRIES):
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if data.get('status') != 'OK' or not data.get('results'):
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data['results'])
-            df = df.rename(columns={'t': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'})
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-            df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
-            df.set_index('timestamp', inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-
-            time_module.sleep(API_DELAY)
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Bar fetch attempt {attempt + 1} failed: {e}")
-            if attempt < API_RETRIES - 1:
-                time_module.sleep(API_RETRY_DELAY)
-        except Exception as e:
-            logger.error(f"Unexpected bar fetch error: {e}")
-            break
-
-    return pd.DataFrame()
+    return _read_bars(ticker, tf_minutes, 'minute', start, end_date)
 
 
 def _fetch_daily_bars(ticker: str, start_date: date, end_date: date) -> pd.DataFrame:
     """Fetch daily bars from Polygon API for a date range."""
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range"
-        f"/1/day/{start_date:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-    )
-    params = {'apiKey': POLYGON_API_KEY, 'adjusted': 'true', 'sort': 'asc', 'limit': 50000}
-
-    for attempt in range(API_RETRIES):
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if data.get('status') != 'OK' or not data.get('results'):
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data['results'])
-            df = df.rename(columns={'t': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'})
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-            df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
-            df.set_index('timestamp', inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-
-            time_module.sleep(API_DELAY)
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Daily bar fetch attempt {attempt + 1} failed: {e}")
-            if attempt < API_RETRIES - 1:
-                time_module.sleep(API_RETRY_DELAY)
-        except Exception as e:
-            logger.error(f"Unexpected daily bar fetch error: {e}")
-            break
-
-    return pd.DataFrame()
+    return _read_bars(ticker, 1, 'day', start_date, end_date)
 
 
 def _fetch_weekly_bars(ticker: str, end_date: date, lookback_weeks: int = 100) -> pd.DataFrame:
-    """Fetch weekly bars from Polygon API."""
+    """Fetch weekly bars from Polygon API (not stored; goes straight to the API)."""
     start = end_date - timedelta(weeks=lookback_weeks)
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range"
-        f"/1/week/{start:%Y-%m-%d}/{end_date:%Y-%m-%d}"
-    )
-    params = {'apiKey': POLYGON_API_KEY, 'adjusted': 'true', 'sort': 'asc', 'limit': 50000}
-
-    for attempt in range(API_RETRIES):
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if data.get('status') != 'OK' or not data.get('results'):
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data['results'])
-            df = df.rename(columns={'t': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'})
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-            df['timestamp'] = df['timestamp'].dt.tz_convert(DISPLAY_TIMEZONE)
-            df.set_index('timestamp', inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-
-            time_module.sleep(API_DELAY)
-            return df
-
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Weekly bar fetch attempt {attempt + 1} failed: {e}")
-            if attempt < API_RETRIES - 1:
-                time_module.sleep(API_RETRY_DELAY)
-        except Exception as e:
-            logger.error(f"Unexpected weekly bar fetch error: {e}")
-            break
-
-    return pd.DataFrame()
+    return _read_bars(ticker, 1, 'week', start, end_date)
 
 
 # =============================================================================
@@ -0,0 +1,112 @@
+"""
+Test 21: Does the vectorized volume profile match the per-bar reference?
+Source: shared.indicators.core.volume_profile
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from conftest import make_check, make_ohlcv_df
+
+from shared.indicators.core.volume_profile import (
+    _build_profile_core, _build_profile_reference, _session_levels,
+    volume_profile_df, calculate_volume_profile, calculate_volume_profiles,
+    calculate_session_targets,
+)
+
+
+def _session_df(n_sessions: int = 5, bars_per_session: int = 60) -> pd.DataFrame:
+    """Stack synthetic sessions with a bar_date column."""
+    frames = []
+    for i in range(n_sessions):
+        df = make_ohlcv_df(n=bars_per_session, start_price=100.0 + i, volatility=0.2, seed=i)
+        df["bar_date"] = date(2025, 1, 6) + timedelta(days=i)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _reference_levels(df: pd.DataFrame, resolution: int = 30, va_pct: int = 70):
+    zone_tops, buy, sell, _, _, gap = _build_profile_reference(
+        df["open"].values, df["high"].values, df["low"].values,
+        df["close"].values, df["volume"].values.astype(float), resolution,
+    )
+    return _session_levels(zone_tops, buy, sell, gap, va_pct)
+
+
+class TestVolumeProfile:
+    TEST_ID = "test_21_volume_profile"
+    QUESTION = "Does the vectorized volume profile match the per-bar reference?"
+
+    def test_profile_matches_reference(self, result_writer):
+        """Zone volumes from the prefix-sum engine equal the per-bar loop."""
+        for seed in range(20):
+            df = make_ohlcv_df(n=120, volatility=0.3, seed=seed)
+            args = (
+                df["open"].values, df["high"].values, df["low"].values,
+                df["close"].values, df["volume"].values.astype(float), 30,
+            )
+            fast = _build_profile_core(*args)
+            ref = _build_profile_reference(*args)
+            np.testing.assert_allclose(fast[0], ref[0])
+            np.testing.assert_allclose(fast[1], ref[1], rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(fast[2], ref[2], rtol=1e-9, atol=1e-6)
+            assert fast[3:] == ref[3:]
+
+    def test_levels_match_to_the_cent(self, result_writer):
+        """POC/VAH/VAL per session equal the reference to $0.01."""
+        df = _session_df()
+        levels = volume_profile_df(df)
+        assert len(levels) == 5
+        for _, row in levels.iterrows():
+            session = df[df["bar_date"] == row["date"]]
+            poc, val, vah = _reference_levels(session)
+            assert round(row["poc"], 2) == round(poc, 2)
+            assert round(row["vah"], 2) == round(vah, 2)
+            assert round(row["val"], 2) == round(val, 2)
+
+    def test_min_bars_and_flat_sessions_skipped(self, result_writer):
+        """Short sessions and flat (zero-range) sessions produce no row."""
+        df = _session_df(n_sessions=2)
+        short = df[df["bar_date"] == date(2025, 1, 6)].head(5)
+        flat = pd.DataFrame({
+            "open": [50.0] * 12, "high": [50.0] * 12, "low": [50.0] * 12,
+            "close": [50.0] * 12, "volume": [100] * 12, "bar_date": date(2025, 2, 3),
+        })
+        levels = volume_profile_df(pd.concat([short, df[df["bar_date"] != date(2025, 1, 6)], flat]))
+        assert list(levels["date"]) == [date(2025, 1, 7)]
+
+    def test_batched_bar_lists(self, result_writer):
+        """calculate_volume_profiles aligns results with the input sessions."""
+        df = _session_df(n_sessions=3)
+        sessions = [
+            df[df["bar_date"] == d].to_dict("records") for d in sorted(df["bar_date"].unique())
+        ]
+        batched = calculate_volume_profiles([sessions[0], [], sessions[2]])
+        assert batched[1] is None
+        single = calculate_volume_profile(sessions[2])
+        assert batched[2].poc == single.poc
+        assert batched[2].profile == single.profile
+
+        targets = calculate_session_targets(sessions[0], sessions[1])
+        assert targets.prior_day_poc == calculate_volume_profile(sessions[0]).poc
+        assert targets.current_vah == calculate_volume_profile(sessions[1]).vah
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        df = _session_df()
+        levels = volume_profile_df(df)
+        first = levels.iloc[0]
+        poc, val, vah = _reference_levels(df[df["bar_date"] == first["date"]])
+        checks.append(make_check("poc_matches_reference", round(poc, 2), round(first["poc"], 2)))
+        checks.append(make_check("vah_matches_reference", round(vah, 2), round(first["vah"], 2)))
+        checks.append(make_check("val_matches_reference", round(val, 2), round(first["val"], 2)))
+        checks.append(make_check("one_row_per_session", 5, len(levels)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,117 @@
+"""
+Test 22: Does the columnar $0.01 HVN profile match the per-bar dict builder?
+Source: 01_application/calculators/hvn_identifier.py - CentVolumeProfile
+
+The reference below replicates the original iterrows/dict loop. The columnar
+builder must produce the same keys, in the same insertion order, with
+bit-identical volumes - so _select_pocs_no_overlap returns identical POCs.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+from math import floor, ceil
+
+import numpy as np
+import pandas as pd
+from conftest import make_check
+
+from calculators.hvn_identifier import CentVolumeProfile, HVNIdentifier
+
+
+def build_profile_reference(bars: pd.DataFrame) -> dict:
+    """Replicate the original HVNIdentifier._build_volume_profile loop."""
+    volume_profile = {}
+    for _, bar in bars.iterrows():
+        bar_low, bar_high, bar_volume = bar["low"], bar["high"], bar["volume"]
+        if bar_volume <= 0 or bar_high <= bar_low:
+            continue
+        if pd.isna(bar_low) or pd.isna(bar_high) or pd.isna(bar_volume):
+            continue
+        low_level = floor(bar_low / 0.01) * 0.01
+        high_level = ceil(bar_high / 0.01) * 0.01
+        num_levels = int(round((high_level - low_level) / 0.01)) + 1
+        volume_per_level = bar_volume / num_levels
+        current = low_level
+        for _ in range(num_levels):
+            price_key = round(current, 2)
+            volume_profile[price_key] = volume_profile.get(price_key, 0) + volume_per_level
+            current += 0.01
+    return volume_profile
+
+
+def make_minute_bars(n: int = 3000, seed: int = 7) -> pd.DataFrame:
+    """Synthetic minute bars with unrounded prices and a few invalid rows."""
+    rng = np.random.RandomState(seed)
+    closes = 150.0 + np.cumsum(rng.normal(0, 0.05, n))
+    lows = closes - np.abs(rng.normal(0, 0.08, n))
+    highs = closes + np.abs(rng.normal(0, 0.08, n))
+    volumes = rng.randint(0, 5000, n).astype(float)
+    lows[10] = np.nan
+    highs[20] = lows[20]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-03-03 09:30", periods=n, freq="min", tz="UTC"),
+        "open": closes, "high": highs, "low": lows, "close": closes, "volume": volumes,
+    })
+
+
+class TestHVNProfile:
+    TEST_ID = "test_22_hvn_profile"
+    QUESTION = "Does the columnar $0.01 HVN profile match the per-bar dict builder?"
+
+    def test_identical_levels_and_order(self, result_writer):
+        """Same keys, same insertion order, bit-identical volumes."""
+        bars = make_minute_bars()
+        expected = build_profile_reference(bars)
+        actual = CentVolumeProfile().add_bars(bars).to_dict()
+        assert list(actual.keys()) == list(expected.keys())
+        assert all(actual[k] == expected[k] for k in expected)
+
+    def test_chunked_build_matches_single_pass(self, result_writer):
+        """Adding bars chunk by chunk equals one pass over all bars."""
+        bars = make_minute_bars()
+        chunked = CentVolumeProfile()
+        for start in range(0, len(bars), 700):
+            chunked.add_bars(bars.iloc[start:start + 700])
+        assert chunked.to_dict() == CentVolumeProfile().add_bars(bars).to_dict()
+        assert chunked.bars_added == len(bars)
+
+    def test_extension_skips_seen_bars(self, result_writer):
+        """Re-feeding overlapping chunks only adds bars newer than the last one."""
+        bars = make_minute_bars()
+        profile = CentVolumeProfile()
+        HVNIdentifier._add_chunks(profile, [bars.iloc[:2000]])
+        HVNIdentifier._add_chunks(profile, [bars.iloc[1500:]])
+        assert profile.bars_added == len(bars)
+        assert profile.to_dict() == build_profile_reference(bars)
+
+    def test_identical_pocs(self, result_writer):
+        """_select_pocs_no_overlap returns the same POCs from either builder."""
+        bars = make_minute_bars()
+        identifier = HVNIdentifier.__new__(HVNIdentifier)
+        expected = identifier._select_pocs_no_overlap(build_profile_reference(bars), 0.5)
+        actual = identifier._select_pocs_no_overlap(CentVolumeProfile().add_bars(bars).to_dict(), 0.5)
+        assert actual == expected
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        bars = make_minute_bars()
+        expected = build_profile_reference(bars)
+        profile = CentVolumeProfile().add_bars(bars)
+        actual = profile.to_dict()
+
+        checks.append(make_check("level_count", len(expected), len(actual)))
+        checks.append(make_check("key_order", True, list(actual) == list(expected)))
+        checks.append(make_check("total_volume", sum(expected.values()), sum(actual.values())))
+
+        identifier = HVNIdentifier.__new__(HVNIdentifier)
+        checks.append(make_check(
+            "poc_prices",
+            [p.price for p in identifier._select_pocs_no_overlap(expected, 0.5)],
+            [p.price for p in identifier._select_pocs_no_overlap(actual, 0.5)],
+        ))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
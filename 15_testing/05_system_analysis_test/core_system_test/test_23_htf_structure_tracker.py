@@ -0,0 +1,161 @@
+"""
+Test 23: Does the memoized HTF structure tracker match per-bar recomputation?
+Source: 02_dow_ai/entry_qualifier/calculations/h1_structure.py - StructureTracker
+
+Reference: for each M1 bar, run calculate_structure() over every HTF bar with
+timestamp <= the M1 timestamp (the original O(n*m) loop). Rolling windows
+(the api_client fetchers return the latest N bars) are checked on every
+prefix, with the walk-forward steps counted.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "02_dow_ai" / "entry_qualifier"))
+
+import numpy as np
+from conftest import make_check
+
+import calculations.h1_structure as h1_structure
+from calculations.h1_structure import (
+    StructureTracker, StructureCache, MarketStructure,
+    calculate_structure, calculate_structure_for_bars,
+)
+
+M5_MS = 300_000
+M1_MS = 60_000
+
+
+def make_htf_bars(n: int, seed: int = 3) -> list:
+    rng = np.random.RandomState(seed)
+    closes = 100.0 + np.cumsum(rng.normal(0, 0.5, n))
+    return [{
+        "timestamp": i * M5_MS,
+        "open": float(closes[i]),
+        "high": float(closes[i] + abs(rng.normal(0, 0.4))),
+        "low": float(closes[i] - abs(rng.normal(0, 0.4))),
+        "close": float(closes[i]),
+    } for i in range(n)]
+
+
+def make_m1_bars(n_htf: int) -> list:
+    return [{"timestamp": t} for t in range(0, n_htf * M5_MS, M1_MS)]
+
+
+def count_walk_steps(monkeypatch) -> dict:
+    """Count walk-forward steps taken by the tracker (stored walk vs prefix tail)."""
+    counts = {"walk": 0, "tail": 0}
+    step = h1_structure._walk_step
+
+    def counting(state, fractals, b, *args, max_frac_bar=None, **kwargs):
+        counts["walk" if max_frac_bar is None else "tail"] += 1
+        return step(state, fractals, b, *args, max_frac_bar=max_frac_bar, **kwargs)
+    monkeypatch.setattr(h1_structure, "_walk_step", counting)
+    return counts
+
+
+def reference_structure(htf_bars: list, m1_bars: list, lookback: int = 5) -> list:
+    out = []
+    for m1 in m1_bars:
+        relevant = [b for b in htf_bars if b["timestamp"] <= m1["timestamp"]]
+        if len(relevant) >= 2 * lookback + 1:
+            out.append(calculate_structure(relevant, lookback).value)
+        else:
+            out.append("N")
+    return out
+
+
+class TestHTFStructureTracker:
+    TEST_ID = "test_23_htf_structure_tracker"
+    QUESTION = "Does the memoized HTF structure tracker match per-bar recomputation?"
+
+    def test_matches_reference(self, result_writer):
+        """calculate_structure_for_bars equals the per-M1-bar recomputation."""
+        for seed in range(5):
+            htf = make_htf_bars(50, seed)
+            m1 = make_m1_bars(50)
+            actual = [r["h1_display"] for r in calculate_structure_for_bars(htf, m1)]
+            assert actual == reference_structure(htf, m1)
+
+    def test_sliding_window_refresh(self, result_writer):
+        """A refresh that drops the oldest bar and adds a new one stays identical."""
+        htf = make_htf_bars(51)
+        m1 = make_m1_bars(51)
+        tracker = StructureTracker()
+        tracker.update(htf[:50])
+        tracker.structure_for_bars(m1)
+        tracker.update(htf[1:51])
+        actual = [r["h1_display"] for r in tracker.structure_for_bars(m1)]
+        assert actual == reference_structure(htf[1:51], m1)
+
+    def test_forming_bar_change_invalidates_prefix(self, result_writer):
+        """A changed last bar (same timestamp) is recomputed, earlier prefixes kept."""
+        htf = make_htf_bars(40)
+        m1 = make_m1_bars(40)
+        tracker = StructureTracker()
+        tracker.update(htf)
+        tracker.structure_for_bars(m1)
+        changed = htf[:-1] + [dict(htf[-1], close=htf[-1]["close"] + 50.0, high=htf[-1]["high"] + 50.0)]
+        tracker.update(changed)
+        # Walk states depending on the changed bar (within lookback) are dropped
+        for (anchor_ts, *_), states in tracker._walks.items():
+            assert anchor_ts // M5_MS + len(states) <= 39 - tracker.lookback
+        actual = [r["h1_display"] for r in tracker.structure_for_bars(m1)]
+        assert actual == reference_structure(changed, m1)
+
+    def test_rolling_window_reuses_walk(self, result_writer, monkeypatch):
+        """Windows rolling by one bar (with a forming last bar) match every prefix and reuse the walk."""
+        counts = count_walk_steps(monkeypatch)
+        htf = make_htf_bars(260, seed=7)
+        window = 230                     # past the first anchor tier (200 bars)
+        tracker = StructureTracker()
+        for shift in range(8):
+            bars = htf[shift:shift + window]
+            forming = dict(bars[-1], close=bars[-1]["close"] + 0.3)
+            for current in (bars[:-1] + [forming], bars):
+                tracker.update(current)
+                before = counts["walk"]
+                actual = [r["h1_display"] for r in tracker.structure_for_bars(current)]
+                assert actual == reference_structure(current, current)
+                if shift:
+                    assert counts["walk"] - before <= 2 * tracker.lookback + 2
+        assert counts["tail"] <= 16 * window * tracker.lookback
+
+    def test_cache_exposes_tracker(self, result_writer):
+        """StructureCache.structure_for_bars uses the cached bars per ticker."""
+        cache = StructureCache(M5_MS)
+        m1 = make_m1_bars(30)
+        assert cache.structure_for_bars("SPY", m1)[0]["h1_structure"] == MarketStructure.NEUTRAL
+        htf = make_htf_bars(30)
+        cache.set_bars("SPY", htf)
+        actual = [r["h1_display"] for r in cache.structure_for_bars("SPY", m1)]
+        assert actual == reference_structure(htf, m1)
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        htf = make_htf_bars(50)
+        m1 = make_m1_bars(50)
+        expected = reference_structure(htf, m1)
+        actual = [r["h1_display"] for r in calculate_structure_for_bars(htf, m1)]
+        checks.append(make_check("per_bar_labels_identical", True, actual == expected))
+
+        tracker = StructureTracker()
+        tracker.update(htf)
+        tracker.structure_for_bars(m1)
+        checks.append(make_check("prefixes_computed_once", True, len(tracker._memo) <= len(htf)))
+
+        # Roll the window by one bar: only the new bar's neighbourhood is walked again
+        longer = make_htf_bars(51)
+        tracker.update(longer[:50])
+        tracker.structure_for_bars(m1)
+        walked = sum(len(states) for states in tracker._walks.values())
+        tracker.update(longer[1:51])
+        kept = sum(len(states) for states in tracker._walks.values())
+        rolled = [r["h1_display"] for r in tracker.structure_for_bars(m1)]
+        checks.append(make_check("rolled_window_labels_identical", True,
+                                 rolled == reference_structure(longer[1:51], m1)))
+        checks.append(make_check("walk_kept_after_roll", True,
+                                 walked > 0 and kept >= walked - tracker.lookback - 1))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
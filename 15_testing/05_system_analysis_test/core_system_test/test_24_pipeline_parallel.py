@@ -0,0 +1,213 @@
+"""
+Test 24: Does the parallel PipelineRunner return the same results as sequential?
+Source: 01_application/core/pipeline_runner.py - PipelineRunner(max_workers > 1)
+
+The per-ticker stages are replaced by a deterministic fake so the scheduler
+(ordering, failure isolation, timeouts, progress) is tested without Polygon.
+Process-mode tests rely on fork, so the patched fake reaches the workers.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import multiprocessing
+import os
+import time
+from datetime import date
+
+import pytest
+from conftest import make_check
+
+from config import INDEX_TICKERS
+from core.pipeline_runner import PipelineRunner
+
+TICKERS = ["AAPL", "BAD", "MSFT", "NVDA", "TSLA", "AMD"]
+DELAYS = {"AAPL": 0.05, "MSFT": 0.0, "NVDA": 0.03, "TSLA": 0.01, "AMD": 0.02}
+
+
+def fake_process_single_ticker(self, ticker, anchor_date, analysis_date,
+                               end_timestamp=None, precomputed_options=None):
+    if ticker == "BAD":
+        raise ValueError("No bar data for BAD")
+    if ticker == "HANG":
+        time.sleep(3)
+    if ticker == "CRASH":
+        os._exit(3)
+    time.sleep(DELAYS.get(ticker, 0.0))
+    return {
+        "ticker": ticker,
+        "success": True,
+        "anchor_date": str(anchor_date),
+        "zones_count": len(ticker),
+        "direction": "Bull",
+        "options": precomputed_options,
+        "pid": os.getpid(),
+    }
+
+
+def ticker_inputs(tickers=TICKERS):
+    return [{"ticker": t, "anchor_date": "2025-01-02"} for t in tickers]
+
+
+@pytest.fixture
+def fake_stages(monkeypatch):
+    monkeypatch.setattr(PipelineRunner, "_process_single_ticker", fake_process_single_ticker)
+
+
+@pytest.fixture
+def process_workers(fake_stages, monkeypatch):
+    """
+    Fork-started workers; records the switch to the cross-process rate limiter
+    (importing shared.data needs live credentials).
+    """
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("process-mode tests need the fork start method")
+    shared = []
+    monkeypatch.setattr(PipelineRunner, "_share_rate_limiter", staticmethod(lambda: shared.append(True)))
+    return shared
+
+
+class LateReader:
+    """Pipe reader whose first poll() misses a result that arrives, and a worker exit, right after."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.polled = False
+
+    def poll(self, timeout=0.0):
+        if not self.polled:
+            self.polled = True
+            self.reader.poll(5)
+            time.sleep(0.3)
+            return False
+        return self.reader.poll(timeout)
+
+    def __getattr__(self, name):
+        return getattr(self.reader, name)
+
+
+class LateContext:
+    """Multiprocessing context handing out LateReader pipes."""
+
+    def __init__(self, context):
+        self.context = context
+
+    def Pipe(self, duplex=True):
+        reader, writer = self.context.Pipe(duplex=duplex)
+        return LateReader(reader), writer
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
+
+
+def without_pids(results):
+    return {key: [{k: v for k, v in r.items() if k != "pid"} for r in rows]
+            for key, rows in results.items()}
+
+
+def run(runner, tickers=TICKERS):
+    return runner.run(
+        ticker_inputs(tickers), date(2025, 2, 3),
+        precomputed_options={"AAPL": [1.0, 2.0]},
+    )
+
+
+class TestPipelineParallel:
+    TEST_ID = "test_24_pipeline_parallel"
+    QUESTION = "Does the parallel PipelineRunner return the same results as sequential?"
+
+    def test_matches_sequential(self, fake_stages, result_writer):
+        """Same result dicts, in the same order, as the sequential runner."""
+        expected = run(PipelineRunner(max_workers=1))
+        actual = run(PipelineRunner(max_workers=4, executor="thread"))
+        assert actual == expected
+        assert [r["ticker"] for r in actual["custom"]] == TICKERS
+        assert [r["ticker"] for r in actual["index"]] == INDEX_TICKERS
+
+    def test_failure_isolated(self, fake_stages, result_writer):
+        """A failing ticker yields an error dict; the others still succeed."""
+        results = run(PipelineRunner(max_workers=3, executor="thread"))
+        bad = results["custom"][TICKERS.index("BAD")]
+        assert bad == {"ticker": "BAD", "success": False, "error": "No bar data for BAD"}
+        assert sum(r["success"] for r in results["custom"]) == len(TICKERS) - 1
+
+    def test_timeout_marks_ticker_failed(self, fake_stages, result_writer):
+        """A ticker running past the timeout is failed without blocking the rest."""
+        runner = PipelineRunner(max_workers=4, executor="thread", ticker_timeout=0.5)
+        started = time.time()
+        results = run(runner, ["AAPL", "HANG", "MSFT"])
+        assert time.time() - started < 2.5
+        hang = results["custom"][1]
+        assert hang["success"] is False and "timed out" in hang["error"]
+        assert results["custom"][0]["success"] and results["custom"][2]["success"]
+
+    def test_progress_monotonic(self, fake_stages, result_writer):
+        """Progress is reported from the calling thread and never goes backwards."""
+        seen = []
+        runner = PipelineRunner(
+            progress_callback=lambda pct, msg: seen.append(pct),
+            max_workers=4, executor="thread",
+        )
+        run(runner)
+        assert seen == sorted(seen)
+        assert seen[-1] == 100
+
+    def test_process_workers_match_sequential(self, process_workers, result_writer):
+        """Process workers return the sequential results and share one rate limiter."""
+        expected = run(PipelineRunner(max_workers=1))
+        actual = run(PipelineRunner(max_workers=3, executor="process"))
+        assert without_pids(actual) == without_pids(expected)
+        assert all(r["pid"] != os.getpid() for r in actual["custom"] if r["success"])
+        assert process_workers == [True]
+
+    def test_crashed_worker_fails_only_its_ticker(self, process_workers, result_writer):
+        """A worker process that dies fails its ticker; it is not re-run in the parent."""
+        results = run(PipelineRunner(max_workers=2, executor="process"), ["AAPL", "CRASH", "MSFT", "NVDA"])
+        crash = results["custom"][1]
+        assert crash["success"] is False and "exit code 3" in crash["error"]
+        others = [results["custom"][i] for i in (0, 2, 3)]
+        assert all(r["success"] and r["pid"] != os.getpid() for r in others)
+
+    def test_result_sent_just_before_exit_is_kept(self, process_workers, monkeypatch, result_writer):
+        """A worker that sends its result and exits between the poll and liveness checks is not a crash."""
+        context = multiprocessing.get_context()
+        monkeypatch.setattr(multiprocessing, "get_context", lambda method=None: LateContext(context))
+        results = run(PipelineRunner(max_workers=2, executor="process"), ["AAPL", "MSFT"])
+        assert all(r["success"] and r["pid"] != os.getpid() for r in results["custom"])
+
+    def test_process_timeout_terminates_worker(self, process_workers, result_writer):
+        """A hung worker process is terminated at the timeout."""
+        runner = PipelineRunner(max_workers=2, executor="process", ticker_timeout=0.5)
+        started = time.time()
+        results = run(runner, ["HANG", "AAPL"])
+        assert time.time() - started < 2.5
+        assert "timed out" in results["custom"][0]["error"]
+        assert results["custom"][1]["success"]
+        assert not multiprocessing.active_children()
+
+    def test_sequential_default_has_no_stage_overlap(self, result_writer):
+        """The default runner fetches market structure and bar data one after the other."""
+        assert PipelineRunner().fetch_workers == 1
+
+    def test_invalid_executor(self, result_writer):
+        with pytest.raises(ValueError):
+            PipelineRunner(max_workers=2, executor="gpu")
+
+    def test_full_suite(self, fake_stages, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        expected = run(PipelineRunner(max_workers=1))
+        actual = run(PipelineRunner(max_workers=4, executor="thread"))
+        checks.append(make_check("results_identical", True, actual == expected))
+        checks.append(make_check(
+            "custom_order",
+            TICKERS, [r["ticker"] for r in actual["custom"]],
+        ))
+        checks.append(make_check(
+            "failed_tickers", 1, sum(not r["success"] for r in actual["custom"]),
+        ))
+        checks.append(make_check("sequential_fetch_workers", 1, PipelineRunner().fetch_workers))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
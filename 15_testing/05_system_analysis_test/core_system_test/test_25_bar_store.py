@@ -0,0 +1,210 @@
+"""
+Test 25: Does the local bar store only fetch spans it has never seen?
+Source: 00_shared/data/bar_store.py - BarStore, read_bars
+
+Runs offline against FakeUpstream, which records every request and returns
+bars that depend only on (ticker, timestamp). Split dates come from an
+in-memory source; partitions "written before a split" get their mtime set
+back with os.utime.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "00_shared" / "data"))
+
+import os
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from conftest import make_check
+
+from bar_store import (
+    AGG_COLUMNS, ET, BarStore, FakeUpstream, UpstreamError,
+    max_days_per_request, read_bars, request_windows,
+)
+
+
+class FakeSplits:
+    """Splits source returning fixed execution dates, recording each lookup."""
+
+    def __init__(self, dates=(), fail=False):
+        self.dates = list(dates)
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, ticker):
+        self.calls.append(ticker)
+        if self.fail:
+            raise UpstreamError("splits unavailable")
+        return list(self.dates)
+
+
+def backdate(store, ticker, multiplier, timespan, days, when: datetime):
+    """Set the write time of stored partitions (as if written at `when`)."""
+    for day in days:
+        path = store.partition_path(ticker, multiplier, timespan, day)
+        os.utime(path, (when.timestamp(), when.timestamp()))
+
+
+def direct(upstream: FakeUpstream, *args) -> pd.DataFrame:
+    """What a client without the store would have received."""
+    return pd.DataFrame(upstream(*args))[AGG_COLUMNS]
+
+
+class TestBarStore:
+    TEST_ID = "test_25_bar_store"
+    QUESTION = "Does the local bar store only fetch spans it has never seen?"
+
+    def test_second_read_is_offline(self, tmp_path, result_writer):
+        """A repeated range query is served from disk without upstream calls."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        first = store.get_bars("aapl", 1, "minute", date(2025, 1, 6), date(2025, 1, 10), upstream)
+        calls = len(upstream.calls)
+        second = store.get_bars("AAPL", 1, "minute", date(2025, 1, 6), date(2025, 1, 10), upstream)
+        assert len(upstream.calls) == calls == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert len(first) == 5 * 16 * 60
+
+    def test_matches_direct_fetch(self, tmp_path, result_writer):
+        """Stored bars equal a single direct request over the same range."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        actual = store.get_bars("MSFT", 5, "minute", date(2025, 2, 3), date(2025, 2, 14), upstream)
+        expected = direct(FakeUpstream(), "MSFT", 5, "minute", date(2025, 2, 3), date(2025, 2, 14))
+        assert (actual.values == expected.values).all()
+
+    def test_only_gaps_fetched(self, tmp_path, result_writer):
+        """Widening a cached range requests just the uncovered spans."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        store.get_bars("SPY", 1, "minute", date(2025, 3, 10), date(2025, 3, 14), upstream)
+        upstream.calls.clear()
+        store.get_bars("SPY", 1, "minute", date(2025, 3, 5), date(2025, 3, 20), upstream)
+        assert upstream.calls == [
+            ("SPY", 1, "minute", date(2025, 3, 5), date(2025, 3, 9)),
+            ("SPY", 1, "minute", date(2025, 3, 15), date(2025, 3, 20)),
+        ]
+
+    def test_empty_dates_remembered(self, tmp_path, result_writer):
+        """Weekend dates are stored as empty partitions and never re-requested."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        assert store.get_bars("SPY", 1, "minute", date(2025, 3, 8), date(2025, 3, 9), upstream).empty
+        assert store.missing_dates("SPY", 1, "minute", date(2025, 3, 8), date(2025, 3, 9)) == []
+
+    def test_recent_empty_weekday_not_persisted(self, tmp_path, result_writer):
+        """An empty recent weekday is asked for again; an old one is remembered."""
+        today = datetime.now(ET).date()
+        weekdays = [today - timedelta(days=i) for i in range(1, 30)
+                    if (today - timedelta(days=i)).weekday() < 5]
+        recent, old = weekdays[0], weekdays[-1]
+        store, upstream = BarStore(tmp_path), FakeUpstream(empty_days=[recent, old])
+        store.get_bars("SPY", 1, "hour", old, recent, upstream)
+        assert not store.partition_path("SPY", 1, "hour", recent).exists()
+        assert store.partition_path("SPY", 1, "hour", old).exists()
+        assert store.missing_dates("SPY", 1, "hour", old, recent) == [recent]
+
+        refreshed = store.get_bars("SPY", 1, "hour", recent, recent, FakeUpstream())
+        assert not refreshed.empty
+        assert store.missing_dates("SPY", 1, "hour", old, recent) == []
+
+    def test_split_invalidates_earlier_partitions(self, tmp_path, result_writer):
+        """Partitions before a split that were written before it are fetched again, once."""
+        split_day = date(2025, 2, 18)
+        splits = FakeSplits()
+        store = BarStore(tmp_path, splits=splits, splits_ttl=0)
+        upstream = FakeUpstream()
+        store.get_bars("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28), upstream)
+        backdate(store, "NVDA", 1, "day",
+                 [date(2025, 2, 3) + timedelta(days=i) for i in range(26)], datetime(2025, 2, 14, tzinfo=ET))
+        assert store.missing_dates("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28)) == []
+
+        splits.dates = [split_day]
+        assert store.missing_dates("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28)) == \
+            [date(2025, 2, 3) + timedelta(days=i) for i in range(15)]
+        calls = len(upstream.calls)
+        store.get_bars("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28), upstream)
+        assert upstream.calls[calls:] == [("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 17))]
+        assert store.missing_dates("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28)) == []
+
+    def test_split_dates_cached(self, tmp_path, result_writer):
+        """Split dates are looked up once per TTL; a failed lookup uses the stored dates."""
+        splits = FakeSplits([date(2024, 6, 10)])
+        store = BarStore(tmp_path, splits=splits, splits_ttl=3600)
+        store.get_bars("NVDA", 1, "day", date(2025, 1, 6), date(2025, 1, 10), FakeUpstream())
+        store.get_bars("NVDA", 1, "day", date(2025, 1, 6), date(2025, 1, 10), FakeUpstream())
+        assert splits.calls == ["NVDA"]
+
+        failing = BarStore(tmp_path, splits=FakeSplits(fail=True), splits_ttl=0)
+        assert failing.split_dates("NVDA") == [date(2024, 6, 10)]
+
+    def test_spans_split_by_result_limit(self, tmp_path, result_writer):
+        """Long ranges are split so no request can exceed 50,000 results."""
+        store = BarStore(tmp_path)
+        spans = store.missing_spans("SPY", 15, "second", date(2025, 1, 1), date(2025, 1, 31))
+        assert all((end - start).days + 1 <= max_days_per_request(15, "second") for start, end in spans)
+        assert spans[0][0] == date(2025, 1, 1) and spans[-1][1] == date(2025, 1, 31)
+
+    def test_today_not_persisted(self, tmp_path, result_writer):
+        """Incomplete dates are fetched on every read and never written."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        today = datetime.now(ET).date()
+        store.get_bars("SPY", 1, "hour", today - timedelta(days=3), today, upstream)
+        store.get_bars("SPY", 1, "hour", today - timedelta(days=3), today, upstream)
+        assert upstream.calls[-1][3:] == (today, today)
+        assert not store.partition_path("SPY", 1, "hour", today).exists()
+
+    def test_upstream_failure_stores_nothing(self, tmp_path, result_writer):
+        """A failed span raises and leaves the dates missing."""
+        store = BarStore(tmp_path)
+        with pytest.raises(UpstreamError):
+            store.get_bars("SPY", 1, "day", date(2025, 1, 1), date(2025, 1, 31), FakeUpstream(fail=True))
+        assert len(store.missing_dates("SPY", 1, "day", date(2025, 1, 1), date(2025, 1, 31))) == 31
+
+    def test_unstored_timespan_bypasses(self, tmp_path, result_writer):
+        """Weekly bars go straight to the upstream, every time."""
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        read_bars("SPY", 1, "week", date(2025, 1, 1), date(2025, 1, 31), lambda *a: [], store=store)
+        read_bars("SPY", 1, "day", date(2025, 1, 1), date(2025, 1, 31), upstream, store=store)
+        read_bars("SPY", 1, "day", date(2025, 1, 1), date(2025, 1, 31), upstream, store=store)
+        assert len(upstream.calls) == 1
+        assert not (tmp_path / "SPY" / "1week").exists()
+
+    def test_request_windows_cover_range(self, tmp_path, result_writer):
+        """Client request windows tile the range without gaps or overlap."""
+        windows = request_windows(15, "second", date(2025, 1, 1), date(2025, 3, 31))
+        assert windows[0][0] == date(2025, 1, 1) and windows[-1][1] == date(2025, 3, 31)
+        assert all(b[0] == a[1] + timedelta(days=1) for a, b in zip(windows, windows[1:]))
+        assert all((end - start).days + 1 <= max_days_per_request(15, "second") for start, end in windows)
+        assert request_windows(1, "week", "2020-01-01", "2025-01-01") == [(date(2020, 1, 1), date(2025, 1, 1))]
+        assert request_windows(1, "minute", date(2025, 1, 2), date(2025, 1, 1)) == []
+
+    def test_windowed_fetch_matches_single_request(self, tmp_path, result_writer):
+        """Concatenated window fetches equal one untruncated request."""
+        windows = request_windows(1, "minute", date(2025, 1, 1), date(2025, 3, 31))
+        records = [r for start, end in windows for r in FakeUpstream()("SPY", 1, "minute", start, end)]
+        expected = direct(FakeUpstream(), "SPY", 1, "minute", date(2025, 1, 1), date(2025, 3, 31))
+        assert len(windows) > 1
+        assert (pd.DataFrame(records)[AGG_COLUMNS].values == expected.values).all()
+
+    def test_full_suite(self, tmp_path, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        store, upstream = BarStore(tmp_path), FakeUpstream()
+        first = store.get_bars("NVDA", 1, "minute", date(2025, 1, 1), date(2025, 2, 28), upstream)
+        fetched = len(upstream.calls)
+        second = store.get_bars("NVDA", 1, "minute", date(2025, 1, 15), date(2025, 2, 10), upstream)
+        expected = direct(FakeUpstream(), "NVDA", 1, "minute", date(2025, 1, 1), date(2025, 2, 28))
+
+        checks.append(make_check("bars_match_direct_fetch", True, bool((first.values == expected.values).all())))
+        checks.append(make_check("subrange_upstream_calls", fetched, len(upstream.calls)))
+        checks.append(make_check("subrange_rows", int(((first["t"] >= second["t"].min()) & (first["t"] <= second["t"].max())).sum()), len(second)))
+
+        split_store = BarStore(tmp_path / "split", splits=FakeSplits(), splits_ttl=0)
+        split_store.get_bars("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28), FakeUpstream())
+        backdate(split_store, "NVDA", 1, "day",
+                 [date(2025, 2, 3) + timedelta(days=i) for i in range(26)], datetime(2025, 2, 14, tzinfo=ET))
+        split_store.splits.dates = [date(2025, 2, 18)]
+        stale = split_store.missing_dates("NVDA", 1, "day", date(2025, 2, 3), date(2025, 2, 28))
+        checks.append(make_check("stale_dates_after_split", 15, len(stale)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
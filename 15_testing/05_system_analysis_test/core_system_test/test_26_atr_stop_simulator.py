@@ -0,0 +1,157 @@
+"""
+Test 26: Does the vectorized ATR stop simulator match the per-trade bar walk?
+Source: 00_shared/calculations/atr_stop/simulator.py - simulate_outcomes vs simulate_reference
+
+Random M1 sessions (shuffled, with unparseable times) and trades around the
+open and the 15:30 cutoff are resolved both ways; every R-level time, stop
+time, bars_from_entry, max_r and result must agree.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import random
+from datetime import time, timedelta
+from types import SimpleNamespace
+
+from conftest import make_check
+
+from shared.calculations.atr_stop import prepare_bars, simulate_outcomes, simulate_reference
+
+R_LEVELS = [1, 2, 3, 4, 5]
+EOD_MINUTES = 15 * 60 + 30
+
+
+def make_session(seed: int, bad_times: int = 3):
+    """Random-walk M1 bars 09:30-16:00 in shuffled order."""
+    rnd = random.Random(seed)
+    price, bars = 100.0, []
+    for minute in range(9 * 60 + 30, 16 * 60):
+        open_ = price
+        price += rnd.gauss(0, 0.3)
+        bars.append({
+            'bar_time': timedelta(minutes=minute),
+            'high': max(open_, price) + abs(rnd.gauss(0, 0.2)),
+            'low': min(open_, price) - abs(rnd.gauss(0, 0.2)),
+            'close': price,
+        })
+    bars += [{'bar_time': 'bad', 'high': 0, 'low': 0, 'close': 0} for _ in range(bad_times)]
+    rnd.shuffle(bars)
+    return bars
+
+
+def make_trades(seed: int, n: int = 10):
+    """(entry_minutes, stop, r_prices, is_long) with entries from 09:25 to 15:45."""
+    rnd = random.Random(seed + 10_000)
+    trades = []
+    for _ in range(n):
+        entry_minutes = rnd.randint(9 * 60 + 25, 15 * 60 + 45)
+        entry = rnd.uniform(95, 105)
+        atr = rnd.uniform(0.05, 1.5)
+        is_long = rnd.random() < 0.5
+        sign = 1 if is_long else -1
+        trades.append((
+            entry_minutes,
+            entry - sign * atr,
+            [entry + sign * r * atr for r in R_LEVELS],
+            is_long,
+        ))
+    return trades
+
+
+def resolve_both(seed: int):
+    """Return (batch outcomes, reference outcomes) for one random session."""
+    raw = make_session(seed)
+    trades = make_trades(seed)
+    bars = prepare_bars(raw)
+    outcome = simulate_outcomes(
+        bars,
+        entry_minutes=[t[0] for t in trades],
+        stop_prices=[t[1] for t in trades],
+        r_prices=[t[2] for t in trades],
+        is_long=[t[3] for t in trades],
+        eod_minutes=EOD_MINUTES,
+        levels=R_LEVELS,
+    )
+
+    batch, reference = [], []
+    for i, (entry_minutes, stop, r_prices, is_long) in enumerate(trades):
+        result = SimpleNamespace(stop_hit=False, stop_time=None, stop_bars_from_entry=None)
+        outcome.apply(i, result, bars)
+        batch.append({
+            'r_hits': {
+                r: (getattr(result, f'r{r}_time'), getattr(result, f'r{r}_bars_from_entry'))
+                for r in R_LEVELS if getattr(result, f'r{r}_hit', False)
+            },
+            'stop': (result.stop_time, result.stop_bars_from_entry) if result.stop_hit else None,
+            'max_r': result.max_r,
+            'result': result.result,
+        })
+        reference.append(simulate_reference(
+            raw, entry_minutes, stop, dict(zip(R_LEVELS, r_prices)), is_long, EOD_MINUTES
+        ))
+    return batch, reference
+
+
+class TestAtrStopSimulator:
+    TEST_ID = "test_26_atr_stop_simulator"
+    QUESTION = "Does the vectorized ATR stop simulator match the per-trade bar walk?"
+
+    def test_matches_reference(self, result_writer):
+        """Batch outcomes equal the sequential walk across random sessions."""
+        for seed in range(100):
+            batch, reference = resolve_both(seed)
+            assert batch == reference, f"seed {seed}"
+
+    def test_same_candle_conflict(self, result_writer):
+        """A bar that touches R1 and closes through the stop is a LOSS."""
+        bars = [
+            {'bar_time': time(10, 0), 'high': 100.0, 'low': 99.9, 'close': 100.0},
+            {'bar_time': time(10, 1), 'high': 101.5, 'low': 98.0, 'close': 98.5},
+            {'bar_time': time(10, 2), 'high': 103.0, 'low': 98.0, 'close': 102.0},
+        ]
+        sim = prepare_bars(bars)
+        outcome = simulate_outcomes(sim, [600], [99.0], [[101, 102, 103, 104, 105]], [True], EOD_MINUTES)
+        result = SimpleNamespace(stop_hit=False)
+        outcome.apply(0, result, sim)
+        assert result.result == 'LOSS' and result.max_r == -1
+        assert result.stop_time == time(10, 1) and result.stop_bars_from_entry == 1
+        assert not getattr(result, 'r1_hit', False)
+
+    def test_all_levels_hit_ignores_later_stop(self, result_writer):
+        """Once every R-level is credited the walk ends; a later stop is not recorded."""
+        bars = [
+            {'bar_time': time(10, 1), 'high': 95.0, 'low': 94.0, 'close': 94.5},
+            {'bar_time': time(10, 2), 'high': 106.0, 'low': 105.0, 'close': 105.5},
+        ]
+        sim = prepare_bars(bars)
+        outcome = simulate_outcomes(sim, [600], [99.0], [[99, 98, 97, 96, 95]], [False], EOD_MINUTES)
+        result = SimpleNamespace(stop_hit=False)
+        outcome.apply(0, result, sim)
+        assert result.result == 'WIN' and result.max_r == 5 and not result.stop_hit
+
+    def test_entry_after_cutoff(self, result_writer):
+        """Entries at or after 15:30 see no bars and resolve to LOSS."""
+        sim = prepare_bars(make_session(1))
+        outcome = simulate_outcomes(sim, [EOD_MINUTES, EOD_MINUTES + 10], [0.0, 0.0],
+                                    [[1e9] * 5, [1e9] * 5], [True, True], EOD_MINUTES)
+        assert (outcome.stop_idx == -1).all() and (outcome.r_idx == -1).all()
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        mismatches, trades, wins, stops = 0, 0, 0, 0
+        for seed in range(200):
+            batch, reference = resolve_both(seed)
+            mismatches += sum(b != r for b, r in zip(batch, reference))
+            trades += len(batch)
+            wins += sum(r['result'] == 'WIN' for r in reference)
+            stops += sum(r['stop'] is not None for r in reference)
+
+        checks.append(make_check("mismatched_trades", 0, mismatches))
+        checks.append(make_check("trades_compared", 2000, trades))
+        checks.append(make_check("wins_and_losses_present", True, 0 < wins < trades))
+        checks.append(make_check("stops_present", True, stops > 0))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,243 @@
+"""
+Test 27: Does the concurrent DOW AI batch analyzer stay in its window and resume cleanly?
+Source: 02_dow_ai/batch_analyzer/analyzer/ - rate_limiter.py, concurrent_analyzer.py, fake_messages_server.py
+
+Runs offline: the limiter uses a fake clock, the scheduler uses in-memory
+storage, and HTTP traffic goes to FakeMessagesServer on localhost.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "02_dow_ai" / "batch_analyzer" / "analyzer"))
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from conftest import make_check
+
+from concurrent_analyzer import BatchCheckpoint, ConcurrentBatchAnalyzer
+from fake_messages_server import FakeMessagesServer
+from rate_limiter import TokenBucketLimiter
+
+
+class FakeClock:
+    """Monotonic clock advanced only by sleep()."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class MemoryStorage:
+    """save_predictions_batch into a list; optionally fails every batch."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.rows = []
+
+    def save_predictions_batch(self, predictions):
+        if self.fail:
+            return 0
+        self.rows.extend(predictions)
+        return len(predictions)
+
+
+def make_trades(n):
+    return [SimpleNamespace(trade_id=f"T{i:03d}") for i in range(n)]
+
+
+def post_message(base_url, prompt, limiter):
+    """Minimal Messages API call through the shared limiter."""
+    body = json.dumps({"model": "fake", "max_tokens": 50,
+                       "messages": [{"role": "user", "content": prompt}]}).encode()
+    while True:
+        limiter.acquire(len(prompt) // 4 + 50)
+        request = urllib.request.Request(f"{base_url}/v1/messages", data=body,
+                                         headers={"content-type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                payload = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code != 429:
+                raise
+            limiter.on_rate_limit(float(e.headers.get("retry-after", 0)))
+            continue
+        limiter.on_success()
+        return payload
+
+
+class TestConcurrentBatchAnalyzer:
+    TEST_ID = "test_27_concurrent_batch_analyzer"
+    QUESTION = "Does the concurrent DOW AI batch analyzer stay in its window and resume cleanly?"
+
+    def test_request_budget(self, result_writer):
+        """After the initial burst, requests are spaced at the per-minute rate."""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(60, clock=clock, sleep=clock.sleep)
+        for _ in range(120):
+            limiter.acquire()
+        assert clock.now == pytest.approx(60.0, abs=1.0)
+
+    def test_token_budget(self, result_writer):
+        """Large requests wait for tokens even when requests are available."""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(1000, tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            limiter.acquire(3000)
+        assert clock.now == pytest.approx(60.0, abs=0.5)
+
+    def test_settle_refunds_unused_tokens(self, result_writer):
+        """Reserving more than was used hands the difference back."""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(1000, tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+        limiter.acquire(6000)
+        limiter.settle(6000, 1000)
+        limiter.acquire(5000)
+        assert clock.now == 0.0
+
+    def test_adaptive_backoff(self, result_writer):
+        """429s pause all callers and halve the rate; successes recover it."""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(600, clock=clock, sleep=clock.sleep, base_backoff=2.0)
+        assert limiter.on_rate_limit() == 2.0
+        assert limiter.on_rate_limit(retry_after=1.0) == 4.0
+        assert limiter.scale == 0.25
+        limiter.acquire()
+        assert clock.now >= 4.0
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.scale == 1.0
+
+    def test_window_bound(self, result_writer):
+        """No more than max_in_flight analyses run at once."""
+        lock, active, peak = threading.Lock(), [0], [0]
+
+        def analyze(trade):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return trade.trade_id, trade
+
+        storage = MemoryStorage()
+        stats = ConcurrentBatchAnalyzer(analyze, storage, max_in_flight=4, write_batch_size=5).run(make_trades(30))
+        assert peak[0] == 4 and stats.max_in_flight_seen == 4
+        assert sorted(p for p, _ in storage.rows) == [t.trade_id for t in make_trades(30)]
+
+    def test_resume_after_interrupt(self, tmp_path, result_writer):
+        """A killed run resumes without re-sending stored trades."""
+        trades, sent = make_trades(20), []
+
+        def analyze(trade):
+            sent.append(trade.trade_id)
+            return trade.trade_id, trade
+
+        def interrupt(i, total, trade, prediction, error):
+            if i == 8:
+                raise KeyboardInterrupt
+
+        storage = MemoryStorage()
+        path = tmp_path / "checkpoint.json"
+        with pytest.raises(KeyboardInterrupt):
+            ConcurrentBatchAnalyzer(analyze, storage, BatchCheckpoint(path, "m|v3"), max_in_flight=1,
+                                    write_batch_size=3, progress_callback=interrupt).run(trades)
+        stored_first = {p for p, _ in storage.rows}
+        assert stored_first == set(BatchCheckpoint(path, "m|v3").completed)
+
+        sent.clear()
+        stats = ConcurrentBatchAnalyzer(analyze, storage, BatchCheckpoint(path, "m|v3"),
+                                        max_in_flight=3, write_batch_size=3).run(trades)
+        assert stats.resumed == len(stored_first)
+        assert not stored_first & set(sent)
+        assert sorted(p for p, _ in storage.rows) == [t.trade_id for t in trades]
+
+    def test_checkpoint_keyed_by_run(self, tmp_path, result_writer):
+        """A checkpoint from another model/prompt is ignored."""
+        path = tmp_path / "checkpoint.json"
+        BatchCheckpoint(path, "opus|v3").mark(["T000"])
+        assert BatchCheckpoint(path, "sonnet|v3").completed == set()
+        assert BatchCheckpoint(path, "opus|v3").completed == {"T000"}
+
+    def test_checkpoint_cleared(self, tmp_path, result_writer):
+        """A cleared checkpoint is gone, so a later run with the same key re-sends every trade."""
+        path = tmp_path / "checkpoint.json"
+        checkpoint = BatchCheckpoint(path, "m|v3")
+        ConcurrentBatchAnalyzer(lambda t: (t.trade_id, t), MemoryStorage(), checkpoint).run(make_trades(5))
+        assert len(BatchCheckpoint(path, "m|v3").completed) == 5
+        checkpoint.clear()
+        assert not path.exists() and checkpoint.completed == set()
+        checkpoint.clear()
+
+        stats = ConcurrentBatchAnalyzer(lambda t: (t.trade_id, t), MemoryStorage(),
+                                        BatchCheckpoint(path, "m|v3")).run(make_trades(5))
+        assert stats.resumed == 0 and stats.analyzed == 5
+
+    def test_failed_write_not_checkpointed(self, tmp_path, result_writer):
+        """Predictions whose batch failed to store are retried next run."""
+        path = tmp_path / "checkpoint.json"
+        stats = ConcurrentBatchAnalyzer(lambda t: (t.trade_id, t), MemoryStorage(fail=True),
+                                        BatchCheckpoint(path), write_batch_size=4).run(make_trades(10))
+        assert stats.save_failures == 10 and stats.saved == 0
+        assert BatchCheckpoint(path).completed == set()
+
+    def test_errors_isolated(self, result_writer):
+        """One failing trade does not stop the batch."""
+        def analyze(trade):
+            if trade.trade_id == "T003":
+                raise RuntimeError("API request failed")
+            return trade.trade_id, trade
+
+        storage = MemoryStorage()
+        stats = ConcurrentBatchAnalyzer(analyze, storage, max_in_flight=3).run(make_trades(8))
+        assert stats.errors == 1 and stats.saved == 7
+
+    def test_fake_server_rate_limit(self, result_writer):
+        """The fake server answers Messages API JSON and 429s over its limit."""
+        with FakeMessagesServer(requests_per_window=2, window_seconds=5.0, retry_after=3) as server:
+            clock = FakeClock()
+            limiter = TokenBucketLimiter(1000, clock=clock, sleep=clock.sleep)
+            reply = post_message(server.base_url, "hello", limiter)
+            assert reply["content"][0]["type"] == "text" and reply["usage"]["input_tokens"] >= 1
+            post_message(server.base_url, "again", limiter)
+            request = urllib.request.Request(f"{server.base_url}/v1/messages", data=b"{}")
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                urllib.request.urlopen(request, timeout=5)
+            assert exc.value.code == 429 and exc.value.headers["retry-after"] == "3"
+
+    def test_full_suite(self, tmp_path, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        trades = make_trades(40)
+
+        with FakeMessagesServer(latency=0.02, requests_per_window=15, window_seconds=0.25) as server:
+            limiter = TokenBucketLimiter(6000, base_backoff=0.05, max_backoff=0.2)
+
+            def analyze(trade):
+                reply = post_message(server.base_url, trade.trade_id, limiter)
+                return reply["content"][0]["text"], trade
+
+            storage = MemoryStorage()
+            stats = ConcurrentBatchAnalyzer(analyze, storage, BatchCheckpoint(tmp_path / "cp.json", "fake"),
+                                            max_in_flight=6, write_batch_size=10).run(trades)
+            accepted = server.requests - server.rate_limited
+
+        checks.append(make_check("trades_stored", 40, stats.saved))
+        checks.append(make_check("accepted_requests", 40, accepted))
+        checks.append(make_check("peak_concurrency_within_window", True, server.max_concurrent <= 6))
+        checks.append(make_check("rate_limits_absorbed", True, server.rate_limited == limiter.rate_limit_events))
+        checks.append(make_check("checkpoint_complete", 40, len(BatchCheckpoint(tmp_path / "cp.json", "fake").completed)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,333 @@
+"""
+Test 28: Does the COPY bulk writer load every row exactly once and reconcile counts?
+Source: 00_shared/data/bulk_writer.py - BulkWriter, bulk_write, copy_field
+        03_backtest/processor/secondary_analysis/m1_indicator_bars_2/populator.py - commit batches
+
+Runs offline against FakeConnection, which decodes the COPY stream and
+applies the merge to an in-memory table keyed on the conflict columns.
+Set EPOCH_TEST_PG_DSN to also run the round trip against a real Postgres.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "00_shared" / "data"))
+
+import importlib.util
+import os
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from conftest import make_check
+
+from bulk_writer import BulkWriteError, BulkWriter, _CopyStream, bulk_write, copy_field
+
+
+COLUMNS = ("ticker", "bar_timestamp", "close")
+KEYS = ("ticker", "bar_timestamp")
+
+_M1_INDICATOR_POPULATOR = (
+    Path(__file__).resolve().parent.parent.parent.parent
+    / "03_backtest" / "processor" / "secondary_analysis" / "m1_indicator_bars_2" / "populator.py"
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.conn.statements.append(sql)
+        if sql.startswith("CREATE TEMP TABLE"):
+            if self.conn.fail_flushes and len(self.conn.statements) > self.conn.fail_after:
+                raise RuntimeError("connection lost")
+            self.conn.staging = []
+        elif sql.startswith("WITH merged AS"):
+            self._result = self.conn.merge(sql)
+
+    def copy_expert(self, sql, stream):
+        self.conn.statements.append(sql)
+        data = b""
+        while True:
+            chunk = stream.read(self.conn.copy_read_size)
+            if not chunk:
+                break
+            data += chunk
+        lines = data.decode("utf-8").split("\n")[:-1]
+        self.conn.staging = [line.split("\t") for line in lines][:len(lines) - self.conn.drop_rows]
+
+    def fetchone(self):
+        return self._result
+
+
+class FakeConnection:
+    """In-memory stand-in for a psycopg2 connection with one target table."""
+
+    def __init__(self, key_width=len(KEYS), drop_rows=0, copy_read_size=64):
+        self.key_width = key_width
+        self.fail_flushes = False
+        self.fail_after = 0
+        self.committed = {}
+        self.commits = []
+        self.drop_rows = drop_rows
+        self.copy_read_size = copy_read_size
+        self.statements = []
+        self.staging = []
+        self.table = {}
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = dict(self.table)
+        self.commits.append(self.committed)
+
+    def rollback(self):
+        self.table = dict(self.committed)
+
+    def fail_from_next_flush(self):
+        self.fail_flushes = True
+        self.fail_after = len(self.statements)
+
+    def merge(self, sql):
+        merged = 0
+        update = "DO UPDATE" in sql
+        for row in self.staging:
+            key = tuple(row[:self.key_width])
+            if key not in self.table or update:
+                merged += key not in self.table or self.table[key] != row
+                self.table[key] = row
+        return len(self.staging), merged
+
+
+def make_rows(n, ticker="AAPL"):
+    start = datetime(2025, 1, 6, 9, 30)
+    return [(ticker, start + timedelta(minutes=i), 100.0 + i) for i in range(n)]
+
+
+def load_indicator_populator():
+    """m1_indicator_bars_2/populator.py, or skip where its imports are unavailable."""
+    pytest.importorskip("psycopg2")
+    pytest.importorskip("shared.data.bulk_writer")
+    spec = importlib.util.spec_from_file_location("m1_indicator_bars_2_populator", _M1_INDICATOR_POPULATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeBarsCalculator:
+    """Per ticker-date bar counts in place of M1IndicatorBarsCalculator."""
+
+    def __init__(self, counts, fail=()):
+        self.counts = counts
+        self.fail = set(fail)
+        self.on_calculate = None
+
+    def calculate_for_ticker_date(self, ticker, trade_date):
+        if self.on_calculate:
+            self.on_calculate(ticker)
+        if ticker in self.fail:
+            raise ValueError("no bars")
+        return [(ticker, trade_date, i) for i in range(self.counts[ticker])]
+
+    def clear_caches(self):
+        pass
+
+
+def run_indicator_populator(monkeypatch, counts, batch_size, fail=(), break_at=None):
+    """
+    Run the m1_indicator_bars_2 populator over fake ticker-dates.
+
+    Rows are (ticker, date, minute); the connection starts failing every
+    flush once the calculator reaches the ticker `break_at`. Returns the
+    stats and the committed rows per ticker after each commit.
+    """
+    module = load_indicator_populator()
+    conn = FakeConnection(key_width=3)
+    calculator = FakeBarsCalculator(counts, fail)
+    if break_at:
+        calculator.on_calculate = lambda t: t == break_at and conn.fail_from_next_flush()
+    monkeypatch.setattr(module, "BULK_BATCH_SIZE", batch_size)
+    monkeypatch.setattr(module, "INSERT_COLUMNS", ("ticker", "bar_date", "bar_time"))
+    monkeypatch.setattr(module, "M1IndicatorBarsCalculator", lambda **kw: calculator)
+
+    populator = module.M1IndicatorBarsPopulator(verbose=False)
+    day = date(2025, 1, 6)
+    monkeypatch.setattr(populator, "get_ticker_dates_needing_calculation",
+                        lambda *a: [{"ticker": t, "date": day} for t in counts])
+    monkeypatch.setattr(populator, "insert_results", lambda writer, results: writer.write(results))
+    stats = populator.run_batch_population(conn=conn)
+    commits = []
+    for table in conn.commits:
+        rows = {}
+        for key in table:
+            rows[key[0]] = rows.get(key[0], 0) + 1
+        commits.append(rows)
+    return stats, commits
+
+
+class TestBulkWriter:
+    TEST_ID = "test_28_bulk_writer"
+    QUESTION = "Does the COPY bulk writer load every row exactly once and reconcile counts?"
+
+    def test_copy_encoding(self, result_writer):
+        """Values encode to COPY text format with escapes and NULLs."""
+        assert copy_field(None) == "\\N"
+        assert copy_field(True) == "t"
+        assert copy_field(np.int64(7)) == "7"
+        assert copy_field(float("nan")) == "NaN"
+        assert copy_field(Decimal("1.2300")) == "1.2300"
+        assert copy_field(datetime(2025, 1, 6, 9, 30)) == "2025-01-06 09:30:00"
+        assert copy_field(date(2025, 1, 6)) == "2025-01-06"
+        assert copy_field(time(9, 30)) == "09:30:00"
+        assert copy_field(timedelta(hours=9, minutes=31)) == "09:31:00"
+        assert copy_field("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+        assert copy_field([1, None, "x"]) == '{"1",NULL,"x"}'
+
+    def test_stream_chunks(self, result_writer):
+        """Small reads reassemble into exactly one line per row."""
+        rows = make_rows(25)
+        stream = _CopyStream(rows, len(COLUMNS))
+        data = b""
+        while True:
+            chunk = stream.read(7)
+            if not chunk:
+                break
+            assert len(chunk) <= 7
+            data += chunk
+        assert data.decode().count("\n") == 25 and stream.count == 25
+
+    def test_row_width_checked(self, result_writer):
+        """A row with the wrong number of values fails the flush."""
+        with pytest.raises(BulkWriteError):
+            bulk_write(FakeConnection(), "m1_bars_2", COLUMNS, [("AAPL", datetime(2025, 1, 6))])
+
+    def test_batches_and_bounded_buffer(self, result_writer):
+        """A generator is consumed in batch_size chunks, never buffered whole."""
+        conn = FakeConnection()
+        writer = BulkWriter(conn, "m1_bars_2", COLUMNS, KEYS, batch_size=100)
+        peak = []
+
+        def rows():
+            for row in make_rows(1050):
+                peak.append(writer.pending)
+                yield row
+
+        assert writer.write(rows()) == 1000
+        assert writer.pending == 50 and max(peak) < 100
+        assert writer.flush() == 50
+        assert writer.result.batches == 11 and writer.result.merged == 1050
+        assert len(conn.table) == 1050
+
+    def test_conflict_do_nothing(self, result_writer):
+        """Existing keys are skipped and reported as skipped."""
+        conn = FakeConnection()
+        bulk_write(conn, "m1_bars_2", COLUMNS, make_rows(10), conflict_columns=KEYS)
+        result = bulk_write(conn, "m1_bars_2", COLUMNS, make_rows(15), conflict_columns=KEYS)
+        assert (result.staged, result.merged, result.skipped) == (15, 5, 10)
+        assert any("DO NOTHING" in s for s in conn.statements)
+
+    def test_conflict_update_sql(self, result_writer):
+        """Upserts dedupe staged keys and honour update_columns/update_extra."""
+        writer = BulkWriter(FakeConnection(key_width=1), "m1_trade_indicator_2",
+                            ("trade_id", "ticker", "pnl_r"), ("trade_id",), on_conflict="update",
+                            update_columns=("pnl_r",), update_extra={"calculated_at": "NOW()"})
+        sql = writer._merge_sql()
+        assert "DISTINCT ON (trade_id)" in sql and "ORDER BY trade_id, ctid DESC" in sql
+        assert "pnl_r = EXCLUDED.pnl_r" in sql and "calculated_at = NOW()" in sql
+        assert "ticker = EXCLUDED" not in sql
+        with pytest.raises(ValueError):
+            BulkWriter(FakeConnection(), "t", COLUMNS, on_conflict="update")
+
+    def test_reconcile_mismatch(self, result_writer):
+        """A staged count short of the rows sent raises BulkWriteError."""
+        with pytest.raises(BulkWriteError, match="mismatch"):
+            bulk_write(FakeConnection(drop_rows=1), "m1_bars_2", COLUMNS, make_rows(5), conflict_columns=KEYS)
+
+    def test_context_manager_drops_staging(self, result_writer):
+        """Leaving the context flushes and drops the staging table."""
+        conn = FakeConnection()
+        with BulkWriter(conn, "m1_bars_2", COLUMNS, KEYS) as writer:
+            writer.write(make_rows(3))
+        assert len(conn.table) == 3
+        assert conn.statements[-1] == f"DROP TABLE IF EXISTS {writer.staging_table}"
+
+    def test_populator_commits_whole_ticker_dates(self, result_writer, monkeypatch):
+        """Ticker-dates are committed whole; a batch never splits one across commits."""
+        counts = {"AAPL": 40, "MSFT": 40, "NVDA": 40, "TSLA": 10}
+        stats, commits = run_indicator_populator(monkeypatch, counts, batch_size=100)
+        assert commits == [{"AAPL": 40, "MSFT": 40}, counts]
+        assert stats["ticker_dates_processed"] == 4 and stats["bars_inserted"] == 130
+
+    def test_populator_flush_failure_fails_buffered_ticker_dates(self, result_writer, monkeypatch):
+        """A failed flush reports every ticker-date in the open batch, not only the current one."""
+        counts = {"AAPL": 60, "MSFT": 50, "NVDA": 30, "TSLA": 10, "AMD": 40}
+        stats, commits = run_indicator_populator(monkeypatch, counts, batch_size=100, break_at="TSLA")
+        assert commits == [{"AAPL": 60}]
+        assert stats["ticker_dates_processed"] == 1 and stats["bars_inserted"] == 60
+        assert [e.split()[0] for e in stats["errors"]] == ["MSFT", "NVDA", "TSLA", "AMD"]
+        assert stats["ticker_dates_skipped"] == 4
+
+    def test_populator_calculation_error_keeps_batch(self, result_writer, monkeypatch):
+        """A calculation error skips its own ticker-date without rolling back the batch."""
+        counts = {"AAPL": 30, "MSFT": 30, "NVDA": 30}
+        stats, commits = run_indicator_populator(monkeypatch, counts, batch_size=100, fail=("MSFT",))
+        assert commits == [{"AAPL": 30, "NVDA": 30}]
+        assert stats["errors"] == ["MSFT 2025-01-06: no bars"]
+        assert stats["ticker_dates_processed"] == 2 and stats["ticker_dates_skipped"] == 1
+
+    @pytest.mark.skipif(not os.environ.get("EPOCH_TEST_PG_DSN"), reason="EPOCH_TEST_PG_DSN not set")
+    def test_postgres_round_trip(self, result_writer):
+        """COPY + merge against a real server matches row-by-row inserts."""
+        import psycopg2
+
+        conn = psycopg2.connect(os.environ["EPOCH_TEST_PG_DSN"])
+        try:
+            with conn.cursor() as cur:
+                cur.execute("CREATE TEMP TABLE bulk_test (ticker TEXT, bar_timestamp TIMESTAMP, "
+                            "close NUMERIC, PRIMARY KEY (ticker, bar_timestamp))")
+            first = bulk_write(conn, "bulk_test", COLUMNS, make_rows(500), KEYS, batch_size=128)
+            second = bulk_write(conn, "bulk_test", COLUMNS, make_rows(600), KEYS, batch_size=128)
+            update = bulk_write(conn, "bulk_test", COLUMNS, [("AAPL", make_rows(1)[0][1], 1.5)] * 2,
+                                KEYS, on_conflict="update")
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*), MIN(close) FROM bulk_test")
+                count, low = cur.fetchone()
+            assert (first.merged, second.merged, second.skipped, update.merged) == (500, 100, 500, 1)
+            assert count == 600 and float(low) == 1.5
+        finally:
+            conn.rollback()
+            conn.close()
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        conn = FakeConnection()
+        first = bulk_write(conn, "m1_bars_2", COLUMNS, iter(make_rows(2500)), KEYS, batch_size=1000)
+        second = bulk_write(conn, "m1_bars_2", COLUMNS, iter(make_rows(3000)), KEYS, batch_size=1000)
+
+        checks.append(make_check("first_load_batches", 3, first.batches))
+        checks.append(make_check("first_load_merged", 2500, first.merged))
+        checks.append(make_check("rerun_staged", 3000, second.staged))
+        checks.append(make_check("rerun_merged_new_only", 500, second.merged))
+        checks.append(make_check("table_rows", 3000, len(conn.table)))
+
+        try:
+            bulk_write(FakeConnection(drop_rows=1), "m1_bars_2", COLUMNS, make_rows(10), KEYS)
+            mismatch_detected = False
+        except BulkWriteError:
+            mismatch_detected = True
+        checks.append(make_check("mismatch_detected", True, mismatch_detected))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
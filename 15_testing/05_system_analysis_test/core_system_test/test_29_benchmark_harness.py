@@ -0,0 +1,95 @@
+"""
+Test 29: Does the benchmark suite generate reproducible data and flag regressions?
+Source: 15_testing/benchmarks/ - generators.py, harness.py, cases.py
+
+Every registered case runs once at the smoke scale, so a refactor that
+breaks a benchmarked hot path is caught here rather than on the next
+benchmark run.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "benchmarks"))
+
+from datetime import time
+
+import pandas as pd
+import pytest
+from conftest import make_check
+
+from cases import APPLICATION_ROOT, CASES, import_isolated
+from generators import SCALES, make_bars, make_trades, make_zones
+from harness import BenchmarkResult, build_report, compare, measure
+
+
+def report(**medians):
+    return build_report("smoke", [BenchmarkResult(n, 100, [t], 1024) for n, t in medians.items()], 0)
+
+
+class TestBenchmarkHarness:
+    TEST_ID = "test_29_benchmark_harness"
+    QUESTION = "Does the benchmark suite generate reproducible data and flag regressions?"
+
+    def test_generators_seeded(self, result_writer):
+        """Same seed gives identical bars; a different seed does not."""
+        pd.testing.assert_frame_equal(make_bars("M1", 3, seed=5), make_bars("M1", 3, seed=5))
+        assert not make_bars("M1", 3, seed=5)["close"].equals(make_bars("M1", 3, seed=6)["close"])
+
+    @pytest.mark.parametrize("timeframe,per_day", [("S15", 1560), ("M1", 390), ("M5", 78), ("H1", 16), ("D1", 1)])
+    def test_bar_grid(self, result_writer, timeframe, per_day):
+        """Bars cover the session grid with valid OHLC on weekdays only."""
+        bars = make_bars(timeframe, 5)
+        assert len(bars) == 5 * per_day
+        assert (bars["high"] >= bars[["open", "close"]].max(axis=1)).all()
+        assert (bars["low"] <= bars[["open", "close"]].min(axis=1)).all()
+        assert (bars["volume"] > 0).all()
+        assert bars["timestamp"].is_monotonic_increasing
+        assert str(bars["timestamp"].dt.tz) == "America/New_York"
+        assert all(d.weekday() < 5 for d in bars["bar_date"])
+
+    def test_trades_and_zones(self, result_writer):
+        """Trades enter inside the entry window; zones sit inside the day's range."""
+        m1 = make_bars("M1", 4)
+        trades = make_trades(m1, 50)
+        assert len(trades) == 50 and len({t["trade_id"] for t in trades}) == 50
+        assert all(time(9, 35) <= t["entry_time"] <= time(15, 30) for t in trades)
+        zones = make_zones(m1, 3)
+        for d, day in m1.groupby("bar_date"):
+            for z in zones[d]:
+                assert day["low"].min() - 1 <= z["hvn_poc"] <= day["high"].max() + 1
+                assert z["zone_low"] < z["zone_high"]
+
+    def test_measure(self, result_writer):
+        """measure returns one time per repeat and a peak covering the allocation."""
+        times, peak = measure(lambda: bytearray(4_000_000), repeat=3)
+        assert len(times) == 3 and peak >= 4_000_000
+
+    def test_compare(self, result_writer):
+        """Slowdowns past the threshold regress; speedups and new cases do not fail."""
+        baseline = report(a=1.0, b=1.0, c=1.0, gone=1.0)
+        current = report(a=1.1, b=1.5, c=0.5, fresh=1.0)
+        status = {c.name: c.status for c in compare(current, baseline, threshold=0.25)}
+        assert status == {"a": "ok", "b": "regression", "c": "improved", "fresh": "new", "gone": "missing"}
+
+    def test_import_isolated_restores_modules(self, result_writer):
+        """Loading an 01_application module leaves sys.modules/sys.path as they were."""
+        path_before = list(sys.path)
+        config_before = sys.modules.get("config")
+        module = import_isolated(APPLICATION_ROOT, "calculators.hvn_identifier")
+        assert hasattr(module, "CentVolumeProfile")
+        assert sys.path == path_before and sys.modules.get("config") is config_before
+
+    def test_full_suite(self, result_writer):
+        """Run every case once at smoke scale and write JSON result."""
+        checks = []
+        scale = SCALES["smoke"]
+
+        for name, case in CASES.items():
+            fn, items = case.setup(scale, 0)
+            times, _ = measure(fn, repeat=1, warmup=0)
+            checks.append(make_check(f"{name}_runs", True, items > 0 and len(times) == 1))
+
+        checks.append(make_check("cases_registered", 10, len(CASES)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,196 @@
+"""
+Test 30: Does the tiered cache stay within its byte budgets and evict least-recently-used entries?
+Source: 01_application/data/cache_manager.py - CacheManager
+
+Each test uses its own temp directory; TTL expiry is simulated by moving a
+file's mtime into the past.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from conftest import make_check
+
+from data.cache_manager import CacheManager
+
+
+def age_file(path: Path, seconds: float):
+    """Make a cache file look `seconds` old."""
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def make_df(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({"close": rng.normal(100, 1, n), "volume": rng.randint(1, 1000, n)})
+
+
+class TestCacheManager:
+    TEST_ID = "test_30_cache_manager"
+    QUESTION = "Does the tiered cache stay within its byte budgets and evict least-recently-used entries?"
+
+    def test_memory_tier_serves_repeat_reads(self, tmp_path, result_writer):
+        """The first read after a restart comes from disk, repeats from memory."""
+        CacheManager(tmp_path).set_dataframe("bars", make_df())
+        cache = CacheManager(tmp_path)
+        pd.testing.assert_frame_equal(cache.get_dataframe("bars"), make_df())
+        pd.testing.assert_frame_equal(cache.get_dataframe("bars"), make_df())
+        stats = cache.get_cache_stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+    def test_returned_values_are_copies(self, tmp_path, result_writer):
+        """Mutating a returned DataFrame/object/dict never changes the cached entry."""
+        cache = CacheManager(tmp_path)
+        cache.set_dataframe("df", make_df())
+        cache.set_object("obj", {"levels": [1, 2]})
+        cache.set_json("js", {"a": [1]})
+        df = cache.get_dataframe("df")
+        df.loc[0, "close"] = -1
+        cache.get_object("obj")["levels"].append(3)
+        cache.get_json("js")["a"].append(2)
+        assert cache.get_dataframe("df").loc[0, "close"] != -1
+        assert cache.get_object("obj") == {"levels": [1, 2]}
+        assert cache.get_json("js") == {"a": [1]}
+
+    def test_memory_budget(self, tmp_path, result_writer):
+        """The memory tier never holds more bytes than its budget."""
+        cache = CacheManager(tmp_path, memory_bytes=40_000)
+        for i in range(20):
+            cache.set_object(f"k{i}", bytes(5_000))
+        stats = cache.get_cache_stats()
+        assert stats["memory_bytes"] <= 40_000 and stats["memory_evictions"] > 0
+        assert cache.get_object("k19") is not None
+
+    def test_disk_lru_eviction(self, tmp_path, result_writer):
+        """Past the disk budget the least recently read file goes first."""
+        cache = CacheManager(tmp_path, memory_bytes=0, disk_bytes=3_500)
+        for name in ("a", "b", "c"):
+            cache.set_object(name, bytes(1_000))
+        for i, name in enumerate(("a", "b", "c")):
+            os.utime(tmp_path / f"{name}.pkl", (1_000 + i, time.time()))
+        assert cache.get_object("a") is not None      # a becomes most recent
+        cache.set_object("d", bytes(1_000))
+        remaining = {p.stem for p in tmp_path.glob("*.pkl")}
+        assert "b" not in remaining and {"a", "d"} <= remaining
+        assert cache.get_cache_stats()["disk_bytes"] <= 3_500
+
+    def test_ttl_and_compaction(self, tmp_path, result_writer):
+        """Expired entries miss; compaction purges them and stale temp files."""
+        cache = CacheManager(tmp_path, memory_bytes=0, max_ttl_seconds=100)
+        cache.set_object("old", 1)
+        cache.set_object("new", 2)
+        age_file(tmp_path / "old.pkl", 200)
+        (tmp_path / "orphan.pkl.1.deadbeef.tmp").write_bytes(b"x")
+        age_file(tmp_path / "orphan.pkl.1.deadbeef.tmp", 7_200)
+
+        assert cache.get_object("old", ttl_seconds=100) is None
+        result = cache.compact()
+        assert result["expired_purged"] == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["new.pkl"]
+
+    def test_compaction_leaves_other_files(self, tmp_path, result_writer):
+        """Files that are not cache entries are never expired, evicted or counted."""
+        cache = CacheManager(tmp_path, memory_bytes=0, disk_bytes=2_500, max_ttl_seconds=100)
+        (tmp_path / "notes.txt").write_bytes(bytes(10_000))
+        (tmp_path / "universe").mkdir()
+        age_file(tmp_path / "notes.txt", 200)
+        for key in "abc":
+            cache.set_object(key, bytes(1_000))
+        cache.set_object("old", 1)
+        age_file(tmp_path / "old.pkl", 200)
+
+        assert cache.compact() == {"expired_purged": 1, "evicted": 0}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["b.pkl", "c.pkl", "notes.txt", "universe"]
+        assert cache.get_cache_stats()["file_count"] == 2
+        assert cache.clear() == 2 and (tmp_path / "notes.txt").exists()
+
+    def test_default_dir_is_not_data_dir(self, result_writer):
+        """The shared instance keeps its entries out of DATA_DIR (tickers.json lives there)."""
+        from config import CACHE_DIR, DATA_DIR
+        from data.cache_manager import cache
+        assert cache.cache_dir == CACHE_DIR and CACHE_DIR != DATA_DIR
+
+    def test_background_compaction(self, tmp_path, result_writer):
+        """The compaction thread purges expired files on its own."""
+        cache = CacheManager(tmp_path, max_ttl_seconds=100, compaction_interval=0.05)
+        try:
+            cache.set_object("old", 1)
+            age_file(tmp_path / "old.pkl", 200)
+            deadline = time.time() + 5
+            while (tmp_path / "old.pkl").exists() and time.time() < deadline:
+                time.sleep(0.02)
+            assert not (tmp_path / "old.pkl").exists()
+        finally:
+            cache.stop_compaction()
+
+    def test_failed_write_keeps_old_entry(self, tmp_path, result_writer):
+        """A write that fails midway leaves the previous entry and no temp file."""
+        cache = CacheManager(tmp_path, memory_bytes=0)
+        cache.set_dataframe("bars", make_df())
+        bad = pd.DataFrame({"mixed": [1, "a", 2.5]})
+        assert cache.set_dataframe("bars", bad) is False
+        pd.testing.assert_frame_equal(cache.get_dataframe("bars"), make_df())
+        assert [p.name for p in tmp_path.iterdir()] == ["bars.parquet"]
+
+    def test_concurrent_writers(self, tmp_path, result_writer):
+        """Readers racing writers on one key only ever see complete entries."""
+        frames = [make_df(5_000, seed) for seed in range(4)]
+        errors = []
+
+        def writer(seed):
+            cache = CacheManager(tmp_path, memory_bytes=0)
+            for _ in range(10):
+                cache.set_dataframe("shared", frames[seed])
+
+        def reader():
+            cache = CacheManager(tmp_path, memory_bytes=0)
+            for _ in range(40):
+                df = cache.get_dataframe("shared")
+                if df is not None and not any(df.equals(f) for f in frames):
+                    errors.append("torn read")
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert [p.name for p in tmp_path.iterdir()] == ["shared.parquet"]
+
+    def test_clear_drops_both_tiers(self, tmp_path, result_writer):
+        """clear() removes matching files and their memory entries."""
+        cache = CacheManager(tmp_path)
+        cache.set_object("hvn_a", 1)
+        cache.set_json("other", {"x": 1})
+        assert cache.clear("*.pkl") == 1
+        assert cache.get_object("hvn_a") is None and cache.get_json("other") == {"x": 1}
+
+    def test_full_suite(self, tmp_path, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        cache = CacheManager(tmp_path, memory_bytes=64_000, disk_bytes=30_000)
+        for i in range(50):
+            cache.set_object(f"k{i}", bytes(2_000))
+            cache.get_object(f"k{i}")
+        cache.get_object("missing")
+        stats = cache.get_cache_stats()
+
+        checks.append(make_check("disk_within_budget", True, stats["disk_bytes"] <= 30_000))
+        checks.append(make_check("memory_within_budget", True, stats["memory_bytes"] <= 64_000))
+        checks.append(make_check("disk_evictions_recorded", True, stats["disk_evictions"] > 0))
+        checks.append(make_check("memory_hits", 50, stats["memory_hits"]))
+        checks.append(make_check("misses", 1, stats["misses"]))
+        checks.append(make_check("latest_entry_kept", True, (tmp_path / "k49.pkl").exists()))
+        checks.append(make_check("no_temp_files", 0, len(list(tmp_path.glob("*.tmp")))))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,124 @@
+"""
+Test 31: Does the vectorized fractal kernel match the per-bar loops it replaced?
+Source: shared.indicators.structure.fractals - fractal_flags, fractal_flags_batch
+
+The reference below replicates the original nested loops. Prices are
+rounded to whole cents so equal highs/lows (which must not be fractals)
+occur often. All three callers must produce identical flags.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_check
+
+from shared.indicators.structure import fractal_flags, fractal_flags_batch, pad_bars
+from shared.indicators.structure.market_structure import detect_fractals
+from calculators.market_structure import MarketStructureCalculator as AppStructureCalculator
+
+_M1_STRUCTURE = (Path(__file__).resolve().parent.parent.parent.parent / "03_backtest" / "processor"
+                 / "secondary_analysis" / "m1_indicator_bars_2" / "structure.py")
+_spec = importlib.util.spec_from_file_location("m1_indicator_bars_2_structure", _M1_STRUCTURE)
+m1_structure = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(m1_structure)
+
+
+def fractals_reference(high, low, length):
+    """Replicate the original _detect_fractals_core loop."""
+    n = len(high)
+    frac_highs = np.zeros(n, dtype=bool)
+    frac_lows = np.zeros(n, dtype=bool)
+    if n < 2 * length + 1:
+        return frac_highs, frac_lows
+    for i in range(length, n - length):
+        frac_highs[i] = all(high[i] > high[i - j] and high[i] > high[i + j] for j in range(1, length + 1))
+        frac_lows[i] = all(low[i] < low[i - j] and low[i] < low[i + j] for j in range(1, length + 1))
+    return frac_highs, frac_lows
+
+
+def make_prices(n, seed=0):
+    rng = np.random.RandomState(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.05, n)), 2)
+    high = close + np.round(rng.uniform(0, 0.05, n), 2)
+    low = close - np.round(rng.uniform(0, 0.05, n), 2)
+    return high, low
+
+
+class TestFractalKernel:
+    TEST_ID = "test_31_fractal_kernel"
+    QUESTION = "Does the vectorized fractal kernel match the per-bar loops it replaced?"
+
+    @pytest.mark.parametrize("length", [1, 2, 3, 5, 10])
+    def test_matches_reference(self, result_writer, length):
+        """Identical flags for any length, including plateaus of equal prices."""
+        high, low = make_prices(2_000, seed=length)
+        fh, fl = fractal_flags(high, low, length)
+        rh, rl = fractals_reference(high, low, length)
+        assert np.array_equal(fh, rh) and np.array_equal(fl, rl)
+        assert fh.any() and fl.any()
+
+    @pytest.mark.parametrize("n", [0, 1, 4, 5, 6])
+    def test_short_inputs(self, result_writer, n):
+        """Fewer than 2*length+1 bars gives no fractals; edges are never flagged."""
+        high, low = make_prices(n)
+        fh, fl = fractal_flags(high, low, 2)
+        rh, rl = fractals_reference(high, low, 2)
+        assert len(fh) == n and np.array_equal(fh, rh) and np.array_equal(fl, rl)
+
+    def test_nan_blocks_fractal(self, result_writer):
+        """A NaN anywhere in the window means no fractal."""
+        high = np.array([1.0, 2.0, 5.0, 2.0, np.nan, 1.0, 2.0, 9.0, 2.0, 1.0])
+        fh, _ = fractal_flags(high, high, 2)
+        assert fh.tolist() == [False] * 7 + [True] + [False] * 2
+
+    def test_batch_matches_per_ticker(self, result_writer):
+        """Each row of a NaN-padded batch matches the single-ticker kernel."""
+        tickers = [make_prices(n, seed=n) for n in (300, 57, 1_000, 4)]
+        bh, bl = fractal_flags_batch(pad_bars([h for h, _ in tickers]),
+                                     pad_bars([l for _, l in tickers]), 2)
+        assert bh.shape == (4, 1_000)
+        for row, (high, low) in enumerate(tickers):
+            fh, fl = fractal_flags(high, low, 2)
+            assert np.array_equal(bh[row, :len(high)], fh) and np.array_equal(bl[row, :len(low)], fl)
+            assert not bh[row, len(high):].any() and not bl[row, len(low):].any()
+
+    def test_callers_agree(self, result_writer):
+        """Shared, 01_application and m1_indicator_bars_2 detectors return the same flags."""
+        high, low = make_prices(500, seed=7)
+        df = pd.DataFrame({"high": high, "low": low})
+        rh, rl = fractals_reference(high, low, 2)
+
+        sh, sl = detect_fractals(df, length=2)
+        app = AppStructureCalculator()._detect_fractals(df)
+        bullf, bearf = m1_structure.MarketStructureCalculator()._detect_fractals(df.to_dict("records"))
+
+        assert np.array_equal(sh.values, rh) and np.array_equal(sl.values, rl)
+        assert np.array_equal(app["bearish_fractal"].values, rh)
+        assert np.array_equal(app["bullish_fractal"].values, rl)
+        assert bearf == rh.tolist() and bullf == rl.tolist()
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        for length in (1, 2, 3, 5):
+            high, low = make_prices(1_000, seed=100 + length)
+            fh, fl = fractal_flags(high, low, length)
+            rh, rl = fractals_reference(high, low, length)
+            checks.append(make_check(f"length_{length}_matches_loop", True,
+                                     bool(np.array_equal(fh, rh) and np.array_equal(fl, rl))))
+
+        tickers = [make_prices(n, seed=n) for n in (120, 80)]
+        bh, _ = fractal_flags_batch(pad_bars([h for h, _ in tickers]), pad_bars([l for _, l in tickers]), 2)
+        checks.append(make_check("batch_row_matches", True,
+                                 bool(np.array_equal(bh[1, :80], fractal_flags(*tickers[1], 2)[0]))))
+        checks.append(make_check("padding_never_flagged", False, bool(bh[1, 80:].any())))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
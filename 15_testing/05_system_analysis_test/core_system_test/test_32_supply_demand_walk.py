@@ -0,0 +1,115 @@
+"""
+Test 32: Does the price-indexed zone walk-forward match the bar x zone loop?
+Source: shared.calculations.supply_demand.engine - _walk_forward_zones, calculate_zones
+
+walk_forward_reference() is the original loop that checked every live zone
+on every bar. The indexed walk must leave every zone with identical
+touches, flips, recent counts, type and status.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "benchmarks"))
+
+import copy
+
+import numpy as np
+import pytest
+from conftest import make_check
+
+from generators import make_bars
+from shared.calculations.h1_supply_demand import H1SupplyDemandResult, calculate_h1_zones
+from shared.calculations.h1_supply_demand.calculator import H1_PARAMS
+from shared.calculations.h4_supply_demand import calculate_h4_zones, calculate_h4_zones_from_bars
+from shared.calculations.h4_supply_demand.calculator import H4_PARAMS
+from shared.calculations.supply_demand import Zone, ZoneType, walk_forward_reference
+from shared.calculations.supply_demand.engine import _walk_forward_zones
+
+
+def random_zones(close, count, seed):
+    """Zones around random past prices, some sharing identical bounds."""
+    rng = np.random.RandomState(seed)
+    zones = []
+    for i in range(count):
+        bar = rng.randint(0, len(close) - 1)
+        half = rng.uniform(0.05, 1.5)
+        if zones and rng.rand() < 0.2:
+            top, bottom = zones[-1].top, zones[-1].bottom
+        else:
+            top, bottom = close[bar] + half, close[bar] - half
+        zones.append(Zone(f"_Z{i}", ZoneType.SUPPLY if rng.rand() < 0.5 else ZoneType.DEMAND,
+                          top, bottom, close[bar], bar, bar + rng.randint(0, 20)))
+    return zones
+
+
+def zone_state(zones):
+    return [(z.zone_id, z.zone_type, z.status, z.touches, z.flips, z.recent_touches, z.recent_flips)
+            for z in zones]
+
+
+def both_walks(df, count, seed, recency):
+    close, high, low = (df[c].to_numpy(dtype=np.float64) for c in ("close", "high", "low"))
+    zones = random_zones(close, count, seed)
+    reference = copy.deepcopy(zones)
+    start = min(z.created_bar for z in zones)
+    _walk_forward_zones(zones, close, high, low, start, recency)
+    walk_forward_reference(reference, close, high, low, start, recency)
+    return zones, reference
+
+
+def result_state(result):
+    return ([(z.zone_id, z.zone_type, z.top, z.bottom, z.touches, z.flips, z.status)
+             for z in result.supply_zones + result.demand_zones + result.exhausted_zones],
+            result.nearest_supply, result.nearest_demand, result.error)
+
+
+class TestSupplyDemandWalk:
+    TEST_ID = "test_32_supply_demand_walk"
+    QUESTION = "Does the price-indexed zone walk-forward match the bar x zone loop?"
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_walk_matches_reference(self, result_writer, seed):
+        """Random zones (incl. duplicates and late activation) end in identical state."""
+        df = make_bars("H1", 60, seed=seed)
+        zones, reference = both_walks(df, 80, seed, recency=100)
+        assert zone_state(zones) == zone_state(reference)
+        assert sum(z.flips for z in zones) > 0 and sum(z.touches for z in zones) > 0
+
+    def test_nan_bars_and_zones(self, result_writer):
+        """NaN prices never touch or flip, as in the original loop."""
+        df = make_bars("H1", 20, seed=3)
+        df.loc[df.index[::7], ["close", "high", "low"]] = np.nan
+        zones, reference = both_walks(df, 30, 3, recency=50)
+        zones[0].top = reference[0].top = np.nan
+        assert zone_state(zones) == zone_state(reference)
+
+    def test_params(self, result_writer):
+        """The timeframe wrappers carry their own parameter sets."""
+        assert (H1_PARAMS.left_bars, H1_PARAMS.right_bars, H1_PARAMS.recency_bars) == (20, 15, 100)
+        assert (H4_PARAMS.left_bars, H4_PARAMS.right_bars, H4_PARAMS.recency_bars) == (10, 8, 25)
+        short = calculate_h1_zones(make_bars("H1", 1))
+        assert isinstance(short, H1SupplyDemandResult)
+        assert short.error == "Insufficient data: need at least 36 H1 bars"
+
+    def test_from_bars_matches_frame(self, result_writer):
+        """Bar-list entry point gives the same zones as the DataFrame one."""
+        h4 = make_bars("H4", 120, seed=4)
+        bars = h4[["open", "high", "low", "close"]].to_dict("records")
+        assert result_state(calculate_h4_zones_from_bars(bars, "X")) == result_state(calculate_h4_zones(h4, "X"))
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        for tf, days in (("H1", 90), ("H4", 360)):
+            zones, reference = both_walks(make_bars(tf, days, seed=11), 150, 11, recency=100)
+            checks.append(make_check(f"{tf.lower()}_walk_matches_reference", True,
+                                     zone_state(zones) == zone_state(reference)))
+
+        h1 = calculate_h1_zones(make_bars("H1", 120, seed=2), "X", d1_atr=2.0, atr_filter=3.0)
+        checks.append(make_check("h1_zones_found", True, h1.error is None and h1.total_supply + h1.total_demand > 0))
+        h4 = calculate_h4_zones(make_bars("H4", 240, seed=2), "X")
+        checks.append(make_check("h4_zones_found", True, h4.error is None and h4.total_supply + h4.total_demand > 0))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,118 @@
+"""
+Test 33: Does the concurrent chunked minute fetch match the sequential one?
+Source: 01_application/data/polygon_client.py - fetch_minute_bars_chunked
+
+The bar store read is replaced by FakeUpstream so chunk scheduling, per-chunk
+retries and the buffer merge are tested without Polygon.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+# Appended, not prepended: 00_shared/data/polygon must not shadow the polygon package
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent / "00_shared" / "data"))
+
+import threading
+import time
+from datetime import date, datetime, timezone
+
+import pandas as pd
+from conftest import make_check
+
+from bar_store import AGG_COLUMNS, FakeUpstream, UpstreamError
+from data.polygon_client import PolygonClient
+
+
+class FakeReadClient(PolygonClient):
+    """PolygonClient whose bar store reads come from FakeUpstream."""
+
+    RETRY_DELAY = 0.0
+
+    def __init__(self, fail_once=(), delay: float = 0.0):
+        super().__init__(api_key="test")
+        self.upstream = FakeUpstream()
+        self.fail_once = set(fail_once)
+        self.delay = delay
+        self.attempts = []
+        self._attempts_lock = threading.Lock()
+
+    def _read_raw(self, ticker, multiplier, timespan, start_date, end_date=None, end_timestamp=None):
+        with self._attempts_lock:
+            self.attempts.append(start_date)
+            fail = start_date in self.fail_once
+            self.fail_once.discard(start_date)
+        time.sleep(self.delay)
+        if fail:
+            raise UpstreamError("transient")
+        raw = pd.DataFrame(self.upstream(ticker, multiplier, timespan, start_date, end_date))
+        if end_timestamp is not None:
+            raw = raw[raw["t"] < int(end_timestamp.timestamp() * 1000)]
+        return raw[AGG_COLUMNS].reset_index(drop=True) if len(raw) else pd.DataFrame(columns=AGG_COLUMNS)
+
+
+def sequential(client: PolygonClient, *args, **kwargs) -> pd.DataFrame:
+    """The pre-concurrency result: concat, dedupe, sort, cutoff."""
+    frames = list(client.iter_minute_bars_chunked(*args, **kwargs))
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(
+        subset=["timestamp"]
+    ).sort_values("timestamp").reset_index(drop=True)
+    end_timestamp = kwargs.get("end_timestamp")
+    if end_timestamp is not None:
+        df = df[df["timestamp"] < end_timestamp].reset_index(drop=True)
+    return df
+
+
+class TestChunkedMinuteFetch:
+    TEST_ID = "test_33_chunked_minute_fetch"
+    QUESTION = "Does the concurrent chunked minute fetch match the sequential one?"
+
+    def test_matches_sequential_merge(self, result_writer):
+        """Same rows, order and dtypes as concat + drop_duplicates + sort."""
+        client = FakeReadClient()
+        actual = client.fetch_minute_bars_chunked("SPY", date(2025, 1, 2), date(2025, 2, 28), chunk_days=5)
+        expected = sequential(client, "SPY", date(2025, 1, 2), date(2025, 2, 28), chunk_days=5)
+        pd.testing.assert_frame_equal(actual, expected)
+        assert actual["timestamp"].is_monotonic_increasing and actual["timestamp"].is_unique
+
+    def test_end_timestamp_cutoff(self, result_writer):
+        """Nothing at or after end_timestamp survives."""
+        cutoff = datetime(2025, 1, 15, 14, 30, tzinfo=timezone.utc)
+        df = FakeReadClient().fetch_minute_bars_chunked("SPY", date(2025, 1, 2), end_timestamp=cutoff)
+        assert df["timestamp"].max() < cutoff
+        assert df["timestamp"].max() >= cutoff - pd.Timedelta(minutes=1)
+
+    def test_failed_chunk_retried_alone(self, result_writer):
+        """A transient failure re-requests only that chunk."""
+        client = FakeReadClient(fail_once={date(2025, 1, 8)})
+        df = client.fetch_minute_bars_chunked("SPY", date(2025, 1, 2), date(2025, 1, 31), chunk_days=5)
+        assert client.attempts.count(date(2025, 1, 8)) == 2
+        assert all(client.attempts.count(d) == 1 for d in set(client.attempts) - {date(2025, 1, 8)})
+        pd.testing.assert_frame_equal(df, FakeReadClient().fetch_minute_bars_chunked(
+            "SPY", date(2025, 1, 2), date(2025, 1, 31), chunk_days=5
+        ))
+
+    def test_chunks_fetched_concurrently(self, result_writer):
+        """Eight slow chunks take far less than eight sequential delays."""
+        client = FakeReadClient(delay=0.2)
+        started = time.perf_counter()
+        client.fetch_minute_bars_chunked("SPY", date(2025, 1, 1), date(2025, 2, 17), chunk_days=5)
+        assert len(client.attempts) == 8
+        assert time.perf_counter() - started < 8 * 0.2 * 0.75
+
+    def test_empty_range(self, result_writer):
+        """No bars at all returns an empty DataFrame."""
+        assert FakeReadClient().fetch_minute_bars_chunked("SPY", date(2025, 1, 4), date(2025, 1, 5)).empty
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        client = FakeReadClient(fail_once={date(2025, 3, 7)})
+        actual = client.fetch_minute_bars_chunked("NVDA", date(2025, 3, 1), date(2025, 4, 30), chunk_days=5)
+        expected = sequential(FakeReadClient(), "NVDA", date(2025, 3, 1), date(2025, 4, 30), chunk_days=5)
+
+        checks.append(make_check("rows_match_sequential", len(expected), len(actual)))
+        checks.append(make_check("values_match_sequential", True, bool(actual.equals(expected))))
+        checks.append(make_check("retried_chunk_attempts", 2, client.attempts.count(date(2025, 3, 7))))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,152 @@
+"""
+Test 34: Does the shared rate limiter hold every client to one budget?
+Source: 00_shared/data/rate_limiter.py - RateLimiter
+
+Rates are kept high (tens to hundreds of tokens per second) so the suite
+stays fast; timing assertions leave generous slack.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import importlib.util
+import multiprocessing
+import threading
+import time
+
+import pytest
+from conftest import make_check
+
+# Loaded by path: other suites put an unrelated top-level `rate_limiter` on sys.path
+_RATE_LIMITER = Path(__file__).resolve().parent.parent.parent.parent / "00_shared" / "data" / "rate_limiter.py"
+_spec = importlib.util.spec_from_file_location("shared_data_rate_limiter", _RATE_LIMITER)
+rate_limiter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rate_limiter)
+RateLimiter = rate_limiter.RateLimiter
+
+
+def drain(limiter: RateLimiter, n: int, endpoint: str = "aggs") -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        limiter.acquire(endpoint)
+    return time.perf_counter() - started
+
+
+def _child_acquire(state_path: str, n: int, barrier, queue):
+    limiter = RateLimiter(rate=50, burst=1, state_path=state_path)
+    barrier.wait()
+    queue.put(drain(limiter, n))
+
+
+class TestRateLimiter:
+    TEST_ID = "test_34_rate_limiter"
+    QUESTION = "Does the shared rate limiter hold every client to one budget?"
+
+    def test_burst_then_rate(self, result_writer):
+        """The first `burst` requests pass at once, the rest at `rate`."""
+        limiter = RateLimiter(rate=100, burst=5)
+        assert drain(limiter, 5) < 0.02
+        assert drain(limiter, 20) == pytest.approx(0.20, abs=0.06)
+
+    def test_threads_share_budget(self, result_writer):
+        """Four threads together get the rate of one bucket, not four."""
+        limiter = RateLimiter(rate=100, burst=1)
+        threads = [threading.Thread(target=drain, args=(limiter, 10)) for _ in range(4)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.perf_counter() - started >= 0.35
+        assert limiter.metrics()["requests"] == 40
+
+    def test_fifo_reservations(self, result_writer):
+        """A request queued behind a heavy one is never served before it."""
+        limiter = RateLimiter(rate=50, burst=1)
+        limiter.acquire()
+        order = []
+
+        def heavy():
+            limiter.acquire("options_snapshot", weight=5)
+            order.append("heavy")
+
+        first = threading.Thread(target=heavy)
+        first.start()
+        time.sleep(0.02)
+        limiter.acquire("aggs")
+        order.append("light")
+        first.join()
+        assert order == ["heavy", "light"]
+
+    def test_endpoint_weights(self, result_writer):
+        """Weighted endpoints consume proportionally more of the budget."""
+        limiter = RateLimiter(rate=100, burst=1, weights={"options_snapshot": 4.0})
+        limiter.acquire()
+        assert drain(limiter, 5, "options_snapshot") == pytest.approx(0.20, abs=0.06)
+        assert limiter.metrics()["endpoints"]["options_snapshot"]["tokens"] == 20.0
+
+    def test_metrics(self, result_writer):
+        """Wait metrics count only requests that actually waited."""
+        limiter = RateLimiter(rate=100, burst=2)
+        drain(limiter, 6)
+        m = limiter.metrics()
+        assert m["requests"] == 6 and m["waited_requests"] == 4
+        assert m["max_wait_seconds"] > 0 and m["mean_wait_seconds"] == m["wait_seconds"] / 6
+        limiter.reset_metrics()
+        assert limiter.metrics()["requests"] == 0
+
+    def test_disabled(self, result_writer):
+        """rate <= 0 never blocks."""
+        assert drain(RateLimiter(rate=0), 1000) < 0.5
+
+    def test_cross_process_budget(self, tmp_path, result_writer):
+        """Two processes on one state file share a single bucket."""
+        state_path = str(tmp_path / "rate.bin")
+        ctx = multiprocessing.get_context("spawn")
+        queue, barrier = ctx.Queue(), ctx.Barrier(2)
+        procs = [ctx.Process(target=_child_acquire, args=(state_path, 10, barrier, queue)) for _ in range(2)]
+        for p in procs:
+            p.start()
+        elapsed = [queue.get(timeout=30) for _ in procs]
+        for p in procs:
+            p.join()
+        # 20 tokens at 50/s with a burst of 1 -> the slower process needs ~0.38s
+        assert max(elapsed) >= 0.3
+
+    def test_share_across_processes(self, tmp_path, monkeypatch, result_writer):
+        """Sharing keeps rate, burst and weights, exports the state file and is idempotent."""
+        monkeypatch.delenv(rate_limiter.RATE_FILE_ENV, raising=False)
+        monkeypatch.setattr(rate_limiter, "_limiter", RateLimiter(rate=7, burst=3, weights={"aggs": 2.0}))
+        state_path = tmp_path / "rate.bin"
+        shared = rate_limiter.share_across_processes(state_path)
+        assert shared.cross_process and shared.state_path == state_path
+        assert (shared.rate, shared.burst, shared.weights["aggs"]) == (7, 3, 2.0)
+        assert rate_limiter.get_rate_limiter() is shared
+        assert rate_limiter.os.environ[rate_limiter.RATE_FILE_ENV] == str(state_path)
+        assert rate_limiter.share_across_processes(tmp_path / "other.bin") is shared
+
+    def test_deprecated_delay_spacing(self, result_writer):
+        """rate_limit_delay warns and still spaces one client's requests."""
+        assert rate_limiter.spacing_limiter(None) is None
+        with pytest.warns(DeprecationWarning):
+            assert rate_limiter.spacing_limiter(0) is None
+        with pytest.warns(DeprecationWarning):
+            spacing = rate_limiter.spacing_limiter(0.05)
+        # First request immediate, the next four 50ms apart
+        assert 0.18 <= drain(spacing, 5) <= 0.4
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        limiter = RateLimiter(rate=200, burst=10, weights={"options_snapshot": 2.0})
+        burst_elapsed = drain(limiter, 10)
+        paced_elapsed = drain(limiter, 20, "options_snapshot")
+        m = limiter.metrics()
+
+        checks.append(make_check("burst_immediate", True, burst_elapsed < 0.02))
+        checks.append(make_check("weighted_paced", True, 0.15 <= paced_elapsed <= 0.30))
+        checks.append(make_check("requests_counted", 30, m["requests"]))
+        checks.append(make_check("tokens_counted", 50.0, m["tokens"]))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,120 @@
+"""
+Test 35: Do chain snapshots give the same options levels with a fraction of the requests?
+Source: 01_application/data/polygon_client.py - get_options_levels, fetch_options_chain
+
+Replays fixtures/options_chain_aapl.json (recorded /v3/snapshot/options pages
+for four expirations, two pages each) instead of calling Polygon.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import json
+from datetime import date
+
+import pandas as pd
+from conftest import make_check
+
+from data.cache_manager import CacheManager
+from data.polygon_client import PolygonClient, options_chain_table, top_strikes_by_open_interest
+
+FIXTURE = json.loads((Path(__file__).resolve().parent / "fixtures" / "options_chain_aapl.json").read_text())
+REFERENCE_DATE = date.fromisoformat(FIXTURE["reference_date"])
+PRICE = FIXTURE["underlying_price"]
+
+
+class ReplayClient(PolygonClient):
+    """PolygonClient serving chain pages from the recorded fixture."""
+
+    RETRY_DELAY = 0.0
+
+    def __init__(self, cache_dir: Path, fail_first: int = 0):
+        super().__init__(api_key="test")
+        self.options_cache = CacheManager(cache_dir, compaction_interval=None)
+        self.requests = []
+        self.fail_first = fail_first
+
+    def _rate_limit(self, endpoint: str = "default"):
+        pass
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        key = f"{url}?expiration_date={params['expiration_date']}" if params else url
+        self.requests.append(key)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise ConnectionError("recorded outage")
+        return FIXTURE["pages"][key]
+
+
+def per_contract_levels(num_levels: int = 10, price_range_pct: float = 0.15) -> list:
+    """The previous algorithm: dict of strike -> summed OI, sorted by OI."""
+    totals = {}
+    for page in FIXTURE["pages"].values():
+        for contract in sorted(page["results"], key=lambda c: c["details"]["strike_price"]):
+            strike = float(contract["details"]["strike_price"])
+            oi = contract.get("open_interest")
+            if oi and oi > 0 and PRICE * (1 - price_range_pct) <= strike <= PRICE * (1 + price_range_pct):
+                totals[strike] = totals.get(strike, 0) + int(oi)
+    ranked = sorted(sorted(totals.items()), key=lambda x: x[1], reverse=True)
+    return [strike for strike, _ in ranked[:num_levels]]
+
+
+class TestOptionsChain:
+    TEST_ID = "test_35_options_chain"
+    QUESTION = "Do chain snapshots give the same options levels with a fraction of the requests?"
+
+    def test_levels_match_per_contract(self, tmp_path, result_writer):
+        """Vectorized top-N over the chain table equals the per-contract sum."""
+        client = ReplayClient(tmp_path)
+        assert client.get_options_levels("AAPL", PRICE, REFERENCE_DATE) == per_contract_levels()
+        assert len(client.requests) == 8
+
+    def test_dict_format(self, tmp_path, result_writer):
+        """fetch_options_levels keeps the op_01..op_NN layout, padded with None."""
+        levels = ReplayClient(tmp_path).fetch_options_levels("AAPL", PRICE, REFERENCE_DATE, num_levels=40)
+        assert list(levels) == [f"op_{i:02d}" for i in range(1, 41)]
+        assert levels["op_40"] is None and levels["op_01"] == per_contract_levels()[0]
+
+    def test_chain_cached_per_day(self, tmp_path, result_writer):
+        """A second run the same day is served from the cache."""
+        ReplayClient(tmp_path).get_options_levels("AAPL", PRICE, REFERENCE_DATE)
+        client = ReplayClient(tmp_path)
+        assert client.get_options_levels("AAPL", PRICE, REFERENCE_DATE) == per_contract_levels()
+        assert client.get_options_levels("AAPL", PRICE * 1.02, REFERENCE_DATE)
+        assert client.requests == []
+
+    def test_pagination_followed(self, tmp_path, result_writer):
+        """Every contract on every page of an expiration lands in the table."""
+        chain = ReplayClient(tmp_path).fetch_options_chain("AAPL", "2025-06-13")
+        recorded = sum(len(p["results"]) for k, p in FIXTURE["pages"].items() if "20250613" in p["request_id"])
+        assert len(chain) == recorded
+        assert set(chain["contract_type"]) == {"call", "put"}
+
+    def test_failed_page_retried(self, tmp_path, result_writer):
+        """A transient failure retries that expiration, not the whole run."""
+        client = ReplayClient(tmp_path, fail_first=1)
+        assert client.get_options_levels("AAPL", PRICE, REFERENCE_DATE) == per_contract_levels()
+        assert len(client.requests) == 9
+
+    def test_top_strikes_edge_cases(self, result_writer):
+        """Empty ranges and ties behave predictably."""
+        chain = pd.DataFrame({"strike": [100.0, 105.0, 110.0, 105.0], "open_interest": [5, 3, 5, 0]})
+        assert top_strikes_by_open_interest(chain, 100, 110, 2) == [100.0, 110.0]
+        assert top_strikes_by_open_interest(chain, 200, 300, 10) == []
+        assert top_strikes_by_open_interest(options_chain_table([]), 0, 1e9, 10) == []
+
+    def test_full_suite(self, tmp_path, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        client = ReplayClient(tmp_path)
+        levels = client.get_options_levels("AAPL", PRICE, REFERENCE_DATE)
+        cached = ReplayClient(tmp_path)
+        cached.get_options_levels("AAPL", PRICE, REFERENCE_DATE)
+
+        checks.append(make_check("levels_match_per_contract", per_contract_levels(), levels))
+        checks.append(make_check("chain_requests", 8, len(client.requests)))
+        checks.append(make_check("cached_requests", 0, len(cached.requests)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,238 @@
+"""
+Test 36: Does the parallel backtest scheduler reproduce the sequential run?
+Source: 03_backtest/engine/backtest_scheduler.py - BacktestScheduler, run_job_chunk
+
+S15 bars come from a seeded random walk around each ticker's zones, so
+every ticker-date produces entries without Polygon.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "benchmarks"))
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+from conftest import make_check
+
+from cases import BACKTEST_ROOT, import_isolated
+
+scheduler_module = import_isolated(BACKTEST_ROOT, "engine.backtest_scheduler")
+BacktestScheduler = scheduler_module.BacktestScheduler
+TickerDateJob = scheduler_module.TickerDateJob
+detect_entries = scheduler_module.detect_entries
+flatten_entries = scheduler_module.flatten_entries
+
+DATES = ["2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08", "2026-01-09"]
+TICKERS = ["AMD", "NVDA", "SPY", "TSLA"]
+
+
+@dataclass
+class Bar:
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def zones_for(ticker: str, trade_date: str):
+    base = 50.0 + 25.0 * TICKERS.index(ticker) if ticker in TICKERS else 100.0
+    primary = {"zone_high": base + 0.5, "zone_low": base - 0.5, "hvn_poc": base, "target": base + 3}
+    secondary = {"zone_high": base - 1.5, "zone_low": base - 2.5, "hvn_poc": base - 2, "target": base - 5}
+    return primary, secondary
+
+
+def make_bars(ticker: str, trade_date: str, n: int = 400):
+    rng = random.Random(f"{ticker}-{trade_date}")
+    price = zones_for(ticker, trade_date)[0]["hvn_poc"] + rng.uniform(-3, 3)
+    start = datetime.strptime(trade_date, "%Y-%m-%d").replace(hour=9, minute=30)
+    bars = []
+    for i in range(n):
+        open_ = price
+        price += rng.gauss(0, 0.4)
+        bars.append(Bar(start + timedelta(seconds=15 * i), open_,
+                        max(open_, price) + rng.uniform(0, 0.3),
+                        min(open_, price) - rng.uniform(0, 0.3), price))
+    return bars
+
+
+class FakeFetcher:
+    """Serves make_bars; `fail` lists (ticker, date) pairs that raise."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def fetch_bars_extended(self, ticker, trade_date):
+        with self._lock:
+            self.calls.append((trade_date, ticker))
+            self.threads.add(threading.get_ident())
+        if (ticker, trade_date) in self.fail:
+            raise ConnectionError("recorded outage")
+        return make_bars(ticker, trade_date)
+
+
+class FakeZone:
+    def __init__(self, ticker, zone):
+        self.ticker = ticker
+        self.zone = zone
+
+
+class FakeZoneLoader:
+    """SupabaseZoneLoader stand-in; tickers listed out of order on purpose."""
+
+    def __init__(self, trade_date, verbose=True):
+        self.trade_date = trade_date
+
+    def load_all_zones(self):
+        tickers = list(reversed(TICKERS))
+        return ([FakeZone(t, zones_for(t, self.trade_date)[0]) for t in tickers],
+                [FakeZone(t, zones_for(t, self.trade_date)[1]) for t in tickers[1:]])
+
+    def get_zone_dict(self, zone):
+        return zone.zone
+
+    def close(self):
+        pass
+
+
+def make_jobs():
+    jobs = []
+    for trade_date in DATES:
+        for ticker in TICKERS:
+            primary, secondary = zones_for(ticker, trade_date)
+            jobs.append(TickerDateJob(len(jobs), trade_date, ticker, primary, secondary))
+    return jobs
+
+
+def sequential_entries():
+    """The per-date loop of run_backtest_for_date over every date."""
+    entries = []
+    for job in make_jobs():
+        entries.extend(detect_entries(job.ticker, job.trade_date, make_bars(job.ticker, job.trade_date),
+                                      job.primary_zone, job.secondary_zone))
+    return entries
+
+
+def scheduler(max_workers=4, fetcher=None, executor="thread", **kwargs):
+    fetcher = fetcher or FakeFetcher()
+    return BacktestScheduler(max_workers=max_workers, executor=executor,
+                             fetcher_factory=partial(lambda f: f, fetcher), **kwargs), fetcher
+
+
+class TestBacktestScheduler:
+    TEST_ID = "test_36_backtest_scheduler"
+    QUESTION = "Does the parallel backtest scheduler reproduce the sequential run?"
+
+    def test_matches_sequential(self, result_writer):
+        """Entries and trade IDs equal the sequential run for any worker count."""
+        expected = sequential_entries()
+        assert expected
+        for workers in (1, 3, 8):
+            actual = flatten_entries(scheduler(workers)[0].run_jobs(make_jobs()))
+            assert actual == expected
+            assert [e.trade_id for e in actual] == [e.trade_id for e in expected]
+
+    def test_every_job_fetched_once(self, result_writer):
+        """Each ticker-date is fetched exactly once, across several threads."""
+        sched, fetcher = scheduler(4)
+        sched.run_jobs(make_jobs())
+        assert sorted(fetcher.calls) == sorted((j.trade_date, j.ticker) for j in make_jobs())
+        assert len(fetcher.threads) > 1
+
+    def test_prefetch_order_within_chunk(self, result_writer):
+        """A single worker fetches jobs in job order, one ahead of simulation."""
+        sched, fetcher = scheduler(1)
+        sched.run_jobs(make_jobs())
+        assert fetcher.calls == [(j.trade_date, j.ticker) for j in make_jobs()]
+
+    def test_failed_fetch_isolated(self, result_writer):
+        """A failed fetch marks only that job; the rest match the sequential run."""
+        sched, _ = scheduler(3, FakeFetcher(fail={("NVDA", "2026-01-07")}))
+        results = sched.run_jobs(make_jobs())
+        failed = [r for r in results if r.error]
+        assert [(r.ticker, r.trade_date) for r in failed] == [("NVDA", "2026-01-07")]
+        expected = [e for e in sequential_entries() if not (e.ticker == "NVDA" and e.date == "2026-01-07")]
+        assert flatten_entries(results) == expected
+
+    def test_failed_detection_isolated(self, result_writer, monkeypatch):
+        """An entry detection error fails only its job; the chunk's other jobs still run."""
+        real = scheduler_module.detect_entries
+
+        def detect(ticker, trade_date, *args):
+            if (ticker, trade_date) == ("SPY", "2026-01-06"):
+                raise ValueError("bad bar")
+            return real(ticker, trade_date, *args)
+
+        monkeypatch.setattr(scheduler_module, "detect_entries", detect)
+        sched, _ = scheduler(2, chunks_per_worker=1)
+        results = sched.run_jobs(make_jobs())
+        failed = [r for r in results if r.error]
+        assert [(r.ticker, r.trade_date, r.error) for r in failed] == \
+            [("SPY", "2026-01-06", "Entry detection failed: bad bar")]
+        expected = [e for e in sequential_entries() if not (e.ticker == "SPY" and e.date == "2026-01-06")]
+        assert flatten_entries(results) == expected
+
+    def test_process_pool_shares_rate_limiter(self, result_writer, monkeypatch):
+        """The process pool starts only after the rate limiter went cross-process."""
+        events = []
+
+        class RecordingPool(ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                events.append("pool")
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(scheduler_module, "ProcessPoolExecutor", RecordingPool)
+        monkeypatch.setattr(BacktestScheduler, "_share_rate_limiter", staticmethod(lambda: events.append("shared")))
+        sched, _ = scheduler(2, executor="process")
+        assert flatten_entries(sched.run_jobs(make_jobs())) == sequential_entries()
+        assert events == ["shared", "pool"]
+
+        scheduler(2)[0].run_jobs(make_jobs())
+        assert events == ["shared", "pool"]
+
+    def test_build_jobs(self, result_writer):
+        """Jobs cover weekdays only, tickers sorted, ticker filter applied."""
+        sched, _ = scheduler()
+        jobs = sched.build_jobs("2026-01-09", "2026-01-12", zone_loader_cls=FakeZoneLoader)
+        assert [(j.trade_date, j.ticker) for j in jobs] == \
+            [(d, t) for d in ("2026-01-09", "2026-01-12") for t in TICKERS]
+        assert [j.index for j in jobs] == list(range(len(jobs)))
+        assert jobs[0].secondary_zone is not None and jobs[3].secondary_zone is None
+
+        filtered = sched.build_jobs("2026-01-09", tickers=["spy", "tsla"], zone_loader_cls=FakeZoneLoader)
+        assert [j.ticker for j in filtered] == ["SPY", "TSLA"]
+
+    def test_chunks_contiguous(self, result_writer):
+        """Chunks are contiguous runs of jobs that together cover every job once."""
+        sched, _ = scheduler(3, chunks_per_worker=2)
+        chunks = sched.chunk_jobs(make_jobs())
+        assert len(chunks) <= 6
+        assert [j.index for chunk in chunks for j in chunk] == list(range(len(make_jobs())))
+
+    def test_invalid_executor(self, result_writer):
+        with pytest.raises(ValueError):
+            BacktestScheduler(executor="cluster")
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        expected = sequential_entries()
+        sched, fetcher = scheduler(4)
+        actual = flatten_entries(sched.run_jobs(make_jobs()))
+
+        checks.append(make_check("entry_count", len(expected), len(actual)))
+        checks.append(make_check("trade_ids_match", [e.trade_id for e in expected], [e.trade_id for e in actual]))
+        checks.append(make_check("entries_match", True, actual == expected))
+        checks.append(make_check("fetches", len(make_jobs()), len(fetcher.calls)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
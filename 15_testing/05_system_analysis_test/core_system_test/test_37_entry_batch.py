@@ -0,0 +1,127 @@
+"""
+Test 37: Does batch entry detection emit exactly the streaming detector's signals?
+Source: 03_backtest/engine/entry_models.py - detect_session_signals, EntryDetector
+
+Cross-check harness: every session is run through a fresh EntryDetector bar
+by bar (check_all_entries, then update_prior_bar, as TradeSimulator does) and
+through detect_session_signals, and the two signal lists must be identical.
+Extended-hours S15 sessions are longer than the detector's bounded history,
+so the trimmed price-origin lookback is exercised too.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "benchmarks"))
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from conftest import make_check
+
+from cases import BACKTEST_ROOT, import_isolated
+from generators import make_bars, make_zones
+
+entry_models = import_isolated(BACKTEST_ROOT, "engine.entry_models")
+EntryDetector = entry_models.EntryDetector
+detect_session_signals = entry_models.detect_session_signals
+MAX_LOOKBACK_BARS = entry_models.MAX_LOOKBACK_BARS
+
+
+def streaming(times, opens, highs, lows, closes, primary, secondary):
+    detector = EntryDetector()
+    signals = []
+    for i, (t, o, h, l, c) in enumerate(zip(times, opens, highs, lows, closes)):
+        signals.extend(detector.check_all_entries(i, t, o, h, l, c, primary, secondary))
+        detector.update_prior_bar(o, h, l, c)
+    return signals
+
+
+def generated_sessions(days: int = 3, seed: int = 7, zones_per_day: int = 4):
+    """Extended-hours S15 sessions with zones the price trades through."""
+    s15 = make_bars("S15", days, seed=seed, extended=True)
+    zones = make_zones(s15, zones_per_day, seed=seed)
+    for d, day in s15.groupby("bar_date", sort=True):
+        primaries = [z for z in zones[d] if z["zone_type"] == "PRIMARY"]
+        secondaries = [z for z in zones[d] if z["zone_type"] == "SECONDARY"]
+        yield (list(day["timestamp"].dt.to_pydatetime()), day["open"].tolist(), day["high"].tolist(),
+               day["low"].tolist(), day["close"].tolist(), primaries[0], secondaries[0])
+
+
+def dwell_session(dwell: int):
+    """
+    One close below the zone, `dwell` bars inside it, then an inside-open
+    bar closing above: EPCH1 LONG fires only if the old close is still in
+    the streaming history.
+    """
+    start = datetime(2026, 1, 5, 9, 30)
+    zone = {"zone_high": 101.0, "zone_low": 99.0}
+    bars = [(98.5, 98.8, 98.2, 98.5)] + [(100.0, 100.5, 99.5, 100.0)] * dwell + [(100.0, 101.6, 99.8, 101.5)]
+    times = [start + timedelta(seconds=15 * i) for i in range(len(bars))]
+    opens, highs, lows, closes = (list(col) for col in zip(*bars))
+    return times, opens, highs, lows, closes, zone, None
+
+
+class TestEntryBatch:
+    TEST_ID = "test_37_entry_batch"
+    QUESTION = "Does batch entry detection emit exactly the streaming detector's signals?"
+
+    def test_generated_sessions_match(self, result_writer):
+        """Identical signals, in identical order, on generated extended-hours sessions."""
+        total = 0
+        for session in generated_sessions():
+            assert len(session[0]) > MAX_LOOKBACK_BARS + 11
+            expected = streaming(*session)
+            assert detect_session_signals(*session) == expected
+            total += len(expected)
+        assert total > 0
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_numpy_inputs_match(self, seed, result_writer):
+        """Float64 arrays give the same signals as lists of floats."""
+        for times, o, h, l, c, primary, secondary in generated_sessions(days=1, seed=seed):
+            arrays = [np.asarray(x, dtype=np.float64) for x in (o, h, l, c)]
+            assert detect_session_signals(times, *arrays, primary, secondary) == \
+                streaming(times, o, h, l, c, primary, secondary)
+
+    @pytest.mark.parametrize("dwell", [MAX_LOOKBACK_BARS - 2, MAX_LOOKBACK_BARS, MAX_LOOKBACK_BARS + 5,
+                                       MAX_LOOKBACK_BARS + 11, MAX_LOOKBACK_BARS + 30])
+    def test_bounded_lookback(self, dwell, result_writer):
+        """The price origin is forgotten exactly when the streaming history drops it."""
+        session = dwell_session(dwell)
+        assert detect_session_signals(*session) == streaming(*session)
+
+    def test_lookback_boundary_both_ways(self, result_writer):
+        """The dwell cases cover both a remembered and a forgotten origin."""
+        fired = {dwell: bool(detect_session_signals(*dwell_session(dwell)))
+                 for dwell in (MAX_LOOKBACK_BARS - 2, MAX_LOOKBACK_BARS + 30)}
+        assert fired == {MAX_LOOKBACK_BARS - 2: True, MAX_LOOKBACK_BARS + 30: False}
+
+    def test_single_zone_and_empty(self, result_writer):
+        """Missing zones and empty sessions behave like the streaming detector."""
+        times, o, h, l, c, primary, secondary = next(generated_sessions(days=1))
+        assert detect_session_signals(times, o, h, l, c, None, secondary) == \
+            streaming(times, o, h, l, c, None, secondary)
+        assert detect_session_signals(times, o, h, l, c, None, None) == []
+        assert detect_session_signals([], [], [], [], [], primary, secondary) == []
+
+    def test_entry_window(self, result_writer):
+        """No signal falls outside the 09:30-15:30 entry window."""
+        for session in generated_sessions(days=2):
+            for signal in detect_session_signals(*session):
+                assert "09:30:00" <= signal.entry_time.strftime("%H:%M:%S") <= "15:30:00"
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        sessions = list(generated_sessions(days=4, seed=11))
+        expected = [streaming(*s) for s in sessions]
+        actual = [detect_session_signals(*s) for s in sessions]
+
+        checks.append(make_check("signal_count", sum(map(len, expected)), sum(map(len, actual))))
+        checks.append(make_check("signals_identical", True, actual == expected))
+        checks.append(make_check("models_seen", ["EPCH1", "EPCH2", "EPCH3", "EPCH4"],
+                                 sorted({s.model_name for day in actual for s in day})))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
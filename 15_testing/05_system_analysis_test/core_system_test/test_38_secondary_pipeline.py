@@ -0,0 +1,361 @@
+"""
+Test 38: Does the in-process secondary pipeline respect the DAG and process only new trades?
+Source: 03_backtest/processor/secondary_analysis/pipeline.py - SecondaryPipeline, M1BarFrame
+
+Processors are replaced by recording fakes with the real entry-point
+signatures (limit, dry_run, conn, trade_ids); connections come from a fake
+pool and watermarks from an in-memory store, so no database is needed.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "benchmarks"))
+
+import inspect
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+import pytest
+from conftest import make_check
+
+from cases import BACKTEST_ROOT, import_isolated
+
+pipeline = import_isolated(BACKTEST_ROOT, "processor.secondary_analysis.pipeline")
+SecondaryPipeline = pipeline.SecondaryPipeline
+M1BarFrame = pipeline.M1BarFrame
+NODES = pipeline.NODES
+
+TRADE_DATE = date(2026, 1, 6)
+BAR_COLUMNS = ('ticker', 'bar_date', 'bar_time', 'bar_timestamp',
+               'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions')
+
+
+def trade_ids(n: int, start: int = 0):
+    return {f"T{i:03d}" for i in range(start, start + n)}
+
+
+def bar_rows(ticker: str, n: int = 30):
+    start = datetime(2026, 1, 6, 9, 30)
+    rows = []
+    for i in range(n):
+        ts = start + timedelta(minutes=i)
+        rows.append((ticker, TRADE_DATE, ts.time(), ts, 100.0 + i, 100.5 + i, 99.5 + i, 100.2 + i, 1000 + i, None, 10))
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.queries.append((query, params))
+
+    def fetchall(self):
+        return [row[1:10] for row in bar_rows(self.conn.queries[-1][1][0])]
+
+
+class FakeConn:
+    def __init__(self):
+        self.queries = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        pass
+
+
+class FakePool:
+    """getconn/putconn pool that tracks connections in use."""
+
+    def __init__(self):
+        self.in_use = 0
+        self.max_in_use = 0
+        self.handed_out = 0
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        with self._lock:
+            self.in_use += 1
+            self.handed_out += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+        return FakeConn()
+
+    def putconn(self, conn):
+        with self._lock:
+            self.in_use -= 1
+
+
+class MemoryWatermarks:
+    def __init__(self):
+        self.data = {}
+
+    def ensure(self, conn):
+        pass
+
+    def settled(self, conn, node):
+        return set(self.data.get(node, ()))
+
+    def record(self, conn, node, ids):
+        if ids:
+            self.data.setdefault(node, set()).update(ids)
+
+
+class Recorder:
+    """Shared log of fake processor calls."""
+
+    def __init__(self, delay=0.05, fail=(), errors=(), unwritten=None):
+        self.delay = delay
+        self.fail = set(fail)
+        self.errors = set(errors)
+        self.unwritten = unwritten or {}     # node -> trade IDs it skips without writing
+        self.calls = []
+        self.spans = {}
+        self.frame_reads = []
+        self._lock = threading.Lock()
+
+
+def make_loader(recorder: Recorder):
+    """Loader returning a fake processor class per node."""
+
+    def loader(node):
+        class FakeProcessor:
+            def __init__(self, verbose=False, bar_frame=None):
+                assert (bar_frame is not None) == node.uses_bar_frame
+                self.bar_frame = bar_frame
+
+            def entry(self, limit=None, dry_run=False, conn=None, trade_ids=None):
+                started = time.perf_counter()
+                assert conn is not None
+                if node.name == "m1_bars" and not dry_run:
+                    for ticker in ("SPY", "NVDA"):
+                        self.bar_frame.put(ticker, TRADE_DATE, BAR_COLUMNS, bar_rows(ticker))
+                elif self.bar_frame is not None:
+                    with recorder._lock:
+                        recorder.frame_reads.append(len(self.bar_frame.get("SPY", TRADE_DATE)))
+                time.sleep(recorder.delay)
+                with recorder._lock:
+                    recorder.calls.append((node.name, tuple(trade_ids)))
+                    recorder.spans[node.name] = (started, time.perf_counter())
+                if node.name in recorder.fail:
+                    raise RuntimeError("recorded failure")
+                return {'errors': ["T000: bad"] if node.name in recorder.errors else []}
+
+        setattr(FakeProcessor, node.method, FakeProcessor.entry)
+        return FakeProcessor
+
+    return loader
+
+
+def make_pipeline(ids, recorder=None, watermarks=None, pool=None, **kwargs):
+    recorder = recorder or Recorder()
+    pipe = SecondaryPipeline(max_workers=4, pool=pool or FakePool(), watermarks=watermarks or MemoryWatermarks(),
+                             loader=make_loader(recorder), trade_id_loader=lambda conn: set(ids),
+                             written_loader=lambda conn, node, pending: set(pending) - recorder.unwritten.get(
+                                 node.name, set()),
+                             **kwargs)
+    return pipe, recorder
+
+
+class TestSecondaryPipeline:
+    TEST_ID = "test_38_secondary_pipeline"
+    QUESTION = "Does the in-process secondary pipeline respect the DAG and process only new trades?"
+
+    def test_layers(self, result_writer):
+        """Declared inputs/outputs give the processor order run_backtest used."""
+        assert pipeline.topological_layers(NODES) == [
+            ["m1_bars"], ["m1_indicators"], ["m1_atr_stop", "m5_atr_stop"],
+            ["trades_consolidated", "m1_trade_indicator", "m1_ramp_up", "m1_post_trade"],
+        ]
+
+    def test_cycle_rejected(self, result_writer):
+        a = pipeline.ProcessorNode("a", "x", "m", "C", "run", inputs=("t2",), outputs=("t1",))
+        b = pipeline.ProcessorNode("b", "x", "m", "C", "run", inputs=("t1",), outputs=("t2",))
+        with pytest.raises(ValueError):
+            pipeline.topological_layers([a, b])
+
+    def test_dependency_order_and_overlap(self, result_writer):
+        """Every node starts after its upstream nodes end; the ATR stops overlap."""
+        pipe, rec = make_pipeline(trade_ids(5))
+        results = pipe.run()
+        assert all(r.status == "ok" for r in results.values())
+        deps = pipeline.dependencies(NODES)
+        for name, upstream in deps.items():
+            for u in upstream:
+                assert rec.spans[u][1] <= rec.spans[name][0]
+        m1, m5 = rec.spans["m1_atr_stop"], rec.spans["m5_atr_stop"]
+        assert m1[0] < m5[1] and m5[0] < m1[1]
+
+    def test_rerun_processes_only_new_trades(self, result_writer):
+        """A rerun skips settled nodes; new trades are the only ones handed out."""
+        watermarks = MemoryWatermarks()
+        pipe, rec = make_pipeline(trade_ids(5), watermarks=watermarks)
+        pipe.run()
+        assert all(ids == set(trade_ids(5)) for ids in watermarks.data.values())
+
+        pipe, rec = make_pipeline(trade_ids(5), watermarks=watermarks)
+        results = pipe.run()
+        assert rec.calls == [] and {r.status for r in results.values()} == {"up_to_date"}
+
+        pipe, rec = make_pipeline(trade_ids(8), watermarks=watermarks)
+        pipe.run()
+        assert len(rec.calls) == len(NODES)
+        assert all(ids == tuple(sorted(trade_ids(3, start=5))) for _, ids in rec.calls)
+
+    def test_failure_skips_dependents(self, result_writer):
+        """A failed node skips its dependents only, and is retried next run."""
+        watermarks = MemoryWatermarks()
+        pipe, rec = make_pipeline(trade_ids(4), Recorder(fail={"m5_atr_stop"}), watermarks)
+        results = pipe.run()
+        assert results["m5_atr_stop"].status == "failed"
+        assert results["m1_atr_stop"].status == "ok"
+        for name in ("trades_consolidated", "m1_trade_indicator", "m1_ramp_up", "m1_post_trade"):
+            assert results[name].status == "skipped"
+        assert "m5_atr_stop" not in watermarks.data
+
+        pipe, rec = make_pipeline(trade_ids(4), watermarks=watermarks)
+        results = pipe.run()
+        assert results["m1_atr_stop"].status == "up_to_date"
+        assert sorted(name for name, _ in rec.calls) == sorted(
+            ["m5_atr_stop", "trades_consolidated", "m1_trade_indicator", "m1_ramp_up", "m1_post_trade"])
+
+    def test_errors_not_settled_downstream(self, result_writer):
+        """Trades a node reported errors for are not settled there or below it."""
+        watermarks = MemoryWatermarks()
+        pipe, _ = make_pipeline(trade_ids(3), Recorder(errors={"m1_indicators"}), watermarks)
+        results = pipe.run()
+        assert results["m1_indicators"].status == "errors"
+        assert results["m1_atr_stop"].status == "ok" and results["m1_atr_stop"].settled == 0
+        assert set(watermarks.data) == {"m1_bars"}
+
+    def test_skipped_trades_stay_pending(self, result_writer):
+        """Trades a node skipped without writing rows stay pending for it and its dependents."""
+        watermarks = MemoryWatermarks()
+        skipped = {"m1_bars": {"T001"}, "m1_atr_stop": {"T003"}}
+        pipe, _ = make_pipeline(trade_ids(4), Recorder(unwritten=skipped), watermarks)
+        results = pipe.run()
+        assert all(r.status == "ok" for r in results.values())
+        assert watermarks.data["m1_bars"] == trade_ids(4) - {"T001"}
+        assert watermarks.data["m1_atr_stop"] == trade_ids(4) - {"T001", "T003"}
+        assert watermarks.data["m5_atr_stop"] == trade_ids(4) - {"T001"}
+        assert results["m1_atr_stop"].settled == 2
+
+        pipe, rec = make_pipeline(trade_ids(4), watermarks=watermarks)
+        pipe.run()
+        calls = dict(rec.calls)
+        assert calls["m1_atr_stop"] == ("T001", "T003")
+        assert all(ids == ("T001",) for name, ids in calls.items() if name != "m1_atr_stop")
+        assert all(ids == trade_ids(4) for ids in watermarks.data.values())
+
+    def test_written_trade_ids_query(self, result_writer):
+        """Trade tables are matched on trade_id, bar tables on the trade's ticker and date."""
+        nodes = {node.name: node for node in NODES}
+
+        class RowsCursor(FakeCursor):
+            def fetchall(self):
+                return [(trade_id,) for trade_id in self.conn.queries[-1][1][0] if trade_id != "T001"]
+
+        conn = FakeConn()
+        conn.cursor = lambda: RowsCursor(conn)
+        assert pipeline.load_written_trade_ids(conn, nodes["m1_atr_stop"], ["T002", "T001"]) == {"T002"}
+        query, params = conn.queries[-1]
+        assert "FROM m1_atr_stop_2 WHERE trade_id = ANY(%s)" in query and params == (["T001", "T002"],)
+
+        assert pipeline.load_written_trade_ids(conn, nodes["m1_bars"], ["T000", "T001"]) == {"T000"}
+        query = " ".join(conn.queries[-1][0].split())
+        assert "FROM trades_2 t" in query and "o.ticker = t.ticker AND o.bar_date = t.date" in query
+        assert pipeline.load_written_trade_ids(conn, nodes["m1_bars"], []) == set()
+
+    def test_subset_and_no_advance(self, result_writer):
+        """Unselected upstream nodes are assumed done; dry runs and limits keep watermarks."""
+        watermarks = MemoryWatermarks()
+        pipe, rec = make_pipeline(trade_ids(3), watermarks=watermarks)
+        pipe.run(["m1_atr_stop"], dry_run=True)
+        pipe.run(["m1_atr_stop"], limit=1)
+        assert watermarks.data == {}
+        results = pipe.run(["m1_atr_stop"])
+        assert list(results) == ["m1_atr_stop"] and results["m1_atr_stop"].settled == 3
+        with pytest.raises(ValueError):
+            pipe.run(["m9_unknown"])
+
+    def test_bar_frame_shared(self, result_writer):
+        """Bars stored by m1_bars are served from memory; misses load once."""
+        pool = FakePool()
+        pipe, rec = make_pipeline(trade_ids(2), pool=pool)
+        pipe.run()
+        assert rec.frame_reads == [30] * 3
+        assert pipe.bar_frame.loads == 0 and len(pipe.bar_frame) == 0
+
+        frame, loads = M1BarFrame(pipe.connection), []
+        threads = [threading.Thread(target=lambda: loads.append(len(frame.get("AMD", TRADE_DATE))))
+                   for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loads == [30] * 6 and frame.loads == 1
+        assert pool.in_use == 0
+
+    def test_frame_matches_db_order(self, result_writer):
+        """put() rows and DB rows give the same frame, ordered by bar_timestamp."""
+        stored = M1BarFrame(None)
+        stored.put("SPY", TRADE_DATE, BAR_COLUMNS, list(reversed(bar_rows("SPY"))))
+        loaded = M1BarFrame(SecondaryPipeline(pool=FakePool()).connection).get("SPY", TRADE_DATE)
+        got = stored.get("SPY", TRADE_DATE)
+        assert list(got.columns) == list(M1BarFrame.COLUMNS)
+        assert got.equals(loaded)
+        assert list(got["bar_time"]) == sorted(got["bar_time"])
+        assert got["bar_time"].iloc[0] == dtime(9, 30)
+
+    def test_connections_returned(self, result_writer):
+        """Every borrowed connection is returned; concurrency stays within the pool."""
+        pool = FakePool()
+        pipe, _ = make_pipeline(trade_ids(4), pool=pool)
+        pipe.run()
+        assert pool.in_use == 0 and pool.handed_out >= len(NODES)
+        assert pool.max_in_use <= pipe.max_workers + 2
+
+    def test_processor_signatures(self, result_writer):
+        """The real processors accept conn, trade_ids and (where declared) bar_frame."""
+        pytest.importorskip("psycopg2")
+        pytest.importorskip("shared.data.bulk_writer")
+        for node in NODES:
+            cls = pipeline.load_processor(node)
+            params = inspect.signature(getattr(cls, node.method)).parameters
+            assert {"limit", "dry_run", "conn", "trade_ids"} <= set(params)
+            assert ("bar_frame" in inspect.signature(cls).parameters) == node.uses_bar_frame
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        watermarks = MemoryWatermarks()
+        pipe, first = make_pipeline(trade_ids(6), watermarks=watermarks)
+        first_results = pipe.run()
+        first_loads = pipe.bar_frame.loads
+        pipe, second = make_pipeline(trade_ids(6), watermarks=watermarks)
+        pipe.run()
+        pipe, third = make_pipeline(trade_ids(9), watermarks=watermarks)
+        pipe.run()
+        m1, m5 = first.spans["m1_atr_stop"], first.spans["m5_atr_stop"]
+
+        checks.append(make_check("nodes_ok", len(NODES), sum(r.status == "ok" for r in first_results.values())))
+        checks.append(make_check("atr_stops_concurrent", True, m1[0] < m5[1] and m5[0] < m1[1]))
+        checks.append(make_check("rerun_calls", 0, len(second.calls)))
+        checks.append(make_check("new_trades_only", sorted(trade_ids(3, start=6)),
+                                 sorted({i for _, ids in third.calls for i in ids})))
+        checks.append(make_check("bar_frame_reads", [30, 30, 30], first.frame_reads))
+        checks.append(make_check("bar_frame_db_loads", 0, first_loads))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,278 @@
+"""
+Test 39: Does the shared database pool reuse, bound and time its connections?
+Source: 00_shared/data/db_pool.py - DatabasePool, decode_columns
+
+Runs against fake psycopg2 connections: result sets are declared per SQL
+string with Postgres type OIDs in the cursor description.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import importlib.util
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+import psycopg2
+import pytest
+from conftest import make_check
+
+# Loaded by path: importing the shared.data package needs live credentials
+_DB_POOL = Path(__file__).resolve().parent.parent.parent.parent / "00_shared" / "data" / "db_pool.py"
+_spec = importlib.util.spec_from_file_location("shared_data_db_pool", _DB_POOL)
+db_pool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(db_pool)
+DatabasePool = db_pool.DatabasePool
+PoolTimeout = db_pool.PoolTimeout
+decode_columns = db_pool.decode_columns
+
+NUMERIC, INT4, INT8, BOOL, TEXT, DATE, TIMESTAMP = 1700, 23, 20, 16, 25, 1082, 1114
+
+BARS_SQL = "SELECT * FROM m1_bars_2 WHERE ticker = %s"
+BARS = (
+    [("ticker", TEXT), ("bar_date", DATE), ("bar_timestamp", TIMESTAMP),
+     ("close", NUMERIC), ("volume", INT8), ("is_rth", BOOL)],
+    [("SPY", date(2026, 1, 5), datetime(2026, 1, 5, 9, 30 + i), 600.0 + i, 1000 * (i + 1), i % 2 == 0)
+     for i in range(25)],
+)
+NULLS_SQL = "SELECT close, volume, is_rth FROM m1_bars_2 WHERE volume IS NULL"
+NULLS = ([("close", NUMERIC), ("volume", INT4), ("is_rth", BOOL)],
+         [(None, None, None), (1.5, 7, True)])
+
+
+class FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.description = None
+        self.rowcount = -1
+        self.itersize = 2000
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params, self.name))
+        if self.conn.fail_next:
+            self.conn.fail_next = False
+            self.conn.closed = 1
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        time.sleep(self.conn.delay)
+        description, rows = self.conn.tables.get(sql, ([], []))
+        self.description = [(name, oid) for name, oid in description]
+        self._rows = list(rows)
+        self.rowcount = len(rows) if description else 3
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+
+class FakeConn:
+    def __init__(self, tables, delay=0.0):
+        self.tables = tables
+        self.delay = delay
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_next = False
+        self.executed = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self, name)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeConnector:
+    """psycopg2.connect stand-in that tracks connections opened and in use."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.connections = []
+
+    def __call__(self, **config):
+        conn = FakeConn({BARS_SQL: BARS, NULLS_SQL: NULLS}, self.delay)
+        self.connections.append(conn)
+        return conn
+
+
+def make_pool(max_connections=4, timeout=5.0, delay=0.0, itersize=10):
+    connector = FakeConnector(delay)
+    pool = DatabasePool({"host": "localhost", "database": "epoch"}, max_connections=max_connections,
+                        timeout=timeout, itersize=itersize, connect=connector)
+    return pool, connector
+
+
+class TestDatabasePool:
+    TEST_ID = "test_39_db_pool"
+    QUESTION = "Does the shared database pool reuse, bound and time its connections?"
+
+    def test_decode_columns(self, result_writer):
+        """Columns decode to native dtypes; NULLs become NaN / NaT / None."""
+        arrays = decode_columns(*BARS)
+        assert list(arrays) == ["ticker", "bar_date", "bar_timestamp", "close", "volume", "is_rth"]
+        assert arrays["close"].dtype == np.float64 and arrays["close"][3] == 603.0
+        assert arrays["volume"].dtype == np.int64
+        assert arrays["is_rth"].dtype == bool
+        assert arrays["bar_timestamp"].dtype == np.dtype("datetime64[us]")
+        assert arrays["ticker"].dtype == object and arrays["bar_date"][0] == date(2026, 1, 5)
+
+        nulls = decode_columns(*NULLS)
+        assert np.isnan(nulls["close"][0]) and nulls["close"][1] == 1.5
+        assert nulls["volume"].dtype == np.float64 and np.isnan(nulls["volume"][0])
+        assert list(nulls["is_rth"]) == [None, True]
+
+        empty = decode_columns(BARS[0], [])
+        assert list(empty) == list(arrays) and all(len(v) == 0 for v in empty.values())
+
+    def test_frame_and_arrow(self, result_writer):
+        pool, _ = make_pool()
+        df = pool.query_frame(BARS_SQL, ["SPY"])
+        assert len(df) == 25 and str(df["bar_timestamp"].dtype).startswith("datetime64")
+        assert df["close"].dtype == np.float64
+        table = pool.query_arrow(BARS_SQL, ["SPY"])
+        assert table.num_rows == 25 and table.column_names == list(df.columns)
+        records = pool.query_records(BARS_SQL, ["SPY"])
+        assert records[0]["ticker"] == "SPY" and records[-1]["volume"] == 25000
+
+    def test_connections_reused(self, result_writer):
+        """Sequential queries share one connection, rolled back between borrowers."""
+        pool, connector = make_pool()
+        for _ in range(20):
+            pool.query_arrays(BARS_SQL, ["SPY"])
+        assert len(connector.connections) == 1
+        assert connector.connections[0].rollbacks == 20
+        assert pool.idle_connections == 1
+
+    def test_concurrency_bounded(self, result_writer):
+        """Many threads never hold more than max_connections at once."""
+        pool, connector = make_pool(max_connections=3, delay=0.01)
+        in_use, peak, lock = [0], [0], threading.Lock()
+        original = pool.getconn
+
+        def tracking_getconn():
+            conn = original()
+            with lock:
+                in_use[0] += 1
+                peak[0] = max(peak[0], in_use[0])
+            return conn
+
+        original_put = pool.putconn
+
+        def tracking_putconn(conn, close=False):
+            with lock:
+                in_use[0] -= 1
+            original_put(conn, close)
+
+        pool.getconn, pool.putconn = tracking_getconn, tracking_putconn
+        threads = [threading.Thread(target=lambda: [pool.query_arrays(BARS_SQL, ["SPY"]) for _ in range(5)])
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert pool.metrics()["queries"] == 40
+        assert peak[0] <= 3 and len(connector.connections) <= 3
+
+    def test_timeout(self, result_writer):
+        pool, _ = make_pool(max_connections=1, timeout=0.05)
+        held = pool.getconn()
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+        pool.putconn(held)
+        pool.putconn(pool.getconn())
+
+    def test_broken_connection_dropped(self, result_writer):
+        """A connection that fails mid-query is closed, and the next borrow opens a new one."""
+        pool, connector = make_pool()
+        pool.query_arrays(BARS_SQL, ["SPY"])
+        connector.connections[0].fail_next = True
+        with pytest.raises(psycopg2.OperationalError):
+            pool.query_arrays(BARS_SQL, ["SPY"])
+        assert connector.connections[0].closed and pool.idle_connections == 0
+        assert len(pool.query_arrays(BARS_SQL, ["SPY"])["close"]) == 25
+        assert len(connector.connections) == 2
+
+    def test_iter_batches_server_side(self, result_writer):
+        """Batches come from a named cursor and the connection returns when done or closed."""
+        pool, connector = make_pool(itersize=10)
+        batches = list(pool.iter_batches(BARS_SQL, ["SPY"]))
+        assert [len(b["close"]) for b in batches] == [10, 10, 5]
+        assert np.concatenate([b["close"] for b in batches]).tolist() == [600.0 + i for i in range(25)]
+        assert connector.connections[0].executed[-1][2].startswith("epoch_")
+
+        stream = pool.iter_batches(BARS_SQL, ["SPY"], batch_size=4)
+        next(stream)
+        stream.close()
+        assert pool.idle_connections == 1
+        assert pool.metrics()["rows"] == 25 + 4
+
+    def test_execute_commits(self, result_writer):
+        pool, connector = make_pool()
+        assert pool.execute("DELETE FROM secondary_watermarks_2", label="reset") == 3
+        assert connector.connections[0].commits == 1
+
+    def test_metrics_per_label(self, result_writer):
+        pool, _ = make_pool(delay=0.002)
+        for _ in range(3):
+            pool.query_arrays(BARS_SQL, ["SPY"], label="m1_bars")
+        pool.query_frame(NULLS_SQL)
+        m = pool.metrics()
+        assert m["queries"] == 4 and m["rows"] == 77
+        assert m["labels"]["m1_bars"]["queries"] == 3 and m["labels"]["m1_bars"]["rows"] == 75
+        assert m["labels"]["m1_bars"]["seconds"] > 0 and m["max_query_seconds"] > 0
+        assert "SELECT close, volume, is_rth FROM m1_bars_2 WHERE volume IS" in m["labels"]
+        assert m["connections_opened"] == 1 and m["borrows"] == 4
+        pool.reset_metrics()
+        assert pool.metrics()["queries"] == 0 and pool.metrics()["labels"] == {}
+
+    def test_pool_key(self, result_writer):
+        """Configs for the same server, database and user share one pool."""
+        a = {"host": "db", "port": 5432, "database": "postgres", "user": "postgres", "password": "x"}
+        b = {"host": "db", "port": "5432", "dbname": "postgres", "user": "postgres", "sslmode": "require"}
+        assert db_pool._pool_key(a) == db_pool._pool_key(b)
+        assert db_pool._pool_key(a) != db_pool._pool_key({**a, "user": "reader"})
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        pool, connector = make_pool(max_connections=2, delay=0.005)
+        threads = [threading.Thread(target=lambda: [pool.query_frame(BARS_SQL, ["SPY"], label="bars")
+                                                    for _ in range(5)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batches = list(pool.iter_batches(BARS_SQL, ["SPY"], label="stream"))
+        m = pool.metrics()
+
+        checks.append(make_check("queries", 21, m["queries"]))
+        checks.append(make_check("rows", 21 * 25, m["rows"]))
+        checks.append(make_check("connections_bounded", True, len(connector.connections) <= 2))
+        checks.append(make_check("stream_batches", [10, 10, 5], [len(b["close"]) for b in batches]))
+        checks.append(make_check("labels", ["bars", "stream"], sorted(m["labels"])))
+        checks.append(make_check("idle_after_run", len(connector.connections), pool.idle_connections))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,166 @@
+"""
+Test 40: Do the O(n) rolling kernels match the per-bar loops they replaced?
+Source: shared.indicators.core - _sma_core, _ema_core, _volume_roc_core, _cvd_slope_core
+        shared.indicators._utils - rolling_* kernels
+
+The references below replicate the original slice-per-bar loops. Inputs
+include flat CVD stretches (zero range), zero-volume baselines, short
+series and NaN gaps, so warm-up, clamp and NaN semantics are all compared.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pytest
+from conftest import make_check
+
+from shared.indicators._utils import (
+    linear_regression_slope, rolling_max, rolling_mean, rolling_min, rolling_regression_slope,
+)
+from shared.indicators.config import CONFIG
+from shared.indicators.core.cvd import _cvd_slope_core
+from shared.indicators.core.sma import _ema_core, _sma_core
+from shared.indicators.core.volume_roc import _volume_roc_core
+
+TOL = dict(rtol=1e-9, atol=1e-9)
+
+
+def sma_reference(close, period):
+    result = np.full(len(close), np.nan)
+    for i in range(period - 1, len(close)):
+        result[i] = close[i - period + 1:i + 1].mean()
+    return result
+
+
+def ema_reference(close, period):
+    n = len(close)
+    result = np.full(n, np.nan)
+    if n < period:
+        return result
+    result[period - 1] = close[:period].mean()
+    multiplier = 2.0 / (period + 1)
+    for i in range(period, n):
+        result[i] = (close[i] - result[i - 1]) * multiplier + result[i - 1]
+    return result
+
+
+def volume_roc_reference(volume, period):
+    result = np.full(len(volume), np.nan)
+    for i in range(period, len(volume)):
+        avg = volume[i - period:i].mean()
+        result[i] = 0.0 if avg == 0 else ((volume[i] - avg) / avg) * 100.0
+    return result
+
+
+def cvd_slope_reference(cvd, window):
+    cfg = CONFIG.cvd
+    result = np.full(len(cvd), np.nan)
+    for i in range(window - 1, len(cvd)):
+        recent = cvd[i - window + 1:i + 1]
+        if len(recent) < 3:
+            result[i] = 0.0
+            continue
+        slope = linear_regression_slope(recent)
+        cvd_range = recent.max() - recent.min()
+        if cvd_range == 0:
+            result[i] = 0.0
+        else:
+            result[i] = float(np.clip(slope / cvd_range * len(recent), cfg.clamp_min, cfg.clamp_max))
+    return result
+
+
+def make_series(n, seed=0):
+    """M1-like close, integer volume with a dead stretch, and CVD with a flat stretch."""
+    rng = np.random.RandomState(seed)
+    close = 600 + np.cumsum(rng.normal(0, 0.3, n))
+    volume = rng.randint(0, 50_000, n).astype(np.float64)
+    volume[n // 4:n // 4 + 30] = 0.0
+    cvd = np.cumsum(rng.normal(0, 1_000, n))
+    cvd[n // 2:n // 2 + 25] = cvd[n // 2] if n else 0.0
+    return close, volume, cvd
+
+
+def with_nans(values, positions):
+    values = values.copy()
+    values[[p for p in positions if p < len(values)]] = np.nan
+    return values
+
+
+class TestRollingKernels:
+    TEST_ID = "test_40_rolling_kernels"
+    QUESTION = "Do the O(n) rolling kernels match the per-bar loops they replaced?"
+
+    @pytest.mark.parametrize("n", [0, 1, 8, 9, 21, 22, 400, 1_950])
+    @pytest.mark.parametrize("period", [1, 2, 9, 21])
+    def test_sma_ema_roc(self, result_writer, n, period):
+        close, volume, _ = make_series(n, seed=n + period)
+        np.testing.assert_allclose(_sma_core(close, period), sma_reference(close, period), **TOL)
+        np.testing.assert_allclose(_ema_core(close, period), ema_reference(close, period), **TOL)
+        np.testing.assert_allclose(_volume_roc_core(volume, period), volume_roc_reference(volume, period), **TOL)
+
+    @pytest.mark.parametrize("n", [0, 2, 14, 15, 400, 1_950])
+    @pytest.mark.parametrize("window", [1, 2, 3, 5, 15, 40])
+    def test_cvd_slope(self, result_writer, n, window):
+        _, _, cvd = make_series(n, seed=n + window)
+        np.testing.assert_allclose(_cvd_slope_core(cvd, window), cvd_slope_reference(cvd, window), **TOL)
+
+    def test_flat_and_bounded(self, result_writer):
+        """A flat CVD stretch gives exactly 0.0; every value stays inside the clamps."""
+        _, _, cvd = make_series(1_950, seed=3)
+        window = CONFIG.cvd.window
+        slopes = _cvd_slope_core(cvd, window)
+        assert (slopes[975 + window - 1:975 + 25] == 0.0).all()
+        finite = slopes[window - 1:]
+        assert CONFIG.cvd.clamp_min <= finite.min() and finite.max() <= CONFIG.cvd.clamp_max
+        assert finite.max() > 1.0 and finite.min() < -1.0
+
+    def test_nan_semantics(self, result_writer):
+        """A NaN poisons exactly the windows (SMA, ROC, CVD) or tail (EMA) the loops did."""
+        close, volume, cvd = make_series(300, seed=5)
+        close = with_nans(close, [40, 41, 200])
+        volume = with_nans(volume, [120])
+        cvd = with_nans(cvd, [60, 250])
+        for period in (9, 21):
+            np.testing.assert_allclose(_sma_core(close, period), sma_reference(close, period), **TOL)
+            np.testing.assert_allclose(_ema_core(close, period), ema_reference(close, period), **TOL)
+            np.testing.assert_allclose(_volume_roc_core(volume, period), volume_roc_reference(volume, period), **TOL)
+        np.testing.assert_allclose(_cvd_slope_core(cvd, 15), cvd_slope_reference(cvd, 15), **TOL)
+        assert np.isnan(_ema_core(close, 9)[40:]).all()
+        assert not np.isnan(_sma_core(close, 9)[60:200]).any()
+
+    @pytest.mark.parametrize("window", [1, 4, 7, 15])
+    def test_rolling_helpers(self, result_writer, window):
+        values = with_nans(np.random.RandomState(window).normal(0, 1, 103), [50])
+        windows = [values[i - window + 1:i + 1] for i in range(window - 1, len(values))]
+        np.testing.assert_array_equal(rolling_max(values, window)[window - 1:], [w.max() for w in windows])
+        np.testing.assert_array_equal(rolling_min(values, window)[window - 1:], [w.min() for w in windows])
+        np.testing.assert_allclose(rolling_mean(values, window)[window - 1:], [w.mean() for w in windows], **TOL)
+        np.testing.assert_allclose(rolling_regression_slope(values, window)[window - 1:],
+                                   [linear_regression_slope(w) for w in windows], **TOL)
+        assert np.isnan(rolling_max(values, window)[:window - 1]).all()
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        close, volume, cvd = make_series(1_950, seed=11)
+        fast, slow, base, win = CONFIG.sma.fast_period, CONFIG.sma.slow_period, \
+            CONFIG.volume_roc.baseline_period, CONFIG.cvd.window
+
+        def max_diff(actual, expected):
+            both = ~(np.isnan(actual) & np.isnan(expected))
+            return float(np.max(np.abs(actual[both] - expected[both]))) if both.any() else 0.0
+
+        for name, actual, expected in [
+            ("sma_fast", _sma_core(close, fast), sma_reference(close, fast)),
+            ("sma_slow", _sma_core(close, slow), sma_reference(close, slow)),
+            ("ema_fast", _ema_core(close, fast), ema_reference(close, fast)),
+            ("volume_roc", _volume_roc_core(volume, base), volume_roc_reference(volume, base)),
+            ("cvd_slope", _cvd_slope_core(cvd, win), cvd_slope_reference(cvd, win)),
+        ]:
+            checks.append(make_check(f"{name}_nan_mask_equal", True,
+                                     bool((np.isnan(actual) == np.isnan(expected)).all())))
+            checks.append(make_check(f"{name}_within_tolerance", True, max_diff(actual, expected) < 1e-9))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
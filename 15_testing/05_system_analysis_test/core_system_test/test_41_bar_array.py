@@ -0,0 +1,274 @@
+"""
+Test 41: Does BarArray give the same indicator values as bar lists, without copying?
+Source: shared.indicators.bar_array - BarArray, as_bar_array
+        shared.indicators.core - bar-list wrappers with BarArray input
+
+Each bar-list wrapper is evaluated at every index from both a list of bar
+dicts and the BarArray built from it. Inputs include zero-range bars, a
+zero-volume stretch and bars with missing prices.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_check
+
+from shared.indicators import BarArray, as_bar_array
+from shared.indicators._utils import bars_to_arrays
+from shared.indicators.core.atr import calculate_atr
+from shared.indicators.core.cvd import calculate_cvd_slope
+from shared.indicators.core.sma import calculate_sma, calculate_sma_momentum, calculate_sma_spread
+from shared.indicators.core.volume_delta import calculate_rolling_delta
+from shared.indicators.core.volume_profile import calculate_volume_profiles
+from shared.indicators.core.volume_roc import calculate_volume_roc
+from shared.indicators.core.vwap import calculate_vwap
+
+START = datetime(2026, 1, 5, 14, 30, tzinfo=timezone.utc)
+
+
+@dataclass
+class S15Bar:
+    """Shape of 03_backtest data.s15_fetcher.S15Bar."""
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    vwap: Optional[float] = None
+    transactions: Optional[int] = None
+
+
+def make_frame(n, seed=0):
+    rng = np.random.RandomState(seed)
+    close = 600 + np.cumsum(rng.normal(0, 0.3, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.2, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.2, n)
+    volume = rng.randint(0, 50_000, n).astype(np.float64)
+    volume[n // 3:n // 3 + 25] = 0.0
+    # Zero-range bars exercise the doji branch of the delta
+    flat = np.arange(5, n, 17)
+    high[flat] = low[flat] = open_[flat] = close[flat]
+    return pd.DataFrame({
+        "timestamp": pd.date_range(START, periods=n, freq="min", unit="ns"),
+        "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+    })
+
+
+def frame_to_dicts(df):
+    return [{k: (v.to_pydatetime() if k == "timestamp" else float(v)) for k, v in row.items()}
+            for row in df.to_dict("records")]
+
+
+def wrapper_results(bars, i):
+    """Every bar-list wrapper evaluated at index i."""
+    return {
+        "atr": calculate_atr(bars, up_to_index=i),
+        "sma": calculate_sma(bars, 9, up_to_index=i),
+        "sma_spread": calculate_sma_spread(bars, up_to_index=i),
+        "sma_momentum": calculate_sma_momentum(bars, up_to_index=i),
+        "volume_roc": calculate_volume_roc(bars, up_to_index=i),
+        "rolling_delta": calculate_rolling_delta(bars, up_to_index=i),
+        "cvd": calculate_cvd_slope(bars, up_to_index=i),
+        "vwap": calculate_vwap(bars, up_to_index=i),
+    }
+
+
+def assert_same(actual, expected):
+    """Equal, with floats compared to 1e-9 relative (dataclasses compared field-wise)."""
+    if hasattr(expected, "__dataclass_fields__"):
+        for name in expected.__dataclass_fields__:
+            assert_same(getattr(actual, name), getattr(expected, name))
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    elif isinstance(expected, list):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+    else:
+        assert actual == expected
+
+
+class TestBarArray:
+    TEST_ID = "test_41_bar_array"
+    QUESTION = "Does BarArray give the same indicator values as bar lists, without copying?"
+
+    def test_from_frame_zero_copy(self, result_writer):
+        df = make_frame(100)
+        bars = BarArray.from_frame(df)
+        for name in ("open", "high", "low", "close", "volume"):
+            assert np.shares_memory(getattr(bars, name), df[name].to_numpy())
+        assert np.shares_memory(bars.timestamp, df["timestamp"].array.asi8)
+        assert bars.timestamp[0] == pd.Timestamp(START).value
+        assert np.isnan(bars.vwap).all()
+
+        window = bars[10:40]
+        assert len(window) == 30 and np.shares_memory(window.close, bars.close)
+        indexed = BarArray.from_frame(df.set_index("timestamp"))
+        np.testing.assert_array_equal(indexed.timestamp, bars.timestamp)
+
+    def test_between_is_view(self, result_writer):
+        bars = BarArray.from_frame(make_frame(390))
+        window = bars.between(START + timedelta(minutes=30), START + timedelta(minutes=90))
+        assert len(window) == 60 and np.shares_memory(window.close, bars.close)
+        assert window[0]["timestamp"] == pd.Timestamp(START + timedelta(minutes=30)).tz_localize(None)
+
+        # Same instant in another zone, open-ended bounds, empty range
+        eastern = pd.Timestamp(START + timedelta(minutes=30)).tz_convert("America/New_York")
+        assert len(bars.between(eastern)) == 360
+        assert len(bars.between(end=START + timedelta(minutes=5))) == 5
+        assert len(bars.between(START + timedelta(minutes=50), START + timedelta(minutes=10))) == 0
+
+        with pytest.raises(ValueError):
+            BarArray([1.0], [1.0], [1.0], [1.0], [1.0]).between(START)
+
+    def test_from_records_and_polygon(self, result_writer):
+        df = make_frame(50)
+        records = df.to_records(index=False)
+        from_records = BarArray.from_records(records)
+        assert np.shares_memory(from_records.close, records)
+        np.testing.assert_array_equal(from_records.timestamp, BarArray.from_frame(df).timestamp)
+
+        response = {"results": [
+            {"o": r["open"], "h": r["high"], "l": r["low"], "c": r["close"], "v": r["volume"],
+             "vw": r["close"], "t": int(r["timestamp"].timestamp() * 1000)}
+            for r in frame_to_dicts(df)
+        ]}
+        polygon = BarArray.from_polygon(response)
+        for name in ("open", "high", "low", "close", "volume", "timestamp"):
+            np.testing.assert_array_equal(getattr(polygon, name), getattr(from_records, name))
+        np.testing.assert_array_equal(polygon.vwap, polygon.close)
+        assert len(BarArray.from_polygon({"results": []})) == 0
+
+    def test_from_bars_s15_fast_path(self, result_writer):
+        df = make_frame(80)
+        s15 = [S15Bar(r["timestamp"], r["open"], r["high"], r["low"], r["close"], int(r["volume"]))
+               for r in frame_to_dicts(df)]
+        bars = BarArray.from_bars(s15)
+        reference = BarArray.from_frame(df)
+        for name in ("open", "high", "low", "close", "volume", "timestamp"):
+            np.testing.assert_array_equal(getattr(bars, name), getattr(reference, name))
+        assert np.isnan(bars.vwap).all()
+        assert bars[3]["volume"] == int(df["volume"][3])
+
+    def test_from_bars_accessor_semantics(self, result_writer):
+        """Mixed key names, None and string values resolve like the get_* accessors."""
+        bars = [
+            {"open_price": 1.0, "high_price": 2.0, "low_price": 0.5, "close_price": 1.5, "volume": "12.7"},
+            {"open": 1.0, "high": 2.0, "low": 0.5, "close": None, "volume": None},
+            {"open": "1.25", "high": 2.0, "low": 0.5, "close": 1.0},
+        ]
+        array = BarArray.from_bars(bars)
+        np.testing.assert_array_equal(array.open, [1.0, 1.0, 1.25])
+        assert array.close[0] == 1.5 and np.isnan(array.close[1])
+        np.testing.assert_array_equal(array.volume, [12.0, 0.0, 0.0])
+        assert array.timestamp is None
+
+        # bars_to_arrays keeps its missing-as-0.0 contract for lists and BarArrays
+        for source in (bars, array):
+            _, _, _, close, volume = bars_to_arrays(source)
+            np.testing.assert_array_equal(close, [1.5, 0.0, 1.0])
+            np.testing.assert_array_equal(volume, [12.0, 0.0, 0.0])
+        assert len(bars_to_arrays(array, up_to_index=1)[0]) == 2
+
+    def test_integer_timestamps_are_epoch_ms(self, result_writer):
+        """Integer timestamps (Polygon M1 dicts) are epoch ms unless unit= says otherwise."""
+        df = make_frame(30)
+        reference = BarArray.from_frame(df).timestamp
+        ms = df["timestamp"].array.asi8 // 1_000_000
+        dicts = [dict(d, timestamp=int(t)) for d, t in zip(frame_to_dicts(df), ms)]
+        np.testing.assert_array_equal(BarArray.from_bars(dicts).timestamp, reference)
+        np.testing.assert_array_equal(as_bar_array(dicts).timestamp, reference)
+        np.testing.assert_array_equal(BarArray.from_frame(df.assign(timestamp=ms)).timestamp, reference)
+        records = df.assign(timestamp=ms).to_records(index=False)
+        np.testing.assert_array_equal(BarArray.from_records(records).timestamp, reference)
+
+        seconds = [dict(d, timestamp=int(t) // 1000) for d, t in zip(dicts, ms)]
+        np.testing.assert_array_equal(BarArray.from_bars(seconds, unit="s").timestamp, reference)
+        ns = df.assign(timestamp=df["timestamp"].array.asi8)
+        np.testing.assert_array_equal(BarArray.from_frame(ns, unit="ns").timestamp, reference)
+        assert len(BarArray.from_bars(dicts).between(START + timedelta(minutes=10))) == 20
+        with pytest.raises(ValueError):
+            BarArray.from_frame(df.assign(timestamp=ms), unit="minutes")
+
+    def test_as_bar_array(self, result_writer):
+        df = make_frame(20)
+        bars = BarArray.from_frame(df)
+        assert as_bar_array(bars) is bars
+        for source in (df, df.to_records(index=False), frame_to_dicts(df)):
+            np.testing.assert_array_equal(as_bar_array(source).close, bars.close)
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_wrappers_match_lists(self, result_writer, seed):
+        df = make_frame(120, seed=seed)
+        dicts = frame_to_dicts(df)
+        bars = BarArray.from_frame(df)
+        for i in list(range(len(df))) + [None, 500]:
+            expected = wrapper_results(dicts, i)
+            actual = wrapper_results(bars, i)
+            for name in expected:
+                assert_same(actual[name], expected[name])
+
+    def test_missing_prices_match_lists(self, result_writer):
+        """Missing prices: 0.0 for ATR/delta/CVD, skipped by SMA and VWAP - for both inputs."""
+        dicts = frame_to_dicts(make_frame(60, seed=4))
+        for i in (20, 41):
+            del dicts[i]["close"]
+        dicts[30]["high"] = None
+        bars = BarArray.from_bars(dicts)
+        assert np.isnan(bars.close[20]) and np.isnan(bars.high[30])
+        for i in range(len(dicts)):
+            expected = wrapper_results(dicts, i)
+            actual = wrapper_results(bars, i)
+            for name in expected:
+                assert_same(actual[name], expected[name])
+
+    def test_volume_profiles(self, result_writer):
+        df = make_frame(390, seed=7)
+        sessions = [df.iloc[:200], df.iloc[200:]]
+        expected = calculate_volume_profiles([frame_to_dicts(s) for s in sessions])
+        actual = calculate_volume_profiles([BarArray.from_frame(s) for s in sessions])
+        for a, e in zip(actual, expected):
+            assert_same(a, e)
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        df = make_frame(390, seed=11)
+        dicts = frame_to_dicts(df)
+        bars = BarArray.from_frame(df)
+
+        checks.append(make_check("from_frame_zero_copy", True,
+                                 all(np.shares_memory(getattr(bars, c), df[c].to_numpy())
+                                     for c in ("open", "high", "low", "close", "volume"))))
+        window = bars.between(START + timedelta(minutes=60), START + timedelta(minutes=120))
+        checks.append(make_check("between_len", 60, len(window)))
+        checks.append(make_check("between_is_view", True, np.shares_memory(window.close, bars.close)))
+
+        s15 = [S15Bar(d["timestamp"], d["open"], d["high"], d["low"], d["close"], int(d["volume"]))
+               for d in dicts]
+        checks.append(make_check("s15_close_equal", True,
+                                 bool(np.array_equal(BarArray.from_bars(s15).close, bars.close))))
+        ms_dicts = [dict(d, timestamp=int(d["timestamp"].timestamp() * 1000)) for d in dicts]
+        checks.append(make_check("epoch_ms_timestamps_equal", True,
+                                 bool(np.array_equal(BarArray.from_bars(ms_dicts).timestamp, bars.timestamp))))
+
+        mismatches = {name: 0 for name in ("atr", "sma", "volume_roc", "rolling_delta", "cvd", "vwap")}
+        for i in range(len(df)):
+            expected, actual = wrapper_results(dicts, i), wrapper_results(bars, i)
+            for name in mismatches:
+                try:
+                    assert_same(actual[name], expected[name])
+                except AssertionError:
+                    mismatches[name] += 1
+        for name, count in mismatches.items():
+            checks.append(make_check(f"{name}_mismatches", 0, count))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
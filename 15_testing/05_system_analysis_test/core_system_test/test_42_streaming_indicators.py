@@ -0,0 +1,248 @@
+"""
+Test 42: Do the streaming indicators reproduce the batch values bar for bar?
+Source: shared.indicators.streaming - *Stream, IndicatorStream
+        02_dow_ai/entry_qualifier/calculations/indicator_stream.py - M1IndicatorStream
+
+Streams are fed one bar at a time and compared with the bar-list wrapper
+at up_to_index=i using exact equality. The entry qualifier stream is synced
+with sliding fetch windows whose newest bar is revised between refreshes.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pickle
+
+import numpy as np
+import pytest
+from conftest import make_check
+
+from shared.indicators.core.atr import calculate_atr
+from shared.indicators.core.candle_range import calculate_candle_range_from_bar
+from shared.indicators.core.cvd import calculate_cvd_slope
+from shared.indicators.core.sma import calculate_sma, calculate_sma_momentum, calculate_sma_spread
+from shared.indicators.core.volume_delta import calculate_bar_delta_from_bar, calculate_rolling_delta
+from shared.indicators.core.volume_roc import calculate_volume_roc
+from shared.indicators.core.vwap import calculate_vwap
+from shared.indicators.streaming import (
+    ATRStream, CVDStream, IndicatorStream, SMAStream, VolumeDeltaStream, VolumeROCStream, VWAPStream,
+)
+
+ENTRY_QUALIFIER = Path(__file__).resolve().parent.parent.parent.parent / "02_dow_ai" / "entry_qualifier"
+if str(ENTRY_QUALIFIER) not in sys.path:
+    sys.path.insert(0, str(ENTRY_QUALIFIER))
+
+from calculations.candle_range import calculate_all_candle_ranges
+from calculations.indicator_stream import M1IndicatorStream
+from calculations.sma_config import calculate_all_sma_configs
+from calculations.volume_delta import calculate_all_deltas
+from calculations.volume_roc import calculate_all_volume_roc
+
+MINUTE_MS = 60_000
+
+
+def make_bars(n, seed=0, start_ms=1_767_623_400_000):
+    """Polygon-style M1 bar dicts: ms timestamps, whole-share volume, some doji bars."""
+    rng = np.random.RandomState(seed)
+    close = 600 + np.cumsum(rng.normal(0, 0.3, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.2, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.2, n)
+    volume = rng.randint(0, 50_000, n)
+    volume[n // 3:n // 3 + 25] = 0
+    bars = []
+    for i in range(n):
+        if i % 17 == 5:
+            high[i] = low[i] = open_[i] = close[i]
+        bars.append({"timestamp": start_ms + i * MINUTE_MS, "open": float(open_[i]), "high": float(high[i]),
+                     "low": float(low[i]), "close": float(close[i]), "volume": float(volume[i])})
+    return bars
+
+
+def batch_values(bars, i):
+    return {
+        "rolling_delta": calculate_rolling_delta(bars, i),
+        "volume_roc": calculate_volume_roc(bars, i),
+        "cvd": calculate_cvd_slope(bars, i),
+        "atr": calculate_atr(bars, up_to_index=i),
+        "sma": calculate_sma_spread(bars, i),
+        "sma_momentum": calculate_sma_momentum(bars, i),
+        "vwap": calculate_vwap(bars, i),
+        "candle_range": calculate_candle_range_from_bar(bars[i]),
+        "bar_delta": calculate_bar_delta_from_bar(bars[i]),
+    }
+
+
+def batch_rows(bars):
+    """The entry qualifier's batch dicts, merged per bar."""
+    rows = []
+    for parts in zip(calculate_all_deltas(bars, roll_period=5), calculate_all_candle_ranges(bars),
+                     calculate_all_volume_roc(bars, lookback=20), calculate_all_sma_configs(bars)):
+        row = {}
+        for part in parts:
+            row.update(part)
+        rows.append(row)
+    return rows
+
+
+def count_mismatches(bars, stream=None):
+    stream = stream or IndicatorStream()
+    mismatches = {}
+    for i, bar in enumerate(bars):
+        actual = stream.update(bar)
+        for name, expected in batch_values(bars, i).items():
+            if actual[name] != expected:
+                mismatches[name] = mismatches.get(name, 0) + 1
+    return mismatches
+
+
+class TestStreamingIndicators:
+    TEST_ID = "test_42_streaming_indicators"
+    QUESTION = "Do the streaming indicators reproduce the batch values bar for bar?"
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_bundle_bit_identical(self, result_writer, seed):
+        assert count_mismatches(make_bars(300, seed=seed)) == {}
+
+    def test_missing_fields(self, result_writer):
+        """Missing close/high follow the wrapper defaults (skip for SMA/VWAP, 0.0 elsewhere)."""
+        bars = make_bars(120, seed=4)
+        del bars[30]["close"]
+        bars[40]["high"] = None
+        bars[41]["volume"] = None
+        assert count_mismatches(bars) == {}
+
+    @pytest.mark.parametrize("period", [1, 2, 7])
+    def test_custom_periods(self, result_writer, period):
+        bars = make_bars(80, seed=period)
+        streams = [(VolumeDeltaStream(period), lambda i: calculate_rolling_delta(bars, i, period)),
+                   (VolumeROCStream(period), lambda i: calculate_volume_roc(bars, i, period)),
+                   (CVDStream(period), lambda i: calculate_cvd_slope(bars, i, period)),
+                   (ATRStream(period), lambda i: calculate_atr(bars, period, i)),
+                   (SMAStream(period), lambda i: calculate_sma(bars, period, i)),
+                   (VWAPStream(), lambda i: calculate_vwap(bars, i))]
+        for stream, batch in streams:
+            for i, bar in enumerate(bars):
+                assert stream.update(bar) == batch(i)
+
+    def test_snapshot_restore(self, result_writer):
+        """Restoring a snapshot and re-applying a revised bar equals never seeing the old version."""
+        bars = make_bars(200, seed=6)
+        stream = IndicatorStream()
+        for bar in bars[:-1]:
+            stream.update(bar)
+        closed = stream.snapshot()
+        pickle.loads(pickle.dumps(closed))
+
+        for revision in range(3):
+            forming = dict(bars[-1], close=bars[-1]["close"] + revision * 0.05,
+                           volume=bars[-1]["volume"] + revision * 100)
+            stream.restore(closed)
+            actual = stream.update(forming)
+            assert actual == batch_values(bars[:-1] + [forming], len(bars) - 1)
+
+        # The snapshot is a copy: later updates do not leak into it
+        stream.restore(closed)
+        stream.update(bars[-1])
+        stream.restore(closed)
+        assert stream.update(bars[-1]) == batch_values(bars, len(bars) - 1)
+
+    def test_reset(self, result_writer):
+        bars = make_bars(60, seed=7)
+        stream = IndicatorStream()
+        for bar in bars:
+            stream.update(bar)
+        stream.reset()
+        assert count_mismatches(bars, stream) == {}
+
+    def test_entry_qualifier_first_sync_matches_batch(self, result_writer):
+        window = make_bars(50, seed=8)
+        assert M1IndicatorStream().sync(window) == batch_rows(window)
+
+    def test_entry_qualifier_sliding_windows(self, result_writer):
+        """Each refresh: window slides, newest bar is revised; post-warm-up rows match the batch."""
+        bars = make_bars(260, seed=9)
+        stream = M1IndicatorStream()
+        end = 50
+        while end <= len(bars):
+            for revision in (0.1, 0.0):
+                window = bars[end - 50:end - 1] + [dict(bars[end - 1], close=bars[end - 1]["close"] + revision)]
+                rows = stream.sync(window)
+                assert len(rows) == 50
+                assert rows[20:] == batch_rows(window)[20:]
+            end += 1 + end % 3
+
+    def test_entry_qualifier_gap_restarts(self, result_writer):
+        """A window that no longer contains the last closed bar is replayed from scratch."""
+        bars = make_bars(200, seed=10)
+        stream = M1IndicatorStream()
+        stream.sync(bars[:50])
+        window = bars[120:170]
+        assert stream.sync(window) == batch_rows(window)
+        assert stream.sync([]) == []
+
+    def test_entry_qualifier_backfilled_bar_restarts(self, result_writer):
+        """A bar that appears before the last closed bar replays the window instead of raising."""
+        bars = make_bars(6, seed=12)
+        stream = M1IndicatorStream()
+        stream.sync([bars[i] for i in (0, 1, 3, 4)])
+        assert stream.sync(bars) == batch_rows(bars)
+
+        bars = make_bars(60, seed=13)
+        stream = M1IndicatorStream()
+        stream.sync(bars[:20] + bars[21:40])
+        window = bars[:45]
+        assert stream.sync(window) == batch_rows(window)
+        assert stream.sync(bars[:46])[20:] == batch_rows(bars[:46])[20:]
+
+    def test_entry_qualifier_revised_bar_restarts(self, result_writer):
+        """A closed bar revised in place (same timestamp, new OHLCV) replays the window."""
+        bars = make_bars(80, seed=14)
+        for field, change in (("close", 0.5), ("volume", 1_000.0)):
+            stream = M1IndicatorStream()
+            stream.sync(bars[:50])
+            window = [dict(bar) for bar in bars[:51]]
+            window[-5][field] += change
+            assert stream.sync(window) == batch_rows(window)
+            # Unrevised refreshes keep resuming from the closed state
+            assert stream.sync(window[1:] + [bars[51]])[20:] == batch_rows(window[1:] + [bars[51]])[20:]
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        bars = make_bars(390, seed=11)
+
+        mismatches = count_mismatches(bars)
+        for name in batch_values(bars, 0):
+            checks.append(make_check(f"{name}_mismatches", 0, mismatches.get(name, 0)))
+
+        stream = IndicatorStream()
+        for bar in bars[:-1]:
+            stream.update(bar)
+        closed = stream.snapshot()
+        stream.update(dict(bars[-1], close=bars[-1]["close"] + 1.0))
+        stream.restore(closed)
+        checks.append(make_check("restore_then_update_equal", True,
+                                 stream.update(bars[-1]) == batch_values(bars, len(bars) - 1)))
+
+        eq = M1IndicatorStream()
+        sliding_ok = True
+        for end in range(50, 120):
+            window = bars[end - 50:end]
+            sliding_ok &= eq.sync(window)[20:] == batch_rows(window)[20:]
+        checks.append(make_check("entry_qualifier_sliding_rows_equal", True, sliding_ok))
+
+        eq = M1IndicatorStream()
+        eq.sync(bars[:20] + bars[21:40])
+        checks.append(make_check("entry_qualifier_backfill_rows_equal", True,
+                                 eq.sync(bars[:45]) == batch_rows(bars[:45])))
+
+        eq = M1IndicatorStream()
+        eq.sync(bars[:50])
+        revised = [dict(bar) for bar in bars[:51]]
+        revised[-5]["close"] += 0.5
+        checks.append(make_check("entry_qualifier_revision_rows_equal", True,
+                                 eq.sync(revised) == batch_rows(revised)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,257 @@
+"""
+Test 43: Does the batched PDV give the same PDVResult as calculate_pdv with far fewer requests?
+Source: 00_shared/calculations/pdv/batch.py - PDVBatch, calculate_pdv_batch, daily_levels
+        01_application/data/polygon_client.py - fetch_grouped_daily, grouped_daily_table
+
+A PolygonClient subclass serves deterministic bars from memory in place of
+the bar store and the grouped daily endpoint, so the real fetch_* methods
+run. Structure direction (MarketStructureCalculator) is replaced by a
+deterministic stand-in in both modules. The universe includes tickers with
+no pre-market bars (hourly fallback), a flat prior session, a short
+history (no ATR), a halt the day before and no data at all.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import zlib
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_check
+
+import data.polygon_client as polygon_client_module
+from data.cache_manager import CacheManager
+from data.polygon_client import PolygonClient, grouped_daily_table
+from shared.calculations.pdv import PDVBatch, calculate_pdv, calculate_pdv_batch
+from shared.calculations.pdv import batch as batch_module
+from shared.calculations.pdv import calculator as calculator_module
+from shared.calculations.pdv.batch import daily_levels
+
+ET = ZoneInfo("America/New_York")
+MONDAY = date(2026, 3, 16)
+WEDNESDAY = date(2026, 3, 18)
+HOLIDAY = date(2026, 2, 16)
+UNIVERSE = ["AAPL", "MSFT", "NVDA", "AMD", "TSLA", "NOPRE", "FLAT", "NEW", "HALT", "GONE"]
+
+
+def trading_days(ticker):
+    days = [date(2025, 12, 1) + timedelta(days=i) for i in range(120)]
+    days = [d for d in days if d.weekday() < 5 and d != HOLIDAY]
+    if ticker == "GONE":
+        return []
+    if ticker == "NEW":
+        return [d for d in days if d >= date(2026, 3, 4)]
+    if ticker == "HALT":
+        return [d for d in days if d not in (date(2026, 3, 13), date(2026, 3, 17))]
+    return days
+
+
+def minute_stamps(day, step_minutes, first_hour=4, last_hour=20):
+    start = datetime.combine(day, time(first_hour), tzinfo=ET)
+    count = (last_hour - first_hour) * 60 // step_minutes
+    return [int((start + timedelta(minutes=step_minutes * i)).timestamp() * 1000) for i in range(count)]
+
+
+def random_bars(seed, stamps, base, flat=False):
+    rng = np.random.RandomState(seed)
+    n = len(stamps)
+    close = base + np.cumsum(rng.normal(0, base * 0.002, n))
+    open_ = np.r_[close[:1], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, base * 0.001, n)
+    low = np.minimum(open_, close) - rng.uniform(0, base * 0.001, n)
+    volume = rng.randint(100, 20_000, n).astype(np.float64)
+    if flat:
+        open_ = high = low = close = np.full(n, base)
+    return pd.DataFrame({"t": np.asarray(stamps, dtype=np.int64), "o": open_, "h": high,
+                         "l": low, "c": close, "v": volume})
+
+
+def build_store():
+    """{(ticker, multiplier, timespan): raw frame} for the whole universe."""
+    store = {}
+    for k, ticker in enumerate(UNIVERSE):
+        days = trading_days(ticker)
+        seed = zlib.crc32(ticker.encode())
+        base = 50.0 + 40 * k
+        daily_stamps = [int(datetime.combine(d, time(0), tzinfo=ET).timestamp() * 1000) for d in days]
+        store[(ticker, 1, "day")] = random_bars(seed, daily_stamps, base)
+
+        five, hourly = [], []
+        for i, day in enumerate(days[-12:]):
+            flat = ticker == "FLAT" and day == date(2026, 3, 13)
+            stamps = minute_stamps(day, 5)
+            if ticker == "NOPRE" and day in (MONDAY, WEDNESDAY):
+                stamps = [t for t in stamps if t >= int(datetime.combine(day, time(9, 30), tzinfo=ET).timestamp() * 1000)]
+            five.append(random_bars(seed + i, stamps, base, flat=flat))
+            hourly.append(random_bars(seed + 100 + i, minute_stamps(day, 60), base))
+        empty = random_bars(0, [], base)
+        store[(ticker, 5, "minute")] = pd.concat(five or [empty], ignore_index=True)
+        store[(ticker, 1, "hour")] = pd.concat(hourly or [empty], ignore_index=True)
+    return store
+
+
+STORE = build_store()
+
+
+class MemoryClient(PolygonClient):
+    """PolygonClient reading bars and grouped daily responses from STORE."""
+
+    RETRY_DELAY = 0.0
+
+    def __init__(self, fail_grouped=()):
+        super().__init__(api_key="test")
+        self.reads = []
+        self.grouped_requests = []
+        self.fail_grouped = set(fail_grouped)
+
+    def _rate_limit(self, endpoint: str = "default"):
+        pass
+
+    def _read_raw(self, ticker, multiplier, timespan, start_date, end_date=None, end_timestamp=None):
+        """Bar store semantics: Eastern trading dates in range, optional exclusive cutoff."""
+        self.reads.append((ticker, multiplier, timespan))
+        if end_timestamp is not None:
+            end_date = end_timestamp.astimezone(ET).date()
+        raw = STORE.get((ticker, multiplier, timespan), random_bars(0, [], 1.0))
+        et_dates = pd.to_datetime(raw["t"], unit="ms", utc=True).dt.tz_convert(ET).dt.date
+        raw = raw[(et_dates >= start_date) & (et_dates <= (end_date or date.today()))]
+        if end_timestamp is not None:
+            raw = raw[raw["t"] < int(end_timestamp.timestamp() * 1000)]
+        return raw.reset_index(drop=True)
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        day = date.fromisoformat(url.rsplit("/", 1)[1])
+        self.grouped_requests.append(day)
+        if day in self.fail_grouped:
+            raise ConnectionError("grouped daily outage")
+        results = []
+        for ticker in UNIVERSE + ["SPY"]:
+            raw = STORE.get((ticker, 1, "day"))
+            if raw is None:
+                continue
+            day_ms = int(datetime.combine(day, time(0), tzinfo=ET).timestamp() * 1000)
+            for row in raw[raw["t"] == day_ms].itertuples():
+                results.append({"T": ticker, "o": row.o, "h": row.h, "l": row.l, "c": row.c,
+                                "v": row.v, "t": row.t})
+        return {"resultsCount": len(results), "results": results}
+
+
+def fake_direction(client, ticker, analysis_date, end_timestamp):
+    return ("Bull", "Bear", "Neutral", "Bull")[zlib.crc32(ticker.encode()) % 4]
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(calculator_module, "_get_structure_direction", fake_direction)
+    monkeypatch.setattr(batch_module, "_get_structure_direction", fake_direction)
+    monkeypatch.setattr(polygon_client_module, "response_cache",
+                        CacheManager(tmp_path / "cache", compaction_interval=None))
+
+
+def reference(analysis_date, client=None):
+    client = client or MemoryClient()
+    return {t: calculate_pdv(t, analysis_date, polygon_client=client) for t in UNIVERSE}, client
+
+
+class TestPDVBatch:
+    TEST_ID = "test_43_pdv_batch"
+    QUESTION = "Does the batched PDV give the same PDVResult as calculate_pdv with far fewer requests?"
+
+    @pytest.mark.parametrize("analysis_date", [MONDAY, WEDNESDAY])
+    def test_iter_results_match(self, result_writer, analysis_date):
+        expected, _ = reference(analysis_date)
+        actual = {r.ticker: r for r in calculate_pdv_batch(UNIVERSE, analysis_date, MemoryClient(),
+                                                           max_workers=3)}
+        assert actual == expected
+
+    def test_edge_cases_exercised(self, result_writer):
+        expected, _ = reference(MONDAY)
+        assert expected["GONE"].error == "Could not find prior trading day"
+        assert expected["FLAT"].error == "Could not calculate prior day volume profile"
+        assert expected["NEW"].d1_atr is None and expected["NEW"].alignment is None
+        assert expected["HALT"].prior_day_date == date(2026, 3, 12)
+        assert expected["NOPRE"].price_at_0800 is not None
+        assert sum(r.alignment is not None for r in expected.values()) >= 5
+
+    def test_calculate_one_ticker(self, result_writer):
+        expected, _ = reference(MONDAY)
+        batch = PDVBatch(UNIVERSE, MONDAY, MemoryClient()).prepare()
+        for ticker in ("aapl", "NOPRE", "FLAT", "GONE"):
+            assert batch.calculate(ticker) == expected[ticker.upper()]
+
+    def test_chunked_profiles(self, result_writer):
+        expected, _ = reference(WEDNESDAY)
+        batch = PDVBatch(UNIVERSE, WEDNESDAY, MemoryClient())
+        assert {r.ticker: r for r in batch.iter_results(max_workers=2, chunk_size=3)} == expected
+
+    def test_per_ticker_fallback(self, result_writer):
+        """Without grouped daily bars (or with a failed date) results are unchanged."""
+        expected, _ = reference(MONDAY)
+        failing = MemoryClient(fail_grouped={date(2026, 3, 10)})
+        assert {r.ticker: r for r in calculate_pdv_batch(UNIVERSE, MONDAY, failing)} == expected
+        assert len(failing.reads) > 0
+
+        batch = PDVBatch(UNIVERSE, MONDAY, MemoryClient())
+        assert batch.calculate("MSFT") == expected["MSFT"]
+
+    def test_daily_levels_vectorized(self, result_writer):
+        client = MemoryClient()
+        frames = []
+        for ticker in UNIVERSE:
+            df = client.fetch_daily_bars(ticker, date(2026, 1, 1), MONDAY)
+            if not df.empty:
+                frames.append(df[["date", "high", "low", "close"]].assign(ticker=ticker))
+        levels = daily_levels(pd.concat(frames, ignore_index=True), MONDAY)
+        for ticker in UNIVERSE:
+            expected = (calculator_module._find_prior_trading_day(client, ticker, MONDAY),
+                        calculator_module._calculate_d1_atr(client, ticker, MONDAY))
+            assert levels.get(ticker, (None, None)) == expected
+        assert daily_levels(pd.DataFrame(columns=["ticker", "date", "high", "low", "close"]), MONDAY) == {}
+
+    def test_grouped_daily_table_and_cache(self, result_writer):
+        table = grouped_daily_table({"results": [
+            {"T": "AAPL", "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 100.0},
+            {"T": "MSFT", "o": 3.0, "h": 4.0, "l": 2.5, "c": 3.5},
+            {"o": 9.0},
+        ]})
+        assert list(table["ticker"]) == ["AAPL", "MSFT"]
+        assert table["close"].tolist() == [1.5, 3.5] and np.isnan(table["volume"][1])
+        assert grouped_daily_table({"resultsCount": 0}).empty
+
+        client = MemoryClient()
+        first = client.fetch_grouped_daily(date(2026, 3, 13))
+        second = client.fetch_grouped_daily(date(2026, 3, 13))
+        pd.testing.assert_frame_equal(first, second)
+        assert client.grouped_requests == [date(2026, 3, 13)]
+        assert client.fetch_grouped_daily(date(2026, 3, 14)).empty
+
+        failing = MemoryClient(fail_grouped={date(2026, 3, 12)})
+        assert failing.fetch_grouped_daily(date(2026, 3, 12)) is None
+        assert len(failing.grouped_requests) == failing.MAX_RETRIES
+
+    def test_full_suite(self, result_writer):
+        """Run all checks and write JSON result."""
+        checks = []
+        expected, per_ticker_client = reference(MONDAY)
+
+        batch_client = MemoryClient()
+        actual = {r.ticker: r for r in calculate_pdv_batch(UNIVERSE, MONDAY, batch_client)}
+        checks.append(make_check("tickers_returned", len(UNIVERSE), len(actual)))
+        checks.append(make_check("results_equal", True, actual == expected))
+        checks.append(make_check("aligned_results", sum(r.alignment is not None for r in expected.values()),
+                                 sum(r.alignment is not None for r in actual.values())))
+
+        # Bar reads: per ticker ~4 (prior day probes, 5-min VP, 5-min price, daily ATR);
+        # batched, one 5-min read per ticker plus the hourly fallback
+        checks.append(make_check("per_ticker_bar_reads", 41, len(per_ticker_client.reads)))
+        checks.append(make_check("batch_bar_reads", 10, len(batch_client.reads)))
+        checks.append(make_check("batch_daily_reads", 0,
+                                 sum(timespan == "day" for _, _, timespan in batch_client.reads)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,321 @@
+"""
+Test 44: Does the grouped-daily phase one give the same scan with per-ticker requests only for survivors?
+Source: 01_application/scanner/scanner.py - TwoPhaseScanner._daily_history, _phase1_filter
+        01_application/scanner/data/universe_table.py - UniverseTable
+
+A PolygonClient subclass serves deterministic daily and minute bars from
+memory (bar store reads and grouped daily responses), and the short
+interest fetcher is replaced by a stand-in. The list has tickers that fail
+each hard filter: ATR, price, gap, a single daily bar and no data at all.
+Each scan is compared with the per-ticker path (grouped daily unavailable).
+"""
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "01_application"))
+
+import zlib
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_check
+
+import data.polygon_client as polygon_client_module
+import scanner.scanner as scanner_module
+from data.cache_manager import CacheManager
+from data.polygon_client import PolygonClient
+from scanner.config import scanner_config
+from scanner.data.universe_table import UniverseTable
+from scanner.filters import FilterPhase
+
+ET = ZoneInfo("America/New_York")
+SCAN_DATE = datetime(2026, 3, 18, 12, 0, tzinfo=timezone.utc)
+
+# ticker -> (price level, daily range as a fraction of price, overnight gap)
+PROFILES = {
+    "BIGA": (250.0, 0.03, 0.030),
+    "BIGB": (310.0, 0.025, -0.045),
+    "BIGC": (180.0, 0.03, 0.004),    # fails gap
+    "BIGD": (420.0, 0.02, 0.022),
+    "BIGE": (95.0, 0.05, -0.028),
+    "SLOW": (30.0, 0.01, 0.05),      # fails ATR
+    "CHEAP": (8.0, 0.40, 0.06),      # fails price
+    "NEWT": (150.0, 0.05, 0.05),     # one daily bar
+    "NONE": (100.0, 0.05, 0.05),     # no data
+}
+TICKERS = list(PROFILES)
+
+
+def weekdays(start, end):
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [d for d in days if d.weekday() < 5]
+
+
+def build_store():
+    store = {}
+    for ticker, (price, spread, gap) in list(PROFILES.items()) + [("SPY", (560.0, 0.01, 0.0))]:
+        rng = np.random.RandomState(zlib.crc32(ticker.encode()))
+        days = [] if ticker == "NONE" else weekdays(date(2026, 2, 2), date(2026, 3, 18))
+        if ticker == "NEWT":
+            days = [date(2026, 3, 17), date(2026, 3, 18)]
+        n = len(days)
+        close = price * (1 + np.cumsum(rng.normal(0, spread / 3, n)))
+        open_ = np.r_[close[:1], close[:-1]]
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, spread, n))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, spread, n))
+        store[(ticker, 1, "day")] = pd.DataFrame({
+            "t": [int(datetime.combine(d, time(0), tzinfo=ET).timestamp() * 1000) for d in days],
+            "o": open_, "h": high, "l": low, "c": close,
+            "v": rng.randint(1_000_000, 9_000_000, n).astype(np.float64),
+        })
+
+        # 1-min bars 04:00-20:00 ET around the scan; the scan day trades at the gap
+        prior_close = close[days.index(date(2026, 3, 17))] if date(2026, 3, 17) in days else price
+        minute = []
+        for day in (date(2026, 3, 16), date(2026, 3, 17), SCAN_DATE.date()):
+            if not days:
+                break
+            level = prior_close * (1 + gap) if day == SCAN_DATE.date() else prior_close
+            start = int(datetime.combine(day, time(4), tzinfo=ET).timestamp() * 1000)
+            m = 960
+            c = level * (1 + np.cumsum(rng.normal(0, 0.0003, m)))
+            minute.append(pd.DataFrame({
+                "t": start + 60_000 * np.arange(m, dtype=np.int64),
+                "o": np.r_[c[:1], c[:-1]], "h": c * 1.0005, "l": c * 0.9995, "c": c,
+                "v": rng.randint(100, 5_000, m).astype(np.float64),
+            }))
+        store[(ticker, 1, "minute")] = pd.concat(minute, ignore_index=True) if minute else None
+    return store
+
+
+STORE = build_store()
+
+
+class MemoryClient(PolygonClient):
+    """PolygonClient reading bars and grouped daily responses from STORE."""
+
+    RETRY_DELAY = 0.0
+
+    def __init__(self, grouped=True):
+        super().__init__(api_key="test")
+        self.reads = []
+        self.grouped_requests = []
+        self.grouped = grouped
+
+    def _rate_limit(self, endpoint: str = "default"):
+        pass
+
+    def _read_raw(self, ticker, multiplier, timespan, start_date, end_date=None, end_timestamp=None):
+        self.reads.append((ticker, timespan))
+        if end_timestamp is not None:
+            end_date = end_timestamp.astimezone(ET).date()
+        raw = STORE.get((ticker, multiplier, timespan))
+        if raw is None:
+            return pd.DataFrame(columns=["t", "o", "h", "l", "c", "v"])
+        et_dates = pd.to_datetime(raw["t"], unit="ms", utc=True).dt.tz_convert(ET).dt.date
+        raw = raw[(et_dates >= start_date) & (et_dates <= (end_date or date.today()))]
+        if end_timestamp is not None:
+            raw = raw[raw["t"] < int(end_timestamp.timestamp() * 1000)]
+        return raw.reset_index(drop=True)
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        day = date.fromisoformat(url.rsplit("/", 1)[1])
+        self.grouped_requests.append(day)
+        if not self.grouped:
+            raise ConnectionError("grouped daily unavailable")
+        day_ms = int(datetime.combine(day, time(0), tzinfo=ET).timestamp() * 1000)
+        results = []
+        for (ticker, _, timespan), raw in STORE.items():
+            if timespan == "day":
+                for row in raw[raw["t"] == day_ms].itertuples():
+                    results.append({"T": ticker, "o": row.o, "h": row.h, "l": row.l, "c": row.c, "v": row.v})
+        return {"results": results}
+
+
+class CountingClient(MemoryClient):
+    """MemoryClient recording every fetch_grouped_daily call, cached or not."""
+
+    def __init__(self, grouped=True):
+        super().__init__(grouped)
+        self.grouped_fetches = []
+
+    def fetch_grouped_daily(self, day):
+        self.grouped_fetches.append(day)
+        return super().fetch_grouped_daily(day)
+
+
+class StubShortFetcher:
+    """ShortInterestFetcher stand-in: deterministic data, records what was loaded."""
+
+    def __init__(self, api_key=None):
+        self.loaded = []
+
+    def load_short_data_for_tickers(self, tickers, reference_date=None, force_refresh=False):
+        self.loaded = list(tickers)
+
+    def fetch_short_interest(self, ticker, reference_date=None):
+        seed = zlib.crc32(ticker.encode())
+        return {"short_interest_percent": (seed % 900) / 100.0, "short_interest_shares": seed % 10_000_000,
+                "days_to_cover": (seed % 50) / 10.0, "data_date": "2026-03-13"}
+
+
+class StubTickerManager:
+    def get_tickers(self, ticker_list=None):
+        return list(TICKERS)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(polygon_client_module, "response_cache",
+                        CacheManager(tmp_path / "response_cache", compaction_interval=None))
+
+
+@pytest.fixture
+def make_scanner(monkeypatch, tmp_path):
+    monkeypatch.setattr(scanner_config, "DATA_CACHE_DIR", tmp_path / "scanner_cache")
+    monkeypatch.setattr(scanner_module, "ShortInterestFetcher", StubShortFetcher)
+    monkeypatch.setattr(scanner_module, "TickerManager", StubTickerManager)
+
+    def make(grouped=True):
+        monkeypatch.setattr(scanner_module, "PolygonClient", lambda: MemoryClient(grouped))
+        return scanner_module.TwoPhaseScanner(parallel_workers=3)
+    return make
+
+
+def run(scanner):
+    """Ranked scan (index reset: it follows pool completion order) and progress calls."""
+    progress = []
+    result = scanner.run_scan(SCAN_DATE, lambda done, total, ticker: progress.append((done, total, ticker)))
+    return result.reset_index(drop=True), progress
+
+
+class TestScannerUniverse:
+    TEST_ID = "test_44_scanner_universe"
+    QUESTION = ("Does the grouped-daily phase one give the same scan with per-ticker "
+                "requests only for survivors?")
+
+    def test_same_ranking(self, result_writer, make_scanner):
+        expected, _ = run(make_scanner(grouped=False))
+        actual, _ = run(make_scanner())
+        assert sorted(actual["ticker"]) == ["BIGA", "BIGB", "BIGD", "BIGE"]
+        pd.testing.assert_frame_equal(actual, expected)
+
+    @pytest.mark.parametrize("min_atr", [0.5, 2.0, 8.0])
+    def test_daily_history_matches_calculate_atr(self, result_writer, make_scanner, min_atr):
+        scanner = make_scanner()
+        scanner.filter_phase = FilterPhase(min_atr=min_atr)
+        history = scanner._daily_history(SCAN_DATE)
+
+        client = MemoryClient()
+        expected = {}
+        for ticker in TICKERS:
+            df = client.fetch_daily_bars(ticker, date(2026, 2, 25), date(2026, 3, 17))
+            if len(df) >= 2 and scanner._calculate_atr(df) >= min_atr:
+                expected[ticker] = (df["close"].iloc[-1], scanner._calculate_atr(df))
+        assert {t: (r.prior_close, r.atr) for t, r in history.iterrows()} == expected
+
+    def test_survivors_only_fetched(self, result_writer, make_scanner):
+        scanner = make_scanner()
+        run(scanner)
+        fetched = {ticker for ticker, timespan in scanner.polygon_client.reads if timespan == "minute"}
+        assert not any(timespan == "day" for _, timespan in scanner.polygon_client.reads)
+        assert fetched == set(scanner.short_fetcher.loaded)
+        assert fetched.isdisjoint({"SLOW", "NEWT", "NONE"})
+
+    def test_universe_persists_between_scans(self, result_writer, make_scanner):
+        first = make_scanner()
+        expected, _ = run(first)
+        assert len(first.polygon_client.grouped_requests) == 15
+
+        second = make_scanner()
+        actual, _ = run(second)
+        assert second.polygon_client.grouped_requests == []
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_progress_counts_filtered_tickers(self, result_writer, make_scanner):
+        scanner = make_scanner()
+        _, progress = run(scanner)
+        survivors = len(scanner.short_fetcher.loaded)
+        assert progress[0] == (len(TICKERS) - survivors, len(TICKERS), "daily bars")
+        assert progress[-1][:2] == (len(TICKERS), len(TICKERS))
+
+    def test_universe_table(self, result_writer, tmp_path):
+        tmp_path = tmp_path / "universe"
+        table = UniverseTable(MemoryClient(), cache_dir=tmp_path)
+        daily = table.daily_bars(date(2026, 3, 13), date(2026, 3, 17), ["BIGA", "NEWT"])
+        assert list(daily.columns) == ["ticker", "date", "open", "high", "low", "close", "volume"]
+        assert list(zip(daily["ticker"], daily["date"])) == [
+            ("BIGA", date(2026, 3, 13)), ("BIGA", date(2026, 3, 16)), ("BIGA", date(2026, 3, 17)),
+            ("NEWT", date(2026, 3, 17)),
+        ]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "2026-03-13.parquet", "2026-03-16.parquet", "2026-03-17.parquet"]
+        assert table.daily_bars(date(2026, 3, 14), date(2026, 3, 15)).empty
+
+        offline = UniverseTable(MemoryClient(grouped=False), cache_dir=tmp_path)
+        assert len(offline.daily_bars(date(2026, 3, 13), date(2026, 3, 17))) > 0
+        assert offline.daily_bars(date(2026, 3, 12), date(2026, 3, 13)) is None
+
+    def test_universe_files_expire(self, result_writer, tmp_path):
+        """Files older than max_age_seconds are refetched; the expired copy is the offline fallback."""
+        tmp_path = tmp_path / "universe"
+        day = date(2026, 3, 13)
+        path = tmp_path / "2026-03-13.parquet"
+        first = UniverseTable(CountingClient(), cache_dir=tmp_path, max_age_seconds=3600)
+        expected = first.day(day)
+
+        def same(table):
+            pd.testing.assert_frame_equal(table, expected, check_dtype=False)
+            return True
+
+        reuse = UniverseTable(CountingClient(), cache_dir=tmp_path, max_age_seconds=3600)
+        assert same(reuse.day(day)) and reuse.client.grouped_fetches == []
+
+        old = path.stat().st_mtime - 7200
+        os.utime(path, (old, old))
+        refetch = UniverseTable(CountingClient(), cache_dir=tmp_path, max_age_seconds=3600)
+        assert same(refetch.day(day)) and refetch.client.grouped_fetches == [day]
+        assert path.stat().st_mtime > old + 3600
+
+        # Tables held in memory expire too
+        refetch.day(day)
+        refetch.max_age_seconds = 0
+        refetch.day(day)
+        assert refetch.client.grouped_fetches == [day, day]
+
+        os.utime(path, (old, old))
+        offline = UniverseTable(CountingClient(grouped=False), cache_dir=tmp_path, max_age_seconds=3600)
+        assert same(offline.day(day)) and offline.client.grouped_fetches == [day]
+        assert UniverseTable(CountingClient(grouped=False), cache_dir=tmp_path).day(date(2026, 3, 12)) is None
+
+    def test_full_suite(self, result_writer, make_scanner):
+        """Run all checks and write JSON result."""
+        checks = []
+        per_ticker = make_scanner(grouped=False)
+        expected, _ = run(per_ticker)
+        grouped = make_scanner()
+        actual, _ = run(grouped)
+
+        checks.append(make_check("ranked_tickers", list(expected["ticker"]), list(actual["ticker"])))
+        checks.append(make_check("results_equal", True, actual.equals(expected)))
+
+        def bar_reads(client):
+            return sum(timespan != "day" for _, timespan in client.reads), \
+                sum(timespan == "day" for _, timespan in client.reads)
+
+        checks.append(make_check("per_ticker_daily_reads", len(TICKERS), bar_reads(per_ticker.polygon_client)[1]))
+        checks.append(make_check("grouped_daily_reads", 0, bar_reads(grouped.polygon_client)[1]))
+        checks.append(make_check("grouped_minute_reads_survivors_only", 3 * len(grouped.short_fetcher.loaded),
+                                 bar_reads(grouped.polygon_client)[0]))
+        checks.append(make_check("per_ticker_minute_reads", 3 * 6, bar_reads(per_ticker.polygon_client)[0]))
+
+        repeat = make_scanner()
+        run(repeat)
+        checks.append(make_check("repeat_scan_grouped_requests", 0, len(repeat.polygon_client.grouped_requests)))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
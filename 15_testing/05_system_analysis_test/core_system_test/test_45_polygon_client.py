@@ -0,0 +1,199 @@
+"""
+Test 45: Does the shared Polygon client page, merge and stream bar windows correctly?
+Source: 00_shared/data/polygon/client.py - PolygonClient.get_bars, iter_bars
+
+_make_request is replaced by FakeAggsApi, which serves 15-second bars for
+every weekday in the requested span, pages them through next_url and, like
+the live API, repeats boundary bars: each window also returns the last
+bars of the day before it, and each page repeats the last bar of the page
+before. The bar store is disabled so every window goes to the fake.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from conftest import make_check
+
+# Importing the shared.data package needs live credentials
+client_module = pytest.importorskip("shared.data.polygon.client")
+from shared.data import bar_store
+
+PolygonClient = client_module.PolygonClient
+
+BARS_PER_DAY = 6
+OVERLAP_BARS = 2
+# Six S15 request windows; START is a Monday, so only later windows overlap
+START, END = date(2024, 1, 1), date(2024, 2, 15)
+
+
+def day_bars(day):
+    """Raw aggregates of one weekday: BARS_PER_DAY bars from 14:30 UTC."""
+    if day.weekday() >= 5:
+        return []
+    open_ms = int(datetime(day.year, day.month, day.day, 14, 30, tzinfo=timezone.utc).timestamp() * 1000)
+    return [{"t": open_ms + i * 15_000, "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 100 + i}
+            for i in range(BARS_PER_DAY)]
+
+
+def bar_times(df):
+    """Epoch ms of a get_bars frame's timestamps."""
+    return [int(ts.timestamp() * 1000) for ts in df["timestamp"]]
+
+
+def expected_timestamps(start=START, end=END):
+    out = []
+    day = start
+    while day <= end:
+        out.extend(bar["t"] for bar in day_bars(day))
+        day += timedelta(days=1)
+    return out
+
+
+class FakeAggsApi:
+    """Aggregates endpoint with next_url pages, overlapping windows and request delay."""
+
+    def __init__(self, base_url, delay=0.01):
+        self.base_url = base_url
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.windows = []          # (from, to) of every first-page request
+        self.pages = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._cursors = {}
+
+    def __call__(self, endpoint, params=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.pages += 1
+        try:
+            time.sleep(self.delay)
+            return self._respond(endpoint, dict(params or {}))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _respond(self, endpoint, params):
+        if endpoint.startswith("/cursor/"):
+            records, offset, limit = self._cursors[endpoint]
+        else:
+            parts = endpoint.split("/")
+            start, end = date.fromisoformat(parts[-2]), date.fromisoformat(parts[-1])
+            with self.lock:
+                self.windows.append((start, end))
+            records = day_bars(start - timedelta(days=1))[-OVERLAP_BARS:]
+            day = start
+            while day <= end:
+                records.extend(day_bars(day))
+                day += timedelta(days=1)
+            offset, limit = 0, int(params["limit"])
+
+        page = records[max(0, offset - 1):offset + limit]
+        response = {"results": page, "resultsCount": len(page)}
+        if offset + limit < len(records):
+            cursor = f"/cursor/{id(records)}/{offset + limit}"
+            with self.lock:
+                self._cursors[cursor] = (records, offset + limit, limit)
+            response["next_url"] = self.base_url + cursor
+        return response
+
+
+@pytest.fixture
+def no_bar_store():
+    previous = (bar_store._store, bar_store._store_configured)
+    bar_store.configure_bar_store(enabled=False)
+    yield
+    bar_store._store, bar_store._store_configured = previous
+
+
+def make_client(monkeypatch, max_workers=3, delay=0.01):
+    client = PolygonClient(api_key="test", max_workers=max_workers)
+    api = FakeAggsApi(client.base_url, delay)
+    monkeypatch.setattr(client, "_make_request", api)
+    return client, api
+
+
+class TestPolygonClient:
+    TEST_ID = "test_45_polygon_client"
+    QUESTION = "Does the shared Polygon client page, merge and stream bar windows correctly?"
+
+    def test_follows_next_url(self, result_writer, monkeypatch, no_bar_store):
+        """Every next_url page is fetched, so a window is never truncated."""
+        client, api = make_client(monkeypatch)
+        df = client.get_bars("aapl", "S15", date(2024, 1, 8), date(2024, 1, 10), limit=4)
+        assert bar_times(df) == expected_timestamps(date(2024, 1, 8), date(2024, 1, 10))
+        # 18 bars in pages of 4, each page repeating the bar before it
+        assert api.windows == [(date(2024, 1, 8), date(2024, 1, 10))]
+        assert api.pages == 5
+
+    def test_concurrent_windows_merged_without_duplicates(self, result_writer, monkeypatch, no_bar_store):
+        """Windows fetched concurrently come back in timestamp order with each bar once."""
+        client, api = make_client(monkeypatch, max_workers=3)
+        df = client.get_bars("AAPL", "S15", START, END, limit=7)
+        t = bar_times(df)
+        assert t == expected_timestamps()
+        assert len(api.windows) == 6
+        assert 1 < api.max_in_flight <= 3
+        assert str(df["timestamp"].dt.tz) == "America/New_York"
+
+    def test_iter_bars_chunks_match_get_bars(self, result_writer, monkeypatch, no_bar_store):
+        """iter_bars yields non-overlapping chunks that concatenate to get_bars."""
+        client, _ = make_client(monkeypatch)
+        chunks = list(client.iter_bars("AAPL", "S15", START, END, limit=50))
+        assert len(chunks) == 6
+        for before, after in zip(chunks, chunks[1:]):
+            assert before["timestamp"].iloc[-1] < after["timestamp"].iloc[0]
+        t = [ts for c in chunks for ts in bar_times(c)]
+        assert t == expected_timestamps()
+
+    def test_early_close_cancels_queued_windows(self, result_writer, monkeypatch, no_bar_store):
+        """Closing the generator after one chunk leaves the later windows unrequested."""
+        client, api = make_client(monkeypatch, max_workers=2)
+        chunks = client.iter_bars("AAPL", "S15", START, END, limit=50)
+        first = next(chunks)
+        chunks.close()
+        assert not first.empty
+        # The first window plus at most max_workers in flight behind it
+        assert len(api.windows) <= 3
+        assert api.in_flight == 0
+
+    def test_empty_range(self, result_writer, monkeypatch, no_bar_store):
+        """A weekend-only range returns an empty frame."""
+        client, api = make_client(monkeypatch)
+        assert client.get_bars("AAPL", "S15", date(2024, 1, 7), date(2024, 1, 7)).empty
+        assert list(client.iter_bars("AAPL", "S15", date(2024, 1, 7), date(2024, 1, 6))) == []
+
+    def test_rate_limit_delay_deprecated(self, result_writer):
+        """The old positional rate_limit_delay still works, with a DeprecationWarning."""
+        with pytest.warns(DeprecationWarning):
+            client = PolygonClient("test", 0.05)
+        assert client.rate_limit_delay == 0.05 and client._spacing.rate == pytest.approx(20.0)
+        assert PolygonClient("test")._spacing is None
+
+    def test_full_suite(self, result_writer, monkeypatch, no_bar_store):
+        """Run all checks and write JSON result."""
+        checks = []
+
+        client, api = make_client(monkeypatch, max_workers=3)
+        df = client.get_bars("AAPL", "S15", START, END, limit=7)
+        t = bar_times(df)
+        checks.append(make_check("windows", 6, len(api.windows)))
+        checks.append(make_check("bars", len(expected_timestamps()), len(t)))
+        checks.append(make_check("ordered_unique", True, t == sorted(set(t))))
+        checks.append(make_check("all_pages_followed", True, t == expected_timestamps()))
+        checks.append(make_check("concurrent_windows", True, 1 < api.max_in_flight <= 3))
+
+        client, api = make_client(monkeypatch, max_workers=2)
+        chunks = client.iter_bars("AAPL", "S15", START, END, limit=50)
+        next(chunks)
+        chunks.close()
+        checks.append(make_check("early_close_windows_bounded", True, len(api.windows) <= 3))
+
+        result_writer.write_validation(self.TEST_ID, self.QUESTION, checks)
+        assert all(c["passed"] for c in checks)
@@ -0,0 +1,255 @@
+"""
+Benchmark Cases
+Hot paths timed by run_benchmarks.py, each against seeded synthetic data.
+
+A case is a setup function registered with @case. Setup builds the input
+data for a Scale (untimed) and returns (fn, items): fn is the zero-argument
+call that gets timed, items the workload size used for throughput.
+
+Modules from 01_application and 03_backtest are loaded with
+import_isolated(), because both trees have top-level `config`, `data` and
+`models` modules that would otherwise shadow each other.
+"""
+
+import importlib
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from generators import Scale, make_bars, make_trades, make_zones
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent    # Epoch_v3/
+SHARED_ROOT = PROJECT_ROOT / "00_shared"
+APPLICATION_ROOT = PROJECT_ROOT / "01_application"
+BACKTEST_ROOT = PROJECT_ROOT / "03_backtest"
+
+if str(SHARED_ROOT) not in sys.path:
+    sys.path.insert(0, str(SHARED_ROOT))
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    description: str
+    setup: Callable[[Scale, int], Tuple[Callable[[], Any], int]]
+
+
+CASES: Dict[str, BenchmarkCase] = {}
+
+
+def case(name: str, description: str):
+    """Register a benchmark setup function."""
+    def register(setup):
+        CASES[name] = BenchmarkCase(name, description, setup)
+        return setup
+    return register
+
+
+def import_isolated(root: Path, module: str):
+    """
+    Import `module` with `root` first on sys.path and its top-level names unshadowed.
+
+    Modules already loaded under the same top-level names (e.g. another
+    tree's `config`) are set aside during the import and restored after,
+    so cases from different trees can run in one process.
+    """
+    local = {p.stem for p in root.iterdir()
+             if p.suffix == ".py" or (p.is_dir() and (p / "__init__.py").exists())}
+    saved_path = list(sys.path)
+    saved = {name: sys.modules.pop(name) for name in list(sys.modules)
+             if name.split(".")[0] in local}
+    sys.path.insert(0, str(root))
+    try:
+        return importlib.import_module(module)
+    finally:
+        sys.path[:] = saved_path
+        for name in list(sys.modules):
+            if name.split(".")[0] in local:
+                del sys.modules[name]
+        sys.modules.update(saved)
+
+
+def _daily_atr(d1: pd.DataFrame, period: int = 14) -> float:
+    prev_close = d1["close"].shift(1)
+    tr = pd.concat([
+        d1["high"] - d1["low"],
+        (d1["high"] - prev_close).abs(),
+        (d1["low"] - prev_close).abs(),
+    ], axis=1).max(axis=1)
+    return float(tr.tail(period).mean())
+
+
+# =============================================================================
+# SHARED INDICATORS / CALCULATIONS
+# =============================================================================
+
+@case("volume_profile", "Per-session POC/VAH/VAL over M1 bars (volume_profile_df)")
+def volume_profile(scale: Scale, seed: int):
+    from shared.indicators.core.volume_profile import volume_profile_df
+
+    m1 = make_bars("M1", scale.intraday_days, seed=seed)
+    return (lambda: volume_profile_df(m1)), len(m1)
+
+
+@case("fractals", "Fractal high/low detection over M1 bars (detect_fractals)")
+def fractals(scale: Scale, seed: int):
+    from shared.indicators.structure import detect_fractals
+
+    m1 = make_bars("M1", scale.intraday_days, seed=seed)
+    return (lambda: detect_fractals(m1)), len(m1)
+
+
+@case("bar_list_indicators", "ATR/SMA/ROC/delta/CVD/VWAP bar-list wrappers at every M1 bar (BarArray)")
+def bar_list_indicators(scale: Scale, seed: int):
+    from shared.indicators import (
+        BarArray, calculate_atr, calculate_cvd_slope, calculate_rolling_delta,
+        calculate_sma_spread, calculate_volume_roc, calculate_vwap,
+    )
+
+    m1 = make_bars("M1", scale.intraday_days, seed=seed)
+    sessions = [BarArray.from_frame(day) for _, day in m1.groupby("bar_date", sort=True)]
+
+    def run():
+        for bars in sessions:
+            for i in range(len(bars)):
+                calculate_atr(bars, up_to_index=i)
+                calculate_sma_spread(bars, up_to_index=i)
+                calculate_volume_roc(bars, up_to_index=i)
+                calculate_rolling_delta(bars, up_to_index=i)
+                calculate_cvd_slope(bars, up_to_index=i)
+                calculate_vwap(bars, up_to_index=i)
+
+    return run, len(m1)
+
+
+@case("market_structure", "Fractal anchor + BOS/ChoCH walk-forward over M5 bars")
+def market_structure(scale: Scale, seed: int):
+    from shared.indicators.structure import get_market_structure
+
+    m5 = make_bars("M5", scale.intraday_days * 4, seed=seed)
+    return (lambda: get_market_structure(m5)), len(m5)
+
+
+@case("h1_zones", "H1 supply/demand pivots + zone walk-forward (calculate_h1_zones)")
+def h1_zones(scale: Scale, seed: int):
+    from shared.calculations.h1_supply_demand import calculate_h1_zones
+
+    h1 = make_bars("H1", scale.htf_days, seed=seed)
+    d1_atr = _daily_atr(make_bars("D1", scale.htf_days, seed=seed))
+    return (lambda: calculate_h1_zones(h1, "BENCH", d1_atr=d1_atr)), len(h1)
+
+
+@case("h4_zones", "H4 supply/demand pivots + zone walk-forward (calculate_h4_zones)")
+def h4_zones(scale: Scale, seed: int):
+    from shared.calculations.h4_supply_demand import calculate_h4_zones
+
+    h4 = make_bars("H4", scale.htf_days * 4, seed=seed)
+    d1_atr = _daily_atr(make_bars("D1", scale.htf_days * 4, seed=seed))
+    return (lambda: calculate_h4_zones(h4, "BENCH", d1_atr=d1_atr)), len(h4)
+
+
+@case("atr_stop", "ATR stop / R-level outcomes for a day's trades (prepare_bars + simulate_outcomes)")
+def atr_stop(scale: Scale, seed: int):
+    from shared.calculations.atr_stop import prepare_bars, simulate_outcomes
+
+    m1 = make_bars("M1", scale.intraday_days, seed=seed)
+    trades = make_trades(m1, scale.trades, seed=seed)
+    bars_by_date = {
+        d: day[["bar_time", "high", "low", "close"]].to_dict("records")
+        for d, day in m1.groupby("bar_date")
+    }
+
+    batches = []
+    for d in sorted({t["date"] for t in trades}):
+        day_trades = [t for t in trades if t["date"] == d]
+        entry_minutes, stops, r_prices, is_long = [], [], [], []
+        for t in day_trades:
+            long = t["direction"] == "LONG"
+            atr = t["entry_price"] * 0.003
+            sign = 1 if long else -1
+            entry_minutes.append(t["entry_time"].hour * 60 + t["entry_time"].minute)
+            stops.append(t["entry_price"] - sign * atr)
+            r_prices.append([t["entry_price"] + sign * r * atr for r in (1, 2, 3, 4, 5)])
+            is_long.append(long)
+        batches.append((bars_by_date[d], entry_minutes, stops, r_prices, is_long))
+
+    def run():
+        for bars, entry_minutes, stops, r_prices, is_long in batches:
+            simulate_outcomes(prepare_bars(bars), entry_minutes, stops, r_prices, is_long,
+                              eod_minutes=15 * 60 + 30)
+
+    return run, len(trades)
+
+
+# =============================================================================
+# 01_APPLICATION
+# =============================================================================
+
+@case("hvn_identifier", "$0.01 epoch volume profile + non-overlapping POC selection (HVNIdentifier)")
+def hvn_identifier(scale: Scale, seed: int):
+    module = import_isolated(APPLICATION_ROOT, "calculators.hvn_identifier")
+    CentVolumeProfile, HVNIdentifier = module.CentVolumeProfile, module.HVNIdentifier
+
+    m1 = make_bars("M1", scale.intraday_days, seed=seed, extended=True)
+    m1 = m1[["timestamp", "open", "high", "low", "close", "volume"]]
+    identifier = HVNIdentifier.__new__(HVNIdentifier)
+    atr = _daily_atr(make_bars("D1", 30, seed=seed))
+
+    def run():
+        profile = CentVolumeProfile().add_bars(m1)
+        return identifier._select_pocs_no_overlap(profile.to_dict(), atr)
+
+    return run, len(m1)
+
+
+# =============================================================================
+# 03_BACKTEST
+# =============================================================================
+
+@case("entry_detector", "EPCH1-4 entry detection over S15 bars with primary + secondary zones")
+def entry_detector(scale: Scale, seed: int):
+    EntryDetector = import_isolated(BACKTEST_ROOT, "engine.entry_models").EntryDetector
+
+    s15 = make_bars("S15", scale.intraday_days, seed=seed)
+    zones = make_zones(s15, max(2, scale.zones_per_day), seed=seed)
+    sessions = []
+    for d, day in s15.groupby("bar_date", sort=True):
+        primary = next(z for z in zones[d] if z["zone_type"] == "PRIMARY")
+        secondary = next(z for z in zones[d] if z["zone_type"] == "SECONDARY")
+        rows = list(zip(day["timestamp"].dt.to_pydatetime(), day["open"].tolist(),
+                        day["high"].tolist(), day["low"].tolist(), day["close"].tolist()))
+        sessions.append((rows, primary, secondary))
+
+    def run():
+        signals = 0
+        for rows, primary, secondary in sessions:
+            detector = EntryDetector()
+            for i, (ts, o, h, l, c) in enumerate(rows):
+                signals += len(detector.check_all_entries(i, ts, o, h, l, c, primary, secondary))
+                detector.update_prior_bar(o, h, l, c)
+        return signals
+
+    return run, len(s15)
+
+
+@case("entry_detector_batch", "EPCH1-4 entry detection over whole S15 sessions (detect_session_signals)")
+def entry_detector_batch(scale: Scale, seed: int):
+    detect_session_signals = import_isolated(BACKTEST_ROOT, "engine.entry_models").detect_session_signals
+
+    s15 = make_bars("S15", scale.intraday_days, seed=seed)
+    zones = make_zones(s15, max(2, scale.zones_per_day), seed=seed)
+    sessions = []
+    for d, day in s15.groupby("bar_date", sort=True):
+        primary = next(z for z in zones[d] if z["zone_type"] == "PRIMARY")
+        secondary = next(z for z in zones[d] if z["zone_type"] == "SECONDARY")
+        sessions.append((list(day["timestamp"].dt.to_pydatetime()), day["open"].to_numpy(),
+                         day["high"].to_numpy(), day["low"].to_numpy(), day["close"].to_numpy(),
+                         primary, secondary))
+
+    def run():
+        return sum(len(detect_session_signals(*session)) for session in sessions)
+
+    return run, len(s15)
@@ -0,0 +1,235 @@
+"""
+Synthetic Market Data Generators
+Seeded S15/M1/M5/H1/D1 bars, trades and zones for the benchmark suite.
+
+Bars follow the shape of PolygonClient.get_bars(): a tz-aware
+America/New_York `timestamp` plus open/high/low/close/volume/vwap, with
+`bar_date` / `bar_time` columns added for the processors that group by
+session. Prices are a random walk whose per-bar volatility scales with the
+bar length, drifting through trending and ranging regimes so fractals,
+supply/demand pivots and zone traversals all occur. Volume follows the
+usual intraday U shape. The same seed always gives the same data.
+"""
+
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ET = "America/New_York"
+
+# Bar length in seconds (D1 handled separately)
+TIMEFRAME_SECONDS = {
+    "S15": 15,
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "H1": 3600,
+    "H4": 14400,
+}
+
+REGULAR_SESSION = (time(9, 30), time(16, 0))
+EXTENDED_SESSION = (time(4, 0), time(20, 0))
+
+DAILY_VOLATILITY = 0.02        # ~2% daily moves
+BASE_DAILY_VOLUME = 20_000_000
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Workload size for one benchmark run."""
+    name: str
+    intraday_days: int     # S15 / M1 / M5 sessions
+    htf_days: int          # H1 / H4 / D1 history
+    trades: int
+    zones_per_day: int
+
+
+SCALES: Dict[str, Scale] = {
+    "smoke": Scale("smoke", intraday_days=2, htf_days=40, trades=20, zones_per_day=2),
+    "small": Scale("small", intraday_days=10, htf_days=120, trades=200, zones_per_day=4),
+    "medium": Scale("medium", intraday_days=40, htf_days=250, trades=1_000, zones_per_day=4),
+    "large": Scale("large", intraday_days=120, htf_days=750, trades=5_000, zones_per_day=6),
+}
+
+
+def trading_days(start: date, count: int) -> List[date]:
+    """The first `count` weekdays on or after start."""
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def _session_offsets(bar_seconds: int, extended: bool) -> np.ndarray:
+    """Bar start offsets (seconds from midnight) for one session."""
+    open_t, close_t = EXTENDED_SESSION if extended else REGULAR_SESSION
+    start = open_t.hour * 3600 + open_t.minute * 60
+    end = close_t.hour * 3600 + close_t.minute * 60
+    return np.arange(start, end, bar_seconds, dtype=np.int64)
+
+
+def _volume_shape(offsets: np.ndarray) -> np.ndarray:
+    """U-shaped intraday volume weights, lighter outside regular hours."""
+    rth_open, rth_close = 9.5 * 3600, 16 * 3600
+    x = np.clip((offsets - rth_open) / (rth_close - rth_open), 0.0, 1.0)
+    shape = 1.0 + 3.0 * (2.0 * x - 1.0) ** 4
+    outside = (offsets < rth_open) | (offsets >= rth_close)
+    shape[outside] = 0.08
+    return shape / shape.sum()
+
+
+def _random_walk(rng: np.random.RandomState, n: int, sigma: float, start_price: float,
+                 regime_length: int) -> np.ndarray:
+    """Log random walk with alternating trend / range regimes."""
+    regimes = max(1, n // max(1, regime_length) + 1)
+    drift = rng.choice([-1.0, 0.0, 0.0, 1.0], size=regimes) * sigma * 0.15
+    drift = np.repeat(drift, regime_length)[:n]
+    returns = rng.normal(0.0, sigma, n) + drift
+    return start_price * np.exp(np.cumsum(returns))
+
+
+def _ohlcv(rng: np.random.RandomState, closes: np.ndarray, sigma: float,
+           volumes: np.ndarray) -> Dict[str, np.ndarray]:
+    opens = np.empty_like(closes)
+    opens[0] = closes[0] * (1 - rng.normal(0, sigma))
+    opens[1:] = closes[:-1]
+    body_high = np.maximum(opens, closes)
+    body_low = np.minimum(opens, closes)
+    highs = body_high * (1 + np.abs(rng.normal(0, sigma * 0.6, len(closes))))
+    lows = body_low * (1 - np.abs(rng.normal(0, sigma * 0.6, len(closes))))
+    return {
+        "open": np.round(opens, 4),
+        "high": np.round(highs, 4),
+        "low": np.round(lows, 4),
+        "close": np.round(closes, 4),
+        "volume": volumes,
+        "vwap": np.round((highs + lows + closes) / 3, 4),
+    }
+
+
+def make_bars(
+    timeframe: str,
+    days: int,
+    start: date = date(2025, 1, 6),
+    start_price: float = 100.0,
+    seed: int = 0,
+    extended: Optional[bool] = None,
+) -> pd.DataFrame:
+    """
+    Generate `days` sessions of bars for one ticker.
+
+    Args:
+        timeframe: S15, M1, M5, M15, H1, H4 or D1
+        days: Number of trading days
+        start: First calendar date (weekends are skipped)
+        start_price: Price at the start of the walk
+        seed: RNG seed
+        extended: Include 04:00-20:00 (default: H1/H4 only, like Polygon HTF)
+
+    Returns:
+        DataFrame with timestamp, open, high, low, close, volume, vwap,
+        bar_date, bar_time
+    """
+    timeframe = timeframe.upper()
+    rng = np.random.RandomState(seed)
+    sessions = trading_days(start, days)
+
+    if timeframe == "D1":
+        sigma = DAILY_VOLATILITY
+        closes = _random_walk(rng, days, sigma, start_price, regime_length=15)
+        volumes = (BASE_DAILY_VOLUME * rng.lognormal(0, 0.3, days)).astype(np.int64)
+        df = pd.DataFrame(_ohlcv(rng, closes, sigma, volumes))
+        df.insert(0, "timestamp", pd.DatetimeIndex(sessions).tz_localize(ET))
+        df["bar_date"] = sessions
+        df["bar_time"] = time(0, 0)
+        return df
+
+    if timeframe not in TIMEFRAME_SECONDS:
+        raise ValueError(f"Unknown timeframe {timeframe!r}")
+
+    bar_seconds = TIMEFRAME_SECONDS[timeframe]
+    if extended is None:
+        extended = timeframe in ("H1", "H4")
+    offsets = _session_offsets(bar_seconds, extended)
+    per_day = len(offsets)
+    n = per_day * days
+
+    sigma = DAILY_VOLATILITY * np.sqrt(bar_seconds / (6.5 * 3600))
+    closes = _random_walk(rng, n, sigma, start_price, regime_length=max(20, per_day // 2))
+
+    shape = np.tile(_volume_shape(offsets), days)
+    volumes = (BASE_DAILY_VOLUME * shape * rng.lognormal(0, 0.5, n)).astype(np.int64) + 1
+
+    day_index = np.repeat(np.arange(days), per_day)
+    midnights = pd.DatetimeIndex(sessions).values.astype("datetime64[s]")
+    stamps = midnights[day_index] + np.tile(offsets, days).astype("timedelta64[s]")
+
+    df = pd.DataFrame(_ohlcv(rng, closes, sigma, volumes))
+    df.insert(0, "timestamp", pd.DatetimeIndex(stamps).tz_localize(ET))
+    df["bar_date"] = np.array(sessions, dtype=object)[day_index]
+    df["bar_time"] = df["timestamp"].dt.time
+    return df
+
+
+def make_zones(bars: pd.DataFrame, per_day: int, seed: int = 0) -> Dict[date, List[dict]]:
+    """
+    Zones around prices each session actually trades through.
+
+    Returns:
+        {bar_date: [{'zone_high', 'zone_low', 'hvn_poc', 'zone_type'}, ...]}
+        with PRIMARY / SECONDARY alternating
+    """
+    rng = np.random.RandomState(seed)
+    zones = {}
+    for bar_date, day in bars.groupby("bar_date", sort=True):
+        low, high = float(day["low"].min()), float(day["high"].max())
+        width = max((high - low) * 0.04, 0.01)
+        day_zones = []
+        for i in range(per_day):
+            poc = round(rng.uniform(low, high), 2)
+            day_zones.append({
+                "zone_high": round(poc + width / 2, 2),
+                "zone_low": round(poc - width / 2, 2),
+                "hvn_poc": poc,
+                "zone_type": "PRIMARY" if i % 2 == 0 else "SECONDARY",
+            })
+        zones[bar_date] = day_zones
+    return zones
+
+
+def make_trades(bars: pd.DataFrame, count: int, ticker: str = "BENCH", seed: int = 0) -> List[dict]:
+    """
+    Trades shaped like trades_2 rows, entered on regular-session M1/S15 bars.
+
+    Entries stop at 15:30 so every trade has bars to walk to the 15:50 EOD.
+    """
+    rng = np.random.RandomState(seed)
+    entry_bars = bars[(bars["bar_time"] >= time(9, 35)) & (bars["bar_time"] <= time(15, 30))]
+    picks = np.sort(rng.choice(len(entry_bars), size=count, replace=len(entry_bars) < count))
+
+    trades = []
+    for i, idx in enumerate(picks):
+        bar = entry_bars.iloc[idx]
+        direction = "LONG" if rng.rand() < 0.5 else "SHORT"
+        price = float(bar["close"])
+        half = price * 0.002
+        model = ("EPCH1", "EPCH2", "EPCH3", "EPCH4")[rng.randint(4)]
+        trades.append({
+            "trade_id": f"{ticker}_{bar['bar_date']:%m%d%y}_{model}_{bar['bar_time']:%H%M}_{i}",
+            "ticker": ticker,
+            "date": bar["bar_date"],
+            "model": model,
+            "zone_type": "PRIMARY" if model in ("EPCH1", "EPCH2") else "SECONDARY",
+            "direction": direction,
+            "zone_high": round(price + half, 2),
+            "zone_low": round(price - half, 2),
+            "entry_price": price,
+            "entry_time": bar["bar_time"],
+        })
+    return trades
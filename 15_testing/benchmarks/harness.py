@@ -0,0 +1,186 @@
+"""
+Benchmark Harness
+Timing, peak-memory measurement, JSON baselines and regression checks.
+
+Each benchmark is timed `repeat` times with time.perf_counter after one
+untimed warm-up call (JIT compilation, import side effects), then run once
+more under tracemalloc for peak memory, so tracing overhead never leaks
+into the timings. NumPy reports its buffers to tracemalloc, so array
+allocations are included in the peak.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.25        # 25% slower (or bigger) than baseline = regression
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one benchmark at one scale."""
+    name: str
+    items: int                  # workload size (bars, trades, ...)
+    times: List[float] = field(default_factory=list)
+    peak_bytes: int = 0
+    error: Optional[str] = None
+
+    @property
+    def median_s(self) -> float:
+        return statistics.median(self.times) if self.times else 0.0
+
+    @property
+    def min_s(self) -> float:
+        return min(self.times) if self.times else 0.0
+
+    @property
+    def items_per_s(self) -> float:
+        return self.items / self.median_s if self.median_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "items": self.items,
+            "median_s": round(self.median_s, 6),
+            "min_s": round(self.min_s, 6),
+            "items_per_s": round(self.items_per_s, 1),
+            "peak_kib": round(self.peak_bytes / 1024, 1),
+            "times": [round(t, 6) for t in self.times],
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+@dataclass
+class Comparison:
+    """One benchmark compared against its baseline."""
+    name: str
+    status: str                 # ok, regression, improved, new, missing, error
+    time_ratio: Optional[float] = None
+    memory_ratio: Optional[float] = None
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Tuple[List[float], int]:
+    """
+    Time fn() `repeat` times and measure its peak traced memory once.
+
+    Returns:
+        (wall times in seconds, peak bytes allocated during one call)
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return times, max(0, peak - baseline)
+
+
+# =============================================================================
+# BASELINES
+# =============================================================================
+
+def environment() -> Dict[str, str]:
+    """Machine details stored with a run (timings are only comparable on the same box)."""
+    import numpy as np
+    import pandas as pd
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def build_report(scale: str, results: List[BenchmarkResult], seed: int) -> Dict[str, Any]:
+    """JSON-ready record of one run."""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "scale": scale,
+        "seed": seed,
+        "environment": environment(),
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+
+def save_report(report: Dict[str, Any], path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, default=str))
+
+
+def load_report(path: Path) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    memory_threshold: Optional[float] = None,
+) -> List[Comparison]:
+    """
+    Compare a run against a baseline report (both from build_report).
+
+    A benchmark regresses when its median time, or its peak memory, grows
+    by more than the threshold. Median time is used so one noisy repeat
+    cannot trigger a failure.
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    now, before = current.get("results", {}), baseline.get("results", {})
+    comparisons = []
+
+    for name, result in now.items():
+        if result.get("error"):
+            comparisons.append(Comparison(name, "error"))
+            continue
+        base = before.get(name)
+        if not base or base.get("error") or not base.get("median_s"):
+            comparisons.append(Comparison(name, "new"))
+            continue
+
+        time_ratio = result["median_s"] / base["median_s"]
+        memory_ratio = (result["peak_kib"] / base["peak_kib"]) if base.get("peak_kib") else None
+
+        if time_ratio > 1 + threshold or (memory_ratio is not None and memory_ratio > 1 + memory_threshold):
+            status = "regression"
+        elif time_ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, status, round(time_ratio, 3),
+                                      None if memory_ratio is None else round(memory_ratio, 3)))
+
+    for name in before:
+        if name not in now:
+            comparisons.append(Comparison(name, "missing"))
+
+    return comparisons
+
+
+def comparison_dicts(comparisons: List[Comparison]) -> List[Dict[str, Any]]:
+    return [asdict(c) for c in comparisons]
@@ -0,0 +1,109 @@
+"""
+Benchmark Runner
+Usage:
+    python run_benchmarks.py                          # small scale, compare to baselines/small.json
+    python run_benchmarks.py --scale medium -k zones  # only cases whose name contains "zones"
+    python run_benchmarks.py --save-baseline          # record this run as the new baseline
+    python run_benchmarks.py --threshold 0.15         # fail on >15% slowdown
+    python run_benchmarks.py --list
+
+Runs offline against the in-repo modules. Each run is written to
+results/<scale>_<timestamp>.json; baselines live in baselines/<scale>.json.
+Exits 1 when any case regresses past the threshold or errors.
+"""
+import argparse
+import sys
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from cases import CASES
+from generators import SCALES
+from harness import (
+    DEFAULT_THRESHOLD, BenchmarkResult, build_report, compare, load_report,
+    measure, save_report,
+)
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_DIR = BENCH_DIR / "baselines"
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+def run_case(name: str, scale, seed: int, repeat: int) -> BenchmarkResult:
+    """Set up and measure one case; errors are recorded, not raised."""
+    try:
+        fn, items = CASES[name].setup(scale, seed)
+        times, peak = measure(fn, repeat=repeat)
+        return BenchmarkResult(name, items, times, peak)
+    except Exception as e:
+        traceback.print_exc()
+        return BenchmarkResult(name, 0, error=f"{type(e).__name__}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epoch benchmark runner")
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="Workload size")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per case")
+    parser.add_argument("--seed", type=int, default=0, help="Data generator seed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown / memory growth vs baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON (default baselines/<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for case in CASES.values():
+            print(f"  {case.name:<20} {case.description}")
+        return
+
+    scale = SCALES[args.scale]
+    names = [n for n in CASES if args.filter in n]
+    print(f"Scale: {scale.name}  Seed: {args.seed}  Repeat: {args.repeat}  Cases: {len(names)}")
+    print(f"{'-'*80}")
+    print(f"  {'case':<20} {'items':>9} {'median':>10} {'min':>10} {'items/s':>12} {'peak':>10}")
+
+    results = []
+    for name in names:
+        result = run_case(name, scale, args.seed, args.repeat)
+        results.append(result)
+        if result.error:
+            print(f"  {name:<20} ERROR {result.error}")
+        else:
+            print(f"  {name:<20} {result.items:>9,} {result.median_s*1000:>8.1f}ms {result.min_s*1000:>8.1f}ms "
+                  f"{result.items_per_s:>12,.0f} {result.peak_bytes/1024/1024:>8.1f}MB")
+
+    report = build_report(scale.name, results, args.seed)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    save_report(report, RESULTS_DIR / f"{scale.name}_{stamp}.json")
+
+    failed = any(r.error for r in results)
+    baseline_path = args.baseline or BASELINE_DIR / f"{scale.name}.json"
+
+    if args.save_baseline:
+        save_report(report, baseline_path)
+        print(f"\nBaseline written: {baseline_path}")
+    else:
+        baseline = load_report(baseline_path)
+        if baseline is None:
+            print(f"\nNo baseline at {baseline_path} (run with --save-baseline to create one)")
+        else:
+            print(f"\nCompared to {baseline_path.name} ({baseline.get('created', '?')}), "
+                  f"threshold {args.threshold:.0%}:")
+            for c in compare(report, baseline, args.threshold):
+                ratios = ""
+                if c.time_ratio is not None:
+                    ratios = f"time x{c.time_ratio:.2f}"
+                    if c.memory_ratio is not None:
+                        ratios += f"  mem x{c.memory_ratio:.2f}"
+                print(f"  {c.status.upper():<10} {c.name:<20} {ratios}")
+                failed |= c.status in ("regression", "error")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()